@@ -12,6 +12,7 @@ import logging
 from backend.shared.models.regime import MarketRegime, RegimeDimensions, SymbolRegime
 from backend.shared.models.data import MultiTimeframeData
 from backend.shared.models.indicators import IndicatorSet
+from backend.analysis.universe_regime import PrecomputedTrend, frame_trend_inputs
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +50,16 @@ def _highest_duration_tf(keys) -> Optional[str]:
 class RegimeDetector:
     """Detects market regime across multiple dimensions"""
 
-    def __init__(self, mode_profile: str = "stealth_balanced"):
+    def __init__(self, mode_profile: str = "stealth_balanced", replay_mode: bool = False):
+        """
+        Args:
+            mode_profile: Scanner mode profile selecting the trend thresholds
+            replay_mode: Every reading is a pure function of the data passed
+                in: no wall-clock caches and no hysteresis across readings.
+                Replay steps through bars far faster than wall time, and a
+                bar must get the same regime whichever process computes it.
+        """
+        self.replay_mode = replay_mode
         self.regime_history: List[MarketRegime] = []
         self.hysteresis_bars = 5  # INCREASED: Require 5 bars before flip (was 3)
         self.mode_profile = mode_profile
@@ -114,7 +124,11 @@ class RegimeDetector:
         """
 
         # Check cache (Gap #4)
-        if self._global_regime_cache is not None and self._global_regime_cache_time is not None:
+        if (
+            not self.replay_mode
+            and self._global_regime_cache is not None
+            and self._global_regime_cache_time is not None
+        ):
             age = (datetime.utcnow() - self._global_regime_cache_time).total_seconds()
             if age < self._global_regime_ttl:
                 logger.debug(f"🗄️ Returning cached global regime (age={age:.1f}s)")
@@ -167,6 +181,9 @@ class RegimeDetector:
             derivatives_score=deriv_score,
         )
 
+        if self.replay_mode:  # one reading per bar: no hysteresis, no cache
+            return regime
+
         # Apply hysteresis to prevent flip-flopping
         regime = self._apply_hysteresis(regime)
 
@@ -211,6 +228,7 @@ class RegimeDetector:
         data: MultiTimeframeData,
         indicators: IndicatorSet,
         cycle_context: Optional["CycleContext"] = None,  # NEW: Cycle-aware override
+        precomputed_trend: Optional[PrecomputedTrend] = None,
     ) -> SymbolRegime:
         """
         Detect per-symbol local regime.
@@ -220,20 +238,25 @@ class RegimeDetector:
             data: Symbol multi-timeframe data
             indicators: Symbol indicators
             cycle_context: Optional cycle context for extreme-zone overrides
+            precomputed_trend: Trend from the scan-level universe pass
+                (universe_regime.compute_universe_regime); skips _detect_trend
 
         Returns:
             SymbolRegime with local trend/vol assessment
         """
 
         # Check cache (Gap #4)
-        if symbol in self._symbol_regime_cache:
+        if not self.replay_mode and symbol in self._symbol_regime_cache:
             cached_regime, cached_time = self._symbol_regime_cache[symbol]
             age = (datetime.utcnow() - cached_time).total_seconds()
             if age < self._symbol_regime_ttl:
                 logger.debug(f"🗄️ Returning cached regime for {symbol} (age={age:.1f}s)")
                 return cached_regime
 
-        trend, _ = self._detect_trend(data)
+        if precomputed_trend is not None:
+            trend = precomputed_trend.trend
+        else:
+            trend, _ = self._detect_trend(data)
         volatility, _ = self._detect_volatility(indicators)
 
         # Symbol score based on trend clarity + volatility quality
@@ -273,7 +296,8 @@ class RegimeDetector:
         regime = SymbolRegime(symbol=symbol, trend=trend, volatility=volatility, score=score)
 
         # Cache result (Gap #4)
-        self._symbol_regime_cache[symbol] = (regime, datetime.utcnow())
+        if not self.replay_mode:
+            self._symbol_regime_cache[symbol] = (regime, datetime.utcnow())
 
         return regime
 
@@ -318,6 +342,10 @@ class RegimeDetector:
         1. Swing structure detection (primary) - 50-bar lookback
         2. ADX check (secondary) - confirms sideways when ADX < 20
 
+        Numeric inputs (ADX, MA20 slope, range ATR%) come from
+        universe_regime.trend_inputs — the same vectorized computation the
+        scan-level universe pass uses — and classify_trend maps them to a label.
+
         Returns: (trend_label, score, reason)
         """
         from backend.strategy.smc.swing_structure import detect_swing_structure
@@ -328,117 +356,24 @@ class RegimeDetector:
 
         # === 1. Calculate ADX for secondary confirmation ===
         adx_value = None
-        adx_diagnostic = {}  # Track WHY ADX might fail
+        inputs = None
 
         try:
-            # Diagnostic: Check input data quality
-            df_len = len(df)
-            has_required_cols = all(col in df.columns for col in ["high", "low", "close"])
-
-            if not has_required_cols:
+            if not all(col in df.columns for col in ["high", "low", "close"]):
                 logger.warning(
                     f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Missing required columns. Have: {df.columns.tolist()}"
                 )
-                adx_diagnostic["reason"] = "missing_columns"
                 raise ValueError(f"Missing required columns for ADX calculation")
 
-            logger.debug(
-                f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Starting calculation with {df_len} bars"
-            )
-
-            # Calculate ADX manually (14-period standard)
-            df_copy = df.copy()
-
-            # True Range
-            df_copy["tr"] = df_copy.apply(
-                lambda row: max(
-                    row["high"] - row["low"],
-                    (
-                        abs(row["high"] - df_copy["close"].shift(1).loc[row.name])
-                        if row.name > df_copy.index[0]
-                        else row["high"] - row["low"]
-                    ),
-                    (
-                        abs(row["low"] - df_copy["close"].shift(1).loc[row.name])
-                        if row.name > df_copy.index[0]
-                        else row["high"] - row["low"]
-                    ),
-                ),
-                axis=1,
-            )
-
-            # Diagnostic: Check TR calculation
-            tr_valid_count = df_copy["tr"].notna().sum()
-            logger.debug(
-                f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: TR calculated, {tr_valid_count}/{df_len} valid values"
-            )
-
-            # +DM and -DM
-            df_copy["plus_dm"] = df_copy["high"].diff()
-            df_copy["minus_dm"] = -df_copy["low"].diff()
-            df_copy["plus_dm"] = df_copy.apply(
-                lambda row: (
-                    row["plus_dm"] if row["plus_dm"] > row["minus_dm"] and row["plus_dm"] > 0 else 0
-                ),
-                axis=1,
-            )
-            df_copy["minus_dm"] = df_copy.apply(
-                lambda row: (
-                    row["minus_dm"]
-                    if row["minus_dm"] > row["plus_dm"] and row["minus_dm"] > 0
-                    else 0
-                ),
-                axis=1,
-            )
-
-            # Smoothed averages (14-period)
-            period = 14
-            df_copy["atr14"] = df_copy["tr"].rolling(period).mean()
-            df_copy["plus_di"] = 100 * (
-                df_copy["plus_dm"].rolling(period).mean() / df_copy["atr14"]
-            )
-            df_copy["minus_di"] = 100 * (
-                df_copy["minus_dm"].rolling(period).mean() / df_copy["atr14"]
-            )
-
-            # Diagnostic: Check DI values
-            plus_di_final = (
-                df_copy["plus_di"].iloc[-1] if not df_copy["plus_di"].isna().all() else None
-            )
-            minus_di_final = (
-                df_copy["minus_di"].iloc[-1] if not df_copy["minus_di"].isna().all() else None
-            )
-            plus_di_str = f"{plus_di_final:.1f}" if plus_di_final is not None else "N/A"
-            minus_di_str = f"{minus_di_final:.1f}" if minus_di_final is not None else "N/A"
-            logger.debug(
-                f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: +DI={plus_di_str}, -DI={minus_di_str}"
-            )
-
-            # DX and ADX
-            df_copy["dx"] = (
-                100
-                * abs(df_copy["plus_di"] - df_copy["minus_di"])
-                / (df_copy["plus_di"] + df_copy["minus_di"] + 1e-10)
-            )
-            df_copy["adx"] = df_copy["dx"].rolling(period).mean()
-
-            # Extract final ADX value
-            adx_value = df_copy["adx"].iloc[-1]
-
-            # Diagnostic: Check if ADX is valid
-            if adx_value is None or (
-                isinstance(adx_value, float) and (adx_value != adx_value)
-            ):  # NaN check
+            inputs = frame_trend_inputs(df)
+            adx_raw = inputs["adx"]
+            if adx_raw is None or adx_raw != adx_raw:  # NaN check
                 logger.warning(
-                    f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Calculated ADX is None/NaN. DX series has {df_copy['dx'].notna().sum()} valid values"
+                    f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Calculated ADX is None/NaN ({len(df)} bars)"
                 )
-                adx_diagnostic["reason"] = "nan_result"
-                adx_diagnostic["dx_valid_count"] = df_copy["dx"].notna().sum()
-                adx_value = None
             else:
+                adx_value = float(adx_raw)
                 logger.info(f"✅ ADX [{timeframe_label}]: {adx_value:.1f} (valid calculation)")
-                adx_diagnostic["reason"] = "success"
-                adx_diagnostic["value"] = adx_value
 
         except Exception as e:
             error_type = type(e).__name__
@@ -446,8 +381,6 @@ class RegimeDetector:
                 f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Calculation FAILED with {error_type}: {str(e)[:100]}"
             )
             logger.debug(f"🔍 ADX DIAGNOSTIC [{timeframe_label}]: Full error: {e}", exc_info=True)
-            adx_diagnostic["reason"] = f"exception_{error_type}"
-            adx_diagnostic["error"] = str(e)[:200]
             adx_value = None
 
         # === 2. Swing Structure Detection (50-bar lookback) ===
@@ -458,156 +391,19 @@ class RegimeDetector:
 
             # Use swing structure detector
             swing_struct = detect_swing_structure(df, lookback=scaled_lookback)
-            trend = swing_struct.trend
-
-            # Log swing points for debugging
-            if len(swing_struct.swing_points) > 0:
-                recent_5 = swing_struct.swing_points[-5:]
-                logger.info(
-                    f"📊 {timeframe_label} SWINGS (last 5): "
-                    + " | ".join(
-                        [
-                            f"{s.swing_type.upper()}@{s.price:.2f} (str={s.strength:.1f})"
-                            for s in recent_5
-                        ]
-                    )
-                )
-            else:
-                logger.info(f"📊 {timeframe_label} SWINGS: No swings detected")
 
-            # Check momentum strength
-            recent_swings = (
-                swing_struct.swing_points[-5:] if len(swing_struct.swing_points) >= 5 else []
+            if inputs is None:
+                inputs = frame_trend_inputs(df)
+            slope = float(inputs["slope_pct"])
+            normalized_slope = float(inputs["normalized_slope"])
+            logger.info(
+                f"📈 {timeframe_label} MA20: slope={slope:.2f}% | norm_slope={normalized_slope:.2f} | "
+                f"price={df['close'].iloc[-1]:.2f}"
             )
-            strong_swings = [s for s in recent_swings if s.strength > 1.5]
-            has_strong_momentum = len(strong_swings) >= 3
 
-            # Check MA slope
-            df_copy = df.copy()
-            df_copy["ma20"] = df_copy["close"].rolling(20).mean()
-
-            if not df_copy["ma20"].isna().all():
-                ma20_now = df_copy["ma20"].iloc[-1]
-                ma20_before = df_copy["ma20"].iloc[-20]
-                slope = (ma20_now - ma20_before) / ma20_before * 100
-
-                atr = df_copy["high"].rolling(14).max() - df_copy["low"].rolling(14).min()
-                current_price = df_copy["close"].iloc[-1]
-                atr_pct = (atr.iloc[-1] / current_price * 100) if current_price > 0 else 1.0
-                normalized_slope = slope / max(atr_pct, 0.5)
-
-                logger.info(
-                    f"📈 {timeframe_label} MA20: now={ma20_now:.2f} | 20bars_ago={ma20_before:.2f} | "
-                    f"slope={slope:.2f}% | norm_slope={normalized_slope:.2f} | price={current_price:.2f}"
-                )
-            else:
-                normalized_slope = 0
-                logger.info(f"📈 {timeframe_label} MA20: Insufficient data for slope")
-
-            # === 3. Classification with ADX Confirmation ===
-
-            # Get mode-specific thresholds
-            strong_slope_threshold = self.thresholds["strong_momentum_slope"]
-            
-            # Helper to generate context description from slope
-            def get_trend_desc(trend_lbl, cur_slope):
-                if trend_lbl == "bullish":
-                    if cur_slope > 4.0: return "Explosive Trend"
-                    if cur_slope > 2.0: return "Strong Momentum"
-                    return "Steady Uptrend"
-                elif trend_lbl == "bearish":
-                    if cur_slope < -4.0: return "Aggressive Selling"
-                    if cur_slope < -2.0: return "Momentum Breakdown"
-                    return "Steady Downtrend"
-                return "Ranging Structure"
-
-            # === MA SLOPE OVERRIDE ===
-            # If MA slope is strongly negative OR positive, override swing structure
-            MA_SLOPE_OVERRIDE_THRESHOLD = 0.06  
-            RAW_SLOPE_OVERRIDE_THRESHOLD = 3.0  
-            
-            if slope < -RAW_SLOPE_OVERRIDE_THRESHOLD and trend == "bullish":
-                logger.warning(
-                    f"⚠️ RAW SLOPE OVERRIDE {timeframe_label}: swing=bullish BUT raw slope={slope:.2f}% < -{RAW_SLOPE_OVERRIDE_THRESHOLD} → DOWN"
-                )
-                # §10 bull/bear symmetry: down=70 mirrors up=70 (line 509).
-                return "down", 70.0, "Momentum Breakdown"
-            
-            if slope > RAW_SLOPE_OVERRIDE_THRESHOLD and trend == "bearish":
-                logger.warning(
-                    f"⚠️ RAW SLOPE OVERRIDE {timeframe_label}: swing=bearish BUT raw slope={slope:.2f}% > {RAW_SLOPE_OVERRIDE_THRESHOLD} → UP"
-                )
-                return "up", 70.0, "Explosive Rebound"
-            
-            if normalized_slope < -MA_SLOPE_OVERRIDE_THRESHOLD and trend == "bullish":
-                logger.warning(
-                    f"⚠️ MA SLOPE OVERRIDE {timeframe_label}: swing=bullish BUT norm_slope={normalized_slope:.2f} < -{MA_SLOPE_OVERRIDE_THRESHOLD} → DOWN"
-                )
-                # §10 bull/bear symmetry: down=70 mirrors up=70 (line 521).
-                # Trend *clarity* drives quality; *direction* doesn't.
-                return "down", 70.0, "Structural Fatigue"
-            
-            if normalized_slope > MA_SLOPE_OVERRIDE_THRESHOLD and trend == "bearish":
-                logger.warning(
-                    f"⚠️ MA SLOPE OVERRIDE {timeframe_label}: swing=bearish BUT norm_slope={normalized_slope:.2f} > {MA_SLOPE_OVERRIDE_THRESHOLD} → UP"
-                )
-                return "up", 70.0, "Impulsive Recovery"
-
-            # If swing structure found a trend
-            if trend == "bullish":
-                desc = get_trend_desc("bullish", slope)
-                if has_strong_momentum and normalized_slope > strong_slope_threshold:
-                    return "strong_up", 85.0, desc
-                else:
-                    return "up", 70.0, desc
-
-            elif trend == "bearish":
-                desc = get_trend_desc("bearish", slope)
-                # §10 bull/bear symmetry: scores mirror the bullish branch above
-                # (strong_down 85, down 70). Standard trend-following research
-                # treats both directions as equally tradeable for a system that
-                # trades LONG and SHORT — directional clarity is the quality
-                # signal, not the direction itself. Prior asymmetric scores
-                # (15 / 30) implicitly weighted "buy-and-hold direction" and
-                # produced a structural drag on SHORT performance via the
-                # composite regime score (trend_score * 0.3 at L121).
-                if has_strong_momentum and normalized_slope < -strong_slope_threshold:
-                    return "strong_down", 85.0, desc
-                else:
-                    return "down", 70.0, desc
-
-            else:
-                # Swing structure returned neutral/sideways
-                # Use mode-specific ADX thresholds to confirm
-                min_adx = self.thresholds["min_trend_adx"]
-
-                logger.info(
-                    f"🔄 {timeframe_label} SIDEWAYS: swing_trend={trend} | "
-                    f"strong_swings={len(strong_swings)}/5 | has_momentum={has_strong_momentum}"
-                )
-
-                if adx_value is not None:
-                    if adx_value < min_adx:
-                        logger.info(
-                            f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f} < {min_adx}, confirmed ranging)"
-                        )
-                        return "sideways", 50.0, f"Ranging (ADX={adx_value:.1f})"
-                    elif adx_value < min_adx + 5:
-                        logger.info(
-                            f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f}, weak trend)"
-                        )
-                        return "sideways", 50.0, f"Weak Trend (ADX={adx_value:.1f})"
-                    else:
-                        # ADX > threshold but no swing pattern = choppy/transitional
-                        logger.info(
-                            f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f} but no clear swing pattern)"
-                        )
-                        return "sideways", 50.0, "Choppy / Transitional"
-                else:
-                    logger.info(
-                        f"✅ {timeframe_label}: SIDEWAYS (no swing pattern, ADX unavailable)"
-                    )
-                    return "sideways", 50.0, "Choppy / No Trend"
+            return self.classify_trend(
+                timeframe_label, swing_struct, slope, normalized_slope, adx_value
+            )
 
         except Exception as e:
             error_type = type(e).__name__
@@ -644,6 +440,150 @@ class RegimeDetector:
             else:
                 return "sideways", 50.0, "Flat Structure"
 
+    def classify_trend(
+        self,
+        timeframe_label: str,
+        swing_struct,
+        slope: float,
+        normalized_slope: float,
+        adx_value: Optional[float],
+    ) -> tuple[str, float, str]:
+        """
+        Map swing structure + MA20 slope + ADX to (trend_label, score, reason).
+
+        Shared by analyze_timeframe_trend (one frame) and the scan-level
+        universe pass in universe_regime (inputs computed for all symbols
+        at once), so both paths classify identically.
+        """
+        trend = swing_struct.trend
+
+        # Log swing points for debugging
+        if len(swing_struct.swing_points) > 0:
+            recent_5 = swing_struct.swing_points[-5:]
+            logger.info(
+                f"📊 {timeframe_label} SWINGS (last 5): "
+                + " | ".join(
+                    [
+                        f"{s.swing_type.upper()}@{s.price:.2f} (str={s.strength:.1f})"
+                        for s in recent_5
+                    ]
+                )
+            )
+        else:
+            logger.info(f"📊 {timeframe_label} SWINGS: No swings detected")
+
+        # Check momentum strength
+        recent_swings = (
+            swing_struct.swing_points[-5:] if len(swing_struct.swing_points) >= 5 else []
+        )
+        strong_swings = [s for s in recent_swings if s.strength > 1.5]
+        has_strong_momentum = len(strong_swings) >= 3
+
+        # === 3. Classification with ADX Confirmation ===
+
+        # Get mode-specific thresholds
+        strong_slope_threshold = self.thresholds["strong_momentum_slope"]
+        
+        # Helper to generate context description from slope
+        def get_trend_desc(trend_lbl, cur_slope):
+            if trend_lbl == "bullish":
+                if cur_slope > 4.0: return "Explosive Trend"
+                if cur_slope > 2.0: return "Strong Momentum"
+                return "Steady Uptrend"
+            elif trend_lbl == "bearish":
+                if cur_slope < -4.0: return "Aggressive Selling"
+                if cur_slope < -2.0: return "Momentum Breakdown"
+                return "Steady Downtrend"
+            return "Ranging Structure"
+
+        # === MA SLOPE OVERRIDE ===
+        # If MA slope is strongly negative OR positive, override swing structure
+        MA_SLOPE_OVERRIDE_THRESHOLD = 0.06  
+        RAW_SLOPE_OVERRIDE_THRESHOLD = 3.0  
+        
+        if slope < -RAW_SLOPE_OVERRIDE_THRESHOLD and trend == "bullish":
+            logger.warning(
+                f"⚠️ RAW SLOPE OVERRIDE {timeframe_label}: swing=bullish BUT raw slope={slope:.2f}% < -{RAW_SLOPE_OVERRIDE_THRESHOLD} → DOWN"
+            )
+            # §10 bull/bear symmetry: down=70 mirrors up=70 (line 509).
+            return "down", 70.0, "Momentum Breakdown"
+        
+        if slope > RAW_SLOPE_OVERRIDE_THRESHOLD and trend == "bearish":
+            logger.warning(
+                f"⚠️ RAW SLOPE OVERRIDE {timeframe_label}: swing=bearish BUT raw slope={slope:.2f}% > {RAW_SLOPE_OVERRIDE_THRESHOLD} → UP"
+            )
+            return "up", 70.0, "Explosive Rebound"
+        
+        if normalized_slope < -MA_SLOPE_OVERRIDE_THRESHOLD and trend == "bullish":
+            logger.warning(
+                f"⚠️ MA SLOPE OVERRIDE {timeframe_label}: swing=bullish BUT norm_slope={normalized_slope:.2f} < -{MA_SLOPE_OVERRIDE_THRESHOLD} → DOWN"
+            )
+            # §10 bull/bear symmetry: down=70 mirrors up=70 (line 521).
+            # Trend *clarity* drives quality; *direction* doesn't.
+            return "down", 70.0, "Structural Fatigue"
+        
+        if normalized_slope > MA_SLOPE_OVERRIDE_THRESHOLD and trend == "bearish":
+            logger.warning(
+                f"⚠️ MA SLOPE OVERRIDE {timeframe_label}: swing=bearish BUT norm_slope={normalized_slope:.2f} > {MA_SLOPE_OVERRIDE_THRESHOLD} → UP"
+            )
+            return "up", 70.0, "Impulsive Recovery"
+
+        # If swing structure found a trend
+        if trend == "bullish":
+            desc = get_trend_desc("bullish", slope)
+            if has_strong_momentum and normalized_slope > strong_slope_threshold:
+                return "strong_up", 85.0, desc
+            else:
+                return "up", 70.0, desc
+
+        elif trend == "bearish":
+            desc = get_trend_desc("bearish", slope)
+            # §10 bull/bear symmetry: scores mirror the bullish branch above
+            # (strong_down 85, down 70). Standard trend-following research
+            # treats both directions as equally tradeable for a system that
+            # trades LONG and SHORT — directional clarity is the quality
+            # signal, not the direction itself. Prior asymmetric scores
+            # (15 / 30) implicitly weighted "buy-and-hold direction" and
+            # produced a structural drag on SHORT performance via the
+            # composite regime score (trend_score * 0.3 at L121).
+            if has_strong_momentum and normalized_slope < -strong_slope_threshold:
+                return "strong_down", 85.0, desc
+            else:
+                return "down", 70.0, desc
+
+        else:
+            # Swing structure returned neutral/sideways
+            # Use mode-specific ADX thresholds to confirm
+            min_adx = self.thresholds["min_trend_adx"]
+
+            logger.info(
+                f"🔄 {timeframe_label} SIDEWAYS: swing_trend={trend} | "
+                f"strong_swings={len(strong_swings)}/5 | has_momentum={has_strong_momentum}"
+            )
+
+            if adx_value is not None:
+                if adx_value < min_adx:
+                    logger.info(
+                        f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f} < {min_adx}, confirmed ranging)"
+                    )
+                    return "sideways", 50.0, f"Ranging (ADX={adx_value:.1f})"
+                elif adx_value < min_adx + 5:
+                    logger.info(
+                        f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f}, weak trend)"
+                    )
+                    return "sideways", 50.0, f"Weak Trend (ADX={adx_value:.1f})"
+                else:
+                    # ADX > threshold but no swing pattern = choppy/transitional
+                    logger.info(
+                        f"✅ {timeframe_label}: SIDEWAYS (ADX={adx_value:.1f} but no clear swing pattern)"
+                    )
+                    return "sideways", 50.0, "Choppy / Transitional"
+            else:
+                logger.info(
+                    f"✅ {timeframe_label}: SIDEWAYS (no swing pattern, ADX unavailable)"
+                )
+                return "sideways", 50.0, "Choppy / No Trend"
+
     def _detect_trend(self, data: MultiTimeframeData):
         """
         Detect global trend using the highest available timeframe.
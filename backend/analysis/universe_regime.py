@@ -0,0 +1,272 @@
+"""
+Universe Regime Engine - whole-universe regime inputs in one pass
+
+RegimeDetector.analyze_timeframe_trend used to run inside every
+ProcessPool worker, recomputing ADX (row-wise .apply, O(n^2) via a
+per-row shift), MA20 slope and range-ATR from each symbol's HTF frame.
+This module computes those inputs for every symbol at once, in the main
+process, right after parallel_fetch:
+
+  1. Symbols are grouped by the timeframe _detect_trend would pick
+     (first of 1w/1d/4h/1h/30m/15m present).
+  2. Each group's trailing window is stacked into bars x symbols frames
+     and ADX / MA20 slope / range-ATR% / above-MA20 are computed as
+     column-wise rolling operations (trend_inputs).
+  3. Swing structure is still detected per symbol (it is a sequential
+     pivot walk), then RegimeDetector.classify_trend turns the inputs
+     into the same (trend, score, reason) the per-symbol path produced.
+
+The per-symbol result rides to the worker in worker_args as a
+PrecomputedTrend; the worker's detect_symbol_regime uses it instead of
+re-deriving the trend and only reads volatility from the IndicatorSet it
+already computed.
+
+Cross-sectional view (UniverseRegime):
+  breadth_up_pct / breadth_down_pct  — share of symbols trending up/down
+  above_ma20_pct                     — share closing above their MA20
+  return_dispersion_pct              — cross-sectional stdev of 20-bar returns
+  median_atr_pct                     — median range-ATR% across the universe
+  liquidity_pct_rank                 — per-symbol percentile of 20-bar mean
+                                       dollar volume within the universe
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Same preference order as RegimeDetector._detect_trend.
+TREND_TF_PREFERENCE = ("1w", "1d", "4h", "1h", "30m", "15m")
+
+# Bars needed for the last value of every input: MA20 slope reads
+# ma20[-20] (39 bars back), ADX reads 14 DX values built from 14-bar
+# DI averages over a diff (29 bars). 60 leaves headroom.
+TREND_WINDOW = 60
+
+MIN_TREND_BARS = 50  # analyze_timeframe_trend's "Insufficient data" floor
+
+_ADX_PERIOD = 14
+_MA_PERIOD = 20
+_RANGE_PERIOD = 14
+_LIQUIDITY_WINDOW = 20
+
+
+def trend_inputs(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    """
+    Trend-classification inputs for every column (symbol) of bars x symbols frames.
+
+    Returns a frame indexed by column with:
+      adx              — 14-period ADX from simple rolling means (NaN if undefined)
+      slope_pct        — MA20 change over the last 20 bars, in percent
+      normalized_slope — slope_pct / max(range_atr_pct, 0.5)
+      atr_pct          — (14-bar highest high - lowest low) / close, in percent
+      above_ma20       — last close above MA20
+
+    Definitions match the historical per-symbol computation in
+    RegimeDetector.analyze_timeframe_trend, including its DM tie rule
+    (-DM is compared against the already-filtered +DM).
+    """
+    prev_close = close.shift(1)
+    hl = high - low
+    tr = np.maximum(hl, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    tr.iloc[0] = hl.iloc[0]
+
+    up = high.diff()
+    down = -low.diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0)
+    minus_dm = down.where((down > plus_dm) & (down > 0), 0.0)
+
+    atr14 = tr.rolling(_ADX_PERIOD).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * (plus_dm.rolling(_ADX_PERIOD).mean() / atr14)
+        minus_di = 100 * (minus_dm.rolling(_ADX_PERIOD).mean() / atr14)
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di + 1e-10)
+    adx = dx.rolling(_ADX_PERIOD).mean().iloc[-1]
+
+    ma20 = close.rolling(_MA_PERIOD).mean()
+    ma_now = ma20.iloc[-1]
+    ma_before = ma20.iloc[-_MA_PERIOD]
+    slope = (ma_now - ma_before) / ma_before * 100
+
+    rng = (high.rolling(_RANGE_PERIOD).max() - low.rolling(_RANGE_PERIOD).min()).iloc[-1]
+    price = close.iloc[-1]
+    atr_pct = (rng / price * 100).where(price > 0, 1.0)
+    normalized_slope = slope / np.maximum(atr_pct, 0.5)
+
+    return pd.DataFrame(
+        {
+            "adx": adx.replace([np.inf, -np.inf], np.nan),
+            "slope_pct": slope,
+            "normalized_slope": normalized_slope,
+            "atr_pct": atr_pct,
+            "above_ma20": close.iloc[-1] > ma_now,
+        }
+    )
+
+
+def frame_trend_inputs(df: pd.DataFrame) -> Dict[str, Any]:
+    """trend_inputs for a single OHLC frame, as a plain dict."""
+    cols = {c: pd.DataFrame({"_": df[c].to_numpy(dtype=float)}) for c in ("high", "low", "close")}
+    return trend_inputs(cols["high"], cols["low"], cols["close"]).iloc[0].to_dict()
+
+
+@dataclass(frozen=True)
+class PrecomputedTrend:
+    """One symbol's trend verdict plus the inputs it was derived from."""
+
+    symbol: str
+    timeframe: str
+    trend: str
+    score: float
+    reason: str
+    adx: Optional[float] = None
+    slope_pct: float = 0.0
+    normalized_slope: float = 0.0
+    atr_pct: float = 0.0
+
+
+@dataclass
+class UniverseRegime:
+    """Per-symbol trends plus cross-sectional breadth/dispersion for one scan."""
+
+    trends: Dict[str, PrecomputedTrend] = field(default_factory=dict)
+    breadth_up_pct: float = 0.0
+    breadth_down_pct: float = 0.0
+    above_ma20_pct: float = 0.0
+    return_dispersion_pct: float = 0.0
+    median_atr_pct: float = 0.0
+    liquidity_pct_rank: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self.trends),
+            "breadth_up_pct": round(self.breadth_up_pct, 1),
+            "breadth_down_pct": round(self.breadth_down_pct, 1),
+            "above_ma20_pct": round(self.above_ma20_pct, 1),
+            "return_dispersion_pct": round(self.return_dispersion_pct, 2),
+            "median_atr_pct": round(self.median_atr_pct, 2),
+        }
+
+
+def _trend_timeframe(timeframes: Dict[str, Any]) -> Optional[str]:
+    for tf in TREND_TF_PREFERENCE:
+        if tf in timeframes:
+            return tf
+    return next(iter(timeframes), None)
+
+
+def _stack(frames: Dict[str, pd.DataFrame], column: str, window: int) -> pd.DataFrame:
+    """bars x symbols frame of the trailing `window` values of `column`."""
+    return pd.DataFrame(
+        {sym: df[column].to_numpy(dtype=float)[-window:] for sym, df in frames.items()}
+    )
+
+
+def compute_universe_regime(universe: Dict[str, Any], detector) -> UniverseRegime:
+    """
+    Compute PrecomputedTrend for every symbol in `universe` ({symbol:
+    MultiTimeframeData}) plus the cross-sectional aggregates.
+
+    `detector` is the RegimeDetector whose mode thresholds classify the
+    trend. Symbols whose swing detection raises fall back to
+    detector.analyze_timeframe_trend so they get the same MA-slope
+    fallback as before.
+    """
+    from backend.shared.config.smc_config import scale_lookback
+    from backend.strategy.smc.swing_structure import detect_swing_structure
+
+    result = UniverseRegime()
+
+    # Group by (trend TF, usable window) so every stacked column has equal length.
+    groups: Dict[Tuple[str, int], Dict[str, pd.DataFrame]] = {}
+    for symbol, mtf in universe.items():
+        if mtf is None or not getattr(mtf, "timeframes", None):
+            continue
+        tf = _trend_timeframe(mtf.timeframes)
+        df = mtf.timeframes.get(tf) if tf else None
+        if df is None or len(df) < MIN_TREND_BARS:
+            result.trends[symbol] = PrecomputedTrend(
+                symbol=symbol, timeframe=tf or "", trend="sideways", score=50.0,
+                reason="Insufficient data",
+            )
+            continue
+        window = min(len(df), TREND_WINDOW)
+        groups.setdefault((tf, window), {})[symbol] = df
+
+    above_flags: List[bool] = []
+    atr_pcts: List[float] = []
+    for (tf, window), frames in groups.items():
+        inputs = trend_inputs(
+            _stack(frames, "high", window),
+            _stack(frames, "low", window),
+            _stack(frames, "close", window),
+        )
+        lookback = scale_lookback(50, tf, min_lookback=30, max_lookback=80)
+        for symbol, df in frames.items():
+            row = inputs.loc[symbol]
+            adx = None if pd.isna(row["adx"]) else float(row["adx"])
+            try:
+                swing_struct = detect_swing_structure(df, lookback=lookback)
+                trend, score, reason = detector.classify_trend(
+                    tf, swing_struct, float(row["slope_pct"]), float(row["normalized_slope"]), adx
+                )
+            except Exception as e:
+                logger.debug("Universe regime: %s swing detection failed (%s), per-symbol fallback", symbol, e)
+                trend, score, reason = detector.analyze_timeframe_trend(df, tf)
+            result.trends[symbol] = PrecomputedTrend(
+                symbol=symbol,
+                timeframe=tf,
+                trend=trend,
+                score=score,
+                reason=reason,
+                adx=adx,
+                slope_pct=float(row["slope_pct"]),
+                normalized_slope=float(row["normalized_slope"]),
+                atr_pct=float(row["atr_pct"]),
+            )
+            above_flags.append(bool(row["above_ma20"]))
+            atr_pcts.append(float(row["atr_pct"]))
+
+    n = len(result.trends)
+    if n:
+        labels = [t.trend for t in result.trends.values()]
+        result.breadth_up_pct = 100.0 * sum(t in ("up", "strong_up") for t in labels) / n
+        result.breadth_down_pct = 100.0 * sum(t in ("down", "strong_down") for t in labels) / n
+    if above_flags:
+        result.above_ma20_pct = 100.0 * sum(above_flags) / len(above_flags)
+    if atr_pcts:
+        result.median_atr_pct = float(np.median(atr_pcts))
+
+    result.return_dispersion_pct, result.liquidity_pct_rank = _cross_section(universe)
+    return result
+
+
+def _cross_section(universe: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+    """Return dispersion and liquidity rank on each symbol's trend timeframe."""
+    returns: Dict[str, float] = {}
+    dollar_volume: Dict[str, float] = {}
+    for symbol, mtf in universe.items():
+        if mtf is None or not getattr(mtf, "timeframes", None):
+            continue
+        df = mtf.timeframes.get(_trend_timeframe(mtf.timeframes))
+        if df is None or len(df) <= _LIQUIDITY_WINDOW:
+            continue
+        close = df["close"].to_numpy(dtype=float)
+        if close[-_LIQUIDITY_WINDOW - 1] > 0:
+            returns[symbol] = (close[-1] / close[-_LIQUIDITY_WINDOW - 1] - 1.0) * 100.0
+        if "volume" in df.columns:
+            vol = df["volume"].to_numpy(dtype=float)
+            dollar_volume[symbol] = float(np.mean(close[-_LIQUIDITY_WINDOW:] * vol[-_LIQUIDITY_WINDOW:]))
+
+    dispersion = float(np.std(list(returns.values()))) if len(returns) > 1 else 0.0
+    ranks: Dict[str, float] = {}
+    if dollar_volume:
+        ranked = pd.Series(dollar_volume).rank(pct=True) * 100.0
+        ranks = {sym: round(float(v), 1) for sym, v in ranked.items()}
+    return dispersion, ranks
@@ -8,11 +8,11 @@ from dotenv import load_dotenv
 from pathlib import Path
 load_dotenv(Path(__file__).parent / ".env")
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 import logging
@@ -26,26 +26,20 @@ if not hasattr(np, "float_"):
 if not hasattr(np, "complex_"):
     np.complex_ = np.complex128
 
+import os
 import threading
 import pandas as pd
 
 from backend.risk.position_sizer import PositionSizer
 from backend.risk.risk_manager import RiskManager
 from backend.bot.executor.paper_executor import PaperExecutor
-from backend.bot.paper_trading_service import (
-    get_paper_trading_service,
-    PaperTradingConfig,
-)
-from backend.bot.live_trading_service import get_live_trading_service
 from backend.shared.config.live_trading_config import LiveTradingConfig
-from backend.data.adapters.phemex import PhemexAdapter
-from backend.data.adapters.bybit import BybitAdapter
-from backend.data.adapters.okx import OKXAdapter
-from backend.data.adapters.bitget import BitgetAdapter
 from backend.bot.telemetry.logger import get_telemetry_logger
 from backend.bot.telemetry.events import EventType
-from backend.engine.orchestrator import Orchestrator
 from backend.data.ingestion_pipeline import IngestionPipeline
+from backend.shared.utils.lazy_service import LazyService, readiness, warm_up
+from backend.data.adapters.request_scheduler import Lane, request_lane, scheduler_stats
+from backend.shared.utils.log_sink import get_log_sink
 from backend.analysis.pair_selection import select_symbols
 from backend.analysis.dominance_service import get_dominance_for_macro
 from backend.shared.config.smc_config import SMCConfig
@@ -115,43 +109,81 @@ class ThreadSafeCache:
     """
     Thread-safe LRU cache with TTL support.
 
-    LEGACY FACADE: This class now delegates to CacheManager for consistency.
-    Kept for backward compatibility with existing code.
+    LEGACY FACADE: Storage lives in the CacheManager namespace of the same
+    name; this class keeps the historical dict-with-_cached_at contract and
+    holds its own keys to max_size (least recently used evicted first),
+    whatever else shares the namespace. Kept for backward compatibility
+    with existing code.
     """
 
     def __init__(self, max_size: int = 1000, ttl: int = 5, namespace: str = "generic"):
         self._namespace = namespace
         self._cache_mgr = get_cache_manager()
+        self._ns = self._cache_mgr.namespace(namespace)
         self._ttl = ttl
-        # For backward compatibility, also maintain local storage for non-CacheManager usage patterns
-        self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
-        self._lock = threading.Lock()
         self._max_size = max_size
+        # This cache's keys in the namespace, least recently used first
+        self._keys: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
 
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
+    def _touch(self, key: str) -> None:
+        """Mark `key` most recently used; evict the oldest keys past max_size."""
         with self._lock:
-            if key not in self._cache:
-                return None
-            entry = self._cache[key]
-            if time.time() - entry.get("_cached_at", 0) > self._ttl:
-                del self._cache[key]
-                return None
-            # Move to end (LRU)
-            self._cache.move_to_end(key)
-            return entry
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self._max_size:
+                evicted, _ = self._keys.popitem(last=False)
+                self._ns.delete(evicted)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._ns.get(key)
+        if value is not None:
+            self._touch(key)
+        return value
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
-        with self._lock:
-            value["_cached_at"] = time.time()
-            self._cache[key] = value
-            self._cache.move_to_end(key)
-            # Evict oldest if over capacity
-            while len(self._cache) > self._max_size:
-                self._cache.popitem(last=False)
+        value["_cached_at"] = time.time()
+        self._ns.set(key, value, ttl=self._ttl)
+        self._touch(key)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Optional[Dict[str, Any]]],
+        stale_ttl: float = 0,
+        refresh_ahead: float = 0,
+        cacheable: Callable[[Any], bool] = lambda v: bool(v) and "error" not in v,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Single-flight cached read for expensive endpoints.
+
+        `compute` is synchronous and runs off the event loop; concurrent
+        misses on `key` share one run. Payloads carrying an "error" key are
+        returned but not cached.
+        """
+
+        def _stamped():
+            value = compute()
+            if isinstance(value, dict):
+                value["_cached_at"] = time.time()
+            return value
+
+        value = await self._ns.get_or_compute_async(
+            key,
+            _stamped,
+            ttl=self._ttl,
+            stale_ttl=stale_ttl,
+            refresh_ahead=refresh_ahead,
+            cacheable=cacheable,
+        )
+        if cacheable(value):
+            self._touch(key)
+        return value
 
     def clear(self) -> None:
+        self._ns.clear()
         with self._lock:
-            self._cache.clear()
+            self._keys.clear()
 
 
 # Use unified cache manager namespaces internally
@@ -217,6 +249,13 @@ async def startup_event():
     # Run in background to not block server startup
     threading.Thread(target=refresh_classifier_cache, daemon=True).start()
 
+    # Build the exchange adapter / orchestrator / trading services off the
+    # event loop once the server is up; /api/health reports progress.
+    if STARTUP_MODE == "warm":
+        threading.Thread(
+            target=warm_up, args=(_WARMUP_ORDER,), name="service-warmup", daemon=True
+        ).start()
+
 
 # Include routers
 app.include_router(htf_router)
@@ -231,6 +270,13 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def dashboard_request_lane(request: Request, call_next):
+    """Exchange calls made while serving the UI queue behind orders, positions and scans."""
+    with request_lane(Lane.DASHBOARD):
+        return await call_next(request)
+
+
 # Pydantic models for API
 class Exchange(str, Enum):
     """Supported exchanges."""
@@ -392,16 +438,50 @@ risk_manager = RiskManager(
 )
 paper_executor = PaperExecutor(initial_balance=10000, fee_rate=0.0006)
 
+
+# Adapter modules import ccxt; keep that out of module import.
+def _phemex_adapter():
+    from backend.data.adapters.phemex import PhemexAdapter
+
+    return PhemexAdapter(testnet=False)
+
+
+def _bybit_adapter():
+    from backend.data.adapters.bybit import BybitAdapter
+
+    return BybitAdapter(testnet=False)
+
+
+def _okx_adapter():
+    from backend.data.adapters.okx import OKXAdapter
+
+    return OKXAdapter(testnet=False)
+
+
+def _bitget_adapter():
+    from backend.data.adapters.bitget import BitgetAdapter
+
+    return BitgetAdapter(testnet=False)
+
+
 # Exchange adapters factory - Tier 1 exchanges only
 EXCHANGE_ADAPTERS = {
-    "bybit": lambda: BybitAdapter(testnet=False),  # #1 Best overall (may be geo-blocked)
-    "phemex": lambda: PhemexAdapter(testnet=False),  # No geo-blocking, fast
-    "okx": lambda: OKXAdapter(testnet=False),  # Institutional-tier
-    "bitget": lambda: BitgetAdapter(testnet=False),  # Bot-friendly
+    "bybit": _bybit_adapter,  # #1 Best overall (may be geo-blocked)
+    "phemex": _phemex_adapter,  # No geo-blocking, fast
+    "okx": _okx_adapter,  # Institutional-tier
+    "bitget": _bitget_adapter,  # Bot-friendly
 }
 
-# Default to Phemex (no geo-blocking)
-exchange_adapter = PhemexAdapter(testnet=False)
+# Startup mode (SNIPERSIGHT_STARTUP_MODE):
+#   warm  — default; heavy services are built in a background task once the
+#           server is accepting connections (first use before that builds inline)
+#   lazy  — built only on first use
+#   eager — built at import, as before
+STARTUP_MODE = os.getenv("SNIPERSIGHT_STARTUP_MODE", "warm").lower()
+
+# Default to Phemex (no geo-blocking). PhemexAdapter.__init__ calls
+# load_markets() over the network, so it must not run at import time.
+exchange_adapter = LazyService("exchange_adapter", _phemex_adapter)
 
 # Initialize orchestrator with default config
 default_config = ScanConfig(
@@ -410,13 +490,43 @@ default_config = ScanConfig(
     min_confluence_score=70.0,
     max_risk_pct=2.0,
 )
-orchestrator = Orchestrator(
-    config=default_config,
-    exchange_adapter=exchange_adapter,
-    risk_manager=risk_manager,
-    position_sizer=position_sizer,
-    concurrency_workers=32,  # INCREASED: 32 workers for parallel I/O (candles/calculation)
-)
+
+
+def _build_orchestrator():
+    from backend.engine.orchestrator import Orchestrator
+
+    return Orchestrator(
+        config=default_config,
+        exchange_adapter=exchange_adapter.get(),
+        risk_manager=risk_manager,
+        position_sizer=position_sizer,
+        concurrency_workers=32,  # INCREASED: 32 workers for parallel I/O (candles/calculation)
+    )
+
+
+orchestrator = LazyService("orchestrator", _build_orchestrator)
+
+
+def get_paper_trading_service():
+    from backend.bot.paper_trading_service import get_paper_trading_service as _get
+
+    return _get()
+
+
+def get_live_trading_service():
+    from backend.bot.live_trading_service import get_live_trading_service as _get
+
+    return _get()
+
+
+paper_trading_service = LazyService("paper_trading_service", get_paper_trading_service)
+live_trading_service = LazyService("live_trading_service", get_live_trading_service)
+
+# Build order for warm-up: adapter first (network), then everything that needs it.
+_WARMUP_ORDER = ("exchange_adapter", "orchestrator", "paper_trading_service", "live_trading_service")
+
+if STARTUP_MODE == "eager":
+    warm_up(_WARMUP_ORDER)
 
 # Configure and include routers with shared dependencies
 configure_scanner_router(
@@ -445,7 +555,7 @@ configure_data_router(
 # The engine constructs its OWN dedicated replay-mode orchestrator per session
 # (replay_engine._build_orchestrator), so the live orchestrator above is never
 # flipped into replay mode. See backend/engine/replay_engine.py module docstring.
-configure_replay_router(exchange_adapter=orchestrator.exchange_adapter)
+configure_replay_router(exchange_adapter=exchange_adapter)
 
 # Configure scanner service for background scan job management
 scanner_service = configure_scanner_service(
@@ -471,16 +581,33 @@ import httpx
 
 @app.get("/api/health")
 async def health_check():
-    """Detailed health check."""
+    """
+    Detailed health check with per-component readiness.
+
+    status is "healthy" once every lazily built service is ready, "warming"
+    while any is still cold/building, and "degraded" if one failed to build
+    (it is retried on next use).
+    """
+    services = readiness()
+    states = {s["state"] for s in services.values()}
+    if "failed" in states:
+        status = "degraded"
+    elif states - {"ready"}:
+        status = "warming"
+    else:
+        status = "healthy"
     return {
-        "status": "healthy",
+        "status": status,
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "startup_mode": STARTUP_MODE,
         "components": {
-            "scanner": "ready",
-            "bot": "ready",
+            "scanner": services["orchestrator"]["state"],
+            "bot": services["paper_trading_service"]["state"],
             "risk_manager": "ready",
             "executor": "ready",
         },
+        "services": services,
+        "rate_limits": scheduler_stats(),
     }
 
 
@@ -1214,6 +1341,8 @@ async def start_paper_trading(config: PaperTradingConfigRequest):
     - Tracks P&L and statistics
     """
     try:
+        from backend.bot.paper_trading_service import PaperTradingConfig
+
         service = get_paper_trading_service()
 
         paper_config = PaperTradingConfig(
@@ -1460,12 +1589,12 @@ async def get_ml_status():
         status = get_model_store().status()
         # Count available signal samples so the UI can show readiness
         try:
-            from backend.ml.signal_dataset_builder import collect_signals, load_trade_journal
-            signals = collect_signals()
-            trades = load_trade_journal()
-            n_signals = len([s for s in signals if s.get("result") == "filtered"])
-            n_executed = len([s for s in signals if s.get("result") == "executed"])
-            n_trades = len(trades)
+            from backend.ml.signal_dataset_builder import sync_index
+            index = sync_index()
+            counts = index.signal_counts()
+            n_signals = counts.get("filtered", 0)
+            n_executed = counts.get("executed", 0)
+            n_trades = index.journal_count()
             status["available_signals"] = n_signals + n_executed
             status["available_trades"] = n_trades
             status["min_samples_required"] = 10
@@ -1543,13 +1672,13 @@ async def clear_session_logs():
     The trained model (edge_model.joblib) is NOT affected.
     """
     import shutil
-    from backend.ml.signal_dataset_builder import _SESSION_LOGS_DIR
+    from backend.ml.session_index import SESSION_LOGS_DIR
 
     try:
         deleted_sessions = 0
         deleted_signals = 0
-        if _SESSION_LOGS_DIR.exists():
-            for session_dir in sorted(_SESSION_LOGS_DIR.iterdir()):
+        if SESSION_LOGS_DIR.exists():
+            for session_dir in sorted(SESSION_LOGS_DIR.iterdir()):
                 if session_dir.is_dir():
                     signals_file = session_dir / "signals.jsonl"
                     if signals_file.exists():
@@ -1581,17 +1710,7 @@ async def reset_ml_model():
     """
     try:
         from backend.ml.model_store import get_model_store
-        from backend.ml.signal_dataset_builder import _TRADE_JOURNAL_PATH
-        store = get_model_store()
-        model_path = store.model_path
-        deleted = False
-        import os
-        if os.path.exists(model_path):
-            os.remove(model_path)
-            deleted = True
-        # Reset in-memory state so next access creates a fresh EdgeModel
-        store._edge_model = None
-        store._loaded = False
+        deleted = get_model_store().reset()
         return {
             "success": True,
             "deleted_file": deleted,
@@ -1879,74 +1998,75 @@ async def get_market_regime(
     Returns:
         MarketRegime with composite label, score, and dimension breakdown
     """
-    # Check cache first (1 minute TTL)
+    # Cached 60 s; concurrent misses share one detection, and the last good
+    # value is served for up to 2 min while a background refresh runs.
     cache_key = f"regime:{symbol or 'global'}"
-    cached = REGIME_CACHE.get(cache_key)
-    if cached:
-        logger.debug("Returning cached regime data for %s", cache_key)
-        return cached
-
     try:
-        # Detect global regime via orchestrator
-        regime = orchestrator._detect_global_regime()
-
-        if not regime:
-            # Return neutral regime if detection fails
-            return {
-                "composite": "neutral",
-                "score": 50.0,
-                "dimensions": {
-                    "trend": "sideways",
-                    "volatility": "normal",
-                    "liquidity": "normal",
-                    "risk_appetite": "neutral",
-                    "derivatives": "balanced",
-                },
-                "trend_score": 50.0,
-                "volatility_score": 50.0,
-                "liquidity_score": 50.0,
-                "risk_score": 50.0,
-                "derivatives_score": 50.0,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-
-        # Get dominance data
-        try:
-            btc_dom, alt_dom, stable_dom = get_dominance_for_macro()
-        except Exception as dom_err:
-            logger.warning("Dominance fetch failed: %s", dom_err)
-            btc_dom, alt_dom, stable_dom = 50.0, 35.0, 15.0  # Fallback values
+        result = await REGIME_CACHE.get_or_compute(
+            cache_key, _compute_market_regime, stale_ttl=120, refresh_ahead=10
+        )
+    except Exception as e:
+        logger.error("Market regime detection failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Regime detection error: {str(e)}") from e
 
-        result = {
-            "composite": regime.composite,
-            "score": regime.score,
+    if result is None:
+        # Return neutral regime if detection fails
+        return {
+            "composite": "neutral",
+            "score": 50.0,
             "dimensions": {
-                "trend": regime.dimensions.trend,
-                "volatility": regime.dimensions.volatility,
-                "liquidity": regime.dimensions.liquidity,
-                "risk_appetite": regime.dimensions.risk_appetite,
-                "derivatives": regime.dimensions.derivatives,
+                "trend": "sideways",
+                "volatility": "normal",
+                "liquidity": "normal",
+                "risk_appetite": "neutral",
+                "derivatives": "balanced",
             },
-            "trend_score": regime.trend_score,
-            "volatility_score": regime.volatility_score,
-            "liquidity_score": regime.liquidity_score,
-            "risk_score": regime.risk_score,
-            "derivatives_score": regime.derivatives_score,
-            "dominance": {
-                "btc_d": round(btc_dom, 2),
-                "alt_d": round(alt_dom, 2),
-                "stable_d": round(stable_dom, 2),
-            },
-            "timestamp": regime.timestamp.isoformat(),
+            "trend_score": 50.0,
+            "volatility_score": 50.0,
+            "liquidity_score": 50.0,
+            "risk_score": 50.0,
+            "derivatives_score": 50.0,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+    return result
 
-        # Cache the result
-        REGIME_CACHE.set(cache_key, result)
-        return result
 
-    except Exception as e:
-        logger.error("Market regime detection failed: %s", e)
-        raise HTTPException(status_code=500, detail=f"Regime detection error: {str(e)}") from e
+def _compute_market_regime() -> Optional[Dict[str, Any]]:
+    """Blocking body of /api/market/regime. None when detection fails (not cached)."""
+    # Detect global regime via orchestrator
+    regime = orchestrator._detect_global_regime()
+    if not regime:
+        return None
+
+    # Get dominance data
+    try:
+        btc_dom, alt_dom, stable_dom = get_dominance_for_macro()
+    except Exception as dom_err:
+        logger.warning("Dominance fetch failed: %s", dom_err)
+        btc_dom, alt_dom, stable_dom = 50.0, 35.0, 15.0  # Fallback values
+
+    return {
+        "composite": regime.composite,
+        "score": regime.score,
+        "dimensions": {
+            "trend": regime.dimensions.trend,
+            "volatility": regime.dimensions.volatility,
+            "liquidity": regime.dimensions.liquidity,
+            "risk_appetite": regime.dimensions.risk_appetite,
+            "derivatives": regime.dimensions.derivatives,
+        },
+        "trend_score": regime.trend_score,
+        "volatility_score": regime.volatility_score,
+        "liquidity_score": regime.liquidity_score,
+        "risk_score": regime.risk_score,
+        "derivatives_score": regime.derivatives_score,
+        "dominance": {
+            "btc_d": round(btc_dom, 2),
+            "alt_d": round(alt_dom, 2),
+            "stable_d": round(stable_dom, 2),
+        },
+        "timestamp": regime.timestamp.isoformat(),
+    }
 
 
 @app.get("/api/market/fear-greed")
@@ -2292,14 +2412,18 @@ async def get_market_cycles(
     Returns:
         Cycle context with timing, phase, translation, and trade bias
     """
-    # Check cache first (5 minute TTL - cycles don't change rapidly)
+    # Cached 5 min; concurrent misses share one computation, and the last
+    # good value is served for up to 10 min while a background refresh runs.
     cache_key = f"cycles:{symbol}"
-    cached = CYCLES_CACHE.get(cache_key)
-    if cached:
-        logger.debug("Returning cached cycles data for %s", symbol)
-        return cached
+    return await CYCLES_CACHE.get_or_compute(
+        cache_key, lambda: _compute_market_cycles(symbol), stale_ttl=600, refresh_ahead=30
+    )
+
 
-    from backend.strategy.smc.cycle_detector import detect_cycle_context, CycleConfig
+def _compute_market_cycles(symbol: str) -> Dict[str, Any]:
+    """Blocking body of /api/market/cycles."""
+    from backend.strategy.smc.cycle_detector import CycleConfig
+    from backend.services.cycle_state_service import get_cycle_state_service
     from backend.indicators.momentum import compute_stoch_rsi
 
     try:
@@ -2321,6 +2445,8 @@ async def get_market_cycles(
         else:
             # Fallback to direct adapter if no pipeline available (e.g. startup)
             logger.warning("Using direct adapter for cycles (pipeline unavailable)")
+            from backend.data.adapters.phemex import PhemexAdapter
+
             adapter = PhemexAdapter()
             daily_df = adapter.fetch_ohlcv(symbol, "1d", limit=500)
 
@@ -2340,24 +2466,13 @@ async def get_market_cycles(
         if "timestamp" in daily_df.columns and not isinstance(daily_df.index, pd.DatetimeIndex):
             daily_df = daily_df.set_index("timestamp", drop=False)
 
-        # Detect cycle context
+        # Cycle context from the shared cycle state (recomputed once per daily
+        # close). It carries symbol_cycle_detector's failure flags, which are
+        # more reliable than cycle_detector's raw price comparison.
         config = CycleConfig()
-        cycle_ctx = detect_cycle_context(daily_df, config)
-
-        # Bridge: also run symbol_cycle_detector to get reliable failure flags
-        # and merge them into cycle_ctx (same pattern as orchestrator)
-        dcl_failed = False
-        wcl_failed = False
-        try:
-            from backend.strategy.smc.symbol_cycle_detector import detect_symbol_cycles as _dsc
-            import dataclasses
-            current_price_val = float(daily_df["close"].iloc[-1])
-            sym_cycles = _dsc(daily_df, symbol=symbol, current_price=current_price_val)
-            dcl_failed = sym_cycles.dcl.is_failed
-            wcl_failed = sym_cycles.wcl.is_failed
-            cycle_ctx = dataclasses.replace(cycle_ctx, dcl_failed=dcl_failed, wcl_failed=wcl_failed)
-        except Exception as _e:
-            logger.debug("Symbol cycle merge skipped in API: %s", _e)
+        cycle_ctx = get_cycle_state_service().update(symbol, daily_df).cycle_context()
+        dcl_failed = cycle_ctx.dcl_failed
+        wcl_failed = cycle_ctx.wcl_failed
 
         # Also compute stochastic RSI for weekly timeframe to add zone info
         stoch_rsi_k = None
@@ -2372,6 +2487,8 @@ async def get_market_cycles(
             else:
                 # Fallback
                 if "adapter" not in locals():
+                    from backend.data.adapters.phemex import PhemexAdapter
+
                     adapter = PhemexAdapter()
                 weekly_df = adapter.fetch_ohlcv(symbol, "1w", limit=100)
 
@@ -2491,8 +2608,6 @@ async def get_market_cycles(
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-        # Cache the result
-        CYCLES_CACHE.set(cache_key, result)
         return result
 
     except Exception as e:
@@ -2597,18 +2712,19 @@ async def get_symbol_cycles(
     Returns DCL (Daily Cycle Low) and WCL (Weekly Cycle Low) states
     with translation analysis (RTR/MTR/LTR) based on Camel Finance methodology.
     """
-    # Check cache first (5 minute TTL)
+    # Cached 5 min; concurrent misses share one computation, and the last
+    # good value is served for up to 10 min while a background refresh runs.
     cache_key = f"symbol_cycles:{symbol}:{exchange}"
-    cached = CYCLES_CACHE.get(cache_key)
-    if cached:
-        logger.debug("Returning cached symbol cycles for %s", symbol)
-        return cached
+    return await CYCLES_CACHE.get_or_compute(
+        cache_key, lambda: _compute_symbol_cycles(symbol, exchange), stale_ttl=600, refresh_ahead=30
+    )
+
 
+def _compute_symbol_cycles(symbol: str, exchange: str) -> Dict[str, Any]:
+    """Blocking body of /api/market/symbol-cycles."""
     try:
-        from backend.strategy.smc.symbol_cycle_detector import (
-            detect_symbol_cycles,
-            check_cycle_alerts,
-        )
+        from backend.strategy.smc.symbol_cycle_detector import check_cycle_alerts
+        from backend.services.cycle_state_service import get_cycle_state_service
         from backend.services.scanner_service import get_scanner_service
 
         # Use shared pipeline for rate limiting
@@ -2623,6 +2739,8 @@ async def get_symbol_cycles(
             daily_df = daily_data.timeframes.get("1d")
         else:
             logger.warning("Using direct adapter for symbol cycles (pipeline unavailable)")
+            from backend.data.adapters.phemex import PhemexAdapter
+
             adapter = PhemexAdapter()
             daily_df = adapter.fetch_ohlcv(symbol, "1d", limit=120)
 
@@ -2637,7 +2755,10 @@ async def get_symbol_cycles(
         if "timestamp" in daily_df.columns and not isinstance(daily_df.index, pd.DatetimeIndex):
             daily_df = daily_df.set_index("timestamp", drop=False)
 
-        cycles = detect_symbol_cycles(daily_df, symbol)
+        state = get_cycle_state_service().update(symbol, daily_df)
+        if state.symbol_cycles is None:
+            raise RuntimeError(state.symbol_cycles_error)
+        cycles = state.symbol_cycles
         alerts = check_cycle_alerts(cycles)
 
         result = {
@@ -2656,8 +2777,6 @@ async def get_symbol_cycles(
             },
         }
 
-        # Cache the result
-        CYCLES_CACHE.set(cache_key, result)
         return result
 
     except Exception as e:
@@ -2673,19 +2792,18 @@ async def get_btc_cycle_context():
     Returns DCL, WCL, and 4-Year Macro Cycle states with alignment assessment.
     BTC serves as the market leader - use this for macro context on any trade.
     """
-    # Check cache first (5 minute TTL)
+    # Cached 5 min; concurrent misses share one computation, and the last
+    # good value is served for up to 10 min while a background refresh runs.
     cache_key = "btc_cycle_context:global"
-    cached = CYCLES_CACHE.get(cache_key)
-    if cached:
-        logger.debug("Returning cached BTC cycle context")
-        return cached
+    return await CYCLES_CACHE.get_or_compute(
+        cache_key, _compute_btc_cycle_context, stale_ttl=600, refresh_ahead=30
+    )
+
 
+def _compute_btc_cycle_context() -> Dict[str, Any]:
+    """Blocking body of /api/market/btc-cycle-context."""
     try:
-        from backend.strategy.smc.symbol_cycle_detector import detect_symbol_cycles
-        from backend.strategy.smc.four_year_cycle import (
-            get_four_year_cycle_context,
-            get_halving_info,
-        )
+        from backend.services.cycle_state_service import get_cycle_state_service
         from backend.services.scanner_service import get_scanner_service
 
         # Use shared pipeline for rate limiting
@@ -2701,6 +2819,8 @@ async def get_btc_cycle_context():
             daily_df = daily_data.timeframes.get("1d")
         else:
             logger.warning("Using direct adapter for BTC cycle context (pipeline unavailable)")
+            from backend.data.adapters.phemex import PhemexAdapter
+
             adapter = PhemexAdapter()
             daily_df = adapter.fetch_ohlcv(symbol, "1d", limit=120)
 
@@ -2711,9 +2831,12 @@ async def get_btc_cycle_context():
         if "timestamp" in daily_df.columns and not isinstance(daily_df.index, pd.DatetimeIndex):
             daily_df = daily_df.set_index("timestamp", drop=False)
 
-        cycles = detect_symbol_cycles(daily_df, "BTC/USDT")
-        fyc = get_four_year_cycle_context()
-        halving = get_halving_info()
+        cycle_states = get_cycle_state_service()
+        state = cycle_states.update(symbol, daily_df)
+        if state.symbol_cycles is None:
+            raise RuntimeError(state.symbol_cycles_error)
+        cycles = state.symbol_cycles
+        fyc, halving = cycle_states.four_year_cycle()
 
         result = {
             "status": "success",
@@ -2762,8 +2885,6 @@ async def get_btc_cycle_context():
             },
         }
 
-        # Cache the result
-        CYCLES_CACHE.set(cache_key, result)
         return result
 
     except HTTPException:
@@ -2954,35 +3075,34 @@ async def get_telemetry_analytics(
     try:
         telemetry = get_telemetry_logger()
 
-        # Get counts for each event type
-        total_scans = telemetry.get_event_count(
-            event_type=EventType.SCAN_COMPLETED, start_time=start_time, end_time=end_time
-        )
-
-        total_signals = telemetry.get_event_count(
-            event_type=EventType.SIGNAL_GENERATED, start_time=start_time, end_time=end_time
-        )
-
-        total_rejected = telemetry.get_event_count(
-            event_type=EventType.SIGNAL_REJECTED, start_time=start_time, end_time=end_time
-        )
-
-        total_errors = telemetry.get_event_count(
-            event_type=EventType.ERROR_OCCURRED, start_time=start_time, end_time=end_time
+        # Counts per event type and rejection reason come from the per-minute
+        # rollups (exact over the range, without reading event payloads)
+        by_type = telemetry.get_event_breakdown(
+            "event_type", start_time=start_time, end_time=end_time
         )
-
-        # Get rejection breakdown
-        rejected_events = telemetry.get_events(
-            limit=1000,
-            event_type=EventType.SIGNAL_REJECTED,
-            start_time=start_time,
-            end_time=end_time,
-        )
-
-        rejection_reasons = {}
-        for event in rejected_events:
-            reason = event.get("data", {}).get("reason", "Unknown")
-            rejection_reasons[reason] = rejection_reasons.get(reason, 0) + 1
+        total_scans = by_type.get(EventType.SCAN_COMPLETED.value, 0)
+        total_signals = by_type.get(EventType.SIGNAL_GENERATED.value, 0)
+        total_rejected = by_type.get(EventType.SIGNAL_REJECTED.value, 0)
+        total_errors = by_type.get(EventType.ERROR_OCCURRED.value, 0)
+
+        rejection_reasons = {
+            (reason or "Unknown"): count
+            for reason, count in telemetry.get_event_breakdown(
+                "reason",
+                event_type=EventType.SIGNAL_REJECTED,
+                start_time=start_time,
+                end_time=end_time,
+            ).items()
+        }
+        rejection_by_type = {
+            (reason_type or "unknown"): count
+            for reason_type, count in telemetry.get_event_breakdown(
+                "reason_type",
+                event_type=EventType.SIGNAL_REJECTED,
+                start_time=start_time,
+                end_time=end_time,
+            ).items()
+        }
 
         return {
             "metrics": {
@@ -2995,6 +3115,7 @@ async def get_telemetry_analytics(
                 ),
             },
             "rejection_breakdown": rejection_reasons,
+            "rejection_breakdown_by_type": rejection_by_type,
             "time_range": {"start": start_time, "end": end_time},
         }
     except Exception as e:
@@ -3016,6 +3137,8 @@ async def get_cache_stats():
     Useful for monitoring cache effectiveness.
     """
     from backend.data.ohlcv_cache import get_ohlcv_cache
+    from backend.data.tf_synthesis import get_timeframe_synthesizer
+    from backend.data.hedged_fetch import hedge_stats
 
     cache = get_ohlcv_cache()
     stats = cache.get_stats()
@@ -3023,6 +3146,8 @@ async def get_cache_stats():
     return {
         "status": "ok",
         "cache": stats,
+        "synthesis": get_timeframe_synthesizer().stats(),
+        "hedging": hedge_stats(),
         "description": (
             f"Cache has {stats['entries']} entries with {stats['hit_rate_pct']}% hit rate. "
             f"Caching {stats['total_candles_cached']} candles across "
@@ -3312,6 +3437,7 @@ def _build_signal_diagnostic(session_dir) -> str:
     from datetime import datetime as _dt
 
     signals_file = _Path(session_dir) / "signals.jsonl"
+    get_log_sink().flush()  # include lines still queued in the log sink
     if not signals_file.exists():
         return ""
 
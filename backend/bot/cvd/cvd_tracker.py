@@ -14,15 +14,152 @@ Design constraints (all measured, not assumed):
 - Features are DIRECTION-SIGNED relative to the trade (flow agreeing with the trade's side is +) so the
   LONG and SHORT cohorts don't self-cancel in the pooled correlation (bull/bear symmetry, CLAUDE.md §10).
 
+Storage: one columnar ring per symbol (NumPy ts / signed_vol / price + running cumulative sums), so
+ingest is amortised O(batch) and the window sums / counts in snapshot_features are a binary search plus
+two lookups instead of a rescan of every buffered trade. The z baseline keeps a running sum and
+sum-of-squares over its fixed-size history.
+
 This module performs NO network I/O — the poller feeds it trades via ingest(); pure + unit-testable.
 """
 from __future__ import annotations
 
-import statistics as _stats
-from collections import defaultdict, deque
-from typing import Deque, Dict, List, Tuple
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 _MIN = 60 * 1000  # one minute in ms
+_RING_INITIAL = 256  # trades per symbol before the first grow (a 200-trade poll fits)
+
+
+class _TradeRing:
+    """Columnar (ts, signed_vol, price) buffer for one symbol, ASC by ts.
+
+    Live rows are [head, tail). cum_net / cum_abs hold running totals of signed_vol / |signed_vol| up to
+    and including each row; base_* is the total just before `head`, so any suffix sum is one subtraction.
+    Rows evicted off the front are reclaimed by compacting (which also rebases the totals to 0, keeping
+    the running sums from drifting) before the arrays ever grow.
+    """
+
+    __slots__ = ("ts", "sv", "px", "cum_net", "cum_abs", "head", "tail", "base_net", "base_abs")
+
+    def __init__(self, capacity: int = _RING_INITIAL) -> None:
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self.sv = np.empty(capacity, dtype=np.float64)
+        self.px = np.empty(capacity, dtype=np.float64)
+        self.cum_net = np.empty(capacity, dtype=np.float64)
+        self.cum_abs = np.empty(capacity, dtype=np.float64)
+        self.head = 0
+        self.tail = 0
+        self.base_net = 0.0
+        self.base_abs = 0.0
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def _total(self) -> Tuple[float, float]:
+        if self.tail > self.head:
+            return float(self.cum_net[self.tail - 1]), float(self.cum_abs[self.tail - 1])
+        return self.base_net, self.base_abs
+
+    def _reserve(self, n: int) -> None:
+        if self.tail + n <= len(self.ts):
+            return
+        live = self.tail - self.head
+        cap = len(self.ts)
+        while live + n > cap:
+            cap *= 2
+        arrays = [self.ts, self.sv, self.px, self.cum_net, self.cum_abs]
+        if cap != len(self.ts):
+            fresh = [np.empty(cap, dtype=a.dtype) for a in arrays]
+        else:
+            fresh = arrays  # compact in place
+        for dst, src in zip(fresh, arrays):
+            dst[:live] = src[self.head:self.tail]
+        self.ts, self.sv, self.px, self.cum_net, self.cum_abs = fresh
+        self.cum_net[:live] -= self.base_net
+        self.cum_abs[:live] -= self.base_abs
+        self.head, self.tail = 0, live
+        self.base_net = self.base_abs = 0.0
+
+    def extend(self, ts: np.ndarray, sv: np.ndarray, px: np.ndarray) -> None:
+        n = len(ts)
+        if n == 0:
+            return
+        self._reserve(n)
+        net0, abs0 = self._total()
+        sl = slice(self.tail, self.tail + n)
+        self.ts[sl] = ts
+        self.sv[sl] = sv
+        self.px[sl] = px
+        self.cum_net[sl] = net0 + np.cumsum(sv)
+        self.cum_abs[sl] = abs0 + np.cumsum(np.abs(sv))
+        self.tail += n
+
+    def first_at_or_after(self, cutoff: int) -> int:
+        """Absolute index of the first live row with ts >= cutoff (== tail if none)."""
+        return self.head + int(np.searchsorted(self.ts[self.head:self.tail], cutoff, side="left"))
+
+    def evict_before(self, cutoff: int) -> None:
+        j = self.first_at_or_after(cutoff)
+        if j > self.head:
+            self.base_net = float(self.cum_net[j - 1])
+            self.base_abs = float(self.cum_abs[j - 1])
+            self.head = j
+
+    def sums_from(self, j: int) -> Tuple[float, float]:
+        """(net, gross) signed volume over live rows [j, tail)."""
+        net_end, abs_end = self._total()
+        if j > self.head:
+            return net_end - float(self.cum_net[j - 1]), abs_end - float(self.cum_abs[j - 1])
+        return net_end - self.base_net, abs_end - self.base_abs
+
+
+class _RollingStats:
+    """Fixed-size history with running sum / sum-of-squares (population mean + stdev in O(1)).
+
+    The sums are recomputed from the buffer each time the write index wraps, so float drift from the
+    add/subtract updates never accumulates past one pass over the history.
+    """
+
+    __slots__ = ("values", "count", "idx", "s", "ss")
+
+    def __init__(self, size: int) -> None:
+        self.values = np.zeros(max(1, size), dtype=np.float64)
+        self.count = 0
+        self.idx = 0
+        self.s = 0.0
+        self.ss = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, x: float) -> None:
+        size = len(self.values)
+        if self.count == size:
+            old = float(self.values[self.idx])
+            self.s -= old
+            self.ss -= old * old
+        else:
+            self.count += 1
+        self.values[self.idx] = x
+        self.s += x
+        self.ss += x * x
+        self.idx = (self.idx + 1) % size
+        if self.idx == 0:
+            self.s = float(self.values.sum())
+            self.ss = float(np.dot(self.values, self.values))
+
+    def mean_pstdev(self) -> Tuple[float, float]:
+        n = self.count
+        mu = self.s / n
+        mean_sq = self.ss / n
+        var = mean_sq - mu * mu
+        # sum-of-squares cancellation leaves ~1e-16 relative noise for a flat history; treat as 0
+        if var <= 1e-12 * mean_sq:
+            return mu, 0.0
+        return mu, math.sqrt(var)
 
 
 class CvdTracker:
@@ -34,10 +171,13 @@ class CvdTracker:
     ) -> None:
         self.long_window_ms = long_window_ms
         self.short_window_ms = short_window_ms
-        self._trades: Dict[str, Deque[Tuple[int, float, float]]] = defaultdict(deque)  # (ts, signed_vol, price)
+        self.z_history = z_history
+        self._trades: Dict[str, _TradeRing] = {}
         self._last_ts: Dict[str, int] = {}
         self._last_gap_ts: Dict[str, int] = {}  # ts of the most recent detected coverage gap
-        self._z_hist: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=z_history))
+        self._z_hist: Dict[str, _RollingStats] = {}
+        # ingest runs on the event loop, snapshots may come from executor threads
+        self._lock = threading.Lock()
 
     # ── ingest ────────────────────────────────────────────────────────────────
     def ingest(self, symbol: str, trades: List[Tuple[int, float, float]]) -> None:
@@ -45,26 +185,31 @@ class CvdTracker:
         evicts trades older than the long window, and samples the windowed net-flow for the z baseline."""
         if not trades:
             return
-        dq = self._trades[symbol]
-        last = self._last_ts.get(symbol)
-        oldest_in = trades[0][0]
-        # Gap detection: on a non-first poll, if the oldest returned trade is newer than what we last
-        # saw, trades fell off the recent-N window between polls and are lost -> mark a gap.
-        if last is not None and oldest_in > last:
-            self._last_gap_ts[symbol] = trades[-1][0]
-        for ts, sv, px in trades:
-            if last is not None and ts <= last:
-                continue  # already seen (de-dup by timestamp — id is None on Phemex)
-            dq.append((ts, sv, px))
-        self._last_ts[symbol] = max(self._last_ts.get(symbol, 0), trades[-1][0])
-        now = self._last_ts[symbol]
-        # Evict beyond the long window.
-        cutoff = now - self.long_window_ms
-        while dq and dq[0][0] < cutoff:
-            dq.popleft()
-        # Sample the current 1h net-flow for the z baseline.
-        net_1h = sum(sv for ts, sv, _ in dq if ts >= now - self.long_window_ms)
-        self._z_hist[symbol].append(net_1h)
+        cols = np.asarray(trades, dtype=np.float64).reshape(len(trades), 3)
+        ts = cols[:, 0].astype(np.int64)
+        with self._lock:
+            ring = self._trades.get(symbol)
+            if ring is None:
+                ring = self._trades[symbol] = _TradeRing()
+            last = self._last_ts.get(symbol)
+            # Gap detection: on a non-first poll, if the oldest returned trade is newer than what we last
+            # saw, trades fell off the recent-N window between polls and are lost -> mark a gap.
+            if last is not None and int(ts[0]) > last:
+                self._last_gap_ts[symbol] = int(ts[-1])
+            if last is not None:
+                fresh = ts > last  # already-seen trades dropped (de-dup by timestamp — id is None on Phemex)
+                ring.extend(ts[fresh], cols[fresh, 1], cols[fresh, 2])
+            else:
+                ring.extend(ts, cols[:, 1], cols[:, 2])
+            now = max(self._last_ts.get(symbol, 0), int(ts[-1]))
+            self._last_ts[symbol] = now
+            # Evict beyond the long window.
+            ring.evict_before(now - self.long_window_ms)
+            # Sample the current 1h net-flow for the z baseline (every live row is inside the window).
+            hist = self._z_hist.get(symbol)
+            if hist is None:
+                hist = self._z_hist[symbol] = _RollingStats(self.z_history)
+            hist.append(ring.sums_from(ring.head)[0])
 
     # ── snapshot ──────────────────────────────────────────────────────────────
     def snapshot_features(self, symbol: str, direction: str, now_ms: int) -> Dict[str, float]:
@@ -74,25 +219,32 @@ class CvdTracker:
         the aggressive order flow AGREES with the trade's intended direction. Empty/cold symbol -> zeros
         with coverage 0 (excluded from the clean test set downstream)."""
         dir_sign = 1.0 if direction == "LONG" else -1.0
-        dq = self._trades.get(symbol)
         zeros = {
             "cvd_slope_1h": 0.0, "cvd_divergence": 0.0, "cvd_z": 0.0,
             "cvd_coverage": 0.0, "cvd_n_trades": 0.0,
         }
-        if not dq:
-            return zeros
-
         long_cut = now_ms - self.long_window_ms
-        win = [(ts, sv, px) for ts, sv, px in dq if ts >= long_cut]
-        if not win:
-            return zeros
-        net = sum(sv for _, sv, _ in win)
-        tot = sum(abs(sv) for _, sv, _ in win)
+        with self._lock:
+            ring = self._trades.get(symbol)
+            if ring is None or not len(ring):
+                return zeros
+            j = ring.first_at_or_after(long_cut)
+            if j >= ring.tail:
+                return zeros
+            n_win = ring.tail - j
+            net, tot = ring.sums_from(j)
+            first_ts = int(ring.ts[j])
+            price_old = float(ring.px[j])
+            price_new = float(ring.px[ring.tail - 1])
+            hist = self._z_hist.get(symbol)
+            baseline: Optional[Tuple[float, float]] = (
+                hist.mean_pstdev() if hist is not None and len(hist) >= 10 else None
+            )
+            last_gap = self._last_gap_ts.get(symbol)
+
         imbalance = (net / tot) if tot > 0 else 0.0  # -1..+1 order-flow imbalance over 1h
 
         # price return over the window (oldest->newest in-window price)
-        price_old = win[0][2]
-        price_new = win[-1][2]
         price_ret = ((price_new - price_old) / price_old) if price_old > 0 else 0.0
 
         # divergence: flow disagrees with price IN THE TRADE'S FAVOR (the fade/exhaustion confirmation).
@@ -104,18 +256,15 @@ class CvdTracker:
             divergence = 0.0
 
         # z-score of the current 1h net-flow vs the per-symbol rolling baseline (normalized level).
-        hist = self._z_hist.get(symbol)
-        if hist and len(hist) >= 10:
-            mu = _stats.mean(hist)
-            sd = _stats.pstdev(hist)
+        if baseline is not None:
+            mu, sd = baseline
             z = ((net - mu) / sd) if sd > 0 else 0.0
         else:
             z = 0.0  # warming up — not enough baseline yet
 
         # coverage: span actually covered (0..1) zeroed if a gap landed inside the window.
-        span = (now_ms - win[0][0]) / self.long_window_ms
+        span = (now_ms - first_ts) / self.long_window_ms
         coverage = max(0.0, min(1.0, span))
-        last_gap = self._last_gap_ts.get(symbol)
         if last_gap is not None and last_gap >= long_cut:
             coverage = 0.0  # a gap corrupted this window -> exclude downstream
 
@@ -124,5 +273,5 @@ class CvdTracker:
             "cvd_divergence": divergence,           # -1/0/+1, signed for the trade
             "cvd_z": z * dir_sign,                  # normalized 1h net-flow, signed
             "cvd_coverage": coverage,               # 0..1 data-quality flag
-            "cvd_n_trades": float(len(win)),        # sample size in the window (quality co-indicator)
+            "cvd_n_trades": float(n_win),           # sample size in the window (quality co-indicator)
         }
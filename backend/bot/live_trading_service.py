@@ -34,8 +34,10 @@ from backend.shared.config.scanner_modes import get_mode
 from backend.shared.config.defaults import ScanConfig
 from backend.shared.models.planner import TradePlan
 from backend.data.adapters.phemex import PhemexAdapter
+from backend.data.adapters.request_scheduler import Lane, set_request_lane
 from backend.data.adapters.phemex_ws import PhemexWebSocketClient
 from backend.shared.utils.math_utils import round_to_lot
+from backend.shared.utils.log_sink import get_log_sink
 
 logger = logging.getLogger(__name__)
 
@@ -322,8 +324,9 @@ class LiveTradingService:
         self._log_activity("session_stopped", {"session_id": self.session_id})
         logger.info(f"Live trading stopped: session={self.session_id}")
 
-        # Write final session report
+        # Write final session report (after the queued signal/activity lines land)
         if self._session_log_dir:
+            get_log_sink().flush()
             try:
                 with open(self._session_log_dir / "stats.json", "w", encoding="utf-8") as f:
                     json.dump(self.stats.to_dict(), f, indent=2, default=str)
@@ -731,6 +734,9 @@ class LiveTradingService:
                 "completed_trades": len(self.completed_trades),
                 "pending_orders": len(self._pending_plans),
             },
+            "scheduler": (
+                self.adapter.scheduler.stats() if getattr(self.adapter, "scheduler", None) else {}
+            ),
         }
 
     def _safe_journal_count(self, session_only: bool) -> int:
@@ -830,6 +836,7 @@ class LiveTradingService:
     # ------------------------------------------------------------------
 
     async def _scan_loop(self):
+        set_request_lane(Lane.SCAN)
         while self._running:
             config = self.config
             if not config:
@@ -861,6 +868,8 @@ class LiveTradingService:
             await asyncio.sleep(interval)
 
     async def _monitor_loop(self):
+        # Price and position checks outrank scanner traffic for the rate budget
+        set_request_lane(Lane.POSITIONS)
         while self._running:
             try:
                 if self.position_manager:
@@ -1452,11 +1461,7 @@ class LiveTradingService:
                     f"(reason_type={_reason_type}, result={result}); cache lookup will miss"
                 )
         if self._session_log_dir:
-            try:
-                with open(self._session_log_dir / "signals.jsonl", "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry, default=str) + "\n")
-            except Exception:
-                pass
+            get_log_sink().write_json(self._session_log_dir / "signals.jsonl", entry)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -2033,11 +2038,7 @@ class LiveTradingService:
         if len(self.activity_log) > 1000:
             self.activity_log = self.activity_log[-500:]
         if self._session_log_dir:
-            try:
-                with open(self._session_log_dir / "activity.jsonl", "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry, default=str) + "\n")
-            except Exception:
-                pass
+            get_log_sink().write_json(self._session_log_dir / "activity.jsonl", entry)
 
     def _get_uptime_seconds(self) -> int:
         if not self.started_at:
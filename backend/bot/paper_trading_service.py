@@ -11,7 +11,7 @@ This service ties together the scanner logic with paper execution,
 allowing users to test trading strategies without real capital.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
 from enum import Enum
@@ -34,11 +34,17 @@ from backend.shared.config.scanner_modes import get_mode, ScannerMode
 from backend.shared.config.defaults import ScanConfig
 from backend.shared.models.planner import TradePlan
 from backend.data.adapters.phemex import PhemexAdapter
+from backend.data.adapters.request_scheduler import Lane, in_lane, set_request_lane
 from backend.analysis.regime_policies import get_regime_policy
 from backend.shared.utils.math_utils import round_to_lot
+from backend.shared.utils.log_sink import get_log_sink
 from backend.diagnostics.logger import DiagnosticLogger, ProbeCategory, Severity
 from backend.diagnostics.report import ReportGenerator, ModeStats
 from backend.bot.trade_journal import get_trade_journal
+from backend.ml.session_index import get_session_index
+
+if TYPE_CHECKING:  # built on first use by _get_liquidity_snapshot()
+    from backend.data.liquidity_snapshot import LiquiditySnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +58,9 @@ _PENDING_TTL_MINUTES: Dict[str, float] = {
 # Max number of adaptive TTL extensions per order (each extension = 50% of original TTL)
 _MAX_TTL_EXTENSIONS = 2
 
+# Concurrent fetch_recent_trades calls per CVD poll (paced further by ccxt's own rateLimit).
+_CVD_POLL_CONCURRENCY = 5
+
 # Maximum distance (%) a limit order can be placed from current price.
 # If the OB entry zone is further away, the limit is "snapped" closer to price
 # so the order actually has a chance of filling within the TTL window.
@@ -666,6 +675,10 @@ class PaperTradingService:
 
         # Regime state (updated each scan cycle for position sizing adjustments)
         self._current_regime_composite: str = "unknown"
+        # id(plan) → ML win probability for the scan batch being processed
+        self._ml_prescored: Dict[int, Optional[float]] = {}
+        # Cached/background-refreshed liquidity inputs for the admission gates
+        self._liquidity_snapshot: Optional["LiquiditySnapshotService"] = None
         self._current_regime_score: float = 50.0
         self._current_regime_policy = None
         self._current_regime_trend: str = "sideways"
@@ -972,6 +985,9 @@ class PaperTradingService:
                 pass
             self._cvd_task = None
 
+        if getattr(self, "_liquidity_snapshot", None) is not None:
+            self._liquidity_snapshot.stop()
+
         if self._monitor_task:
             self._monitor_task.cancel()
             try:
@@ -1026,8 +1042,10 @@ class PaperTradingService:
             "session_stopped", {"session_id": self.session_id, "final_stats": self.stats.to_dict()}
         )
 
-        # Final state checkpoint before session report (captures last balance/stats)
+        # Final state checkpoint before session report (captures last balance/stats);
+        # the report reads signals/activity back, so drain the log sink first.
         self._save_state()
+        get_log_sink().flush()
 
         # Generate comprehensive session report on disk
         report_path = self._generate_session_report()
@@ -1260,6 +1278,7 @@ class PaperTradingService:
 
     async def _scan_loop(self):
         """Background loop for running scanner at intervals."""
+        set_request_lane(Lane.SCAN)
         while self._running:
             # Re-read config each iteration so mid-session changes take effect
             config = self.config
@@ -1311,25 +1330,38 @@ class PaperTradingService:
     async def _cvd_poll_loop(self):
         """OBSERVATIONAL order-flow poller (decisions/2026-06-30__cvd-experiment). Polls recent taker
         trades for the candidate universe and feeds the CvdTracker so CVD-at-entry is warm when a symbol
-        fires. Reads NOTHING into the decision path; failures are swallowed (never affects trading)."""
+        fires. Reads NOTHING into the decision path; failures are swallowed (never affects trading).
+
+        fetch_recent_trades is a blocking REST call, so each poll fans the symbols out over the default
+        executor (at most _CVD_POLL_CONCURRENCY in flight) instead of running them on the event loop."""
         _CVD_POLL_INTERVAL = 60  # seconds; bounded per-symbol fetch like the depth gate
         while self._running:
             try:
                 syms = list(self._cvd_poll_symbols)[:25]  # bounded call budget
                 adapter = self.orchestrator.exchange_adapter if self.orchestrator else None
-                if adapter:
-                    for sym in syms:
-                        try:
-                            perp = sym if ":" in sym else f"{sym}:USDT"
-                            trades = adapter.fetch_recent_trades(perp, limit=200)
-                            if trades:
-                                self._cvd_tracker.ingest(sym, trades)
-                        except Exception as _se:
-                            logger.debug(f"cvd poll {sym} skipped: {_se}")
+                if adapter and syms:
+                    await self._poll_cvd_trades(adapter, syms)
             except Exception as _e:
                 logger.debug(f"cvd poll loop iteration error: {_e}")
             await asyncio.sleep(_CVD_POLL_INTERVAL)
 
+    async def _poll_cvd_trades(self, adapter, syms: List[str]) -> None:
+        """Fetch recent trades for `syms` concurrently off the loop and ingest each as it lands."""
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(_CVD_POLL_CONCURRENCY)
+
+        async def _one(sym: str) -> None:
+            perp = sym if ":" in sym else f"{sym}:USDT"
+            try:
+                async with sem:
+                    trades = await loop.run_in_executor(None, adapter.fetch_recent_trades, perp, 200)
+                if trades:
+                    self._cvd_tracker.ingest(sym, trades)
+            except Exception as _se:
+                logger.debug(f"cvd poll {sym} skipped: {_se}")
+
+        await asyncio.gather(*(_one(sym) for sym in syms))
+
     def _inject_cvd_snapshot(self, plan) -> None:
         """Attach the entry-time CVD + OI snapshot to plan.metadata['cvd'] (observational; NEVER raises —
         a CVD failure must not block a trade opening). Mirrors the macro-metadata carrier pattern."""
@@ -1349,6 +1381,8 @@ class PaperTradingService:
 
     async def _monitor_loop(self):
         """Background loop for monitoring positions."""
+        # Price and position checks outrank scanner traffic for the rate budget
+        set_request_lane(Lane.POSITIONS)
         while self._running:
             try:
                 if self.position_manager:
@@ -1773,7 +1807,12 @@ class PaperTradingService:
                     )
                 else:
                     _liq_floor = getattr(self.mode, "min_24h_volume_usdt", 5_000_000.0)
-                _vols = self.orchestrator.exchange_adapter.get_symbol_volumes(scan_symbols)
+                # Volumes / books / min-order specs come from the liquidity snapshot: cached per
+                # symbol with a short TTL and refreshed in the background between scans, so these
+                # gates read memory instead of making serial REST calls before the OHLCV fetch.
+                _liq_src = self._get_liquidity_snapshot()
+                _liq_src.watch(scan_symbols)
+                _vols = _liq_src.get_symbol_volumes(scan_symbols)
                 if _vols:
                     scan_symbols, _illiquid_dropped = filter_illiquid_symbols(
                         scan_symbols, _vols, _liq_floor, context="paper_trading_service"
@@ -1793,7 +1832,7 @@ class PaperTradingService:
                 _want_liq = _aware and getattr(self.config, "liquidation_safety_guard", True)
                 _book: Dict[str, Dict[str, float]] = {}
                 if (_want_depth or _want_liq) and scan_symbols:
-                    _book = self.orchestrator.exchange_adapter.get_book_quality(
+                    _book = _liq_src.get_book_quality(
                         scan_symbols, band_bps=getattr(self.config, "depth_band_bps", 10.0)
                     )
                 # Depth-aware admission: volume is a cheap first screen, but volume != depth (NEAR
@@ -1818,7 +1857,7 @@ class PaperTradingService:
                         and scan_symbols):
                     _risk_budget = ((getattr(self.config, "initial_balance", 0.0) or 0.0)
                                     * (getattr(self.config, "risk_per_trade", 1.0) or 0.0) / 100.0)
-                    _specs = self.orchestrator.exchange_adapter.get_min_order_specs(scan_symbols)
+                    _specs = _liq_src.get_min_order_specs(scan_symbols)
                     if _specs:
                         _pre = list(scan_symbols)
                         _kept, _minord_dropped = filter_by_min_order_risk(
@@ -2183,8 +2222,14 @@ class PaperTradingService:
                     logger.info(f"SIGNAL DEFERRED: {_p.symbol} {_p.direction} | {_defer_reason}")
                     self._log_signal(_p, "filtered", _defer_reason, reason_type="directional_cap")
 
-            for plan in _capped_plans:
-                await self._process_signal(plan)
+            # Score the whole batch through the ML edge model in one call;
+            # _process_signal reads the result instead of scoring per plan.
+            self._ml_prescored = self._prescore_ml_edge(_capped_plans)
+            try:
+                for plan in _capped_plans:
+                    await self._process_signal(plan)
+            finally:
+                self._ml_prescored = {}
 
         except Exception as e:
             import traceback
@@ -2194,6 +2239,55 @@ class PaperTradingService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             self._log_activity("scan_error", {"error": error_details})
 
+    def _get_liquidity_snapshot(self) -> "LiquiditySnapshotService":
+        """Liquidity snapshot bound to the current exchange adapter (rebuilt if it changed)."""
+        from backend.data.liquidity_snapshot import LiquiditySnapshotService
+
+        adapter = self.orchestrator.exchange_adapter
+        snap = getattr(self, "_liquidity_snapshot", None)
+        if snap is None or snap.adapter is not adapter:
+            if snap is not None:
+                snap.stop()
+            snap = LiquiditySnapshotService(
+                adapter, band_bps=getattr(self.config, "depth_band_bps", 10.0)
+            )
+            self._liquidity_snapshot = snap
+        return snap
+
+    def _ml_gate_record(self, plan: TradePlan) -> Dict[str, Any]:
+        """Feature record the ML edge model scores for a candidate plan."""
+        return {
+            "confidence_score": plan.confidence_score,
+            "risk_reward_ratio": plan.risk_reward if hasattr(plan, "risk_reward") else 0,
+            "stop_distance_atr": 0,
+            "pullback_probability": float((getattr(plan, "metadata", {}) or {}).get("pullback_probability", 0) or getattr(getattr(plan, "entry_zone", None), "pullback_probability", 0) or 0),
+            "entry_time": datetime.now(timezone.utc).isoformat(),
+            "conviction_class": getattr(plan, "conviction_class", "B"),
+            "plan_type": getattr(plan, "plan_type", "SMC"),
+            "trade_type": getattr(plan, "trade_type", "intraday"),
+            "direction": plan.direction,
+            "kill_zone": (lambda kz: kz.value if hasattr(kz, "value") else (str(kz) if kz else "no_session"))(get_current_kill_zone(datetime.now(timezone.utc))),
+            "regime": self._current_regime_composite if hasattr(self, "_current_regime_composite") else "unknown",
+        }
+
+    def _prescore_ml_edge(self, plans: List[TradePlan]) -> Dict[int, Optional[float]]:
+        """
+        Win probabilities for a scan's plans keyed by id(plan), or {} when
+        the ML gate is inactive (thesis mode / untrained) or scoring fails.
+        """
+        if not plans or is_thesis_mode():
+            return {}
+        try:
+            from backend.ml.model_store import get_model_store
+            store = get_model_store()
+            if not store.status().get("trained"):
+                return {}
+            probs = store.predict_proba_batch([self._ml_gate_record(p) for p in plans])
+            return {id(p): prob for p, prob in zip(plans, probs)}
+        except Exception as _ml_err:
+            logger.debug("ML batch scoring skipped: %s", _ml_err)
+            return {}
+
     def _log_signal(self, plan: TradePlan, result: str, reason: str, **extra):
         """Record every signal's processing result for the Signal Intelligence panel."""
         _meta = getattr(plan, "metadata", None) or {}
@@ -2287,13 +2381,10 @@ class PaperTradingService:
         # Keep last 200 entries in memory for UI
         if len(self.signal_log) > 200:
             self.signal_log = self.signal_log[-200:]
-        # Persist every signal to disk so nothing is lost on long runs
+        # Persist every signal to disk so nothing is lost on long runs (the sink's
+        # writer thread serializes and appends; this only enqueues)
         if self._session_log_dir:
-            try:
-                with open(self._session_log_dir / "signals.jsonl", "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry) + "\n")
-            except Exception:
-                pass  # Don't let logging failure crash the bot
+            get_log_sink().write_json(self._session_log_dir / "signals.jsonl", entry)
 
         # Log to diagnostics
         if self.diagnostic_logger:
@@ -2524,20 +2615,11 @@ class PaperTradingService:
             # mode it silently re-gates thesis-approved low-score trades on a stale prior. Skip it in
             # thesis mode (legacy unchanged). Re-introduce once retrained on thesis-era fills.
             if not is_thesis_mode() and _ml_store.status().get("trained"):
-                _ml_record = {
-                    "confidence_score": plan.confidence_score,
-                    "risk_reward_ratio": plan.risk_reward if hasattr(plan, "risk_reward") else 0,
-                    "stop_distance_atr": 0,
-                    "pullback_probability": float((getattr(plan, "metadata", {}) or {}).get("pullback_probability", 0) or getattr(getattr(plan, "entry_zone", None), "pullback_probability", 0) or 0),
-                    "entry_time": datetime.now(timezone.utc).isoformat(),
-                    "conviction_class": getattr(plan, "conviction_class", "B"),
-                    "plan_type": getattr(plan, "plan_type", "SMC"),
-                    "trade_type": getattr(plan, "trade_type", "intraday"),
-                    "direction": plan.direction,
-                    "kill_zone": (lambda kz: kz.value if hasattr(kz, "value") else (str(kz) if kz else "no_session"))(get_current_kill_zone(datetime.now(timezone.utc))),
-                    "regime": self._current_regime_composite if hasattr(self, "_current_regime_composite") else "unknown",
-                }
-                _win_prob = _ml_store.predict_proba(_ml_record)
+                _prescored = getattr(self, "_ml_prescored", {})
+                if id(plan) in _prescored:
+                    _win_prob = _prescored[id(plan)]
+                else:
+                    _win_prob = _ml_store.predict_proba(self._ml_gate_record(plan))
                 ml_threshold = getattr(config, "ml_gate_threshold", 0.40)
                 if _win_prob is not None and _win_prob < ml_threshold:
                     reason = f"ML edge model: {_win_prob:.1%} win probability < {ml_threshold:.0%} threshold"
@@ -3824,11 +3906,9 @@ class PaperTradingService:
                 "pending_orders": pending_data,
             }
 
-            state_path = self._session_log_dir / "state.json"
-            tmp_path = state_path.with_suffix(".tmp")
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(state, f, indent=2, default=str)
-            tmp_path.rename(state_path)
+            # Serialized and atomically replaced on the log-sink thread; back-to-back
+            # checkpoints collapse into one write of the newest state.
+            get_log_sink().write_snapshot(self._session_log_dir / "state.json", state)
 
         except Exception as e:
             logger.warning(f"State checkpoint save failed: {e}")
@@ -3905,11 +3985,7 @@ class PaperTradingService:
 
         # Persist to disk so nothing is lost
         if self._session_log_dir:
-            try:
-                with open(self._session_log_dir / "activity.jsonl", "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry, default=str) + "\n")
-            except Exception:
-                pass
+            get_log_sink().write_json(self._session_log_dir / "activity.jsonl", entry)
 
     def _generate_session_report(self) -> Optional[Path]:
         """
@@ -4018,14 +4094,12 @@ class PaperTradingService:
             lines.append("\n## Signal Rejection Analysis\n")
             # Read the full signal log from disk (not the truncated in-memory version)
             all_signals = []
-            signals_file = log_dir / "signals.jsonl"
-            if signals_file.exists():
-                with open(signals_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            all_signals.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            pass
+            try:
+                _index = get_session_index()
+                _index.sync([log_dir])  # only lines not indexed yet are parsed
+                all_signals = _index.signals([log_dir])
+            except Exception as e:
+                logger.warning(f"Session index unavailable for report: {e}")
 
             if all_signals:
                 total_signals = len(all_signals)
@@ -4297,7 +4371,7 @@ class PaperTradingService:
         try:
             loop = asyncio.get_event_loop()
             ticker = await loop.run_in_executor(
-                None, self.orchestrator.exchange_adapter.fetch_ticker, symbol
+                None, in_lane(Lane.POSITIONS, self.orchestrator.exchange_adapter.fetch_ticker), symbol
             )
             price = ticker.get("last", ticker.get("close", 0.0))
             if price and price > 0:
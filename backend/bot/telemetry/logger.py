@@ -198,6 +198,36 @@ class TelemetryLogger:
             event_type=event_type, symbol=symbol, start_time=start_dt, end_time=end_dt
         )
 
+    def get_event_breakdown(
+        self,
+        group_by: str,
+        event_type: Optional[EventType] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Count events per value of one rollup dimension.
+
+        Args:
+            group_by: "event_type", "symbol", "reason_type", "reason" or "mode"
+            event_type: Filter by event type
+            start_time: Count events after this time (ISO format)
+            end_time: Count events before this time (ISO format)
+
+        Returns:
+            {value: count} ('' = events without that field)
+        """
+        from datetime import datetime
+
+        start_dt = datetime.fromisoformat(start_time) if start_time else None
+        end_dt = datetime.fromisoformat(end_time) if end_time else None
+        filters = {"event_type": event_type.value} if event_type else None
+
+        counts = self.storage.get_rollup_counts(
+            (group_by,), filters=filters, start_time=start_dt, end_time=end_dt
+        )
+        return {key[0]: n for key, n in counts.items()}
+
     def cleanup_old_events(self, older_than_days: int = 30) -> int:
         """
         Delete events older than specified days.
@@ -3,13 +3,21 @@ Telemetry Storage Layer
 
 SQLite-based persistence for telemetry events with efficient querying
 and automatic schema management.
+
+Hot payload fields (rejection reason, reason_type / gate name, scan mode)
+are extracted into indexed columns at write time, and every insert also
+bumps a per-minute rollup row keyed by (minute, event_type, symbol,
+reason_type, reason, mode). Counts and breakdowns over a time range read
+the rollups for whole minutes and the raw table only for the partial
+minutes at the range edges, so analytics cost tracks the number of
+minutes in the range rather than the number of events.
 """
 
 import sqlite3
 import json
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from contextlib import contextmanager
 import logging
 
@@ -17,6 +25,32 @@ from backend.bot.telemetry.events import TelemetryEvent, EventType
 
 logger = logging.getLogger(__name__)
 
+# Columns extracted from data_json (name -> SQL type)
+_HOT_COLUMNS = {"reason": "TEXT", "reason_type": "TEXT", "mode": "TEXT"}
+
+# Dimensions a rollup row is keyed by (besides the minute)
+ROLLUP_DIMENSIONS = ("event_type", "symbol", "reason_type", "reason", "mode")
+
+_MINUTE_FMT = "%Y-%m-%dT%H:%M"
+
+
+def _minute_key(ts: datetime) -> str:
+    """UTC minute bucket, e.g. '2026-03-01T12:34'."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.strftime(_MINUTE_FMT)
+
+
+def _hot_fields(event: TelemetryEvent, run_mode: Optional[str]) -> Dict[str, Optional[str]]:
+    data = event.data or {}
+    reason_type = data.get("reason_type") or data.get("gate_name")
+    mode = data.get("mode") or data.get("profile") or run_mode
+    return {
+        "reason": str(data["reason"]) if data.get("reason") is not None else None,
+        "reason_type": str(reason_type) if reason_type else None,
+        "mode": str(mode) if mode else None,
+    }
+
 
 class TelemetryStorage:
     """
@@ -40,11 +74,12 @@ class TelemetryStorage:
             db_path = str(cache_dir / "telemetry.db")
 
         self.db_path = db_path
+        self._run_modes: Dict[str, str] = {}  # run_id -> mode from its scan_started event
         self._init_db()
         logger.info(f"Telemetry storage initialized: {self.db_path}")
 
     def _init_db(self):
-        """Create database schema if it doesn't exist."""
+        """Create database schema if it doesn't exist (and migrate older files)."""
         with self._get_connection() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS telemetry_events (
@@ -58,6 +93,14 @@ class TelemetryStorage:
                 )
             """)
 
+            # Hot columns were added after the first release: add + backfill
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(telemetry_events)")}
+            added = [col for col in _HOT_COLUMNS if col not in existing]
+            for col in added:
+                conn.execute(f"ALTER TABLE telemetry_events ADD COLUMN {col} {_HOT_COLUMNS[col]}")
+            if added:
+                self._backfill_hot_columns(conn)
+
             # Create indices for common queries
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_event_type 
@@ -75,9 +118,84 @@ class TelemetryStorage:
                 CREATE INDEX IF NOT EXISTS idx_run_id 
                 ON telemetry_events(run_id)
             """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_type_timestamp
+                ON telemetry_events(event_type, timestamp)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reason_type
+                ON telemetry_events(reason_type)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mode
+                ON telemetry_events(mode)
+            """)
+
+            has_rollups = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'telemetry_rollups'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS telemetry_rollups (
+                    minute TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    symbol TEXT NOT NULL DEFAULT '',
+                    reason_type TEXT NOT NULL DEFAULT '',
+                    reason TEXT NOT NULL DEFAULT '',
+                    mode TEXT NOT NULL DEFAULT '',
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (minute, event_type, symbol, reason_type, reason, mode)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rollups_type_minute
+                ON telemetry_rollups(event_type, minute)
+            """)
+            if not has_rollups:
+                self._rebuild_rollups(conn)
 
             conn.commit()
 
+    @staticmethod
+    def _backfill_hot_columns(conn: sqlite3.Connection) -> None:
+        """Populate hot columns of rows written before they existed."""
+        conn.execute("""
+            UPDATE telemetry_events SET
+                reason = json_extract(data_json, '$.reason'),
+                reason_type = COALESCE(
+                    json_extract(data_json, '$.reason_type'),
+                    json_extract(data_json, '$.gate_name')
+                ),
+                mode = COALESCE(
+                    json_extract(data_json, '$.mode'),
+                    json_extract(data_json, '$.profile')
+                )
+            WHERE data_json IS NOT NULL AND json_valid(data_json)
+        """)
+        # Events of a scan inherit the mode of that run's scan_started event
+        conn.execute("""
+            UPDATE telemetry_events SET mode = (
+                SELECT s.mode FROM telemetry_events s
+                WHERE s.run_id = telemetry_events.run_id
+                  AND s.event_type = 'scan_started' AND s.mode IS NOT NULL
+                LIMIT 1
+            )
+            WHERE mode IS NULL AND run_id IS NOT NULL
+        """)
+
+    @staticmethod
+    def _rebuild_rollups(conn: sqlite3.Connection) -> None:
+        """Recompute every rollup row from the raw events."""
+        conn.execute("DELETE FROM telemetry_rollups")
+        conn.execute("""
+            INSERT INTO telemetry_rollups
+                (minute, event_type, symbol, reason_type, reason, mode, count)
+            SELECT strftime('%Y-%m-%dT%H:%M', timestamp), event_type,
+                   COALESCE(symbol, ''), COALESCE(reason_type, ''),
+                   COALESCE(reason, ''), COALESCE(mode, ''), COUNT(*)
+            FROM telemetry_events
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """)
+
     @contextmanager
     def _get_connection(self):
         """Get database connection context manager."""
@@ -98,12 +216,18 @@ class TelemetryStorage:
         Returns:
             Event ID in database
         """
+        hot = _hot_fields(event, self._run_modes.get(event.run_id) if event.run_id else None)
+        if event.event_type == EventType.SCAN_STARTED and event.run_id and hot["mode"]:
+            if len(self._run_modes) > 1000:
+                self._run_modes.clear()
+            self._run_modes[event.run_id] = hot["mode"]
+
         with self._get_connection() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO telemetry_events 
-                (event_type, timestamp, run_id, symbol, data_json)
-                VALUES (?, ?, ?, ?, ?)
+                (event_type, timestamp, run_id, symbol, data_json, reason, reason_type, mode)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     event.event_type.value,
@@ -111,6 +235,26 @@ class TelemetryStorage:
                     event.run_id,
                     event.symbol,
                     json.dumps(event.data) if event.data else None,
+                    hot["reason"],
+                    hot["reason_type"],
+                    hot["mode"],
+                ),
+            )
+            conn.execute(
+                """
+                INSERT INTO telemetry_rollups
+                (minute, event_type, symbol, reason_type, reason, mode, count)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (minute, event_type, symbol, reason_type, reason, mode)
+                DO UPDATE SET count = count + 1
+            """,
+                (
+                    _minute_key(event.timestamp),
+                    event.event_type.value,
+                    event.symbol or "",
+                    hot["reason_type"] or "",
+                    hot["reason"] or "",
+                    hot["mode"] or "",
                 ),
             )
             conn.commit()
@@ -236,28 +380,128 @@ class TelemetryStorage:
         Returns:
             Event count
         """
-        query = "SELECT COUNT(*) as count FROM telemetry_events WHERE 1=1"
-        params = []
-
+        filters: Dict[str, str] = {}
         if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type.value)
-
+            filters["event_type"] = event_type.value
         if symbol:
-            query += " AND symbol = ?"
-            params.append(symbol)
+            filters["symbol"] = symbol
+        counts = self.get_rollup_counts((), filters=filters, start_time=start_time, end_time=end_time)
+        return counts.get((), 0)
 
-        if start_time:
-            query += " AND timestamp >= ?"
-            params.append(start_time.isoformat())
+    def get_rollup_counts(
+        self,
+        group_by: Sequence[str],
+        filters: Optional[Dict[str, str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[Tuple[str, ...], int]:
+        """
+        Event counts grouped by rollup dimensions over [start_time, end_time].
 
-        if end_time:
-            query += " AND timestamp <= ?"
-            params.append(end_time.isoformat())
+        Whole minutes inside the range are summed from telemetry_rollups; the
+        partial minutes at either edge are counted from the raw events, so the
+        result is exact for any bounds.
+
+        Args:
+            group_by: dimensions from ROLLUP_DIMENSIONS ('' = no value)
+            filters: {dimension: value} equality filters
+            start_time: Count events at or after this time
+            end_time: Count events at or before this time
+
+        Returns:
+            {tuple of group_by values: count}
+        """
+        filters = filters or {}
+        unknown = [d for d in (*group_by, *filters) if d not in ROLLUP_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown rollup dimension(s): {unknown}")
+        start_time = _as_utc(start_time)
+        end_time = _as_utc(end_time)
+
+        # Whole minutes: [first_minute, end_minute) fully inside the range
+        first_minute = _ceil_minute(start_time) if start_time else None
+        end_minute = _floor_minute(end_time) if end_time else None
+
+        dims = ", ".join(group_by)
+        select_dims = f"{dims}, " if dims else ""
+        group_clause = f" GROUP BY {dims}" if dims else ""
+        counts: Dict[Tuple[str, ...], int] = {}
+
+        def _add(rows) -> None:
+            for row in rows:
+                key = tuple(row[d] or "" for d in group_by)
+                counts[key] = counts.get(key, 0) + (row["n"] or 0)
+
+        roll_where = [f"{d} = ?" for d in filters]
+        roll_params: List[Any] = list(filters.values())
+        if first_minute is not None:
+            roll_where.append("minute >= ?")
+            roll_params.append(first_minute.strftime(_MINUTE_FMT))
+        if end_minute is not None:
+            roll_where.append("minute < ?")
+            roll_params.append(end_minute.strftime(_MINUTE_FMT))
+
+        raw_filters = [f"COALESCE({d}, '') = ?" for d in filters]
+        raw_params: List[Any] = list(filters.values())
+        edges: List[Tuple[Optional[datetime], bool, Optional[datetime], bool]] = []
+        if first_minute is not None and end_minute is not None and first_minute >= end_minute:
+            # Range lies within a single minute (or two partial ones): raw only
+            edges.append((start_time, True, end_time, True))
+            roll_where.append("0")
+        else:
+            if start_time is not None and first_minute != start_time:
+                edges.append((start_time, True, first_minute, False))
+            if end_time is not None:
+                edges.append((end_minute, True, end_time, True))
 
         with self._get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return cursor.fetchone()["count"]
+            where = " AND ".join(roll_where) or "1=1"
+            _add(conn.execute(
+                f"SELECT {select_dims}SUM(count) AS n FROM telemetry_rollups WHERE {where}{group_clause}",
+                roll_params,
+            ))
+            for lo, lo_incl, hi, hi_incl in edges:
+                where_parts = list(raw_filters)
+                params = list(raw_params)
+                if lo is not None:
+                    where_parts.append(f"timestamp {'>=' if lo_incl else '>'} ?")
+                    params.append(lo.isoformat())
+                if hi is not None:
+                    where_parts.append(f"timestamp {'<=' if hi_incl else '<'} ?")
+                    params.append(hi.isoformat())
+                where = " AND ".join(where_parts) or "1=1"
+                raw_dims = ", ".join(f"COALESCE({d}, '') AS {d}" for d in group_by)
+                _add(conn.execute(
+                    f"SELECT {raw_dims + ', ' if raw_dims else ''}COUNT(*) AS n "
+                    f"FROM telemetry_events WHERE {where}{group_clause}",
+                    params,
+                ))
+        return {k: v for k, v in counts.items() if v}
+
+    def get_rollup_series(
+        self,
+        event_type: Optional[EventType] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Per-minute event counts ([{minute, event_type, count}]) from the rollups."""
+        where, params = ["1=1"], []
+        if event_type:
+            where.append("event_type = ?")
+            params.append(event_type.value)
+        if start_time:
+            where.append("minute >= ?")
+            params.append(_minute_key(_as_utc(start_time)))
+        if end_time:
+            where.append("minute <= ?")
+            params.append(_minute_key(_as_utc(end_time)))
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT minute, event_type, SUM(count) AS count FROM telemetry_rollups "
+                f"WHERE {' AND '.join(where)} GROUP BY minute, event_type ORDER BY minute",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
 
     def cleanup_old_events(self, older_than_days: int = 30) -> int:
         """
@@ -279,6 +523,10 @@ class TelemetryStorage:
             """,
                 (cutoff_time.isoformat(),),
             )
+            conn.execute(
+                "DELETE FROM telemetry_rollups WHERE minute < ?",
+                (_minute_key(cutoff_time),),
+            )
             conn.commit()
             deleted = cursor.rowcount
 
@@ -298,6 +546,21 @@ class TelemetryStorage:
         )
 
 
+def _as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is None:
+        return None
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _floor_minute(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+def _ceil_minute(ts: datetime) -> datetime:
+    floor = _floor_minute(ts)
+    return floor if floor == ts else floor + timedelta(minutes=1)
+
+
 # Singleton instance
 _storage_instance: Optional[TelemetryStorage] = None
 
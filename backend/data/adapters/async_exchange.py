@@ -0,0 +1,230 @@
+"""
+Async exchange access on one shared event loop.
+
+The adapters in this package wrap synchronous ccxt, so every async caller
+hops through a thread pool and bulk fetches need one thread per in-flight
+request. This module runs ccxt.async_support on a single background event
+loop ("exchange-io") instead:
+
+  - one AsyncExchangeAdapter per exchange (get_async_adapter), holding one
+    async ccxt instance with one pooled aiohttp session (keep-alive,
+    connection cap = max_concurrency)
+  - a semaphore bounds in-flight requests per exchange; the shared
+    RequestScheduler (request_scheduler.py) is installed on the async
+    instance, so sync and async clients draw from one rate budget
+  - callers on any thread use run_sync(coro); callers on another event
+    loop (FastAPI) await run_async(coro); both execute on the io loop
+
+Market data only (OHLCV, tickers) — order management stays on the sync
+adapters. SS_ASYNC_INGEST=1 makes IngestionPipeline bulk fetches go
+through this layer.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from backend.data.adapters.request_scheduler import get_request_scheduler
+
+DEFAULT_MAX_CONCURRENCY = 32
+# Phemex rejects kline requests below 500 rows (error 30000), as in PhemexAdapter
+MIN_OHLCV_LIMIT = {"phemex": 500}
+DEFAULT_TYPE = {"binance": "future"}
+
+
+def async_ingest_enabled() -> bool:
+    """SS_ASYNC_INGEST flag (default OFF): bulk OHLCV fetches use the async layer."""
+    return os.getenv("SS_ASYNC_INGEST", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _IOLoop:
+    """Daemon thread running the event loop that owns every async exchange."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="exchange-io", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+_IO_LOOP: Optional[_IOLoop] = None
+_IO_LOOP_LOCK = threading.Lock()
+
+
+def _io_loop() -> _IOLoop:
+    global _IO_LOOP
+    with _IO_LOOP_LOCK:
+        if _IO_LOOP is None or not _IO_LOOP.thread.is_alive():
+            _IO_LOOP = _IOLoop()
+        return _IO_LOOP
+
+
+def on_io_loop() -> bool:
+    io = _IO_LOOP
+    return io is not None and threading.current_thread() is io.thread
+
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run `coro` on the io loop and block for its result (not from the io loop itself)."""
+    if on_io_loop():
+        coro.close()
+        raise RuntimeError("run_sync called on the exchange-io loop; await the coroutine instead")
+    return _io_loop().submit(coro).result(timeout)
+
+
+async def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await `coro` on the io loop from any event loop."""
+    if on_io_loop():
+        return await coro
+    return await asyncio.wrap_future(_io_loop().submit(coro))
+
+
+class AsyncExchangeAdapter:
+    """
+    Async market-data adapter for one exchange. Coroutines must run on the
+    io loop — go through run_sync / run_async.
+
+    Args:
+        exchange_id: ccxt exchange id ('phemex', 'bybit', ...)
+        testnet: use the exchange sandbox
+        default_type: ccxt defaultType option (swap/future/spot)
+        max_concurrency: in-flight request cap and connection pool size
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        testnet: bool = False,
+        default_type: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.exchange_id = exchange_id
+        self.testnet = testnet
+        self.default_type = default_type or DEFAULT_TYPE.get(exchange_id, "swap")
+        self.max_concurrency = max(1, max_concurrency)
+        self.exchange: Any = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_open(self) -> Any:
+        if self.exchange is not None:
+            return self.exchange
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self.exchange is None:
+                import aiohttp
+                import ccxt.async_support as ccxt_async
+
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.max_concurrency, ttl_dns_cache=300, enable_cleanup_closed=True
+                    ),
+                )
+                exchange = getattr(ccxt_async, self.exchange_id)(
+                    {
+                        "enableRateLimit": True,
+                        "options": {"defaultType": self.default_type},
+                        "timeout": 30000,
+                        "session": session,
+                    }
+                )
+                if self.testnet:
+                    exchange.set_sandbox_mode(True)
+                if self.exchange_id == "phemex":
+                    from backend.data.adapters.phemex import phemex_base_url, route_to_base_url
+
+                    base_url = phemex_base_url()
+                    if base_url:
+                        route_to_base_url(exchange, base_url)
+                get_request_scheduler(exchange)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self.exchange = exchange
+                logger.info(
+                    f"Async {self.exchange_id} adapter ready "
+                    f"({'TESTNET' if self.testnet else 'PRODUCTION'}, {self.max_concurrency} connections)"
+                )
+        return self.exchange
+
+    async def fetch_ohlcv(
+        self, symbol: str, timeframe: str, limit: int = 500, since: Optional[int] = None
+    ) -> pd.DataFrame:
+        """OHLCV as a DataFrame in the sync adapters' layout (timestamp, o, h, l, c, v)."""
+        exchange = await self._ensure_open()
+        limit = max(limit, MIN_OHLCV_LIMIT.get(self.exchange_id, 0))
+        async with self._semaphore:
+            ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        if not ohlcv:
+            logger.warning(f"No OHLCV data returned for {symbol} {timeframe}")
+            return pd.DataFrame()
+        df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        return df
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        exchange = await self._ensure_open()
+        async with self._semaphore:
+            return await exchange.fetch_ticker(symbol)
+
+    async def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        exchange = await self._ensure_open()
+        async with self._semaphore:
+            return await exchange.fetch_tickers(symbols)
+
+    async def close(self) -> None:
+        if self.exchange is not None:
+            exchange, self.exchange = self.exchange, None
+            session = exchange.session
+            await exchange.close()
+            if session is not None:
+                await session.close()
+
+
+_ADAPTERS: Dict[str, AsyncExchangeAdapter] = {}
+_ADAPTERS_LOCK = threading.Lock()
+
+
+def get_async_adapter(
+    exchange_id: str, testnet: bool = False, default_type: Optional[str] = None
+) -> AsyncExchangeAdapter:
+    """Process-wide AsyncExchangeAdapter per (exchange, testnet)."""
+    key = f"{exchange_id}-testnet" if testnet else exchange_id
+    with _ADAPTERS_LOCK:
+        adapter = _ADAPTERS.get(key)
+        if adapter is None:
+            adapter = AsyncExchangeAdapter(exchange_id, testnet=testnet, default_type=default_type)
+            _ADAPTERS[key] = adapter
+        return adapter
+
+
+def async_adapter_for(adapter: Any) -> Optional[AsyncExchangeAdapter]:
+    """
+    The async counterpart of a sync adapter (same exchange, sandbox and
+    market type), or None when it does not wrap a ccxt exchange.
+    """
+    exchange = getattr(adapter, "exchange", None)
+    exchange_id = getattr(exchange, "id", None)
+    if not isinstance(exchange_id, str):
+        return None
+    try:
+        import ccxt.async_support as ccxt_async
+    except ImportError:
+        return None
+    if exchange_id not in ccxt_async.exchanges:
+        return None
+    testnet = bool(getattr(adapter, "testnet", False) or getattr(exchange, "isSandboxModeEnabled", False))
+    options = getattr(exchange, "options", None)
+    default_type = options.get("defaultType") if isinstance(options, dict) else None
+    return get_async_adapter(exchange_id, testnet=testnet, default_type=default_type)
+
@@ -10,6 +10,8 @@ import pandas as pd
 import ccxt
 from loguru import logger
 
+from backend.data.adapters.request_scheduler import get_request_scheduler
+
 
 def _retry_on_rate_limit(max_retries: int = 3, backoff: float = 1.0):
     """
@@ -87,6 +89,8 @@ class BinanceAdapter:
         else:
             logger.info("Binance adapter initialized in PRODUCTION mode")
 
+        self.scheduler = get_request_scheduler(self.exchange)
+
     @_retry_on_rate_limit(max_retries=3)
     def fetch_ohlcv(
         self, symbol: str, timeframe: str, limit: int = 500, since: Optional[int] = None
@@ -8,6 +8,7 @@ import pandas as pd
 import ccxt
 from loguru import logger
 
+from backend.data.adapters.request_scheduler import get_request_scheduler
 from backend.data.adapters.retry import retry_on_rate_limit
 
 
@@ -39,6 +40,8 @@ class BybitAdapter:
         else:
             logger.info("Bybit adapter initialized in PRODUCTION mode")
 
+        self.scheduler = get_request_scheduler(self.exchange)
+
     @retry_on_rate_limit(max_retries=3)
     def fetch_ohlcv(
         self, symbol: str, timeframe: str, limit: int = 500, since: Optional[int] = None
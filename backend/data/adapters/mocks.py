@@ -1,6 +1,9 @@
 """
 Mock data generators for deterministic testing.
 Creates synthetic OHLCV data with different market regimes.
+
+For many symbols/timeframes at once (scale tests) use
+synthetic_universe.generate_universe, which is vectorized.
 """
 
 from datetime import datetime, timedelta
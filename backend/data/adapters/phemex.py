@@ -9,11 +9,43 @@ import time
 from typing import Optional, Dict, Any, List, Tuple, cast
 import pandas as pd
 import ccxt
-import random
 from loguru import logger
 
+from backend.data.adapters.request_scheduler import (
+    MARKET_DATA,
+    Lane,
+    get_request_scheduler,
+    request_lane,
+)
 from backend.data.adapters.retry import retry_on_rate_limit
 
+# Points every Phemex client at another host, e.g. the local mock exchange
+# (backend/devtools/mock_exchange.py): http://127.0.0.1:8765
+PHEMEX_BASE_URL_ENV = "SS_PHEMEX_BASE_URL"
+
+
+def phemex_base_url(base_url: Optional[str] = None) -> Optional[str]:
+    """Base URL override (argument, else SS_PHEMEX_BASE_URL), or None for the real exchange."""
+    url = (base_url or os.getenv(PHEMEX_BASE_URL_ENV, "")).strip().rstrip("/")
+    return url or None
+
+
+def route_to_base_url(exchange: Any, base_url: str) -> None:
+    """
+    Send every request of a ccxt phemex instance (sync or async, live or
+    sandbox) to `base_url`. Also recorded in options so the instance gets
+    its own RequestScheduler instead of sharing the real exchange's budget.
+    """
+    urls = {
+        "v1": f"{base_url}/v1",
+        "v2": base_url,
+        "public": f"{base_url}/exchange/public",
+        "private": base_url,
+    }
+    exchange.urls["api"] = dict(urls)
+    exchange.urls["test"] = dict(urls)
+    exchange.options["baseUrlOverride"] = base_url
+
 
 class PhemexAdapter:
     """
@@ -27,6 +59,7 @@ class PhemexAdapter:
         default_type: str = "swap",
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
+        base_url: Optional[str] = None,
     ):
         """
         Initialize Phemex exchange connection.
@@ -36,6 +69,8 @@ class PhemexAdapter:
             default_type: Default market type ('spot' or 'swap')
             api_key: Phemex API key (falls back to PHEMEX_API_KEY env var)
             api_secret: Phemex API secret (falls back to PHEMEX_API_SECRET env var)
+            base_url: Send all requests to this host instead (falls back to
+                SS_PHEMEX_BASE_URL env var) — used for the local mock exchange
         """
         _key = api_key or os.getenv("PHEMEX_API_KEY")
         _secret = api_secret or os.getenv("PHEMEX_API_SECRET")
@@ -56,6 +91,7 @@ class PhemexAdapter:
 
         self.default_type = default_type
         self.testnet = testnet
+        self.base_url = phemex_base_url(base_url)
 
         # Lightweight in-process counters surfaced via /api/integrations/phemex/healthz
         # so the integration is never a black box. Updated on every REST call.
@@ -77,6 +113,12 @@ class PhemexAdapter:
             logger.info(f"Phemex adapter initialized in TESTNET mode (type: {default_type})")
         else:
             logger.info(f"Phemex adapter initialized in PRODUCTION mode (type: {default_type})")
+        if self.base_url:
+            route_to_base_url(self.exchange, self.base_url)
+            logger.info(f"Phemex adapter routed to {self.base_url}")
+
+        # One rate budget per exchange, shared by every adapter instance
+        self.scheduler = get_request_scheduler(self.exchange)
 
         # Load markets to ensure proper symbol resolution and API routing
         try:
@@ -188,7 +230,9 @@ class PhemexAdapter:
                 }
                 resolution = tf_map.get(timeframe, 60)
 
-                _base = "https://testnet-api.phemex.com" if self.testnet else "https://api.phemex.com"
+                _base = self.base_url or (
+                    "https://testnet-api.phemex.com" if self.testnet else "https://api.phemex.com"
+                )
                 url = f"{_base}/exchange/public/md/kline"
                 end_time = int(time.time())
 
@@ -203,8 +247,8 @@ class PhemexAdapter:
                 else:
                     params["from"] = end_time - (resolution * params["limit"])
 
-                # Polite request
-                time.sleep(random.uniform(0.5, 1.0))  # Extra polite on fallback
+                # Bypasses ccxt, so take the kline cost from the shared budget here
+                self.scheduler.acquire(MARKET_DATA, cost=5)
                 response = requests.get(url, params=params, timeout=5)
                 data = response.json()
 
@@ -718,9 +762,10 @@ class PhemexAdapter:
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required for order placement")
         try:
-            order = self.exchange.create_order(
-                symbol, order_type, side, amount, price, params or {}
-            )
+            with request_lane(Lane.ORDERS):
+                order = self.exchange.create_order(
+                    symbol, order_type, side, amount, price, params or {}
+                )
             logger.info(
                 f"Order created on Phemex: {side} {amount} {symbol} @ {price} "
                 f"(id={order.get('id')})"
@@ -742,7 +787,8 @@ class PhemexAdapter:
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required to cancel orders")
         try:
-            result = self.exchange.cancel_order(order_id, symbol)
+            with request_lane(Lane.ORDERS):
+                result = self.exchange.cancel_order(order_id, symbol)
             logger.info(f"Order cancelled: {order_id} {symbol}")
             return result
         except ccxt.OrderNotFound:
@@ -757,7 +803,8 @@ class PhemexAdapter:
         """Fetch a single order's current status from Phemex."""
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required to fetch orders")
-        return self.exchange.fetch_order(order_id, symbol)
+        with request_lane(Lane.ORDERS):
+            return self.exchange.fetch_order(order_id, symbol)
 
     @retry_on_rate_limit(max_retries=3)
     def fetch_balance(self) -> Dict[str, Any]:
@@ -769,7 +816,8 @@ class PhemexAdapter:
         """
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required to fetch balance")
-        return self.exchange.fetch_balance()
+        with request_lane(Lane.POSITIONS):
+            return self.exchange.fetch_balance()
 
     @retry_on_rate_limit(max_retries=3)
     def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -784,7 +832,8 @@ class PhemexAdapter:
         """
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required to fetch positions")
-        return self.exchange.fetch_positions(symbols)
+        with request_lane(Lane.POSITIONS):
+            return self.exchange.fetch_positions(symbols)
 
     @retry_on_rate_limit(max_retries=3)
     def fetch_my_trades(
@@ -853,7 +902,8 @@ class PhemexAdapter:
         if not self.supports_trading():
             raise ccxt.AuthenticationError("API keys required to set leverage")
         try:
-            self.exchange.set_leverage(leverage, symbol)
+            with request_lane(Lane.ORDERS):
+                self.exchange.set_leverage(leverage, symbol)
             logger.info(f"Leverage set to {leverage}x for {symbol}")
         except ccxt.ExchangeError as e:
             logger.warning(f"Could not set leverage for {symbol}: {e}")
@@ -871,7 +921,8 @@ class PhemexAdapter:
         if not self.supports_trading():
             return
         try:
-            self.exchange.set_margin_mode(mode, symbol)
+            with request_lane(Lane.ORDERS):
+                self.exchange.set_margin_mode(mode, symbol)
             logger.info(f"Margin mode set to {mode} for {symbol}")
         except ccxt.ExchangeError as e:
             logger.warning(f"Could not set margin mode to {mode} for {symbol}: {e}")
@@ -892,7 +943,8 @@ class PhemexAdapter:
             return True
         try:
             # CCXT unified call: hedged=False → one-way / netting mode
-            self.exchange.set_position_mode(False)
+            with request_lane(Lane.ORDERS):
+                self.exchange.set_position_mode(False)
             logger.info("Position mode set to one-way (non-hedge)")
             return True
         except ccxt.ExchangeError as e:
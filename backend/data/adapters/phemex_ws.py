@@ -22,6 +22,7 @@ import hashlib
 import hmac
 import json
 import logging
+import os
 import time
 from typing import Callable, Optional
 
@@ -37,6 +38,17 @@ _RECONNECT_DELAY = 5        # seconds to wait before reconnect attempt
 _AUTH_TIMEOUT = 10.0        # seconds to wait for auth response
 
 
+def default_ws_url(testnet: bool = False) -> str:
+    """
+    Phemex WS endpoint, or the /ws endpoint of SS_PHEMEX_BASE_URL when the
+    REST adapter is pointed at another host (the local mock exchange).
+    """
+    base = os.getenv("SS_PHEMEX_BASE_URL", "").strip().rstrip("/")
+    if base:
+        return base.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/ws"
+    return TESTNET_WS_URL if testnet else MAINNET_WS_URL
+
+
 class PhemexWebSocketClient:
     """
     Phemex WebSocket client for real-time AOP order updates.
@@ -60,10 +72,11 @@ class PhemexWebSocketClient:
         api_secret: str,
         testnet: bool = False,
         on_order_update: Optional[Callable] = None,
+        ws_url: Optional[str] = None,
     ):
         self._api_key = api_key
         self._api_secret = api_secret
-        self._ws_url = TESTNET_WS_URL if testnet else MAINNET_WS_URL
+        self._ws_url = ws_url or default_ws_url(testnet)
         self._on_order_update = on_order_update
         self._running = False
         self._msg_id = 0
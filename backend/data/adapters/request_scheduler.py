@@ -0,0 +1,414 @@
+"""
+Request Scheduler - one weighted token-bucket rate limiter per exchange.
+
+Every adapter (Phemex, Bybit, OKX, Bitget, Binance) installs the scheduler
+for its exchange on its ccxt instance, so all REST calls made by any
+adapter instance in the process — scanner, price refresh, CVD poller,
+book-quality checks, API endpoints, order management — draw from the
+same budget instead of each ccxt instance throttling only itself.
+
+Budget:
+  - an exchange-wide bucket in ccxt cost units, refilled at ccxt's
+    rateLimit (one unit per rateLimit ms) with GLOBAL_BURST_S of burst;
+    each request takes ccxt's per-endpoint cost
+  - per endpoint class request-count buckets for private endpoints
+    (account reads, order management), CLASS_LIMITS per exchange
+
+Priority lanes: waiters are served strictly in lane order, FIFO within a
+lane — orders > positions > scan > dashboard. The lane comes from a
+context variable (request_lane / set_request_lane / in_lane); unset
+means SCAN. Note run_in_executor does not copy context — wrap the callable
+with in_lane(). ccxt.async_support instances are hooked too (acquire_async),
+so sync and async clients of an exchange share its budget.
+
+A RateLimitExceeded / DDoSProtection from the exchange pauses the whole
+exchange (doubling per consecutive hit, capped) rather than only the
+thread that saw it.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+
+class Lane(IntEnum):
+    """Priority lanes, highest priority first."""
+
+    ORDERS = 0
+    POSITIONS = 1
+    SCAN = 2
+    DASHBOARD = 3
+
+
+# Endpoint classes
+MARKET_DATA = "market_data"
+ACCOUNT = "account"
+ORDERS = "orders"
+
+
+@dataclass(frozen=True)
+class BucketSpec:
+    """Token bucket: `capacity` tokens, refilled at `rate` tokens/second."""
+
+    capacity: float
+    rate: float
+
+
+GLOBAL_BURST_S = 2.0           # exchange-wide bucket holds this many seconds of budget
+DEFAULT_RATE_LIMIT_MS = 100.0  # when the exchange reports no rateLimit
+PENALTY_BASE_S = 1.0
+PENALTY_MAX_S = 30.0
+PENALTY_RESET_S = 60.0         # a rate-limit hit this long after the last one starts over
+ASYNC_POLL_S = 0.02            # coroutine waiters re-check the queue this often
+
+# Request-count budgets for private endpoint classes. Phemex: order
+# management 500/min, other authenticated calls 100/min per account.
+CLASS_LIMITS: Dict[str, Dict[str, BucketSpec]] = {
+    "phemex": {
+        ORDERS: BucketSpec(capacity=20, rate=500 / 60),
+        ACCOUNT: BucketSpec(capacity=10, rate=100 / 60),
+    },
+    "default": {
+        ORDERS: BucketSpec(capacity=10, rate=5.0),
+        ACCOUNT: BucketSpec(capacity=10, rate=2.0),
+    },
+}
+
+_LANE: contextvars.ContextVar[Lane] = contextvars.ContextVar("request_lane", default=Lane.SCAN)
+
+
+def current_lane() -> Lane:
+    return _LANE.get()
+
+
+def set_request_lane(lane: Lane) -> contextvars.Token:
+    """Set the lane for the rest of the current context (e.g. a loop task)."""
+    return _LANE.set(lane)
+
+
+@contextmanager
+def request_lane(lane: Lane) -> Iterator[None]:
+    """Exchange calls inside the block queue in `lane`."""
+    token = _LANE.set(lane)
+    try:
+        yield
+    finally:
+        _LANE.reset(token)
+
+
+def in_lane(lane: Lane, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap `fn` so it runs in `lane` (for run_in_executor, which drops context)."""
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with request_lane(lane):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def classify_endpoint(api: Any, method: str) -> str:
+    """Endpoint class of a ccxt request: private writes are ORDERS, private reads ACCOUNT."""
+    name = "/".join(str(a) for a in api) if isinstance(api, (list, tuple)) else str(api)
+    if "private" not in name.lower():
+        return MARKET_DATA
+    return ORDERS if str(method).upper() in ("POST", "PUT", "DELETE") else ACCOUNT
+
+
+class _Bucket:
+    """Token bucket allowed to go into debt: a request heavier than the
+    capacity waits for a full bucket, then leaves the balance negative."""
+
+    def __init__(self, spec: BucketSpec) -> None:
+        self.spec = spec
+        self.tokens = spec.capacity
+        self._stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.spec.capacity, self.tokens + (now - self._stamp) * self.spec.rate)
+        self._stamp = now
+
+    def delay(self, amount: float, now: float) -> float:
+        self._refill(now)
+        need = min(amount, self.spec.capacity) - self.tokens
+        return need / self.spec.rate if need > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= amount
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RequestScheduler:
+    """
+    Shared rate limiter for one exchange.
+
+    Args:
+        name: exchange key (ccxt id, "-testnet" suffixed for sandboxes)
+        rate_limit_ms: ccxt rateLimit — milliseconds per cost unit
+        class_limits: request-count buckets per endpoint class
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_limit_ms: float = DEFAULT_RATE_LIMIT_MS,
+        class_limits: Optional[Dict[str, BucketSpec]] = None,
+    ) -> None:
+        self.name = name
+        rate = 1000.0 / rate_limit_ms
+        self._global = _Bucket(BucketSpec(capacity=rate * GLOBAL_BURST_S, rate=rate))
+        self._classes = {cls: _Bucket(spec) for cls, spec in (class_limits or {}).items()}
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []  # heap of (lane, seq)
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._penalty_s = 0.0
+        self._last_penalty = 0.0
+        self._lane_stats = {
+            lane: {"waiting": 0, "granted": 0, "wait_s_total": 0.0, "wait_s_max": 0.0} for lane in Lane
+        }
+        self._class_cost = {cls: [0, 0.0] for cls in (MARKET_DATA, ACCOUNT, ORDERS)}  # [n, cost sum]
+        self._penalties = 0
+
+    # ── acquisition ───────────────────────────────────────────────────────────
+
+    def acquire(self, endpoint_class: str = MARKET_DATA, cost: float = 1.0, lane: Optional[Lane] = None) -> float:
+        """
+        Block until a request of `endpoint_class` costing `cost` units may
+        start. Returns the seconds waited.
+        """
+        t0 = time.monotonic()
+        with self._cond:
+            ticket, buckets = self._enqueue(endpoint_class, cost, lane)
+            granted = False
+            try:
+                while True:
+                    delay = self._head_delay(ticket, buckets)
+                    if delay is None:
+                        self._cond.wait()
+                    elif delay > 0:
+                        self._cond.wait(delay)
+                    else:
+                        granted = True
+                        break
+            finally:
+                self._dequeue(ticket, endpoint_class, cost, time.monotonic() - t0 if granted else None)
+        return time.monotonic() - t0
+
+    async def acquire_async(
+        self, endpoint_class: str = MARKET_DATA, cost: float = 1.0, lane: Optional[Lane] = None
+    ) -> float:
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop."""
+        t0 = time.monotonic()
+        with self._cond:
+            ticket, buckets = self._enqueue(endpoint_class, cost, lane)
+        granted = False
+        try:
+            while True:
+                with self._cond:
+                    delay = self._head_delay(ticket, buckets)
+                    if delay is not None and delay <= 0:
+                        granted = True
+                        break
+                # Threads are woken by notify; a coroutine polls.
+                await asyncio.sleep(ASYNC_POLL_S if delay is None else min(delay, ASYNC_POLL_S))
+        finally:
+            with self._cond:
+                self._dequeue(ticket, endpoint_class, cost, time.monotonic() - t0 if granted else None)
+        return time.monotonic() - t0
+
+    def _enqueue(self, endpoint_class: str, cost: float, lane: Optional[Lane]):
+        lane = current_lane() if lane is None else Lane(lane)
+        cost = max(float(cost), 0.0)
+        buckets = [(self._global, cost)]
+        if endpoint_class in self._classes:
+            buckets.append((self._classes[endpoint_class], 1.0))
+        ticket = (int(lane), next(self._seq))
+        heapq.heappush(self._waiters, ticket)
+        self._lane_stats[lane]["waiting"] += 1
+        self._cond.notify_all()  # a higher-priority arrival takes over the head
+        return ticket, buckets
+
+    def _head_delay(self, ticket: Tuple[int, int], buckets) -> Optional[float]:
+        """None unless `ticket` heads the queue; else seconds until it may go
+        (<= 0: its tokens have been taken)."""
+        if self._waiters[0] != ticket:
+            return None
+        now = time.monotonic()
+        delay = max(self._paused_until - now, max(bucket.delay(amount, now) for bucket, amount in buckets))
+        if delay <= 0:
+            for bucket, amount in buckets:
+                bucket.take(amount, now)
+        return delay
+
+    def _dequeue(self, ticket: Tuple[int, int], endpoint_class: str, cost: float, waited: Optional[float]) -> None:
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+        stats = self._lane_stats[Lane(ticket[0])]
+        stats["waiting"] -= 1
+        self._cond.notify_all()
+        if waited is None:  # interrupted / cancelled
+            return
+        stats["granted"] += 1
+        stats["wait_s_total"] += waited
+        stats["wait_s_max"] = max(stats["wait_s_max"], waited)
+        seen = self._class_cost.setdefault(endpoint_class, [0, 0.0])
+        seen[0] += 1
+        seen[1] += max(float(cost), 0.0)
+
+    def penalize(self) -> float:
+        """The exchange rejected a request for rate: pause every lane. Returns the pause."""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_penalty > PENALTY_RESET_S:
+                self._penalty_s = 0.0
+            self._penalty_s = min(PENALTY_MAX_S, self._penalty_s * 2 or PENALTY_BASE_S)
+            self._last_penalty = now
+            self._paused_until = max(self._paused_until, now + self._penalty_s)
+            self._global.drain(now)
+            self._penalties += 1
+            self._cond.notify_all()
+            pause = self._penalty_s
+        logger.warning("{}: rate limited by exchange — pausing all requests {:.1f}s", self.name, pause)
+        return pause
+
+    def estimate_seconds(self, n_requests: int, endpoint_class: str = MARKET_DATA) -> float:
+        """Time the exchange-wide budget needs for `n_requests` more requests
+        of `endpoint_class` (at the average cost seen so far) beyond what is
+        already queued."""
+        with self._cond:
+            n, total = self._class_cost.get(endpoint_class, [0, 0.0])
+            avg_cost = total / n if n else 1.0
+            now = time.monotonic()
+            backlog = sum(self._lane_stats[lane]["waiting"] for lane in Lane) + n_requests
+            self._global.delay(0.0, now)  # refresh tokens
+            need = backlog * avg_cost - max(self._global.tokens, 0.0)
+            return max(0.0, need / self._global.spec.rate, self._paused_until - now)
+
+    # ── ccxt integration ──────────────────────────────────────────────────────
+
+    def install(self, exchange: Any) -> Any:
+        """
+        Route every REST request of a ccxt `exchange` through this scheduler
+        (wraps fetch2, which all implicit and unified ccxt methods call) and
+        turn off ccxt's own per-instance throttle.
+        """
+        import ccxt  # deferred: the API server imports this module before any adapter exists
+
+        if getattr(exchange, "_request_scheduler", None) is self:
+            return exchange
+        original = exchange.fetch2
+        scheduler = self
+
+        if asyncio.iscoroutinefunction(original):  # ccxt.async_support instance
+
+            async def fetch2(path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+                cost = exchange.calculate_rate_limiter_cost(api, method, path, params, config)
+                await scheduler.acquire_async(classify_endpoint(api, method), cost)
+                try:
+                    return await original(path, api, method, params, headers, body, config)
+                except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+                    scheduler.penalize()
+                    raise
+
+        else:
+
+            def fetch2(path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+                cost = exchange.calculate_rate_limiter_cost(api, method, path, params, config)
+                scheduler.acquire(classify_endpoint(api, method), cost)
+                try:
+                    return original(path, api, method, params, headers, body, config)
+                except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+                    scheduler.penalize()
+                    raise
+
+        exchange.fetch2 = fetch2
+        exchange.enableRateLimit = False
+        exchange._request_scheduler = self
+        return exchange
+
+    # ── metrics ───────────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._global.delay(0.0, now)
+            lanes = {}
+            for lane, s in self._lane_stats.items():
+                lanes[lane.name.lower()] = {
+                    "waiting": s["waiting"],
+                    "granted": s["granted"],
+                    "wait_s_avg": round(s["wait_s_total"] / s["granted"], 4) if s["granted"] else 0.0,
+                    "wait_s_max": round(s["wait_s_max"], 4),
+                }
+            buckets = {"global": round(self._global.tokens, 2)}
+            for cls, bucket in self._classes.items():
+                bucket.delay(0.0, now)
+                buckets[cls] = round(bucket.tokens, 2)
+            return {
+                "exchange": self.name,
+                "queue_depth": len(self._waiters),
+                "lanes": lanes,
+                "tokens": buckets,
+                "penalties": self._penalties,
+                "paused_for_s": round(max(0.0, self._paused_until - now), 2),
+            }
+
+
+_SCHEDULERS: Dict[str, RequestScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def _exchange_key(exchange: Any) -> str:
+    key = str(getattr(exchange, "id", "exchange"))
+    if getattr(exchange, "isSandboxModeEnabled", False):
+        key += "-testnet"
+    options = getattr(exchange, "options", None)
+    base_url = options.get("baseUrlOverride") if isinstance(options, dict) else None
+    if base_url:
+        key += f"@{base_url}"  # e.g. the local mock exchange: its own budget
+    return key
+
+
+def get_request_scheduler(exchange: Any) -> RequestScheduler:
+    """
+    Process-wide scheduler for `exchange` (a ccxt instance), installed on
+    it. Adapter instances for the same exchange share one scheduler.
+    Call after set_sandbox_mode (and route_to_base_url) — testnet and
+    redirected hosts have their own budget.
+    """
+    key = _exchange_key(exchange)
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(key)
+        if scheduler is None:
+            rate_limit = getattr(exchange, "rateLimit", None)
+            scheduler = RequestScheduler(
+                key,
+                rate_limit_ms=float(rate_limit) if isinstance(rate_limit, (int, float)) and rate_limit > 0
+                else DEFAULT_RATE_LIMIT_MS,
+                class_limits=CLASS_LIMITS.get(str(getattr(exchange, "id", "")), CLASS_LIMITS["default"]),
+            )
+            _SCHEDULERS[key] = scheduler
+    scheduler.install(exchange)
+    return scheduler
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """{exchange key: stats()} for every scheduler created so far."""
+    with _SCHEDULERS_LOCK:
+        schedulers = dict(_SCHEDULERS)
+    return {key: s.stats() for key, s in schedulers.items()}
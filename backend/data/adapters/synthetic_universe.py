@@ -0,0 +1,373 @@
+"""
+Vectorized synthetic market universes for scale tests.
+
+mocks.py builds one List[OHLCV] bar by bar, which is fine for unit tests
+but far too slow for 500 symbols x 6 timeframes x 1000 bars. This module
+generates a whole universe as NumPy arrays in one pass:
+
+  - every symbol is an independent seeded walk with regime switching
+    (trend up / trend down / range / volatile), generated for all symbols
+    at once as (symbols, bars) arrays
+  - SMC patterns are injected at known bars: order blocks followed by a
+    displacement leg that leaves a fair value gap, and liquidity sweeps
+    that wick through the prior lows/highs and close back inside
+  - timeframes are consistent: each one is the exact aggregate of the next
+    finer one where that exists (a 4h candle is its four 1h candles);
+    further back, coarser timeframes continue with their own generated
+    history so every timeframe gets `bars` candles
+
+The result plugs into the pipeline as DataFrames (frame, multi_timeframe),
+as BacktestAdapter data (to_backtest_frame) or as one shared-memory block
+for worker processes (share / attach).
+"""
+
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.data.ohlcv_cache import TIMEFRAME_SECONDS
+from backend.shared.models.data import MultiTimeframeData
+
+DEFAULT_TIMEFRAMES = ("1w", "1d", "4h", "1h", "15m", "5m")
+DEFAULT_END = pd.Timestamp("2025-01-06")  # a Monday, so every default timeframe closes there
+WEEK_ANCHOR_NS = 4 * 86_400 * 1_000_000_000  # weekly candles open on Monday (1970-01-05)
+
+# name, drift (in per-bar sigmas), volatility multiplier, MA(1) coefficient (mean reversion)
+REGIMES = (
+    ("trend_up", 0.08, 1.0, 0.0),
+    ("trend_down", -0.08, 1.0, 0.0),
+    ("range", 0.0, 0.6, 0.6),
+    ("volatile", 0.0, 2.2, 0.0),
+)
+PATTERN_KINDS = ("order_block", "sweep")
+SWEEP_LOOKBACK = 20
+# Log price reverts to its reference with this time constant, so long
+# weekly/daily histories stay within a plausible range of today's price
+MEAN_REVERSION_DAYS = 180.0
+
+
+def _tf_seconds(timeframe: str) -> int:
+    """Seconds per candle; accepts the upper-case keys the scanner uses ('4H', '1W'), not months."""
+    seconds = TIMEFRAME_SECONDS.get(timeframe) or TIMEFRAME_SECONDS.get(timeframe.lower())
+    if not seconds or timeframe == "1M":
+        raise ValueError(f"Unsupported timeframe for synthetic data: {timeframe}")
+    return seconds
+
+
+def _floor(ts_ns: int, period_ns: int) -> int:
+    anchor = WEEK_ANCHOR_NS if period_ns % (7 * 86_400 * 1_000_000_000) == 0 else 0
+    return (ts_ns - anchor) // period_ns * period_ns + anchor
+
+
+@dataclass
+class SyntheticUniverse:
+    """
+    OHLCV for many symbols on a shared time grid.
+
+    Attributes:
+        symbols: symbol names, row order of every array
+        timeframes: timeframe keys as requested
+        timestamps: candle open times per timeframe (int64 ns, shared by all symbols)
+        ohlcv: (symbols, bars, 5) float64 per timeframe — open, high, low, close, volume
+        regimes: (symbols, bars) int8 index into REGIMES per timeframe
+        patterns: per timeframe and kind, (n, 3) int64 rows of (symbol index,
+            bar index, direction +1 bullish / -1 bearish); only timeframes
+            where the pattern was generated (finer ones carry it into coarser)
+    """
+
+    symbols: List[str]
+    timeframes: List[str]
+    timestamps: Dict[str, np.ndarray]
+    ohlcv: Dict[str, np.ndarray]
+    regimes: Dict[str, np.ndarray]
+    patterns: Dict[str, Dict[str, np.ndarray]] = field(default_factory=dict)
+    _shm: Optional[shared_memory.SharedMemory] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+    def frame(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """One (symbol, timeframe) in the adapters' DataFrame layout."""
+        rows = self.ohlcv[timeframe][self._index[symbol]]
+        return pd.DataFrame(
+            {
+                "timestamp": self.timestamps[timeframe].view("M8[ns]"),
+                "open": rows[:, 0],
+                "high": rows[:, 1],
+                "low": rows[:, 2],
+                "close": rows[:, 3],
+                "volume": rows[:, 4],
+            }
+        )
+
+    def multi_timeframe(self, symbol: str) -> MultiTimeframeData:
+        return MultiTimeframeData(
+            symbol=symbol,
+            timeframes={tf: self.frame(symbol, tf) for tf in self.timeframes},
+            metadata={"exchange": "synthetic"},
+        )
+
+    def to_backtest_frame(self) -> pd.DataFrame:
+        """Long layout of the backtest CSV (symbol, timeframe, timestamp, ohlcv) for BacktestAdapter."""
+        n_sym = len(self.symbols)
+        sizes = [n_sym * len(self.timestamps[tf]) for tf in self.timeframes]
+        rows = np.concatenate([self.ohlcv[tf].reshape(-1, 5) for tf in self.timeframes])
+        symbol_codes = np.concatenate([np.repeat(np.arange(n_sym), len(self.timestamps[tf])) for tf in self.timeframes])
+        return pd.DataFrame(
+            {
+                "symbol": pd.Categorical.from_codes(symbol_codes, self.symbols),
+                "timeframe": pd.Categorical.from_codes(np.repeat(np.arange(len(sizes)), sizes), self.timeframes),
+                "timestamp": np.concatenate([np.tile(self.timestamps[tf], n_sym) for tf in self.timeframes]).view("M8[ns]"),
+                "open": rows[:, 0],
+                "high": rows[:, 1],
+                "low": rows[:, 2],
+                "close": rows[:, 3],
+                "volume": rows[:, 4],
+            }
+        )
+
+    # ── shared memory ─────────────────────────────────────────────────────────
+
+    def share(self) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+        """
+        Copy the arrays into one shared-memory block. Returns the block (the
+        caller owns it: close() and unlink() when done) and a picklable spec
+        for attach() in other processes. Patterns are not shared.
+        """
+        layout: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for tf in self.timeframes:
+            entry = {}
+            for name, arr in (("timestamps", self.timestamps[tf]), ("ohlcv", self.ohlcv[tf]), ("regimes", self.regimes[tf])):
+                entry[name] = (offset, arr.shape, arr.dtype.str)
+                offset += -(-arr.nbytes // 8) * 8
+            layout[tf] = entry
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for tf, entry in layout.items():
+            for name, (start, shape, dtype) in entry.items():
+                view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+                view[...] = getattr(self, name)[tf]
+        spec = {"name": shm.name, "symbols": list(self.symbols), "timeframes": list(self.timeframes), "layout": layout}
+        return shm, spec
+
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> "SyntheticUniverse":
+        """Zero-copy view of a shared universe; call close() when done with it."""
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        arrays: Dict[str, Dict[str, np.ndarray]] = {"timestamps": {}, "ohlcv": {}, "regimes": {}}
+        for tf, entry in spec["layout"].items():
+            for name, (start, shape, dtype) in entry.items():
+                arrays[name][tf] = np.ndarray(tuple(shape), dtype=dtype, buffer=shm.buf, offset=start)
+        return cls(list(spec["symbols"]), list(spec["timeframes"]), _shm=shm, **arrays)
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self.timestamps, self.ohlcv, self.regimes = {}, {}, {}
+            self._shm.close()
+            self._shm = None
+
+
+class _Generator:
+    """Per-level bar generation; all arrays are (symbols, bars)."""
+
+    def __init__(self, rng: np.random.Generator, sigma: np.ndarray, volume: np.ndarray, phi: float,
+                 regime_bars: float, pattern_rate: float) -> None:
+        self.rng = rng
+        self.phi = phi  # per-bar AR(1) coefficient of the log price
+        self.sigma = sigma[:, None]  # per-bar log volatility per symbol
+        self.volume = volume[:, None]  # mean volume per bar per symbol
+        self.regime_bars = regime_bars
+        self.pattern_rate = pattern_rate
+
+    def bars(self, n: int, end_price: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """`n` candles whose last close is `end_price`; returns (ohlcv, regimes, patterns)."""
+        rng, sigma = self.rng, self.sigma
+        n_sym = sigma.shape[0]
+        drift, vol_mult, theta = (np.array([r[k] for r in REGIMES]) for k in (1, 2, 3))
+
+        switches = rng.random((n_sym, n)) < 1.0 / self.regime_bars
+        segment = np.cumsum(switches, axis=1)
+        labels = rng.integers(0, len(REGIMES), (n_sym, int(segment.max()) + 1)).astype(np.int8)
+        regime = np.take_along_axis(labels, segment, axis=1)
+
+        e = rng.standard_normal((n_sym, n + 1))
+        shock = e[:, 1:] - theta[regime] * e[:, :-1]
+        r = sigma * (drift[regime] + vol_mult[regime] * shock)
+        up = sigma * vol_mult[regime] * np.abs(rng.standard_normal((n_sym, n))) * 0.5
+        down = sigma * vol_mult[regime] * np.abs(rng.standard_normal((n_sym, n))) * 0.5
+        volume = self.volume * vol_mult[regime] * np.exp(0.4 * rng.standard_normal((n_sym, n))) * (1 + 0.5 * np.abs(shock))
+
+        patterns: Dict[str, np.ndarray] = {}
+        ob = self._pick(n, lo=SWEEP_LOOKBACK, hi=n - 3)
+        if len(ob):
+            s_idx, i, d = ob.T
+            sig = sigma[s_idx, 0]
+            for k, size in enumerate((-1.0, 3.5, 2.0)):  # opposing OB candle, then displacement
+                r[s_idx, i + k] = d * size * sig
+                up[s_idx, i + k] = down[s_idx, i + k] = 0.1 * sig
+            volume[s_idx, i + 1] *= 3.0
+            patterns["order_block"] = ob
+        in_ob = np.zeros((n_sym, n), dtype=bool)
+        for k in range(3):
+            in_ob[ob[:, 0], ob[:, 1] + k] = True
+
+        level = _ar1(r, self.phi)
+        close = np.exp(level - level[:, -1:]) * end_price[:, None]
+        open_ = close / np.exp(np.diff(level, axis=1, prepend=0.0))
+        high = np.maximum(open_, close) * np.exp(up)
+        low = np.minimum(open_, close) * np.exp(-down)
+
+        sweep = self._pick(n, lo=SWEEP_LOOKBACK, hi=n)
+        if len(sweep):
+            s_idx, j, d = sweep.T
+            windows = np.stack([j - SWEEP_LOOKBACK + k for k in range(SWEEP_LOOKBACK)], axis=1)
+            prior_low = low[s_idx[:, None], windows].min(axis=1)
+            prior_high = high[s_idx[:, None], windows].max(axis=1)
+            bull = d > 0
+            # Keep only bars that close back inside the prior range without already breaking it
+            ok = np.where(bull, (low[s_idx, j] > prior_low) & (close[s_idx, j] > prior_low),
+                          (high[s_idx, j] < prior_high) & (close[s_idx, j] < prior_high))
+            ok &= ~in_ob[s_idx, j]  # leave the order-block gaps intact
+            # Sweeps are placed from the unswept lows/highs, so one must not sit in another's lookback
+            close_pair = (s_idx[1:] == s_idx[:-1]) & (j[1:] - j[:-1] <= SWEEP_LOOKBACK)
+            ok &= ~(np.append(close_pair, False) | np.insert(close_pair, 0, False))
+            s_idx, j, bull, sweep = s_idx[ok], j[ok], bull[ok], sweep[ok]
+            sig = sigma[s_idx, 0]
+            low[s_idx[bull], j[bull]] = prior_low[ok][bull] * np.exp(-0.5 * sig[bull])
+            high[s_idx[~bull], j[~bull]] = prior_high[ok][~bull] * np.exp(0.5 * sig[~bull])
+            volume[s_idx, j] *= 2.0
+            patterns["sweep"] = sweep
+
+        return np.stack([open_, high, low, close, volume], axis=-1), regime, patterns
+
+    def _pick(self, n: int, lo: int, hi: int) -> np.ndarray:
+        """Random (symbol, bar, direction) rows, about pattern_rate per bar."""
+        n_sym = self.sigma.shape[0]
+        if hi <= lo or self.pattern_rate <= 0:
+            return np.empty((0, 3), dtype=np.int64)
+        count = int(self.rng.poisson(self.pattern_rate * n_sym * (hi - lo)))
+        rows = np.stack(
+            [
+                self.rng.integers(0, n_sym, count),
+                self.rng.integers(lo, hi, count),
+                np.where(self.rng.random(count) < 0.5, 1, -1),
+            ],
+            axis=1,
+        )
+        return np.unique(rows, axis=0).astype(np.int64)
+
+
+def _ar1(r: np.ndarray, phi: float, block: int = 512) -> np.ndarray:
+    """x[t] = phi * x[t-1] + r[t] along axis 1, vectorized in blocks (phi**-k stays finite)."""
+    out = np.empty_like(r)
+    state = np.zeros(r.shape[0])
+    for b in range(0, r.shape[1], block):
+        chunk = r[:, b : b + block]
+        powers = phi ** np.arange(chunk.shape[1])
+        out[:, b : b + block] = powers * (phi * state[:, None] + np.cumsum(chunk / powers, axis=1))
+        state = out[:, b + chunk.shape[1] - 1]
+    return out
+
+
+def _aggregate(rows: np.ndarray, ratio: int) -> np.ndarray:
+    """(symbols, n, 5) -> (symbols, n / ratio, 5) candles; n must be a multiple of ratio."""
+    n_sym, n, _ = rows.shape
+    g = rows.reshape(n_sym, n // ratio, ratio, 5)
+    return np.stack(
+        [g[:, :, 0, 0], g[:, :, :, 1].max(axis=2), g[:, :, :, 2].min(axis=2), g[:, :, -1, 3], g[:, :, :, 4].sum(axis=2)],
+        axis=-1,
+    )
+
+
+def generate_universe(
+    symbols: Union[int, Sequence[str]] = 500,
+    timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+    bars: int = 1000,
+    seed: int = 42,
+    end: Optional[pd.Timestamp] = None,
+    regime_bars: float = 150.0,
+    pattern_rate: float = 0.004,
+) -> SyntheticUniverse:
+    """
+    Generate a seeded universe; the same arguments always give the same data.
+
+    Args:
+        symbols: symbol names, or a count for SYN000/USDT, SYN001/USDT, ...
+        timeframes: each must divide the next coarser one (5m, 15m, 1h, 4h, 1d, 1w)
+        bars: candles per (symbol, timeframe)
+        seed: random seed
+        end: close time of the last candle of every timeframe, floored to the
+            coarsest one (default DEFAULT_END)
+        regime_bars: mean regime length in bars of each generated timeframe
+        pattern_rate: expected order blocks and sweeps per symbol per bar
+    """
+    names = [f"SYN{i:03d}/USDT" for i in range(symbols)] if isinstance(symbols, int) else list(symbols)
+    if not names or bars < 1:
+        raise ValueError("need at least one symbol and one bar")
+    tfs = sorted(dict.fromkeys(timeframes), key=_tf_seconds)
+    periods = [_tf_seconds(tf) * 1_000_000_000 for tf in tfs]
+    for fine, coarse, tf in zip(periods, periods[1:], tfs[1:]):
+        if coarse % fine:
+            raise ValueError(f"{tf} is not a whole number of the next finer timeframe")
+    end_ns = _floor(int(pd.Timestamp(end or DEFAULT_END).value), periods[-1])
+
+    n_sym = len(names)
+    base_rng = np.random.default_rng([seed, 0])
+    daily_vol = base_rng.uniform(0.02, 0.06, n_sym)
+    price = 10.0 ** base_rng.uniform(-2, 4.5, n_sym)
+    volume_per_s = 10.0 ** base_rng.uniform(6, 9, n_sym) / price / 86_400  # base units, $1M-$1B a day
+
+    universe: Dict[str, Dict[str, Any]] = {"timestamps": {}, "ohlcv": {}, "regimes": {}}
+    patterns: Dict[str, Dict[str, np.ndarray]] = {}
+    rows: Optional[np.ndarray] = None
+    regime: Optional[np.ndarray] = None
+    start_ns = end_ns
+    for level, (tf, period) in enumerate(zip(tfs, periods)):
+        if rows is not None:
+            ratio = period // periods[level - 1]
+            regime = regime.reshape(n_sym, -1, ratio)[:, :, -1]
+            rows = _aggregate(rows, ratio)
+        # Internal series starts on a boundary of the next coarser timeframe so it aggregates whole
+        want = end_ns - bars * period
+        if level + 1 < len(tfs):
+            want = _floor(want, periods[level + 1])
+        if want > start_ns:  # aggregated history is long enough: drop the unaligned head
+            drop = int((want - start_ns) // period)
+            rows, regime = rows[:, drop:], regime[:, drop:]
+            start_ns = want
+        elif want < start_ns:
+            seconds = period / 1e9
+            gen = _Generator(
+                np.random.default_rng([seed, level + 1]),
+                daily_vol * np.sqrt(seconds / 86_400),
+                volume_per_s * seconds,
+                float(np.exp(-seconds / (MEAN_REVERSION_DAYS * 86_400))),
+                regime_bars,
+                pattern_rate,
+            )
+            first_open = price if rows is None else rows[:, 0, 0]
+            old, old_regime, old_patterns = gen.bars(int((start_ns - want) // period), first_open)
+            rows = old if rows is None else np.concatenate([old, rows], axis=1)
+            regime = old_regime if regime is None else np.concatenate([old_regime, regime], axis=1)
+            offset = rows.shape[1] - bars
+            patterns[tf] = {
+                kind: found[found[:, 1] >= offset] - np.array([0, offset, 0])
+                for kind, found in old_patterns.items()
+            }
+            start_ns = want
+        universe["timestamps"][tf] = end_ns - np.arange(bars, 0, -1, dtype=np.int64) * period
+        universe["ohlcv"][tf] = np.ascontiguousarray(rows[:, -bars:])
+        universe["regimes"][tf] = np.ascontiguousarray(regime[:, -bars:])
+
+    order = list(dict.fromkeys(timeframes))
+    return SyntheticUniverse(
+        names,
+        order,
+        {tf: universe["timestamps"][tf] for tf in order},
+        {tf: universe["ohlcv"][tf] for tf in order},
+        {tf: universe["regimes"][tf] for tf in order},
+        patterns,
+    )
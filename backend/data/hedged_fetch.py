@@ -0,0 +1,280 @@
+"""
+Hedged OHLCV requests across two exchanges.
+
+One slow exchange response holds a whole scan batch until parallel_fetch's
+deadline drops the symbol. With hedging on, each OHLCV request the
+ingestion pipeline sends to its primary exchange gets a deadline derived
+from the primary's recent latency (p95 of the last HEDGE_WINDOW responses,
+clamped to [HEDGE_MIN_DEADLINE_S, HEDGE_MAX_DEADLINE_S]):
+
+  - primary answers in time with candles: used as is, no second request
+  - primary is late, fails or returns nothing: the same request goes to
+    the secondary exchange (symbol mapped to its unified form) and the
+    first non-empty frame from either exchange wins
+  - both fail: the primary's error is raised, as without hedging
+
+The late primary call is left to finish so its latency still feeds the
+deadline. SS_HEDGE_EXCHANGE=<bybit|okx|bitget|phemex|binance> turns it on
+(default OFF); stats per (primary, secondary) pair are in hedge_stats().
+"""
+
+import asyncio
+import importlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+HEDGE_WINDOW = 200              # primary latencies kept for the deadline
+HEDGE_MIN_SAMPLES = 20          # below this the initial deadline applies
+HEDGE_QUANTILE = 95.0
+HEDGE_INITIAL_DEADLINE_S = 5.0
+HEDGE_MIN_DEADLINE_S = 0.5
+HEDGE_MAX_DEADLINE_S = 10.0
+
+# Sync adapters a secondary can be built from (module, class), imported lazily
+HEDGE_ADAPTERS = {
+    "bybit": ("backend.data.adapters.bybit", "BybitAdapter"),
+    "okx": ("backend.data.adapters.okx", "OKXAdapter"),
+    "bitget": ("backend.data.adapters.bitget", "BitgetAdapter"),
+    "phemex": ("backend.data.adapters.phemex", "PhemexAdapter"),
+    "binance": ("backend.data.adapters.binance", "BinanceAdapter"),
+}
+
+
+def hedge_exchange() -> Optional[str]:
+    """SS_HEDGE_EXCHANGE (default unset = OFF): secondary exchange for hedged OHLCV requests."""
+    name = os.getenv("SS_HEDGE_EXCHANGE", "").strip().lower()
+    return name or None
+
+
+def exchange_id(adapter: Any) -> str:
+    """ccxt id of an adapter's exchange ('phemex', 'bybit', ...), else its class name."""
+    ccxt_id = getattr(getattr(adapter, "exchange", None), "id", None)
+    return ccxt_id if isinstance(ccxt_id, str) else type(adapter).__name__.lower()
+
+
+def unified_symbol(symbol: str) -> str:
+    """'BTC/USDT:USDT' -> 'BTC/USDT'; every adapter maps the unified pair to its own market."""
+    return symbol.split(":", 1)[0]
+
+
+def _valid(df: Any) -> bool:
+    return isinstance(df, pd.DataFrame) and not df.empty
+
+
+def _retrieve(future) -> None:
+    """Mark a finished request's error as seen: the loser of a hedge is never awaited."""
+    if not future.cancelled():
+        future.exception()
+
+
+class HedgedFetcher:
+    """
+    Deadline-hedged OHLCV requests from a primary exchange to a secondary one.
+
+    The primary request is passed in as a callable (the pipeline's own sync
+    or async adapter call) so one fetcher, with one latency history and one
+    set of counters, serves every pipeline on the same primary exchange.
+    """
+
+    def __init__(
+        self,
+        secondary,
+        primary_id: str,
+        secondary_id: Optional[str] = None,
+        symbol_map: Optional[Dict[str, str]] = None,
+        initial_deadline_s: float = HEDGE_INITIAL_DEADLINE_S,
+        min_deadline_s: float = HEDGE_MIN_DEADLINE_S,
+        max_deadline_s: float = HEDGE_MAX_DEADLINE_S,
+        max_workers: int = 32,
+    ):
+        """
+        Args:
+            secondary: Sync exchange adapter the hedge requests go to
+            primary_id: Name of the primary exchange (provenance / stats)
+            secondary_id: Name of the secondary exchange (default: its ccxt id)
+            symbol_map: Explicit primary -> secondary symbols where the unified
+                pair differs between the exchanges (e.g. renamed tickers)
+            initial_deadline_s: Deadline until HEDGE_MIN_SAMPLES latencies are known
+            min_deadline_s / max_deadline_s: Clamp for the p95-derived deadline
+            max_workers: Threads for concurrent primary + secondary sync calls
+        """
+        self.secondary = secondary
+        self.primary_id = primary_id
+        self.secondary_id = secondary_id or exchange_id(secondary)
+        self.symbol_map = dict(symbol_map or {})
+        self.initial_deadline_s = initial_deadline_s
+        self.min_deadline_s = min_deadline_s
+        self.max_deadline_s = max_deadline_s
+        self._latencies: deque = deque(maxlen=HEDGE_WINDOW)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ohlcv-hedge")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "hedged": 0, "secondary_wins": 0, "primary_wins": 0, "failed": 0}
+
+    # ── deadline ──────────────────────────────────────────────────────────────
+
+    def deadline(self) -> float:
+        """Seconds to wait for the primary before hedging."""
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return self.initial_deadline_s
+            p95 = float(np.percentile(self._latencies, HEDGE_QUANTILE))
+        return min(self.max_deadline_s, max(self.min_deadline_s, p95))
+
+    def _on_primary_done(self, started: float) -> Callable[[Any], None]:
+        def done(future) -> None:
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+            _retrieve(future)
+
+        return done
+
+    def map_symbol(self, symbol: str) -> str:
+        return self.symbol_map.get(symbol) or unified_symbol(symbol)
+
+    # ── requests ──────────────────────────────────────────────────────────────
+
+    def fetch(
+        self, primary: Callable[[], pd.DataFrame], symbol: str, timeframe: str, limit: int
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Run `primary()`, hedging to the secondary past the deadline.
+
+        Returns:
+            (frame, exchange that produced it)
+        """
+        started = time.monotonic()
+        primary_future = self._pool.submit(primary)
+        primary_future.add_done_callback(self._on_primary_done(started))
+        self._count("requests")
+        try:
+            df = primary_future.result(timeout=self.deadline())
+            if _valid(df):
+                return df, self.primary_id
+        except Exception:
+            pass  # late or failed: hedge
+
+        self._hedge_started(symbol, timeframe, primary_future.done(), started)
+        secondary_future = self._pool.submit(
+            self.secondary.fetch_ohlcv, self.map_symbol(symbol), timeframe, limit=limit
+        )
+        sources = {primary_future: self.primary_id, secondary_future: self.secondary_id}
+        pending = set(sources)  # a primary that already failed just comes back done
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and _valid(future.result()):
+                    return future.result(), self._won(sources[future])
+        return self._lost(primary_future), self.primary_id
+
+    async def fetch_async(
+        self, primary: Callable[[], Awaitable[pd.DataFrame]], symbol: str, timeframe: str, limit: int
+    ) -> Tuple[pd.DataFrame, str]:
+        """fetch() for a coroutine primary; the secondary's sync call runs in a thread."""
+        started = time.monotonic()
+        primary_task = asyncio.ensure_future(primary())
+        primary_task.add_done_callback(self._on_primary_done(started))
+        self._count("requests")
+        done, _ = await asyncio.wait({primary_task}, timeout=self.deadline())
+        if done and primary_task.exception() is None and _valid(primary_task.result()):
+            return primary_task.result(), self.primary_id
+
+        self._hedge_started(symbol, timeframe, bool(done), started)
+        secondary_task = asyncio.ensure_future(
+            asyncio.to_thread(self.secondary.fetch_ohlcv, self.map_symbol(symbol), timeframe, limit=limit)
+        )
+        secondary_task.add_done_callback(_retrieve)
+        sources = {primary_task: self.primary_id, secondary_task: self.secondary_id}
+        pending = set(sources)
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task.exception() is None and _valid(task.result()):
+                    return task.result(), self._won(sources[task])
+        return self._lost(primary_task), self.primary_id
+
+    # ── counters ──────────────────────────────────────────────────────────────
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _hedge_started(self, symbol: str, timeframe: str, primary_done: bool, started: float) -> None:
+        self._count("hedged")
+        reason = "failed or empty" if primary_done else f"no answer after {time.monotonic() - started:.1f}s"
+        logger.debug(f"Hedging {symbol} {timeframe} to {self.secondary_id}: {self.primary_id} {reason}")
+
+    def _won(self, source: str) -> str:
+        self._count("secondary_wins" if source == self.secondary_id else "primary_wins")
+        if source == self.secondary_id:
+            logger.debug(f"Hedge won by {source}")
+        return source
+
+    def _lost(self, primary) -> pd.DataFrame:
+        """Neither exchange produced candles: the primary's error, else its (empty) frame."""
+        self._count("failed")
+        return primary.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            samples = len(self._latencies)
+        requests = stats["requests"] or 1
+        stats.update(
+            primary=self.primary_id,
+            secondary=self.secondary_id,
+            hedge_rate_pct=round(100.0 * stats["hedged"] / requests, 1),
+            secondary_win_pct=round(100.0 * stats["secondary_wins"] / requests, 1),
+            deadline_s=round(self.deadline(), 3),
+            latency_samples=samples,
+        )
+        return stats
+
+
+_fetchers: Dict[Tuple[str, str], HedgedFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def hedged_fetcher_for(adapter: Any, secondary: Optional[str] = None) -> Optional[HedgedFetcher]:
+    """
+    The process-wide HedgedFetcher for `adapter`'s exchange, hedging to
+    `secondary` (default: SS_HEDGE_EXCHANGE). None when hedging is off, the
+    secondary is the primary's own exchange, or it cannot be built.
+    """
+    secondary = (secondary or hedge_exchange() or "").lower()
+    if not secondary:
+        return None  # checked first: reading adapter.exchange builds a lazy adapter
+    primary_id = exchange_id(adapter)
+    if secondary == primary_id:
+        return None
+    if secondary not in HEDGE_ADAPTERS:
+        logger.warning(f"Unknown hedge exchange '{secondary}' — hedging disabled")
+        return None
+    key = (primary_id, secondary)
+    with _fetchers_lock:
+        fetcher = _fetchers.get(key)
+        if fetcher is None:
+            module, cls = HEDGE_ADAPTERS[secondary]
+            try:
+                secondary_adapter = getattr(importlib.import_module(module), cls)()
+            except Exception as e:
+                logger.warning(f"Hedge exchange {secondary} unavailable ({e}) — hedging disabled")
+                return None
+            fetcher = HedgedFetcher(secondary_adapter, primary_id, secondary_id=secondary)
+            _fetchers[key] = fetcher
+            logger.info(f"Hedged OHLCV requests: {primary_id} -> {secondary}")
+        return fetcher
+
+
+def hedge_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters of every hedged primary -> secondary pair, keyed 'primary->secondary'."""
+    with _fetchers_lock:
+        fetchers = dict(_fetchers)
+    return {f"{p}->{s}": f.stats() for (p, s), f in fetchers.items()}
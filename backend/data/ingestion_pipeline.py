@@ -1,37 +1,81 @@
 """
 Data ingestion pipeline for multi-timeframe market data fetching.
 Handles parallel symbol fetching and data normalization.
-Includes smart OHLCV caching to reduce API calls.
+Includes smart OHLCV caching to reduce API calls, and extends cached
+higher timeframes locally from lower-timeframe candles (see tf_synthesis).
+Exchange requests can be hedged to a second exchange (see hedged_fetch).
 """
 
+import asyncio
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Generator, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from loguru import logger
 
 from backend.shared.models.data import MultiTimeframeData
 from backend.data.ohlcv_cache import get_ohlcv_cache, OHLCVCache
+from backend.data.adapters.async_exchange import (
+    AsyncExchangeAdapter,
+    async_adapter_for,
+    async_ingest_enabled,
+    run_async,
+    run_sync,
+)
+from backend.data.adapters.request_scheduler import RequestScheduler
+from backend.data.hedged_fetch import HedgedFetcher, hedged_fetcher_for
+from backend.data.tf_synthesis import (
+    VERIFY_CANDLES,
+    TimeframeSynthesizer,
+    derivation_sources,
+    extend,
+    get_timeframe_synthesizer,
+    is_current,
+    matches,
+    timeframe_seconds,
+)
 
 
 class IngestionPipeline:
     """
     Pipeline for fetching and normalizing multi-timeframe market data.
-    Supports parallel fetching across symbols and timeframes.
+    Supports parallel fetching across symbols and timeframes, on threads
+    or, with an async adapter, as tasks on one event loop.
     Uses smart OHLCV caching to minimize API calls.
     """
 
-    def __init__(self, adapter, use_cache: bool = True):
+    def __init__(
+        self,
+        adapter,
+        use_cache: bool = True,
+        use_synthesis: bool = True,
+        async_adapter: Optional[AsyncExchangeAdapter] = None,
+        hedge: Optional[HedgedFetcher] = None,
+    ):
         """
         Initialize ingestion pipeline with exchange adapter.
 
         Args:
             adapter: Exchange adapter instance (e.g., BinanceAdapter)
             use_cache: Whether to use OHLCV caching (default: True)
+            use_synthesis: Build expired higher timeframes from lower-timeframe
+                candles instead of refetching them (requires use_cache)
+            async_adapter: Async counterpart used by parallel_fetch; defaults to
+                the adapter's exchange when SS_ASYNC_INGEST is on
+            hedge: Hedges slow or failed exchange requests to a second exchange;
+                defaults to the SS_HEDGE_EXCHANGE one when that is set
         """
         self.adapter = adapter
         self.use_cache = use_cache
         self._cache: OHLCVCache = get_ohlcv_cache() if use_cache else None
+        self.use_synthesis = use_cache and use_synthesis
+        self._synth: TimeframeSynthesizer = get_timeframe_synthesizer()
+        if async_adapter is None and async_ingest_enabled():
+            async_adapter = async_adapter_for(adapter)
+        self.async_adapter = async_adapter
+        if hedge is None:
+            hedge = hedged_fetcher_for(adapter)
+        self.hedge = hedge
 
         cache_status = "enabled" if use_cache else "disabled"
         logger.info(
@@ -91,6 +135,10 @@ class IngestionPipeline:
         Fetch OHLCV data across multiple timeframes for a single symbol.
         Uses caching to avoid redundant API calls.
 
+        Timeframes are resolved finest first so an expired higher timeframe
+        can be extended from a lower one already resolved in this call; the
+        exchange is only asked when that is not possible.
+
         Args:
             symbol: Trading pair symbol (e.g., 'BTC/USDT')
             timeframes: List of timeframe strings (e.g., ['1W', '1D', '4H'])
@@ -103,17 +151,104 @@ class IngestionPipeline:
         Raises:
             ValueError: If any timeframe data is missing or invalid
         """
+        steps = self._multi_timeframe_steps(symbol, timeframes, limit, current_price)
+        sources: Dict[str, str] = {}
+        try:
+            request = next(steps)
+            while True:
+                tf, n = request
+                try:
+                    if self.hedge is None:
+                        raw = self.adapter.fetch_ohlcv(symbol, tf, limit=n)
+                    else:
+                        raw, sources[tf] = self.hedge.fetch(
+                            lambda: self.adapter.fetch_ohlcv(symbol, tf, limit=n), symbol, tf, n
+                        )
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(raw)
+        except StopIteration as done:
+            return self._tag_sources(done.value, sources)
+
+    async def fetch_multi_timeframe_async(
+        self,
+        symbol: str,
+        timeframes: List[str],
+        limit: int = 500,
+        current_price: Optional[float] = None,
+    ) -> MultiTimeframeData:
+        """
+        fetch_multi_timeframe on the async adapter. Runs on the exchange-io
+        loop (see parallel_fetch_async).
+        """
+        steps = self._multi_timeframe_steps(symbol, timeframes, limit, current_price)
+        sources: Dict[str, str] = {}
+        try:
+            request = next(steps)
+            while True:
+                tf, n = request
+                try:
+                    if self.hedge is None:
+                        raw = await self._fetch_ohlcv_async(symbol, tf, n)
+                    else:
+                        raw, sources[tf] = await self.hedge.fetch_async(
+                            lambda: self._fetch_ohlcv_async(symbol, tf, n), symbol, tf, n
+                        )
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(raw)
+        except StopIteration as done:
+            return self._tag_sources(done.value, sources)
+
+    def _tag_sources(self, data: MultiTimeframeData, sources: Dict[str, str]) -> MultiTimeframeData:
+        """
+        With hedging on, record which exchange answered each request of this
+        call (timeframes served from cache or synthesis are not listed).
+        """
+        if self.hedge is not None:
+            data.metadata["ohlcv_sources"] = sources
+            data.metadata["hedged_timeframes"] = sorted(
+                tf for tf, source in sources.items() if source != self.hedge.primary_id
+            )
+        return data
+
+    async def _fetch_ohlcv_async(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        try:
+            return await self.async_adapter.fetch_ohlcv(symbol, timeframe, limit=limit)
+        except Exception as e:
+            # The sync adapter carries venue-specific fallbacks (e.g. Phemex direct REST)
+            logger.debug(f"Async fetch failed for {symbol} {timeframe} ({e}); using sync adapter")
+            return await asyncio.to_thread(self.adapter.fetch_ohlcv, symbol, timeframe, limit=limit)
+
+    def _multi_timeframe_steps(
+        self,
+        symbol: str,
+        timeframes: List[str],
+        limit: int,
+        current_price: Optional[float],
+    ) -> Generator[Tuple[str, int], pd.DataFrame, MultiTimeframeData]:
+        """
+        Cache / synthesis / validation logic of fetch_multi_timeframe, free of
+        I/O: yields (timeframe, limit) for each exchange fetch it needs and is
+        sent the raw DataFrame (or thrown the fetch error). Returns the result.
+        """
         logger.debug(f"Fetching multi-timeframe data for {symbol}: {timeframes}")
 
         tf_data = {}
         missing_timeframes = []
         cache_hits = 0
         cache_misses = 0
+        synthesized = 0
 
-        for tf in timeframes:
-            tf = tf.lower()
+        requested = list(dict.fromkeys(tf.lower() for tf in timeframes))
+        for tf in sorted(requested, key=timeframe_seconds):
             try:
                 df = None
+                # Read before get(): an expired entry is dropped there but is
+                # still a valid base to extend.
+                base = self._cache.peek(symbol, tf) if self.use_synthesis else None
 
                 # Try cache first (with optional price drift check)
                 if self.use_cache and self._cache:
@@ -124,9 +259,17 @@ class IngestionPipeline:
                         tf_data[tf] = df
                         continue
 
-                # Cache miss - fetch from exchange
                 cache_misses += 1
-                df = self.adapter.fetch_ohlcv(symbol, tf, limit=limit)
+                if base is not None:
+                    df = yield from self._synthesize(symbol, tf, base, tf_data)
+                    if df is not None:
+                        synthesized += 1
+                        tf_data[tf] = df
+                        self._cache.set(symbol, tf, df)
+                        continue
+
+                # Fetch from exchange
+                df = yield (tf, limit)
 
                 if df.empty:
                     logger.warning(f"No data returned for {symbol} {tf}")
@@ -140,6 +283,8 @@ class IngestionPipeline:
                 # Cache the validated data
                 if self.use_cache and self._cache:
                     self._cache.set(symbol, tf, validated_df)
+                    if self.use_synthesis:
+                        self._synth.mark_exchange(symbol, tf)
 
                 logger.debug(f"✓ Fetched {len(validated_df)} candles for {symbol} {tf}")
 
@@ -152,7 +297,8 @@ class IngestionPipeline:
         if total_requests > 0:
             hit_rate = cache_hits / total_requests * 100
             logger.debug(
-                f"{symbol}: cache {cache_hits}/{total_requests} ({hit_rate:.0f}% hit rate)"
+                f"{symbol}: cache {cache_hits}/{total_requests} ({hit_rate:.0f}% hit rate), "
+                f"{synthesized} synthesized"
             )
 
         # Check if we have complete data
@@ -165,8 +311,44 @@ class IngestionPipeline:
         if not tf_data:
             raise ValueError(f"No data fetched for {symbol} across any timeframe")
 
+        tf_data = {tf: tf_data[tf] for tf in requested if tf in tf_data}
         return MultiTimeframeData(symbol=symbol, timeframes=tf_data)
 
+    def _synthesize(
+        self, symbol: str, timeframe: str, base: pd.DataFrame, resolved: Dict[str, pd.DataFrame]
+    ) -> Generator[Tuple[str, int], pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Extend the expired cached `base` with candles aggregated from a lower
+        timeframe in `resolved`. None when no source covers the gap up to the
+        latest closed candle, or when due verification fails.
+        """
+        for source_tf in derivation_sources(timeframe, resolved):
+            df = extend(base, resolved[source_tf], source_tf, timeframe)
+            if df is None or not is_current(df, timeframe):
+                continue
+            if self._synth.due_for_verification(symbol, timeframe):
+                ok = yield from self._verify(symbol, timeframe, df)
+                if not ok:
+                    return None
+            self._synth.record_synthesized()
+            logger.debug(f"✓ Synthesized {symbol} {timeframe} from {source_tf}")
+            return df
+        return None
+
+    def _verify(
+        self, symbol: str, timeframe: str, synthetic: pd.DataFrame
+    ) -> Generator[Tuple[str, int], pd.DataFrame, bool]:
+        """Compare the newest synthesized candles with the exchange's."""
+        try:
+            raw = yield (timeframe, VERIFY_CANDLES)
+            exchange_df = self.normalize_and_validate(raw, symbol, timeframe)
+        except Exception as e:
+            logger.debug(f"Synthesis check for {symbol} {timeframe} skipped: {e}")
+            return True
+        ok, _ = matches(synthetic, exchange_df)
+        self._synth.record_verification(symbol, timeframe, ok)
+        return ok
+
     def parallel_fetch(
         self,
         symbols: List[str],
@@ -179,6 +361,10 @@ class IngestionPipeline:
         Fetch multi-timeframe data for multiple symbols in parallel.
         Uses caching to dramatically reduce API calls on subsequent scans.
 
+        With an async adapter this is a blocking wrapper around
+        parallel_fetch_async (max_workers is then ignored: concurrency is the
+        async adapter's).
+
         Args:
             symbols: List of trading pair symbols
             timeframes: List of timeframe strings
@@ -190,14 +376,12 @@ class IngestionPipeline:
             Dictionary mapping symbol to MultiTimeframeData
 
         """
-        # Log cache stats before fetch
-        if self.use_cache and self._cache:
-            stats_before = self._cache.get_stats()
-            logger.info(
-                f"Cache stats before fetch: {stats_before['entries']} entries, "
-                f"{stats_before['hit_rate_pct']}% hit rate"
+        if self.async_adapter is not None:
+            return run_sync(
+                self.parallel_fetch_async(symbols, timeframes, limit, current_prices=current_prices)
             )
 
+        self._log_cache_stats("before")
         logger.info(
             f"Starting parallel fetch for {len(symbols)} symbols "
             f"across {len(timeframes)} timeframes with {max_workers} workers"
@@ -206,8 +390,14 @@ class IngestionPipeline:
         results = {}
         failed_symbols = []
 
+        # Adapters with a shared request scheduler pace every call themselves;
+        # stretch the batch deadline by the time the budget needs for this batch
+        # instead of staggering submissions.
+        paced = isinstance(getattr(self.adapter, "scheduler", None), RequestScheduler)
+        batch_timeout = self._batch_timeout(len(symbols) * len(timeframes))
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit tasks with small stagger delay to avoid exchange rate limits
+            # Without a scheduler, stagger submissions to avoid exchange rate limits
             # Phemex returns error 30000 when concurrent requests hit too fast
             future_to_symbol = {}
             for i, symbol in enumerate(symbols):
@@ -222,14 +412,14 @@ class IngestionPipeline:
                 )
                 future_to_symbol[future] = symbol
                 # Small stagger (100ms) between submissions to avoid concurrent burst
-                if i < len(symbols) - 1:
+                if not paced and i < len(symbols) - 1:
                     time.sleep(0.1)
 
             # Collect results with timeout
             try:
                 # Use a total timeout for the entire batch to prevent indefinite hangs
                 # 45s should be enough for parallel fetching of 10-20 symbols
-                for future in as_completed(future_to_symbol, timeout=45):
+                for future in as_completed(future_to_symbol, timeout=batch_timeout):
                     symbol = future_to_symbol[future]
                     try:
                         data = future.result()
@@ -239,7 +429,9 @@ class IngestionPipeline:
                         logger.error(f"✗ Failed to fetch {symbol}: {e}")
                         failed_symbols.append(symbol)
             except TimeoutError:
-                logger.error("Parallel fetch timed out after 45s - some symbols may be missing")
+                logger.error(
+                    f"Parallel fetch timed out after {batch_timeout:.0f}s - some symbols may be missing"
+                )
                 # Cancel remaining futures
                 for f in future_to_symbol:
                     f.cancel()
@@ -249,23 +441,107 @@ class IngestionPipeline:
                         failed_symbols.append(s)
                         logger.warning(f"TIMEOUT: {s} fetch cancelled")
 
-        # Log cache stats after fetch
-        if self.use_cache and self._cache:
-            stats_after = self._cache.get_stats()
+        self._log_cache_stats("after")
+        self._log_fetch_summary(results, failed_symbols)
+        return results
+
+    async def parallel_fetch_async(
+        self,
+        symbols: List[str],
+        timeframes: List[str],
+        limit: int = 500,
+        current_prices: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, MultiTimeframeData]:
+        """
+        parallel_fetch without threads: one task per symbol on the
+        exchange-io loop, bounded by the async adapter's connection pool and
+        paced by the exchange's request scheduler. Awaitable from any loop.
+        """
+        if self.async_adapter is None:
+            raise RuntimeError("IngestionPipeline has no async adapter")
+        return await run_async(self._gather(symbols, timeframes, limit, current_prices))
+
+    async def _gather(
+        self,
+        symbols: List[str],
+        timeframes: List[str],
+        limit: int,
+        current_prices: Optional[Dict[str, float]],
+    ) -> Dict[str, MultiTimeframeData]:
+        self._log_cache_stats("before")
+        logger.info(
+            f"Starting async parallel fetch for {len(symbols)} symbols "
+            f"across {len(timeframes)} timeframes"
+        )
+        batch_timeout = self._batch_timeout(len(symbols) * len(timeframes))
+        tasks = {
+            asyncio.ensure_future(
+                self.fetch_multi_timeframe_async(
+                    symbol, timeframes, limit, current_prices.get(symbol) if current_prices else None
+                )
+            ): symbol
+            for symbol in symbols
+        }
+        results = {}
+        failed_symbols = []
+        done, pending = await asyncio.wait(tasks, timeout=batch_timeout) if tasks else (set(), set())
+        if pending:
+            logger.error(
+                f"Parallel fetch timed out after {batch_timeout:.0f}s - some symbols may be missing"
+            )
+        for task in pending:
+            task.cancel()
+            failed_symbols.append(tasks[task])
+            logger.warning(f"TIMEOUT: {tasks[task]} fetch cancelled")
+        for task in done:
+            symbol = tasks[task]
+            if task.exception() is not None:
+                logger.error(f"✗ Failed to fetch {symbol}: {task.exception()}")
+                failed_symbols.append(symbol)
+            else:
+                results[symbol] = task.result()
+                logger.debug(f"✓ Completed fetch for {symbol}")
+        # Keep the caller's symbol order
+        results = {s: results[s] for s in symbols if s in results}
+
+        self._log_cache_stats("after")
+        self._log_fetch_summary(results, failed_symbols)
+        return results
+
+    def _batch_timeout(self, n_requests: int) -> float:
+        """45 s, plus what the exchange's rate budget needs for this batch."""
+        scheduler = getattr(self.adapter, "scheduler", None)
+        if isinstance(scheduler, RequestScheduler):
+            return 45.0 + scheduler.estimate_seconds(n_requests)
+        return 45.0
+
+    def _log_cache_stats(self, when: str) -> None:
+        if not (self.use_cache and self._cache):
+            return
+        stats = self._cache.get_stats()
+        if when == "before":
             logger.info(
-                f"Cache stats after fetch: {stats_after['entries']} entries, "
-                f"{stats_after['hit_rate_pct']}% hit rate, "
-                f"{stats_after['total_candles_cached']} candles cached"
+                f"Cache stats before fetch: {stats['entries']} entries, "
+                f"{stats['hit_rate_pct']}% hit rate"
             )
+            return
+        logger.info(
+            f"Cache stats after fetch: {stats['entries']} entries, "
+            f"{stats['hit_rate_pct']}% hit rate, "
+            f"{stats['total_candles_cached']} candles cached"
+        )
+        if self.use_synthesis:
+            logger.info(f"Timeframe synthesis: {self._synth.stats()}")
 
+    def _log_fetch_summary(self, results: Dict[str, MultiTimeframeData], failed_symbols: List[str]) -> None:
         logger.info(
             f"Parallel fetch complete: {len(results)} succeeded, " f"{len(failed_symbols)} failed"
         )
 
         if failed_symbols:
             logger.warning(f"Failed symbols: {', '.join(failed_symbols)}")
-
-        return results
+        if self.hedge is not None:
+            logger.info(f"Hedged requests: {self.hedge.stats()}")
 
     def _to_pandas_freq(self, timeframe: str) -> Optional[str]:
         """Convert exchange timeframe to pandas frequency."""
@@ -546,6 +822,8 @@ class IngestionPipeline:
 
         stats = self._cache.get_stats()
         stats["enabled"] = True
+        if self.hedge is not None:
+            stats["hedge"] = self.hedge.stats()
         return stats
 
     def clear_cache(self) -> None:
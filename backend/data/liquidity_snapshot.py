@@ -0,0 +1,288 @@
+"""
+Liquidity Snapshot Service
+
+Cached, concurrently refreshed view of the per-symbol liquidity inputs the
+admission gates need (pair_selection.filter_illiquid_symbols /
+filter_by_book_quality / filter_by_min_order_risk /
+filter_by_liquidation_safety):
+
+  volumes     — 24h perp quote volume     (adapter.get_symbol_volumes)
+  books       — spread_bps / depth_usd    (adapter.get_book_quality)
+  min orders  — min order notional USDT   (adapter.get_min_order_specs)
+
+Phemex has no bulk order-book endpoint, so get_book_quality costs one REST
+call per symbol; run serially before every scan it added seconds before the
+OHLCV fetch started. Here:
+
+  - Book fetches for missing/stale symbols fan out over a small thread pool.
+    Adapters with a shared request scheduler are paced by it; otherwise
+    request starts are spaced by the adapter's ccxt `rateLimit` so the burst
+    stays inside the venue limit.
+  - Every value is cached per symbol with a short TTL (books 60 s, volumes
+    120 s, min-order specs 300 s).
+  - watch(symbols) registers the candidate universe; a daemon refresher
+    re-fetches entries before they expire, so at scan time the gates read
+    memory only.
+
+Failure semantics match the adapter methods: a per-symbol book failure is
+the inf-spread / 0-depth sentinel (never cached, retried next call), and a
+TOTAL volume / min-order fetch failure returns {} so the caller skips that
+gate for the scan.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from backend.data.adapters.request_scheduler import RequestScheduler
+
+BOOK_TTL_SECONDS = 60.0
+VOLUME_TTL_SECONDS = 120.0
+MIN_ORDER_TTL_SECONDS = 300.0
+
+# Fallback spacing between book requests when the adapter exposes no ccxt rateLimit.
+_DEFAULT_MIN_INTERVAL = 0.1
+
+
+class _TTLMap:
+    """Per-symbol {value, fetched_at} with a fixed TTL. Thread-safe."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._data: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_fresh(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """Return ({symbol: value} for entries younger than max_age, [missing/stale symbols])."""
+        limit = self.ttl if max_age is None else max_age
+        now = time.time()
+        hits: Dict[str, Any] = {}
+        misses: List[str] = []
+        with self._lock:
+            for s in symbols:
+                entry = self._data.get(s)
+                if entry is not None and now - entry[1] < limit:
+                    hits[s] = entry[0]
+                else:
+                    misses.append(s)
+        return hits, misses
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            for s, v in values.items():
+                self._data[s] = (v, now)
+
+    def due(self, symbols: Iterable[str], max_age: float) -> List[str]:
+        """Symbols that HAVE an entry older than max_age (never-requested ones are skipped)."""
+        now = time.time()
+        with self._lock:
+            return [s for s in symbols if s in self._data and now - self._data[s][1] >= max_age]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def _is_book_failure(quality: Dict[str, float]) -> bool:
+    return quality.get("spread_bps", float("inf")) == float("inf") or quality.get("depth_usd", 0.0) <= 0
+
+
+class LiquiditySnapshotService:
+    """
+    TTL cache + concurrent fetcher for the liquidity admission inputs of one adapter.
+
+    Args:
+        adapter: exchange adapter exposing get_symbol_volumes / get_book_quality /
+            get_min_order_specs (PhemexAdapter today)
+        band_bps: depth band passed to get_book_quality
+        max_workers: concurrent book fetches
+        refresh_ahead: background refresh re-fetches entries older than
+            (ttl - refresh_ahead) seconds
+    """
+
+    def __init__(
+        self,
+        adapter: Any,
+        *,
+        band_bps: float = 10.0,
+        max_workers: int = 4,
+        book_ttl: float = BOOK_TTL_SECONDS,
+        volume_ttl: float = VOLUME_TTL_SECONDS,
+        min_order_ttl: float = MIN_ORDER_TTL_SECONDS,
+        refresh_ahead: float = 15.0,
+    ) -> None:
+        self.adapter = adapter
+        self.band_bps = band_bps
+        self.max_workers = max(1, max_workers)
+        self.refresh_ahead = refresh_ahead
+        self._books = _TTLMap(book_ttl)
+        self._volumes = _TTLMap(volume_ttl)
+        self._min_orders = _TTLMap(min_order_ttl)
+
+        rate_limit_ms = getattr(getattr(adapter, "exchange", None), "rateLimit", None)
+        if isinstance(getattr(adapter, "scheduler", None), RequestScheduler):
+            self._min_interval = 0.0  # the exchange's shared scheduler paces every request
+        elif isinstance(rate_limit_ms, (int, float)) and rate_limit_ms > 0:
+            self._min_interval = float(rate_limit_ms) / 1000.0
+        else:
+            self._min_interval = _DEFAULT_MIN_INTERVAL
+        self._pace_lock = threading.Lock()
+        self._next_slot = 0.0
+
+        self._watched: List[str] = []
+        self._watch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"book_fetches": 0, "book_hits": 0, "refresh_cycles": 0, "refresh_errors": 0}
+
+    # ── reads (what the gates call) ───────────────────────────────────────────
+
+    def get_book_quality(self, symbols: List[str], band_bps: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Same contract as adapter.get_book_quality, served from cache where fresh."""
+        if band_bps is not None and band_bps != self.band_bps:
+            # Cached entries were measured at a different band; start over.
+            self.band_bps = band_bps
+            self._books.clear()
+        hits, misses = self._books.get_fresh(symbols)
+        self._count("book_hits", len(hits))
+        if misses:
+            hits.update(self._fetch_books(misses))
+        return {s: hits[s] for s in symbols if s in hits}
+
+    def get_symbol_volumes(self, symbols: List[str]) -> Dict[str, float]:
+        """Same contract as adapter.get_symbol_volumes ({} on total fetch failure)."""
+        return self._cached_bulk(self._volumes, symbols, self.adapter.get_symbol_volumes)
+
+    def get_min_order_specs(self, symbols: List[str]) -> Dict[str, "float | None"]:
+        """Same contract as adapter.get_min_order_specs ({} on total fetch failure)."""
+        return self._cached_bulk(self._min_orders, symbols, self.adapter.get_min_order_specs)
+
+    # ── background refresh ────────────────────────────────────────────────────
+
+    def watch(self, symbols: List[str]) -> None:
+        """Set the symbols the background refresher keeps warm and start it if needed."""
+        with self._watch_lock:
+            self._watched = list(dict.fromkeys(symbols))
+        if self._refresher is None or not self._refresher.is_alive():
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="liquidity-snapshot", daemon=True
+            )
+            self._refresher.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher (cached values stay readable)."""
+        self._stop.set()
+        t = self._refresher
+        if t is not None and t.is_alive() and t is not threading.current_thread():
+            t.join(timeout=5.0)
+        self._refresher = None
+
+    def refresh(self, symbols: Optional[List[str]] = None) -> None:
+        """
+        Re-fetch cached entries within `refresh_ahead` of expiry for `symbols`
+        (default: the watched set). Only inputs a gate has already asked for
+        are refreshed, so a disabled gate costs no background calls. Blocking.
+        """
+        if symbols is None:
+            with self._watch_lock:
+                symbols = list(self._watched)
+        if not symbols:
+            return
+        for ttl_map, fetch in (
+            (self._volumes, self.adapter.get_symbol_volumes),
+            (self._min_orders, self.adapter.get_min_order_specs),
+        ):
+            due = ttl_map.due(symbols, max(0.0, ttl_map.ttl - self.refresh_ahead))
+            if due:
+                fetched = fetch(due)
+                if fetched:
+                    ttl_map.put_many(fetched)
+        due = self._books.due(symbols, max(0.0, self._books.ttl - self.refresh_ahead))
+        if due:
+            self._fetch_books(due)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._watch_lock:
+            watched = len(self._watched)
+        with self._stats_lock:
+            counters = dict(self._stats)
+        return {
+            **counters,
+            "watched": watched,
+            "books_cached": len(self._books),
+            "volumes_cached": len(self._volumes),
+            "min_orders_cached": len(self._min_orders),
+        }
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _refresh_loop(self) -> None:
+        interval = max(1.0, min(self._books.ttl, self._volumes.ttl) - self.refresh_ahead) / 2.0
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self._count("refresh_cycles")
+            except Exception as e:
+                self._count("refresh_errors")
+                logger.warning("liquidity snapshot refresh failed: {}", e)
+            self._stop.wait(interval)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        # Incremented from the scan thread, the refresher and pool threads.
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _cached_bulk(
+        self, ttl_map: _TTLMap, symbols: List[str], fetch: Callable[[List[str]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        hits, misses = ttl_map.get_fresh(symbols)
+        if misses:
+            fetched = fetch(misses)
+            if not fetched:
+                # Total failure: propagate the adapter's {} so the caller skips the
+                # gate this scan, exactly as with a direct adapter call.
+                return {}
+            ttl_map.put_many(fetched)
+            hits.update(fetched)
+        return {s: hits[s] for s in symbols if s in hits}
+
+    def _pace(self) -> None:
+        """Block until this thread may start its request (spacing = adapter rateLimit)."""
+        # Sleep under the lock and space from the actual wake-up time: reserving
+        # slots up front lets an oversleeping thread start right before the next.
+        with self._pace_lock:
+            delay = self._next_slot - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_slot = time.monotonic() + self._min_interval
+
+    def _fetch_one_book(self, symbol: str) -> Dict[str, float]:
+        self._pace()
+        try:
+            result = self.adapter.get_book_quality([symbol], band_bps=self.band_bps)
+        except Exception as e:
+            logger.warning("liquidity snapshot: {} book fetch failed ({}); fail-safe DROP", symbol, e)
+            result = {}
+        return result.get(symbol) or {"spread_bps": float("inf"), "depth_usd": 0.0}
+
+    def _fetch_books(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        self._count("book_fetches", len(symbols))
+        if len(symbols) == 1 or self.max_workers == 1:
+            results = {s: self._fetch_one_book(s) for s in symbols}
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(symbols)), thread_name_prefix="book-quality"
+            ) as pool:
+                results = dict(zip(symbols, pool.map(self._fetch_one_book, symbols)))
+        self._books.put_many({s: q for s, q in results.items() if not _is_book_failure(q)})
+        return results
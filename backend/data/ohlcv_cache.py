@@ -304,6 +304,17 @@ class OHLCVCache:
             )
             return entry.df.copy()  # Return copy to prevent mutation
 
+    def peek(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame even if expired, without touching hit/miss
+        counters. Used as the base for extending a timeframe locally.
+
+        Not a copy — callers must not mutate it.
+        """
+        with self._lock:
+            entry = self._cache.get(self._make_key(symbol, timeframe))
+            return entry.df if entry is not None else None
+
     def set(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
         """
         Cache OHLCV data.
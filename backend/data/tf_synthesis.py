@@ -0,0 +1,230 @@
+"""
+Derived-timeframe synthesis.
+
+A higher-timeframe candle is an exact aggregate of the lower-timeframe
+candles inside it (first open, max high, min low, last close, summed
+volume). Once an exchange-fetched HTF frame is in the OHLCV cache, new
+HTF candles can be built locally from a fresher LTF series instead of
+re-downloading the whole HTF history every time the newest candle closes:
+
+  - bootstrap: the first fetch of a (symbol, timeframe) comes from the
+    exchange and fixes the bucket alignment (e.g. the weekly anchor day)
+  - extend: when that entry expires, complete buckets past its last
+    candle are aggregated from an LTF series resolved in the same pass
+    (coarsest divisor first: fewest rows, longest history) and appended,
+    keeping the window length
+  - verify: every VERIFY_INTERVAL_S a (symbol, timeframe) that is being
+    synthesized is checked against a few exchange candles; a mismatch
+    drops the synthetic frame and falls back to a full exchange fetch
+
+Only gaps the LTF series fully covers are synthesized; anything else
+(cold cache, LTF history too short, partial buckets) goes to the exchange.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from backend.data.ohlcv_cache import TIMEFRAME_SECONDS
+
+VERIFY_INTERVAL_S = 6 * 3600.0
+VERIFY_CANDLES = 5           # exchange candles compared per verification
+PRICE_RTOL = 1e-6
+VOLUME_RTOL = 1e-3           # exchanges round per-candle volumes independently
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    return TIMEFRAME_SECONDS.get(timeframe, 0)
+
+
+def derivation_sources(timeframe: str, available: Iterable[str]) -> list:
+    """Timeframes in `available` that tile `timeframe` exactly, coarsest first."""
+    target = timeframe_seconds(timeframe)
+    if not target or timeframe == "1M":
+        return []
+    sources = [
+        tf for tf in available
+        if tf != "1M" and 0 < timeframe_seconds(tf) < target and target % timeframe_seconds(tf) == 0
+    ]
+    return sorted(sources, key=timeframe_seconds, reverse=True)
+
+
+def _timestamps_ns(df: pd.DataFrame) -> np.ndarray:
+    return pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8
+
+
+def aggregate(
+    df: pd.DataFrame,
+    source_tf: str,
+    target_tf: str,
+    anchor_ns: int = 0,
+    after_ns: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Aggregate a validated `source_tf` frame into complete `target_tf` candles.
+
+    Buckets start at anchor_ns + k * period; only buckets holding every
+    source candle are returned, and only those opening after `after_ns`.
+    The result has the validated-frame layout (timestamp column + index).
+    """
+    src_ns = timeframe_seconds(source_tf) * 1_000_000_000
+    period_ns = timeframe_seconds(target_tf) * 1_000_000_000
+    per_bucket = period_ns // src_ns
+    ts = _timestamps_ns(df)
+    if after_ns is not None:
+        keep = ts >= after_ns + period_ns
+        df, ts = df[keep], ts[keep]
+    if len(ts) < per_bucket:
+        return _frame(df, np.empty(0, dtype="int64"), *([np.empty(0)] * 5))
+
+    buckets = (ts - anchor_ns) // period_ns * period_ns + anchor_ns
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(ts)])
+    # Complete = every source slot present and contiguous (the validated
+    # frame is gap-filled, so a short bucket is a leading/trailing partial).
+    spans = ts[np.minimum(starts + counts - 1, len(ts) - 1)] - ts[starts]
+    complete = (counts == per_bucket) & (spans == period_ns - src_ns) & (ts[starts] == buckets[starts])
+
+    o = df["open"].to_numpy(dtype="float64")
+    h = df["high"].to_numpy(dtype="float64")
+    lo = df["low"].to_numpy(dtype="float64")
+    c = df["close"].to_numpy(dtype="float64")
+    v = df["volume"].to_numpy(dtype="float64")
+    sel = starts[complete]
+    last = sel + per_bucket - 1
+    return _frame(
+        df,
+        buckets[sel],
+        o[sel],
+        np.maximum.reduceat(h, starts)[complete],
+        np.minimum.reduceat(lo, starts)[complete],
+        c[last],
+        np.add.reduceat(v, starts)[complete],
+    )
+
+
+def _frame(like: pd.DataFrame, ts_ns, o, h, lo, c, v) -> pd.DataFrame:
+    stamps = pd.to_datetime(ts_ns, unit="ns", utc=True)
+    tz = pd.DatetimeIndex(like["timestamp"]).tz if len(like) else None
+    stamps = stamps.tz_convert(tz) if tz is not None else stamps.tz_localize(None)
+    out = pd.DataFrame(
+        {"timestamp": stamps, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+    )
+    out = out.set_index("timestamp", drop=False)
+    out.index.name = None
+    return out
+
+
+def extend(
+    base: pd.DataFrame,
+    source: pd.DataFrame,
+    source_tf: str,
+    target_tf: str,
+) -> Optional[pd.DataFrame]:
+    """
+    Append the complete `target_tf` candles after `base` built from `source`.
+
+    Returns None unless the first synthesized candle directly follows the
+    last base candle (no gap). The window keeps len(base) rows.
+    """
+    if base is None or base.empty or source is None or source.empty:
+        return None
+    period_ns = timeframe_seconds(target_tf) * 1_000_000_000
+    last_ns = int(_timestamps_ns(base)[-1])
+    new = aggregate(source, source_tf, target_tf, anchor_ns=last_ns % period_ns, after_ns=last_ns)
+    if new.empty or int(_timestamps_ns(new)[0]) != last_ns + period_ns:
+        return None
+    new_ns = _timestamps_ns(new)
+    if np.any(np.diff(new_ns) != period_ns):
+        return None
+    combined = pd.concat([base[OHLCV_COLUMNS], new], ignore_index=False)
+    return combined.iloc[-len(base):]
+
+
+def is_current(df: pd.DataFrame, timeframe: str, now: Optional[float] = None) -> bool:
+    """True when `df` would not already be expired in the OHLCV cache."""
+    if df is None or df.empty:
+        return False
+    period = timeframe_seconds(timeframe)
+    latest_open = _timestamps_ns(df)[-1] / 1e9
+    return (time.time() if now is None else now) < latest_open + 2 * period
+
+
+def matches(synthetic: pd.DataFrame, exchange: pd.DataFrame) -> Tuple[bool, int]:
+    """Compare overlapping candles. Returns (all equal within tolerance, overlap count)."""
+    a = synthetic.set_index(_timestamps_ns(synthetic))
+    b = exchange.set_index(_timestamps_ns(exchange))
+    common = a.index.intersection(b.index)
+    if len(common) == 0:
+        return True, 0
+    a, b = a.loc[common], b.loc[common]
+    prices_ok = all(
+        np.allclose(a[col].to_numpy(dtype="float64"), b[col].to_numpy(dtype="float64"), rtol=PRICE_RTOL)
+        for col in ("open", "high", "low", "close")
+    )
+    volume_ok = np.allclose(
+        a["volume"].to_numpy(dtype="float64"), b["volume"].to_numpy(dtype="float64"),
+        rtol=VOLUME_RTOL, atol=1e-9,
+    )
+    return bool(prices_ok and volume_ok), len(common)
+
+
+class TimeframeSynthesizer:
+    """Verification schedule and counters for synthesized timeframes."""
+
+    def __init__(self, verify_interval_s: float = VERIFY_INTERVAL_S) -> None:
+        self.verify_interval_s = verify_interval_s
+        self._verified_at: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._stats = {"synthesized": 0, "bootstrapped": 0, "verified": 0, "mismatches": 0}
+
+    def mark_exchange(self, symbol: str, timeframe: str) -> None:
+        """An exchange frame was cached: it is the verified baseline."""
+        with self._lock:
+            self._verified_at[(symbol, timeframe)] = time.time()
+            self._stats["bootstrapped"] += 1
+
+    def due_for_verification(self, symbol: str, timeframe: str) -> bool:
+        with self._lock:
+            last = self._verified_at.get((symbol, timeframe), 0.0)
+        return time.time() - last >= self.verify_interval_s
+
+    def record_synthesized(self) -> None:
+        with self._lock:
+            self._stats["synthesized"] += 1
+
+    def record_verification(self, symbol: str, timeframe: str, ok: bool) -> None:
+        with self._lock:
+            self._stats["verified"] += 1
+            if ok:
+                self._verified_at[(symbol, timeframe)] = time.time()
+            else:
+                self._stats["mismatches"] += 1
+                self._verified_at.pop((symbol, timeframe), None)
+        if not ok:
+            logger.warning(
+                f"Synthesized {symbol} {timeframe} disagrees with exchange candles — refetching"
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_global_synthesizer: Optional[TimeframeSynthesizer] = None
+_synthesizer_lock = threading.Lock()
+
+
+def get_timeframe_synthesizer() -> TimeframeSynthesizer:
+    """Process-wide synthesizer (shares the global OHLCV cache's lifetime)."""
+    global _global_synthesizer
+    with _synthesizer_lock:
+        if _global_synthesizer is None:
+            _global_synthesizer = TimeframeSynthesizer()
+        return _global_synthesizer
@@ -0,0 +1,401 @@
+"""
+Deterministic market simulator behind the mock exchange (mock_exchange.py).
+
+Every symbol follows a seeded walk at one-minute resolution:
+
+  - daily log closes are a mean-reverting walk from EPOCH with drift and
+    volatility regimes, generated in fixed blocks of days so extending the
+    history never changes what was already generated
+  - each day's minute path is a Brownian bridge between two consecutive
+    daily closes, generated CHUNK_DAYS days at a time
+
+So any time range is generated on demand, identically on every run, and
+every timeframe is the aggregate of the same minute candles (a 4h candle
+is exactly its four 1h candles), as on a real exchange. The forming minute
+is interpolated by the clock, so the last price moves every second.
+
+Order book and public trades are derived from the price at the current
+second and are deterministic for a given clock.
+"""
+
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EPOCH = 1514764800  # 2018-01-01 00:00 UTC — no candles before the first full day
+MINUTE_S = 60
+DAY_S = 86_400
+MINUTES_PER_DAY = DAY_S // MINUTE_S
+WEEK_ANCHOR_S = 4 * DAY_S  # 1970-01-05 00:00 UTC, a Monday
+BLOCK_DAYS = 256  # daily closes are generated this many days at a time
+REGIME_DAYS = 32
+MEAN_REVERSION = 0.995  # AR(1) coefficient of the daily log deviation from the reference price
+CHUNK_DAYS = 8  # minute paths are generated (and cached) this many days at a time
+MINUTE_CACHE_CHUNKS = 256
+
+# (base, reference price, 24h quote volume in USDT)
+DEFAULT_MARKETS: Sequence[Tuple[str, float, float]] = (
+    ("BTC", 65000.0, 2.5e9),
+    ("ETH", 3200.0, 1.2e9),
+    ("SOL", 150.0, 4.0e8),
+    ("XRP", 0.55, 2.5e8),
+    ("BNB", 580.0, 1.0e8),
+    ("DOGE", 0.15, 2.0e8),
+    ("ADA", 0.45, 6.0e7),
+    ("AVAX", 30.0, 5.0e7),
+    ("SUI", 1.2, 6.0e7),
+    ("TON", 5.5, 2.0e7),
+    ("NEAR", 5.0, 3.0e7),
+    ("APT", 8.0, 2.0e7),
+    ("ARB", 0.8, 2.5e7),
+    ("OP", 1.8, 2.0e7),
+    ("INJ", 22.0, 1.5e7),
+    ("SEI", 0.4, 1.2e7),
+    ("JUP", 0.9, 1.0e7),
+    ("LINK", 15.0, 4.0e7),
+    ("DOT", 6.5, 2.5e7),
+    ("ATOM", 7.0, 1.2e7),
+    ("TIA", 6.0, 1.5e7),
+    ("LTC", 80.0, 3.0e7),
+    ("WIF", 2.0, 4.0e7),
+    ("SHIB", 0.00002, 3.0e7),
+    ("PEPE", 0.00001, 8.0e7),
+    ("BONK", 0.00002, 2.0e7),
+    ("FLOKI", 0.00015, 1.0e7),
+)
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """Static parameters of one simulated market."""
+
+    base: str
+    ref_price: float
+    quote_volume: float  # typical 24h turnover, USDT
+    daily_vol: float  # stdev of daily log returns
+    tick_size: float
+    qty_step: float
+    key: int  # per-symbol seed component
+
+    @property
+    def price_decimals(self) -> int:
+        return max(0, -int(math.floor(math.log10(self.tick_size))))
+
+    @property
+    def qty_decimals(self) -> int:
+        return max(0, -int(math.floor(math.log10(self.qty_step))))
+
+
+def make_spec(base: str, ref_price: float, quote_volume: float) -> SymbolSpec:
+    key = zlib.crc32(base.encode())
+    magnitude = math.floor(math.log10(ref_price))
+    return SymbolSpec(
+        base=base,
+        ref_price=ref_price,
+        quote_volume=quote_volume,
+        daily_vol=0.02 + (key % 400) / 10_000,  # 2% .. 6%
+        tick_size=10.0 ** (magnitude - 4),  # five significant digits
+        qty_step=10.0 ** math.floor(math.log10(50.0 / ref_price)),  # one step ~ $5-50
+        key=key,
+    )
+
+
+class MarketSimulator:
+    """
+    Seeded markets for a set of base assets quoted in USDT.
+
+    Args:
+        markets: (base, reference price, 24h quote volume) per symbol
+        extra_symbols: add this many synthetic symbols (SYN001...) for load tests
+        seed: run seed — the same seed and clock give the same market
+        clock: wall clock in epoch seconds (time.time); tests pass a fixed one
+    """
+
+    def __init__(
+        self,
+        markets: Optional[Sequence[Tuple[str, float, float]]] = None,
+        extra_symbols: int = 0,
+        seed: int = 7,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.seed = int(seed)
+        self.clock = clock
+        rows = list(markets or DEFAULT_MARKETS)
+        rng = np.random.default_rng([self.seed, 0x5EED])
+        for i in range(extra_symbols):
+            rows.append((f"SYN{i + 1:03d}", float(10.0 ** rng.uniform(-3, 3)), float(10.0 ** rng.uniform(6.5, 8.5))))
+        self.specs: Dict[str, SymbolSpec] = {base: make_spec(base, float(p), float(v)) for base, p, v in rows}
+        self._lock = threading.Lock()
+        self._log_closes: Dict[str, np.ndarray] = {}
+        self._minutes: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        self._days: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @property
+    def bases(self) -> List[str]:
+        return list(self.specs)
+
+    def now(self) -> float:
+        return float(self.clock())
+
+    # ── generation ────────────────────────────────────────────────────────────
+
+    def _daily_log_closes(self, base: str, day: int) -> np.ndarray:
+        """Log close of every day 0..`day` (day 0 = EPOCH), extended block-wise."""
+        closes = self._log_closes.get(base)
+        if closes is not None and len(closes) > day:
+            return closes
+        spec = self.specs[base]
+        log_ref = math.log(spec.ref_price)
+        have = 0 if closes is None else len(closes)
+        dev = 0.0 if closes is None else float(closes[-1]) - log_ref
+        blocks = [closes] if closes is not None else []
+        while have <= day:
+            block = have // BLOCK_DAYS
+            rng = np.random.default_rng([self.seed, spec.key, block])
+            n_regimes = BLOCK_DAYS // REGIME_DAYS
+            drift = np.repeat(rng.normal(0.0, 0.15 * spec.daily_vol, n_regimes), REGIME_DAYS)
+            vol = np.repeat(np.exp(rng.normal(0.0, 0.35, n_regimes)), REGIME_DAYS) * spec.daily_vol
+            eps = drift + rng.normal(0.0, 1.0, BLOCK_DAYS) * vol
+            out = np.empty(BLOCK_DAYS)
+            for i in range(BLOCK_DAYS):
+                dev = MEAN_REVERSION * dev + eps[i]
+                out[i] = log_ref + dev
+            blocks.append(out)
+            have += BLOCK_DAYS
+        closes = np.concatenate(blocks)
+        self._log_closes[base] = closes
+        return closes
+
+    def _chunk_minutes(self, base: str, chunk: int) -> np.ndarray:
+        """(CHUNK_DAYS * 1440, 5) open/high/low/close/volume minutes of one chunk of days."""
+        cache_key = (base, chunk)
+        with self._lock:
+            cached = self._minutes.get(cache_key)
+            if cached is not None:
+                self._minutes.move_to_end(cache_key)
+                return cached
+            first = chunk * CHUNK_DAYS
+            closes = self._daily_log_closes(base, first + CHUNK_DAYS - 1)
+        spec = self.specs[base]
+        log_prev = math.log(spec.ref_price) if first == 0 else float(closes[first - 1])
+        lo = np.r_[log_prev, closes[first : first + CHUNK_DAYS - 1]][:, None]
+        lc = closes[first : first + CHUNK_DAYS][:, None]
+        shape = (CHUNK_DAYS, MINUTES_PER_DAY)
+        rng = np.random.default_rng([self.seed, spec.key, chunk, 1])
+        sigma = spec.daily_vol / math.sqrt(MINUTES_PER_DAY)
+        steps = rng.standard_normal(shape, dtype=np.float32) * sigma
+        path = np.cumsum(steps, axis=1, dtype=np.float64)
+        path += np.linspace(1.0 / MINUTES_PER_DAY, 1.0, MINUTES_PER_DAY) * ((lc - lo) - path[:, -1:])
+        close = np.exp(lo + path).ravel()
+        open_ = np.r_[math.exp(log_prev), close[:-1]]
+        wicks = np.abs(rng.standard_normal((2, close.size), dtype=np.float32)) * (0.6 * sigma)
+        high = np.maximum(open_, close) * np.exp(wicks[0])
+        low = np.minimum(open_, close) * np.exp(-wicks[1])
+        tick = spec.tick_size
+        ohlc = np.round(np.vstack([open_, high, low, close]) / tick) * tick
+        activity = np.exp(0.5 * rng.standard_normal(close.size, dtype=np.float32)) * (0.5 + np.abs(steps.ravel()) / sigma)
+        volume = spec.quote_volume / MINUTES_PER_DAY / spec.ref_price * activity.astype(np.float64) / 1.3
+        volume = np.round(volume / spec.qty_step) * spec.qty_step
+        out = np.column_stack([ohlc.T, volume])
+        out.setflags(write=False)
+        with self._lock:
+            self._minutes[cache_key] = out
+            if len(self._minutes) > MINUTE_CACHE_CHUNKS:
+                self._minutes.popitem(last=False)
+        return out
+
+    def _day_minutes(self, base: str, day: int) -> np.ndarray:
+        """(1440, 5) minutes of one day."""
+        i = day % CHUNK_DAYS * MINUTES_PER_DAY
+        return self._chunk_minutes(base, day // CHUNK_DAYS)[i : i + MINUTES_PER_DAY]
+
+    def _day_summaries(self, base: str, first: int, last: int) -> np.ndarray:
+        """(n, 5) OHLCV of the full days first..last-1."""
+        out = []
+        for chunk in range(first // CHUNK_DAYS, (last - 1) // CHUNK_DAYS + 1):
+            days = self._days.get((base, chunk))
+            if days is None:
+                m = self._chunk_minutes(base, chunk).reshape(CHUNK_DAYS, MINUTES_PER_DAY, 5)
+                days = np.column_stack(
+                    [m[:, 0, 0], m[:, :, 1].max(axis=1), m[:, :, 2].min(axis=1), m[:, -1, 3], m[:, :, 4].sum(axis=1)]
+                )
+                self._days[(base, chunk)] = days
+            lo = max(first - chunk * CHUNK_DAYS, 0)
+            hi = min(last - chunk * CHUNK_DAYS, CHUNK_DAYS)
+            out.append(days[lo:hi])
+        return np.vstack(out) if out else np.empty((0, 5))
+
+    def minutes(self, base: str, start_s: float, end_s: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Minute candles opening in [start_s, end_s] (epoch seconds, end
+        defaults to now) as (open times, (n, 5) ohlcv). The minute forming
+        now is cut at the current second.
+        """
+        now = self.now()
+        end = now if end_s is None else min(float(end_s), now)
+        first = max(int(start_s) // MINUTE_S, (EPOCH + DAY_S) // MINUTE_S)
+        last = int(end) // MINUTE_S
+        if last < first:
+            return np.empty(0, dtype=np.int64), np.empty((0, 5))
+        d0 = (first * MINUTE_S - EPOCH) // DAY_S
+        d1 = (last * MINUTE_S - EPOCH) // DAY_S
+        block = np.vstack([self._day_minutes(base, d) for d in range(d0, d1 + 1)])
+        offset = (EPOCH + d0 * DAY_S) // MINUTE_S
+        rows = np.array(block[first - offset : last - offset + 1])
+        if last == int(now) // MINUTE_S:
+            rows[-1] = _forming(rows[-1], (now % MINUTE_S) / MINUTE_S, self.specs[base])
+        return np.arange(first, last + 1, dtype=np.int64) * MINUTE_S, rows
+
+    # ── market data ───────────────────────────────────────────────────────────
+
+    def candles(
+        self,
+        base: str,
+        tf_s: int,
+        limit: int,
+        start_s: Optional[float] = None,
+        end_s: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Up to `limit` candles of `tf_s` seconds as (open times, (n, 5) ohlcv),
+        oldest first, ending with the candle forming at `end_s` (default now).
+        With `start_s`, the candles start at the one containing it.
+        Timeframes must divide a day, or be a whole number of days (weeks
+        open on Monday).
+        """
+        if tf_s < MINUTE_S or (tf_s < DAY_S and DAY_S % tf_s) or (tf_s >= DAY_S and tf_s % DAY_S):
+            raise ValueError(f"unsupported timeframe: {tf_s}s")
+        now = self.now()
+        end = now if end_s is None else min(float(end_s), now)
+        anchor = WEEK_ANCHOR_S if tf_s % (7 * DAY_S) == 0 else 0
+        last_open = (int(end) - anchor) // tf_s * tf_s + anchor
+        if start_s is None:
+            first_open = last_open - (limit - 1) * tf_s
+        else:
+            first_open = (int(start_s) - anchor) // tf_s * tf_s + anchor
+            last_open = min(last_open, first_open + (limit - 1) * tf_s)
+            end = min(end, last_open + tf_s - 1)
+        if tf_s < DAY_S:
+            ts, rows = self.minutes(base, first_open, end)
+        else:
+            ts, rows = self._days_between(base, first_open, end)
+        if not len(ts):
+            return ts, rows
+        bucket = (ts - anchor) // tf_s * tf_s + anchor
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        return bucket[starts], _reduce_at(rows, starts)
+
+    def _days_between(self, base: str, start_s: int, end_s: float) -> Tuple[np.ndarray, np.ndarray]:
+        first = max(1, (start_s - EPOCH) // DAY_S)
+        last = int(end_s - EPOCH) // DAY_S
+        if last < first:
+            return np.empty(0, dtype=np.int64), np.empty((0, 5))
+        _, today = self.minutes(base, EPOCH + last * DAY_S, end_s)
+        rows = np.vstack([self._day_summaries(base, first, last), _reduce(today)])
+        return EPOCH + np.arange(first, last + 1, dtype=np.int64) * DAY_S, rows
+
+    def last_price(self, base: str) -> float:
+        _, rows = self.minutes(base, self.now())
+        return float(rows[-1, 3])
+
+    def ticker(self, base: str) -> Dict[str, float]:
+        """Rolling 24h statistics, best bid/ask and mark/index/funding."""
+        now = self.now()
+        ts, rows = self.minutes(base, now - DAY_S + MINUTE_S, now)
+        spec = self.specs[base]
+        last = float(rows[-1, 3])
+        bid, ask = self._touch(spec, last)
+        turnover = float(np.dot(rows[:, 3], rows[:, 4]))
+        funding = round(((spec.key + int(now) // 28_800) % 21 - 5) * 1e-5, 8)
+        return {
+            "timestamp": now,
+            "open": float(rows[0, 0]),
+            "high": float(rows[:, 1].max()),
+            "low": float(rows[:, 2].min()),
+            "last": last,
+            "bid": bid,
+            "ask": ask,
+            "mark": last,
+            "index": last,
+            "volume": float(rows[:, 4].sum()),
+            "turnover": turnover,
+            "open_interest": round(spec.quote_volume / last / 4.0, spec.qty_decimals),
+            "funding_rate": funding,
+        }
+
+    @staticmethod
+    def _touch(spec: SymbolSpec, price: float) -> Tuple[float, float]:
+        """Best bid/ask around `price`: about two basis points wide, at least one tick."""
+        half = max(1, round(price * 1e-4 / spec.tick_size)) * spec.tick_size
+        return _round(price - half, spec.tick_size), _round(price + half, spec.tick_size)
+
+    def order_book(self, base: str, depth: int = 30) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """(bids, asks) of `depth` levels each, best first."""
+        spec = self.specs[base]
+        price = self.last_price(base)
+        bid, ask = self._touch(spec, price)
+        step = max(1, round(price * 5e-5 / spec.tick_size)) * spec.tick_size
+        rng = np.random.default_rng([self.seed, spec.key, int(self.now()), 2])
+        level_qty = spec.quote_volume * 2e-5 / price  # ~0.2 bp of daily turnover per level
+        sizes = np.round(rng.exponential(level_qty, (2, depth)) / spec.qty_step + 1) * spec.qty_step
+        levels = np.arange(depth) * step
+        bids = [(_round(bid - d, spec.tick_size), float(q)) for d, q in zip(levels, sizes[0])]
+        asks = [(_round(ask + d, spec.tick_size), float(q)) for d, q in zip(levels, sizes[1])]
+        return [b for b in bids if b[0] > 0], asks
+
+    def trades(self, base: str, limit: int = 100) -> List[Tuple[int, str, float, float]]:
+        """Recent public trades as (timestamp ns, 'Buy'|'Sell', price, qty), oldest first."""
+        spec = self.specs[base]
+        now = self.now()
+        ts, rows = self.minutes(base, now - 2 * MINUTE_S, now)
+        per_second = spec.quote_volume / DAY_S / (spec.ref_price * spec.qty_step * 20)
+        out: List[Tuple[int, str, float, float]] = []
+        second = int(now)
+        while len(out) < limit and second > now - 120:
+            rng = np.random.default_rng([self.seed, spec.key, second, 3])
+            n = int(rng.poisson(min(per_second, 5.0)))
+            if n:
+                i = int(np.searchsorted(ts, second, side="right")) - 1
+                o, c = rows[max(i, 0), 0], rows[max(i, 0), 3]
+                frac = np.sort(rng.uniform(0.0, 1.0, n))
+                prices = o + (c - o) * ((second % MINUTE_S) + frac) / MINUTE_S
+                qty = np.maximum(1, np.round(rng.exponential(20.0, n))) * spec.qty_step
+                sides = np.where(rng.uniform(size=n) < 0.5, "Buy", "Sell")
+                for f, p, q, s in zip(frac[::-1], prices[::-1], qty[::-1], sides[::-1]):
+                    ns = int((second + f) * 1e9)
+                    if ns <= now * 1e9:
+                        out.append((ns, str(s), _round(float(p), spec.tick_size), float(q)))
+            second -= 1
+        return out[:limit][::-1]
+
+
+def _round(x: float, step: float) -> float:
+    return round(round(x / step) * step, 12)
+
+
+def _reduce(rows: np.ndarray) -> np.ndarray:
+    return np.array([rows[0, 0], rows[:, 1].max(), rows[:, 2].min(), rows[-1, 3], rows[:, 4].sum()])
+
+
+def _reduce_at(rows: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    out = np.empty((len(starts), 5))
+    ends = np.r_[starts[1:], len(rows)] - 1
+    out[:, 0] = rows[starts, 0]
+    out[:, 1] = np.maximum.reduceat(rows[:, 1], starts)
+    out[:, 2] = np.minimum.reduceat(rows[:, 2], starts)
+    out[:, 3] = rows[ends, 3]
+    out[:, 4] = np.add.reduceat(rows[:, 4], starts)
+    return out
+
+
+def _forming(row: np.ndarray, frac: float, spec: SymbolSpec) -> np.ndarray:
+    """The minute candle `frac` of the way through: close moves linearly from the open."""
+    o, _, _, c, v = row
+    price = _round(o + (c - o) * frac, spec.tick_size)
+    return np.array([o, max(o, price), min(o, price), price, round(v * frac / spec.qty_step) * spec.qty_step])
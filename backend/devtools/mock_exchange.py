@@ -0,0 +1,1219 @@
+"""
+Local mock Phemex exchange for offline load and latency testing.
+
+An aiohttp server speaking the Phemex wire format for everything the
+adapters use through ccxt — products, klines, tickers, order book and
+trades for USDT perpetuals and spot, and the USDT-perpetual account API
+(orders, positions, balance, fills, leverage) — plus the private
+WebSocket (user.auth / aop_p.subscribe) that PhemexWebSocketClient connects
+to. Account pushes use the USDT-perpetual frame format (accounts_p /
+orders_p / positions_p, type snapshot or incremental).
+Market data comes from the deterministic MarketSimulator (market_sim.py);
+orders fill against its prices on a background tick.
+
+FaultConfig injects the failure modes a real exchange has: a lognormal
+latency distribution, random 5xx, a server-side request budget answered
+with Phemex 429s, partial fills and scheduled outages (503 + WS drop).
+
+Point the bot at it with one variable (PhemexAdapter, the async layer and
+PhemexWebSocketClient all honour it):
+
+    python -m backend.devtools.mock_exchange --port 8765 --latency-ms 40 --latency-p99-ms 250
+    export SS_PHEMEX_BASE_URL=http://127.0.0.1:8765
+    export PHEMEX_API_KEY=mock-key PHEMEX_API_SECRET=mock-secret
+
+or in-process: ``with MockExchangeServer() as mock: PhemexAdapter(**mock.adapter_kwargs())``.
+GET /_mock/stats reports per-endpoint counts and server-side p50/p99.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from aiohttp import WSMsgType, web
+from loguru import logger
+
+from backend.devtools.market_sim import MarketSimulator, SymbolSpec
+
+DEFAULT_API_KEY = "mock-key"
+DEFAULT_API_SECRET = "mock-secret"
+QUOTE = "USDT"
+EV_SCALE = 8  # valueScale of every currency, and priceScale of spot markets
+FALLBACK_PRICE_SCALE = 4  # Ep scale of the legacy /exchange/public/md/kline rows
+TAKER_FEE = 0.0006
+MAKER_FEE = 0.0001
+MAINT_MARGIN = 0.005
+DEFAULT_LEVERAGE = 10.0
+MAX_KLINE_ROWS = 1000
+RESOLUTIONS = (60, 180, 300, 900, 1800, 3600, 7200, 10800, 14400, 21600, 43200, 86400, 604800)
+TRIGGERED_TYPES = {"Stop": "Market", "MarketIfTouched": "Market", "StopLimit": "Limit", "LimitIfTouched": "Limit"}
+OPEN_STATUSES = ("New", "PartiallyFilled", "Untriggered")
+LATENCY_WINDOW = 5000  # served requests kept per endpoint for the percentile stats
+
+
+@dataclass
+class FaultConfig:
+    """
+    Failure injection. Everything defaults to off.
+
+    Args:
+        latency_ms: median injected latency per request
+        latency_p99_ms: 99th percentile; above the median the latency is
+            lognormal with this tail, otherwise constant
+        error_rate: fraction of requests answered with a random 5xx
+        rate_limit_per_min: server request budget per minute (token bucket),
+            over it requests get Phemex's 429 / code 39995; 0 = unlimited
+        rate_limit_error_rate: fraction answered 429 regardless of budget
+        partial_fill_rate: chance that a fill takes only part of the order
+        outages: (start, duration) seconds after server start during which
+            REST answers 503 and WebSockets are dropped
+        seed: seed of the fault draws
+    """
+
+    latency_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_per_min: int = 0
+    rate_limit_error_rate: float = 0.0
+    partial_fill_rate: float = 0.0
+    outages: List[Tuple[float, float]] = field(default_factory=list)
+    seed: int = 11
+
+    def latency_s(self, rng: random.Random) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_p99_ms <= self.latency_ms:
+            return self.latency_ms / 1000.0
+        sigma = math.log(self.latency_p99_ms / self.latency_ms) / 2.3263  # z of the 99th percentile
+        return self.latency_ms * math.exp(sigma * rng.gauss(0.0, 1.0)) / 1000.0
+
+    def in_outage(self, elapsed_s: float) -> bool:
+        return any(start <= elapsed_s < start + duration for start, duration in self.outages)
+
+
+class MockError(Exception):
+    """A Phemex business error: HTTP 200 with a non-zero code, which ccxt maps to its exception."""
+
+    def __init__(self, code: int, msg: str) -> None:
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+
+
+# ── account ───────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Order:
+    id: str
+    cl_id: str
+    symbol: str
+    base: str
+    side: str  # Buy | Sell
+    ord_type: str  # Market | Limit | Stop | StopLimit | MarketIfTouched | LimitIfTouched
+    qty: float
+    price: float  # 0 for market orders
+    stop_px: float
+    pos_side: str  # Merged | Long | Short
+    reduce_only: bool
+    tif: str
+    take_profit: float
+    stop_loss: float
+    status: str
+    created_ns: int
+    updated_ns: int
+    filled: float = 0.0
+    value: float = 0.0
+    fee: float = 0.0
+    triggered: bool = False
+
+    @property
+    def leaves(self) -> float:
+        return max(0.0, self.qty - self.filled)
+
+    @property
+    def exec_type(self) -> str:
+        """The order type after triggering (what it executes as)."""
+        return TRIGGERED_TYPES.get(self.ord_type, self.ord_type)
+
+
+@dataclass
+class _Position:
+    symbol: str
+    base: str
+    pos_side: str
+    size: float = 0.0  # signed: long > 0
+    entry: float = 0.0
+    realized: float = 0.0
+    opened_ns: int = 0
+    updated_ns: int = 0
+
+
+class MockAccount:
+    """
+    The one trading account of the mock exchange: USDT balance, perpetual
+    positions (one-way "Merged" or hedged Long/Short) and orders.
+
+    Market orders take the simulated touch, resting limits fill when the
+    last price trades through them (maker fee), conditional orders trigger
+    on the last price, and TP/SL attached to an entry become reduce-only
+    conditional orders once it fills. Not thread-safe: the server only
+    touches it from its event loop.
+    """
+
+    def __init__(self, sim: MarketSimulator, faults: FaultConfig, balance: float = 10_000.0) -> None:
+        self.sim = sim
+        self.faults = faults
+        self.balance = float(balance)
+        self.orders: Dict[str, _Order] = {}
+        self.positions: Dict[Tuple[str, str], _Position] = {}
+        self.leverage: Dict[str, float] = {}
+        self.fills: Deque[Dict[str, Any]] = deque(maxlen=5000)
+        self.hedged = False
+        self._ids = itertools.count(1)
+        self._rng = random.Random(faults.seed + 1)
+        self.changed_orders: Dict[str, _Order] = {}
+        self.changed_positions: Set[Tuple[str, str]] = set()
+
+    # ── helpers ───────────────────────────────────────────────────────────────
+
+    def _now_ns(self) -> int:
+        return int(self.sim.now() * 1e9)
+
+    def _spec(self, symbol: str) -> SymbolSpec:
+        base = base_of(symbol)
+        spec = self.sim.specs.get(base) if symbol == perp_id(base) else None
+        if spec is None:
+            raise MockError(11027, f"Invalid symbol: {symbol}")
+        return spec
+
+    def _position(self, symbol: str, pos_side: str) -> _Position:
+        key = (symbol, pos_side)
+        pos = self.positions.get(key)
+        if pos is None:
+            pos = self.positions[key] = _Position(symbol, base_of(symbol), pos_side)
+        return pos
+
+    def _lev(self, symbol: str) -> float:
+        return abs(self.leverage.get(symbol, DEFAULT_LEVERAGE)) or DEFAULT_LEVERAGE
+
+    def _mark(self, base: str) -> float:
+        return self.sim.last_price(base)
+
+    def used_margin(self) -> float:
+        used = sum(abs(p.size) * p.entry / self._lev(p.symbol) for p in self.positions.values())
+        for o in self.orders.values():
+            if o.status in OPEN_STATUSES and not o.reduce_only:
+                px = o.price or o.stop_px or self._mark(o.base)
+                used += o.leaves * px / self._lev(o.symbol)
+        return used
+
+    def unrealized(self) -> float:
+        return sum(p.size * (self._mark(p.base) - p.entry) for p in self.positions.values() if p.size)
+
+    def _closable(self, o: _Order) -> float:
+        """How much of `o` would reduce an existing position."""
+        if o.pos_side == "Merged":
+            size = self._position(o.symbol, "Merged").size
+            return abs(size) if (size > 0) == (o.side == "Sell") and size else 0.0
+        size = self._position(o.symbol, o.pos_side).size
+        closing = (o.pos_side == "Long") == (o.side == "Sell")
+        return abs(size) if closing else 0.0
+
+    def _touch(self, o: _Order) -> Tuple[float, float, float]:
+        spec = self.sim.specs[o.base]
+        last = self._mark(o.base)
+        bid, ask = self.sim._touch(spec, last)
+        return last, bid, ask
+
+    def _mark_changed(self, o: _Order) -> None:
+        self.changed_orders[o.id] = o
+
+    # ── order entry ───────────────────────────────────────────────────────────
+
+    def place(self, req: Dict[str, Any]) -> _Order:
+        symbol = str(req.get("symbol", ""))
+        spec = self._spec(symbol)
+        side = str(req.get("side", ""))
+        ord_type = str(req.get("ordType", "Limit"))
+        if side not in ("Buy", "Sell"):
+            raise MockError(30000, f"Invalid side: {side}")
+        if ord_type not in ("Market", "Limit") and ord_type not in TRIGGERED_TYPES:
+            raise MockError(30000, f"Unsupported ordType: {ord_type}")
+        qty = _float(req.get("orderQtyRq"))
+        steps = qty / spec.qty_step
+        if qty <= 0 or abs(steps - round(steps)) > 1e-6:
+            raise MockError(11012, f"Order quantity {qty} is not a positive multiple of {spec.qty_step}")
+        price = _float(req.get("priceRp"))
+        if TRIGGERED_TYPES.get(ord_type, ord_type) == "Limit" and price <= 0:
+            raise MockError(412, "Missing parameter - priceRp")
+        stop_px = _float(req.get("stopPxRp"))
+        if ord_type in TRIGGERED_TYPES and stop_px <= 0:
+            raise MockError(412, "Missing parameter - stopPxRp")
+        pos_side = str(req.get("posSide") or "Merged")
+        if pos_side not in ("Merged", "Long", "Short") or (pos_side == "Merged") == self.hedged:
+            raise MockError(20004, f"posSide {pos_side} does not match the position mode")
+        cl_id = str(req.get("clOrdID") or uuid.uuid4())
+        if any(o.cl_id == cl_id and o.status in OPEN_STATUSES for o in self.orders.values()):
+            raise MockError(10001, f"Duplicated clOrdID {cl_id}")
+        now = self._now_ns()
+        order = _Order(
+            id=str(uuid.UUID(int=(next(self._ids) << 64) | (now & 0xFFFFFFFFFFFF))),
+            cl_id=cl_id,
+            symbol=symbol,
+            base=spec.base,
+            side=side,
+            ord_type=ord_type,
+            qty=qty,
+            price=price if ord_type not in ("Market", "Stop", "MarketIfTouched") else 0.0,
+            stop_px=stop_px,
+            pos_side=pos_side,
+            reduce_only=_truthy(req.get("reduceOnly")) or _truthy(req.get("closeOnTrigger")),
+            tif=str(req.get("timeInForce") or ("ImmediateOrCancel" if ord_type == "Market" else "GoodTillCancel")),
+            take_profit=_float(req.get("takeProfitRp")),
+            stop_loss=_float(req.get("stopLossRp")),
+            status="Untriggered" if ord_type in TRIGGERED_TYPES else "New",
+            created_ns=now,
+            updated_ns=now,
+        )
+        if order.ord_type in ("Market", "Limit"):
+            if order.reduce_only and self._closable(order) <= 0:
+                raise MockError(11011, "Reduce-only order would increase the position")
+            if not order.reduce_only:
+                last, _, _ = self._touch(order)
+                needed = order.qty * (order.price or last) / self._lev(symbol) * (1 + TAKER_FEE)
+                if needed > self.balance + min(0.0, self.unrealized()) - self.used_margin():
+                    raise MockError(11001, "Insufficient available balance")
+        self.orders[order.id] = order
+        self._mark_changed(order)
+        self._work(order)
+        return order
+
+    def cancel(self, symbol: str, order_id: Optional[str], cl_id: Optional[str]) -> _Order:
+        order = self.find(order_id, cl_id)
+        if order is None or order.symbol != symbol or order.status not in OPEN_STATUSES:
+            raise MockError(10002, "Order not found")
+        self._close(order, "Canceled")
+        return order
+
+    def cancel_all(self, symbol: Optional[str]) -> int:
+        open_orders = [o for o in self.orders.values() if o.status in OPEN_STATUSES and symbol in (None, o.symbol)]
+        for o in open_orders:
+            self._close(o, "Canceled")
+        return len(open_orders)
+
+    def find(self, order_id: Optional[str], cl_id: Optional[str]) -> Optional[_Order]:
+        if order_id:
+            return self.orders.get(order_id)
+        return next((o for o in reversed(list(self.orders.values())) if o.cl_id == cl_id), None)
+
+    def open_orders(self, symbol: Optional[str]) -> List[_Order]:
+        return [o for o in self.orders.values() if o.status in OPEN_STATUSES and symbol in (None, o.symbol)]
+
+    def set_leverage(self, symbol: str, leverage: float) -> None:
+        self._spec(symbol)
+        if leverage == 0 or abs(leverage) > 100:
+            raise MockError(20003, f"Invalid leverage {leverage}")
+        self.leverage[symbol] = leverage
+
+    def set_position_mode(self, hedged: bool) -> None:
+        if hedged != self.hedged and (any(p.size for p in self.positions.values()) or self.open_orders(None)):
+            raise MockError(20010, "Position mode can not be switched with open positions or orders")
+        self.hedged = hedged
+
+    # ── matching ──────────────────────────────────────────────────────────────
+
+    def tick(self) -> None:
+        """Trigger and match every open order against the current prices."""
+        for order in list(self.orders.values()):
+            if order.status in OPEN_STATUSES:
+                self._work(order)
+
+    def _work(self, o: _Order) -> None:
+        last, bid, ask = self._touch(o)
+        if o.status == "Untriggered":
+            rising = (o.ord_type in ("Stop", "StopLimit")) == (o.side == "Buy")
+            if not (last >= o.stop_px if rising else last <= o.stop_px):
+                return
+            o.status, o.triggered, o.updated_ns = "New", True, self._now_ns()
+            self._mark_changed(o)
+        if o.exec_type == "Market" or (o.side == "Buy" and o.price >= ask) or (o.side == "Sell" and o.price <= bid):
+            px, maker = (ask if o.side == "Buy" else bid), False
+        elif (o.side == "Buy" and last < o.price) or (o.side == "Sell" and last > o.price):
+            px, maker = o.price, True
+        else:
+            if o.tif in ("ImmediateOrCancel", "FillOrKill"):
+                self._close(o, "Canceled")
+            return
+        qty = o.leaves
+        if o.reduce_only:
+            qty = min(qty, self._closable(o))
+            if qty <= 0:
+                self._close(o, "Canceled")  # the position it protected is gone
+                return
+        spec = self.sim.specs[o.base]
+        if qty > spec.qty_step and self._rng.random() < self.faults.partial_fill_rate and o.tif != "FillOrKill":
+            steps = max(1, int(qty / spec.qty_step * self._rng.uniform(0.2, 0.8)))
+            qty = round(steps * spec.qty_step, spec.qty_decimals)
+        self._fill(o, px, qty, maker)
+
+    def _fill(self, o: _Order, px: float, qty: float, maker: bool) -> None:
+        now = self._now_ns()
+        fee_rate = MAKER_FEE if maker else TAKER_FEE
+        fee = qty * px * fee_rate
+        realized = self._apply(o, px, qty, now)
+        self.balance += realized - fee
+        o.filled = round(o.filled + qty, 12)
+        o.value += qty * px
+        o.fee += fee
+        o.updated_ns = now
+        self.fills.append(
+            {
+                "transactTimeNs": now,
+                "execID": uuid.uuid4().hex,
+                "orderID": o.id,
+                "clOrdID": o.cl_id,
+                "symbol": o.symbol,
+                "side": o.side,
+                "ordType": o.exec_type,
+                "execStatus": "MakerFill" if maker else "TakerFill",
+                "execPriceRp": _fmt(px, self.sim.specs[o.base].price_decimals),
+                "execQtyRq": _fmt(qty, self.sim.specs[o.base].qty_decimals),
+                "execValueRv": _fmt(qty * px, 8),
+                "execFeeRv": _fmt(fee, 8),
+                "feeRateRr": _fmt(fee_rate, 6),
+                "closedPnlRv": _fmt(realized, 8),
+                "currency": QUOTE,
+            }
+        )
+        if o.leaves <= 1e-12:
+            self._close(o, "Filled")
+            self._attach_tp_sl(o)
+        else:
+            o.status = "PartiallyFilled"
+            self._mark_changed(o)
+
+    def _apply(self, o: _Order, px: float, qty: float, now: int) -> float:
+        """Book a fill on the position; returns the realized PnL."""
+        pos = self._position(o.symbol, o.pos_side)
+        signed = qty if o.side == "Buy" else -qty
+        realized = 0.0
+        if pos.size == 0 or (pos.size > 0) == (signed > 0):
+            total = abs(pos.size) + qty
+            pos.entry = (abs(pos.size) * pos.entry + qty * px) / total
+            if pos.size == 0:
+                pos.opened_ns = now
+        else:
+            closing = min(abs(pos.size), qty)
+            realized = closing * (px - pos.entry) * (1 if pos.size > 0 else -1)
+            if qty > abs(pos.size):  # one-way flip: the rest opens the other side
+                pos.entry, pos.opened_ns = px, now
+        pos.size = round(pos.size + signed, 12)
+        if abs(pos.size) < 1e-12:
+            pos.size, pos.entry = 0.0, 0.0
+        pos.realized += realized
+        pos.updated_ns = now
+        self.changed_positions.add((pos.symbol, pos.pos_side))
+        if pos.size == 0:
+            for other in self.open_orders(o.symbol):
+                if other.reduce_only and other.pos_side == o.pos_side and other.id != o.id:
+                    self._close(other, "Canceled")
+        return realized
+
+    def _attach_tp_sl(self, o: _Order) -> None:
+        if o.reduce_only or not (o.take_profit or o.stop_loss):
+            return
+        exit_side = "Sell" if o.side == "Buy" else "Buy"
+        for ord_type, stop_px in (("MarketIfTouched", o.take_profit), ("Stop", o.stop_loss)):
+            if stop_px:
+                self.place(
+                    {
+                        "symbol": o.symbol,
+                        "side": exit_side,
+                        "ordType": ord_type,
+                        "orderQtyRq": o.qty,
+                        "stopPxRp": stop_px,
+                        "posSide": o.pos_side,
+                        "reduceOnly": True,
+                        "clOrdID": f"{o.cl_id}-{'tp' if ord_type == 'MarketIfTouched' else 'sl'}",
+                    }
+                )
+
+    def _close(self, o: _Order, status: str) -> None:
+        o.status = status
+        o.updated_ns = self._now_ns()
+        self._mark_changed(o)
+
+    # ── wire format ───────────────────────────────────────────────────────────
+
+    def order_view(self, o: _Order) -> Dict[str, Any]:
+        spec = self.sim.specs[o.base]
+        p, q = spec.price_decimals, spec.qty_decimals
+        return {
+            "orderID": o.id,
+            "clOrdID": o.cl_id,
+            "symbol": o.symbol,
+            "side": o.side,
+            "posSide": o.pos_side,
+            "ordType": o.ord_type,
+            "orderType": o.exec_type if o.triggered else o.ord_type,
+            "ordStatus": o.status,
+            "timeInForce": o.tif,
+            "priceRp": _fmt(o.price, p),
+            "stopPxRp": _fmt(o.stop_px, p),
+            "orderQtyRq": _fmt(o.qty, q),
+            "cumQtyRq": _fmt(o.filled, q),
+            "leavesQtyRq": _fmt(o.leaves if o.status in OPEN_STATUSES else 0.0, q),
+            "cumValueRv": _fmt(o.value, 8),
+            "avgPriceRp": _fmt(o.value / o.filled if o.filled else 0.0, p),
+            "execFeeRv": _fmt(o.fee, 8),
+            "closedPnlRv": "0",
+            "reduceOnly": o.reduce_only,
+            "execInst": "ReduceOnly" if o.reduce_only else "",
+            "takeProfitRp": _fmt(o.take_profit, p),
+            "stopLossRp": _fmt(o.stop_loss, p),
+            "trigger": "ByLastPrice" if o.ord_type in TRIGGERED_TYPES else "UNSPECIFIED",
+            "actionTimeNs": o.created_ns,
+            "transactTimeNs": o.updated_ns,
+        }
+
+    def position_view(self, pos: _Position) -> Dict[str, Any]:
+        spec = self.sim.specs[pos.base]
+        mark = self._mark(pos.base)
+        lev = self.leverage.get(pos.symbol, DEFAULT_LEVERAGE)
+        size = abs(pos.size)
+        margin = size * pos.entry / abs(lev)
+        if pos.size > 0:
+            liq = pos.entry * (1 - 1 / abs(lev) + MAINT_MARGIN)
+        elif pos.size < 0:
+            liq = pos.entry * (1 + 1 / abs(lev) - MAINT_MARGIN)
+        else:
+            liq = 0.0
+        return {
+            "accountID": 10001,
+            "symbol": pos.symbol,
+            "currency": QUOTE,
+            "side": "Buy" if pos.size > 0 else "Sell" if pos.size < 0 else "None",
+            "posSide": pos.pos_side,
+            "positionStatus": "Normal",
+            "crossMargin": lev < 0,
+            "leverageRr": _fmt(lev, 2),
+            "initMarginReqRr": _fmt(1 / abs(lev), 6),
+            "maintMarginReqRr": _fmt(MAINT_MARGIN, 6),
+            "sizeRq": _fmt(size, spec.qty_decimals),
+            "valueRv": _fmt(size * mark, 8),
+            "avgEntryPriceRp": _fmt(pos.entry, spec.price_decimals + 2),
+            "avgEntryPrice": _fmt(pos.entry, spec.price_decimals + 2),
+            "posCostRv": _fmt(margin, 8),
+            "assignedPosBalanceRv": _fmt(margin, 8),
+            "positionMarginRv": _fmt(margin, 8),
+            "markPriceRp": _fmt(mark, spec.price_decimals),
+            "liquidationPriceRp": _fmt(liq, spec.price_decimals),
+            "unRealisedPnlRv": _fmt(pos.size * (mark - pos.entry), 8),
+            "curTermRealisedPnlRv": _fmt(pos.realized, 8),
+            "cumClosedPnlRv": _fmt(pos.realized, 8),
+            "openedTimeNs": pos.opened_ns,
+            "transactTimeNs": pos.updated_ns,
+        }
+
+    def account_view(self) -> Dict[str, Any]:
+        return {
+            "userID": 1000,
+            "accountId": 10001,
+            "currency": QUOTE,
+            "accountBalanceRv": _fmt(self.balance, 8),
+            "totalUsedBalanceRv": _fmt(self.used_margin(), 8),
+            "bonusBalanceRv": "0",
+        }
+
+
+# ── symbols & formatting ──────────────────────────────────────────────────────
+
+
+def perp_id(base: str) -> str:
+    return f"{base}{QUOTE}"
+
+
+def spot_id(base: str) -> str:
+    return f"s{base}{QUOTE}"
+
+
+def base_of(symbol: str) -> str:
+    s = symbol[1:] if symbol.startswith("s") else symbol
+    return s[: -len(QUOTE)] if s.endswith(QUOTE) else s
+
+
+def _fmt(x: float, decimals: int) -> str:
+    s = f"{x:.{max(0, decimals)}f}"
+    return s.rstrip("0").rstrip(".") if "." in s else s
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value) if value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        raise MockError(30000, f"Invalid number: {value!r}")
+
+
+def _truthy(value: Any) -> bool:
+    return value is True or str(value).lower() in ("true", "1")
+
+
+def _ep(x: float, scale: int = EV_SCALE) -> int:
+    return int(round(x * 10**scale))
+
+
+def _ok(data: Any) -> web.Response:
+    return web.json_response({"code": 0, "msg": "", "data": data})
+
+
+def _md(result: Any) -> web.Response:
+    return web.json_response({"error": None, "id": 0, "result": result})
+
+
+# ── server ────────────────────────────────────────────────────────────────────
+
+
+class MockExchangeServer:
+    """
+    Mock Phemex REST + WebSocket server.
+
+    Args:
+        simulator: market data source (default: MarketSimulator())
+        faults: failure injection (default: none)
+        host, port: bind address; port 0 picks a free port
+        api_key, api_secret: the one accepted credential pair
+        balance: starting USDT balance of the account
+        tick_s: order matching / WS push interval
+    """
+
+    def __init__(
+        self,
+        simulator: Optional[MarketSimulator] = None,
+        faults: Optional[FaultConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: str = DEFAULT_API_KEY,
+        api_secret: str = DEFAULT_API_SECRET,
+        balance: float = 10_000.0,
+        tick_s: float = 0.25,
+    ) -> None:
+        self.sim = simulator or MarketSimulator()
+        self.faults = faults or FaultConfig()
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.tick_s = tick_s
+        self.account = MockAccount(self.sim, self.faults, balance)
+        self._rng = random.Random(self.faults.seed)
+        self._started = time.monotonic()
+        self._bucket = 0.0
+        self._bucket_ts = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+        self._tick_task: Optional["asyncio.Task[None]"] = None
+        self._sockets: Set[web.WebSocketResponse] = set()
+        self._subscribed: Set[web.WebSocketResponse] = set()
+        self._sequence = itertools.count(1)
+        self._counts: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._latency: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ── lifecycle ─────────────────────────────────────────────────────────────
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def adapter_env(self) -> Dict[str, str]:
+        """Environment that points PhemexAdapter / PhemexWebSocketClient at this server."""
+        return {"SS_PHEMEX_BASE_URL": self.url, "PHEMEX_API_KEY": self.api_key, "PHEMEX_API_SECRET": self.api_secret}
+
+    def adapter_kwargs(self) -> Dict[str, Any]:
+        """PhemexAdapter(**kwargs) for this server."""
+        return {"base_url": self.url, "api_key": self.api_key, "api_secret": self.api_secret}
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        public = [
+            ("GET", "/public/products", self._products),
+            ("GET", "/v1/exchange/public/products", self._v1_products),
+            ("GET", "/exchange/public/md/v2/kline", self._kline),
+            ("GET", "/exchange/public/md/v2/kline/last", self._kline),
+            ("GET", "/exchange/public/md/v2/kline/list", self._kline),
+            ("GET", "/exchange/public/md/kline", self._legacy_kline),
+            ("GET", "/md/v2/ticker/24hr", self._perp_ticker),
+            ("GET", "/md/v2/ticker/24hr/all", self._perp_tickers),
+            ("GET", "/v1/md/spot/ticker/24hr", self._spot_ticker),
+            ("GET", "/v1/md/spot/ticker/24hr/all", self._spot_tickers),
+            ("GET", "/md/v2/orderbook", self._perp_book),
+            ("GET", "/v1/md/orderbook", self._spot_book),
+            ("GET", "/md/v2/trade", self._perp_trades),
+            ("GET", "/v1/md/trade", self._spot_trades),
+            ("GET", "/public/time", self._time),
+        ]
+        private = [
+            ("GET", "/g-accounts/accountPositions", self._account_positions),
+            ("GET", "/g-accounts/positions", self._account_positions),
+            ("POST", "/g-orders", self._create_order),
+            ("PUT", "/g-orders/create", self._create_order),
+            ("DELETE", "/g-orders/cancel", self._cancel_order),
+            ("DELETE", "/g-orders/all", self._cancel_all),
+            ("GET", "/g-orders/activeList", self._active_orders),
+            ("GET", "/api-data/g-futures/orders/by-order-id", self._order_by_id),
+            ("GET", "/api-data/g-futures/orders", self._order_history),
+            ("GET", "/exchange/order/v2/tradingList", self._trading_list),
+            ("GET", "/api-data/g-futures/trades", self._trading_list),
+            ("PUT", "/g-positions/leverage", self._set_leverage),
+            ("PUT", "/g-positions/switch-pos-mode-sync", self._switch_mode),
+        ]
+        for method, path, handler in public:
+            app.router.add_route(method, path, handler)
+        for method, path, handler in private:
+            app.router.add_route(method, path, self._authenticated(handler))
+        app.router.add_get("/ws", self._ws)
+        app.router.add_get("/_mock/stats", self._stats)
+        app.router.add_post("/_mock/faults", self._set_faults)
+        app.router.add_post("/_mock/outage", self._outage)
+        return app
+
+    async def start(self) -> str:
+        """Serve on the running loop; returns the base URL."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = int(self._runner.addresses[0][1])
+        self._started = time.monotonic()
+        self._tick_task = asyncio.get_running_loop().create_task(self._tick_loop())
+        return self.url
+
+    async def stop(self) -> None:
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self) -> str:
+        """Serve from a daemon thread with its own loop (for tests and benchmarks)."""
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:  # surface bind errors to the caller
+                failure.append(e)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-exchange", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        if failure:
+            raise failure[0]
+        return self.url
+
+    def stop_in_thread(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._thread = self._loop = None
+
+    def __enter__(self) -> "MockExchangeServer":
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop_in_thread()
+
+    # ── fault injection ───────────────────────────────────────────────────────
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def _rate_limited(self) -> bool:
+        limit = self.faults.rate_limit_per_min
+        if limit <= 0:
+            return False
+        now = time.monotonic()
+        self._bucket = max(0.0, self._bucket - (now - self._bucket_ts) * limit / 60.0)
+        self._bucket_ts = now
+        if self._bucket + 1 > limit:
+            return True
+        self._bucket += 1
+        return False
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if request.path.startswith("/_mock/") or request.path == "/ws":
+            return await handler(request)
+        started = time.perf_counter()
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "unknown"
+        response = await self._serve(request, handler)
+        self._counts[route][response.status] += 1
+        self._latency[route].append(time.perf_counter() - started)
+        return response
+
+    async def _serve(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if self.faults.in_outage(self._elapsed()):
+            return web.Response(status=503, text="Service Temporarily Unavailable")
+        delay = self.faults.latency_s(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._rate_limited() or self._rng.random() < self.faults.rate_limit_error_rate:
+            return web.json_response(
+                {"code": 39995, "msg": "Too many requests."}, status=429, headers={"x-ratelimit-retry-after": "1"}
+            )
+        if self._rng.random() < self.faults.error_rate:
+            return web.Response(status=self._rng.choice((500, 502, 503, 504)), text="upstream error")
+        try:
+            return await handler(request)
+        except MockError as e:
+            return web.json_response({"code": e.code, "msg": e.msg, "data": None})
+        except web.HTTPException:
+            raise
+        except (KeyError, ValueError) as e:
+            return web.json_response({"code": 30000, "msg": f"Bad request: {e}", "data": None})
+
+    def _authenticated(self, handler: Any) -> Any:
+        async def checked(request: web.Request) -> web.StreamResponse:
+            body = await request.text()
+            expiry = request.headers.get("x-phemex-request-expiry", "")
+            payload = request.rel_url.raw_path + request.rel_url.raw_query_string + expiry + body
+            expected = hmac.new(self.api_secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+            if request.headers.get("x-phemex-access-token") != self.api_key:
+                raise MockError(10500, "Api key not found")
+            if not hmac.compare_digest(expected, request.headers.get("x-phemex-request-signature", "")):
+                raise MockError(10500, "API Signature verification failed.")
+            if expiry.isdigit() and int(expiry) < time.time():
+                raise MockError(10500, "Request expired")
+            return await handler(request)
+
+        return checked
+
+    # ── market data ───────────────────────────────────────────────────────────
+
+    def _spec_for(self, request: web.Request) -> Tuple[SymbolSpec, bool]:
+        symbol = request.query.get("symbol", "")
+        spec = self.sim.specs.get(base_of(symbol))
+        is_spot = symbol.startswith("s")
+        if spec is None or symbol != (spot_id(spec.base) if is_spot else perp_id(spec.base)):
+            raise MockError(6001, f"invalid symbol {symbol}")
+        return spec, is_spot
+
+    async def _time(self, request: web.Request) -> web.Response:
+        return _ok({"serverTime": int(self.sim.now() * 1000)})
+
+    async def _products(self, request: web.Request) -> web.Response:
+        currencies = [
+            {"currency": c, "name": c, "code": i + 1, "valueScale": EV_SCALE, "minValueEv": 1,
+             "maxValueEv": 5_000_000_000_000_000_000, "needAddrTag": 0, "status": "Listed",
+             "displayCurrency": c, "inAssetsDisplay": 1, "perpetual": 0, "stableCoin": int(c == QUOTE),
+             "assetsPrecision": EV_SCALE}
+            for i, c in enumerate([QUOTE] + self.sim.bases)
+        ]
+        perps, spots = [], []
+        for i, spec in enumerate(self.sim.specs.values()):
+            tick = _fmt(spec.tick_size, spec.price_decimals)
+            step = _fmt(spec.qty_step, spec.qty_decimals)
+            perps.append(
+                {"symbol": perp_id(spec.base), "code": 41_000 + i, "type": "PerpetualV2",
+                 "displaySymbol": f"{spec.base} / {QUOTE}", "baseCurrency": spec.base,
+                 "contractUnderlyingAssets": spec.base, "quoteCurrency": QUOTE, "settleCurrency": QUOTE,
+                 "tickSize": tick, "priceScale": 0, "ratioScale": 0, "pricePrecision": spec.price_decimals,
+                 "qtyStepSize": step, "minOrderValueRv": "1", "maxOrderQtyRq": _fmt(spec.qty_step * 1e7, spec.qty_decimals),
+                 "minPriceRp": tick, "maxPriceRp": _fmt(spec.ref_price * 100, spec.price_decimals),
+                 "maxLeverage": 100, "defaultLeverage": "0", "fundingInterval": 28800,
+                 "status": "Listed", "listTime": 1_600_000_000_000}
+            )
+            spots.append(
+                {"symbol": spot_id(spec.base), "code": 1_001 + i, "type": "Spot",
+                 "displaySymbol": f"{spec.base} / {QUOTE}", "baseCurrency": spec.base, "quoteCurrency": QUOTE,
+                 "priceScale": EV_SCALE, "ratioScale": EV_SCALE, "pricePrecision": spec.price_decimals,
+                 "baseTickSize": f"{step} {spec.base}", "baseTickSizeEv": _ep(spec.qty_step),
+                 "quoteTickSize": f"{tick} {QUOTE}", "quoteTickSizeEv": _ep(spec.tick_size),
+                 "minOrderValue": f"1 {QUOTE}", "minOrderValueEv": _ep(1),
+                 "maxBaseOrderSize": f"{_fmt(spec.qty_step * 1e7, spec.qty_decimals)} {spec.base}",
+                 "maxOrderValue": f"5000000 {QUOTE}", "defaultTakerFee": "0.001", "defaultMakerFee": "0.001",
+                 "status": "Listed", "listTime": 1_600_000_000_000}
+            )
+        return _ok({"currencies": currencies, "products": spots, "perpProductsV2": perps,
+                    "riskLimits": [], "riskLimitsV2": [], "leverages": [], "leverageMargins": []})
+
+    async def _v1_products(self, request: web.Request) -> web.Response:
+        return _ok([])
+
+    def _klines(self, request: web.Request, spec: SymbolSpec) -> Tuple[int, np.ndarray, np.ndarray]:
+        resolution = int(request.query.get("resolution", "0") or 0)
+        if resolution not in RESOLUTIONS:
+            raise MockError(30000, f"Invalid resolution {resolution}")
+        limit = min(int(request.query.get("limit") or MAX_KLINE_ROWS), MAX_KLINE_ROWS)
+        start = request.query.get("from")
+        end = request.query.get("to")
+        ts, rows = self.sim.candles(
+            spec.base,
+            resolution,
+            limit,
+            start_s=float(start) if start else None,
+            end_s=float(end) if end else None,
+        )
+        return resolution, ts, rows
+
+    async def _kline(self, request: web.Request) -> web.Response:
+        spec, is_spot = self._spec_for(request)
+        resolution, ts, rows = self._klines(request, spec)
+        out = []
+        prev = rows[0, 0] if len(rows) else 0.0
+        for t, (o, h, low, c, v) in zip(ts.tolist(), rows.tolist()):
+            turnover = v * (o + c) / 2
+            if is_spot:
+                out.append([t, resolution, _ep(prev), _ep(o), _ep(h), _ep(low), _ep(c), _ep(v), _ep(turnover)])
+            else:
+                p, q = spec.price_decimals, spec.qty_decimals
+                out.append([t, resolution, _fmt(prev, p), _fmt(o, p), _fmt(h, p), _fmt(low, p), _fmt(c, p),
+                            _fmt(v, q), _fmt(turnover, 4)])
+            prev = c
+        return _ok({"total": -1, "rows": out})
+
+    async def _legacy_kline(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        _, ts, rows = self._klines(request, spec)
+        out = [[t, _ep(o, FALLBACK_PRICE_SCALE), _ep(h, FALLBACK_PRICE_SCALE), _ep(low, FALLBACK_PRICE_SCALE),
+                _ep(c, FALLBACK_PRICE_SCALE), v] for t, (o, h, low, c, v) in zip(ts.tolist(), rows.tolist())]
+        return _ok({"total": -1, "rows": out})
+
+    def _perp_ticker_row(self, spec: SymbolSpec) -> Dict[str, Any]:
+        t = self.sim.ticker(spec.base)
+        p, q = spec.price_decimals, spec.qty_decimals
+        return {
+            "symbol": perp_id(spec.base),
+            "openRp": _fmt(t["open"], p), "highRp": _fmt(t["high"], p), "lowRp": _fmt(t["low"], p),
+            "closeRp": _fmt(t["last"], p), "lastRp": _fmt(t["last"], p),
+            "bidRp": _fmt(t["bid"], p), "askRp": _fmt(t["ask"], p),
+            "bidEp": _fmt(t["bid"], p), "askEp": _fmt(t["ask"], p),
+            "markPriceRp": _fmt(t["mark"], p), "indexPriceRp": _fmt(t["index"], p),
+            "volumeRq": _fmt(t["volume"], q), "turnoverRv": _fmt(t["turnover"], 4),
+            "openInterestRv": _fmt(t["open_interest"], q), "fundingRateRr": _fmt(t["funding_rate"], 8),
+            "predFundingRateRr": _fmt(t["funding_rate"], 8),
+            "timestamp": int(t["timestamp"] * 1e9),
+        }
+
+    def _spot_ticker_row(self, spec: SymbolSpec) -> Dict[str, Any]:
+        t = self.sim.ticker(spec.base)
+        return {
+            "symbol": spot_id(spec.base),
+            "openEp": _ep(t["open"]), "highEp": _ep(t["high"]), "lowEp": _ep(t["low"]), "lastEp": _ep(t["last"]),
+            "bidEp": _ep(t["bid"]), "askEp": _ep(t["ask"]),
+            "volumeEv": _ep(t["volume"]), "turnoverEv": _ep(t["turnover"]),
+            "timestamp": int(t["timestamp"] * 1e9),
+        }
+
+    async def _perp_ticker(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        return _md(self._perp_ticker_row(spec))
+
+    async def _perp_tickers(self, request: web.Request) -> web.Response:
+        return _md([self._perp_ticker_row(spec) for spec in self.sim.specs.values()])
+
+    async def _spot_ticker(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        return _md(self._spot_ticker_row(spec))
+
+    async def _spot_tickers(self, request: web.Request) -> web.Response:
+        return _md([self._spot_ticker_row(spec) for spec in self.sim.specs.values()])
+
+    def _book(self, spec: SymbolSpec, is_spot: bool) -> Dict[str, Any]:
+        bids, asks = self.sim.order_book(spec.base)
+        if is_spot:
+            side = lambda levels: [[_ep(px), _ep(q)] for px, q in levels]  # noqa: E731
+        else:
+            side = lambda levels: [[_fmt(px, spec.price_decimals), _fmt(q, spec.qty_decimals)] for px, q in levels]  # noqa: E731
+        return {"asks": side(asks), "bids": side(bids)}
+
+    async def _perp_book(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        return _md({"orderbook_p": self._book(spec, False), "depth": 30, "sequence": next(self._sequence),
+                    "symbol": perp_id(spec.base), "timestamp": int(self.sim.now() * 1e9), "type": "snapshot"})
+
+    async def _spot_book(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        return _md({"book": self._book(spec, True), "depth": 30, "sequence": next(self._sequence),
+                    "symbol": spot_id(spec.base), "timestamp": int(self.sim.now() * 1e9), "type": "snapshot"})
+
+    async def _perp_trades(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        rows = [[ns, side, _fmt(px, spec.price_decimals), _fmt(q, spec.qty_decimals)]
+                for ns, side, px, q in reversed(self.sim.trades(spec.base))]
+        return _md({"trades_p": rows, "sequence": next(self._sequence), "symbol": perp_id(spec.base), "type": "snapshot"})
+
+    async def _spot_trades(self, request: web.Request) -> web.Response:
+        spec, _ = self._spec_for(request)
+        rows = [[ns, side, _ep(px), _ep(q)] for ns, side, px, q in reversed(self.sim.trades(spec.base))]
+        return _md({"trades": rows, "sequence": next(self._sequence), "symbol": spot_id(spec.base), "type": "snapshot"})
+
+    # ── account ───────────────────────────────────────────────────────────────
+
+    async def _account_positions(self, request: web.Request) -> web.Response:
+        if request.query.get("currency", QUOTE) != QUOTE:
+            raise MockError(30000, "Only USDT-settled perpetuals are simulated")
+        positions = [self.account.position_view(p) for p in self.account.positions.values()]
+        return _ok({"account": self.account.account_view(), "positions": positions})
+
+    async def _create_order(self, request: web.Request) -> web.Response:
+        body = await request.text()
+        req = dict(request.query)
+        if body:
+            req.update(json.loads(body))
+        order = self.account.place(req)
+        self._push()
+        return _ok(self.account.order_view(order))
+
+    async def _cancel_order(self, request: web.Request) -> web.Response:
+        q = request.query
+        order = self.account.cancel(q.get("symbol", ""), q.get("orderID"), q.get("clOrdID"))
+        self._push()
+        return _ok(self.account.order_view(order))
+
+    async def _cancel_all(self, request: web.Request) -> web.Response:
+        count = self.account.cancel_all(request.query.get("symbol"))
+        self._push()
+        return _ok(count)
+
+    async def _active_orders(self, request: web.Request) -> web.Response:
+        orders = self.account.open_orders(request.query.get("symbol"))
+        if not orders:
+            raise MockError(10002, "Order not found")  # Phemex answers an empty list this way
+        return _ok({"rows": [self.account.order_view(o) for o in orders]})
+
+    async def _order_by_id(self, request: web.Request) -> web.Response:
+        q = request.query
+        found = []
+        for order_id in (q.get("orderID") or "").split(",") if q.get("orderID") else [None]:
+            order = self.account.find(order_id, q.get("clOrdID"))
+            if order is not None and order.symbol == q.get("symbol", order.symbol):
+                found.append(self.account.order_view(order))
+        return _ok(found)
+
+    async def _order_history(self, request: web.Request) -> web.Response:
+        symbol = request.query.get("symbol")
+        rows = [self.account.order_view(o) for o in self.account.orders.values() if symbol in (None, o.symbol)]
+        return _ok({"total": len(rows), "rows": rows[::-1]})
+
+    async def _trading_list(self, request: web.Request) -> web.Response:
+        q = request.query
+        start_ns = int(q.get("start") or 0) * 1_000_000
+        fills = [f for f in self.account.fills if f["transactTimeNs"] >= start_ns and q.get("symbol") in (None, f["symbol"])]
+        offset = int(q.get("offset") or 0)
+        limit = int(q.get("limit") or 200)
+        return _ok(fills[::-1][offset : offset + limit])
+
+    async def _set_leverage(self, request: web.Request) -> web.Response:
+        q = request.query
+        self.account.set_leverage(q.get("symbol", ""), _float(q.get("leverageRr") or q.get("longLeverageRr")))
+        return _ok("OK")
+
+    async def _switch_mode(self, request: web.Request) -> web.Response:
+        self.account.set_position_mode(request.query.get("targetPosMode") == "Hedged")
+        return _ok("OK")
+
+    # ── websocket ─────────────────────────────────────────────────────────────
+
+    async def _ws(self, request: web.Request) -> web.StreamResponse:
+        if self.faults.in_outage(self._elapsed()):
+            return web.Response(status=503, text="Service Temporarily Unavailable")
+        ws = web.WebSocketResponse(heartbeat=None)
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        authed = False
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    req = json.loads(msg.data)
+                except ValueError:
+                    continue
+                method, params, req_id = req.get("method"), req.get("params") or [], req.get("id")
+                if method == "server.ping":
+                    await ws.send_json({"error": None, "id": req_id, "result": "pong"})
+                elif method == "user.auth":
+                    authed = self._ws_auth(params)
+                    error = None if authed else {"code": 6012, "message": "invalid login token"}
+                    await ws.send_json({"error": error, "id": req_id, "result": {"status": "success"} if authed else None})
+                elif method == "aop_p.subscribe":
+                    if not authed:
+                        await ws.send_json({"error": {"code": 6012, "message": "invalid login token"}, "id": req_id, "result": None})
+                        continue
+                    await ws.send_json({"error": None, "id": req_id, "result": {"status": "success"}})
+                    await ws.send_json(self._aop_message("snapshot"))
+                    self._subscribed.add(ws)
+                else:
+                    await ws.send_json({"error": {"code": 6001, "message": "invalid argument"}, "id": req_id, "result": None})
+        finally:
+            self._sockets.discard(ws)
+            self._subscribed.discard(ws)
+        return ws
+
+    def _ws_auth(self, params: List[Any]) -> bool:
+        if len(params) < 4 or params[1] != self.api_key:
+            return False
+        expected = hmac.new(self.api_secret.encode(), f"{params[1]}{params[3]}".encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, str(params[2]))
+
+    def _aop_message(self, kind: str) -> Dict[str, Any]:
+        account = self.account
+        if kind == "snapshot":
+            orders = account.open_orders(None)
+            positions = list(account.positions.values())
+        else:
+            orders = list(account.changed_orders.values())
+            positions = [account.positions[k] for k in account.changed_positions if k in account.positions]
+        return {
+            "accounts_p": [account.account_view()],
+            "orders_p": [account.order_view(o) for o in orders],
+            "positions_p": [account.position_view(p) for p in positions],
+            "sequence": next(self._sequence),
+            "timestamp": int(self.sim.now() * 1e9),
+            "type": kind,
+        }
+
+    def _push(self) -> None:
+        """Send the order/position changes since the last push to every subscriber."""
+        if not (self.account.changed_orders or self.account.changed_positions):
+            return
+        message = self._aop_message("incremental") if self._subscribed else None
+        self.account.changed_orders.clear()
+        self.account.changed_positions.clear()
+        for ws in list(self._subscribed):
+            if ws.closed:
+                self._subscribed.discard(ws)
+            else:
+                asyncio.get_running_loop().create_task(ws.send_json(message))
+
+    async def _tick_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_s)
+            try:
+                if self.faults.in_outage(self._elapsed()):
+                    for ws in list(self._sockets):
+                        await ws.close(code=1012, message=b"outage")
+                    continue
+                self.account.tick()
+                self._push()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # keep matching alive; a broken tick must not end the server
+                logger.error(f"Mock exchange tick failed: {e!r}")
+
+    # ── admin ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint request counts by status and server-side latency percentiles (ms)."""
+        out: Dict[str, Any] = {}
+        for route, counts in sorted(self._counts.items()):
+            samples = np.fromiter(self._latency[route], dtype=float) * 1000.0
+            out[route] = {
+                "requests": sum(counts.values()),
+                "status": {str(k): v for k, v in sorted(counts.items())},
+                "p50_ms": round(float(np.percentile(samples, 50)), 3) if len(samples) else None,
+                "p99_ms": round(float(np.percentile(samples, 99)), 3) if len(samples) else None,
+            }
+        return {"uptime_s": round(self._elapsed(), 3), "endpoints": out, "faults": asdict(self.faults)}
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def _set_faults(self, request: web.Request) -> web.Response:
+        changes = await request.json()
+        for name, value in changes.items():
+            if not hasattr(self.faults, name) or name == "seed":
+                return web.json_response({"error": f"unknown fault {name}"}, status=400)
+            setattr(self.faults, name, [tuple(w) for w in value] if name == "outages" else value)
+        return web.json_response(asdict(self.faults))
+
+    async def _outage(self, request: web.Request) -> web.Response:
+        seconds = float(request.query.get("seconds", "10"))
+        self.faults.outages.append((self._elapsed(), seconds))
+        return web.json_response({"outage_until_s": round(self._elapsed() + seconds, 3)})
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local mock Phemex exchange")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=7, help="market simulator seed")
+    parser.add_argument("--extra-symbols", type=int, default=0, help="add synthetic symbols for load tests")
+    parser.add_argument("--balance", type=float, default=10_000.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-p99-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-per-min", type=int, default=0)
+    parser.add_argument("--rate-limit-error-rate", type=float, default=0.0)
+    parser.add_argument("--partial-fill-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--outage", action="append", default=[], metavar="START:SECONDS",
+        help="outage window relative to server start, repeatable",
+    )
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        latency_p99_ms=args.latency_p99_ms,
+        error_rate=args.error_rate,
+        rate_limit_per_min=args.rate_limit_per_min,
+        rate_limit_error_rate=args.rate_limit_error_rate,
+        partial_fill_rate=args.partial_fill_rate,
+        outages=[tuple(float(x) for x in w.split(":", 1)) for w in args.outage],  # type: ignore[misc]
+    )
+    server = MockExchangeServer(
+        MarketSimulator(extra_symbols=args.extra_symbols, seed=args.seed),
+        faults,
+        host=args.host,
+        port=args.port,
+        balance=args.balance,
+    )
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Mock Phemex exchange on {server.url} ({len(server.sim.specs)} symbols)")
+        for name, value in server.adapter_env().items():
+            print(f"  export {name}={value}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
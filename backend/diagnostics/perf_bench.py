@@ -0,0 +1,500 @@
+"""
+Golden-fixture performance benchmarks for the scanner hot paths.
+
+Complements pipeline_smoke.py: that harness freezes pipeline *structure*,
+this one freezes pipeline *cost*. Every bench runs against a deterministic
+fixture so two runs on the same machine measure the same work.
+
+Benches (one per hot path, grouped by prefix):
+
+  smc.structure_breaks / smc.order_blocks / smc.fvgs / smc.liquidity_sweeps /
+  smc.equal_highs_lows / smc.swing_structure / smc.detect
+                                   — each SMC detector on the primary-TF frame,
+                                     plus the full SMCDetectionService.detect
+  indicators.compute               — IndicatorService.compute (all TFs)
+  confluence.score                 — calculate_confluence_score (bullish + bearish)
+  planner.generate_trade_plan      — generate_trade_plan on the scored context
+  orchestrator.scan                — Orchestrator.scan on N fixture symbols
+                                     (ProcessPool included, OHLCV cache cleared
+                                     before every round)
+
+Fixture:
+  backend/tests/backtest/backtest_multitimeframe_5000bars.csv when present
+  (same file scripts/backtest_from_csv.py reads), otherwise a seeded
+  synthetic universe (regime-switching random walk per symbol/TF). The
+  fixture id is written into the baseline; verify refuses to compare runs
+  taken on different fixtures.
+
+Timing:
+  Each bench runs `warmup` untimed rounds then `rounds` timed rounds with
+  time.perf_counter; the median is the compared statistic (min/max kept
+  for context). Setup work (cache clears) is excluded from the timing.
+
+Modes:
+  python -m backend.diagnostics.perf_bench run [--filter smc.] [--json out.json]
+  python -m backend.diagnostics.perf_bench capture           # mint new baseline
+  python -m backend.diagnostics.perf_bench verify            # compare vs baseline (default)
+  python -m backend.diagnostics.perf_bench compare REF_A REF_B
+                                   # run both git refs in temporary worktrees,
+                                   # fail if REF_B regresses vs REF_A
+
+Regression rule: a bench fails when current_median > baseline_median *
+(1 + threshold_pct / 100). threshold_pct comes from the baseline file
+("threshold_pct", per-bench overrides in "thresholds"), or --threshold.
+Baselines are machine-specific — recapture after hardware changes and
+document the why in the commit body. Non-zero exit on regression.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DIAG_DIR = Path(__file__).parent
+BASELINE_PATH = DIAG_DIR / "perf_bench_baseline.json"
+REPO_ROOT = DIAG_DIR.parent.parent
+CSV_FIXTURE_PATH = REPO_ROOT / "backend" / "tests" / "backtest" / "backtest_multitimeframe_5000bars.csv"
+
+DEFAULT_THRESHOLD_PCT = 25.0
+DEFAULT_SYMBOLS = 4
+DEFAULT_BARS = 750
+FIXTURE_TIMEFRAMES = ("1w", "1d", "4h", "1h", "15m", "5m")
+_FIXTURE_END = "2026-01-01"
+_SYNTHETIC_VERSION = "synthetic-v1"
+
+_TF_MINUTES = {"5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440, "1w": 10080}
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+
+def _synthetic_frame(symbol: str, timeframe: str, bars: int):
+    """Seeded regime-switching random walk. Deterministic per (symbol, tf, bars)."""
+    import numpy as np
+    import pandas as pd
+
+    seed = int(hashlib.sha1(f"{symbol}|{timeframe}|{bars}".encode()).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
+
+    # Regime blocks of 40-120 bars alternating trend-up / range / trend-down.
+    drift = np.empty(bars)
+    i = 0
+    while i < bars:
+        n = int(rng.integers(40, 120))
+        drift[i:i + n] = rng.choice([0.0015, 0.0, -0.0015])
+        i += n
+    vol = 0.01 * (1.0 + 0.5 * np.abs(np.sin(np.arange(bars) / 50.0)))
+    rets = drift + rng.normal(0.0, 1.0, bars) * vol
+    base = 100.0 + (seed % 900)
+    close = base * np.exp(np.cumsum(rets))
+    open_ = np.concatenate(([base], close[:-1]))
+    wick = np.abs(rng.normal(0.0, 0.4, (2, bars))) * vol * close
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    volume = rng.lognormal(10.0, 0.6, bars) * (1.0 + 3.0 * np.abs(rets) / vol.mean())
+
+    step = pd.Timedelta(minutes=_TF_MINUTES[timeframe])
+    index = pd.date_range(end=pd.Timestamp(_FIXTURE_END) - step, periods=bars, freq=step)
+    df = pd.DataFrame(
+        {"timestamp": index, "open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=index,
+    )
+    df.index.name = None
+    return df
+
+
+def load_fixture(n_symbols: int = DEFAULT_SYMBOLS, bars: int = DEFAULT_BARS):
+    """
+    Return (fixture_id, {symbol: MultiTimeframeData}).
+
+    Prefers the 5000-bar backtest CSV; falls back to the synthetic universe.
+    """
+    import pandas as pd
+    from backend.shared.models.data import MultiTimeframeData
+
+    if CSV_FIXTURE_PATH.exists():
+        raw = pd.read_csv(CSV_FIXTURE_PATH)
+        raw["timestamp"] = pd.to_datetime(raw["timestamp"])
+        raw["timeframe"] = raw["timeframe"].str.lower()
+        digest = hashlib.sha1(CSV_FIXTURE_PATH.read_bytes()).hexdigest()[:12]
+        symbols = sorted(raw["symbol"].unique())[:n_symbols]
+        out = {}
+        for sym in symbols:
+            frames = {}
+            for tf, grp in raw[raw["symbol"] == sym].groupby("timeframe"):
+                df = grp.sort_values("timestamp").tail(bars)
+                df = df[["timestamp", "open", "high", "low", "close", "volume"]].set_index(
+                    "timestamp", drop=False
+                )
+                df.index.name = None
+                frames[tf] = df
+            out[sym] = MultiTimeframeData(symbol=sym, timeframes=frames)
+        return f"csv:{CSV_FIXTURE_PATH.name}:{digest}:{n_symbols}x{bars}", out
+
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "LINK/USDT", "AVAX/USDT", "DOGE/USDT",
+               "XRP/USDT", "ADA/USDT"][:max(1, n_symbols)]
+    out = {
+        sym: MultiTimeframeData(
+            symbol=sym,
+            timeframes={tf: _synthetic_frame(sym, tf, bars) for tf in FIXTURE_TIMEFRAMES},
+        )
+        for sym in symbols
+    }
+    return f"{_SYNTHETIC_VERSION}:{len(symbols)}x{bars}", out
+
+
+class FixtureAdapter:
+    """Exchange adapter serving fixture frames — no network, no rate limits."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 500):
+        import pandas as pd
+
+        mtf = self._data.get(symbol)
+        df = mtf.timeframes.get(timeframe.lower()) if mtf is not None else None
+        if df is None:
+            return pd.DataFrame()
+        return df.tail(limit).reset_index(drop=True)
+
+    def get_top_symbols(self, n: int = 20, quote_currency: str = "USDT", market_type=None):
+        return list(self._data)[:n]
+
+
+# ---------------------------------------------------------------------------
+# Bench registry
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Bench:
+    name: str
+    fn: Callable[[], Any]
+    setup: Optional[Callable[[], None]] = None
+    rounds: int = 5
+    warmup: int = 1
+
+
+def build_benches(fixture: Dict[str, Any], mode: str = "stealth", scan_symbols: int = DEFAULT_SYMBOLS) -> List[Bench]:
+    """Construct every bench against `fixture`. Heavy imports happen here, not at module load."""
+    from backend.shared.config.defaults import ScanConfig
+    from backend.shared.config.scanner_modes import get_mode
+    from backend.shared.config.smc_config import SMCConfig
+    from backend.services.indicator_service import IndicatorService
+    from backend.services.smc_service import SMCDetectionService
+    from backend.strategy.smc.bos_choch import detect_structural_breaks
+    from backend.strategy.smc.order_blocks import detect_order_blocks
+    from backend.strategy.smc.fvg import detect_fvgs
+    from backend.strategy.smc.liquidity_sweeps import detect_liquidity_sweeps, detect_equal_highs_lows
+    from backend.strategy.smc.swing_structure import detect_swing_structure
+    from backend.strategy.confluence.scorer import calculate_confluence_score
+    from backend.strategy.planner.planner_service import generate_trade_plan
+
+    scanner_mode = get_mode(mode)
+    symbol = next(iter(fixture))
+    mtf = fixture[symbol]
+    primary_tf = "1h" if "1h" in mtf.timeframes else next(iter(mtf.timeframes))
+    df = mtf.timeframes[primary_tf]
+    smc_cfg = SMCConfig()
+    current_price = mtf.get_current_price()
+
+    indicator_service = IndicatorService(scanner_mode=scanner_mode)
+    smc_service = SMCDetectionService(smc_config=smc_cfg, mode=scanner_mode.name)
+    indicators = indicator_service.compute(mtf)
+    snapshot = smc_service.detect(mtf, current_price)
+
+    config = ScanConfig(profile=scanner_mode.profile, timeframes=tuple(scanner_mode.timeframes))
+
+    def _score_both():
+        return [
+            calculate_confluence_score(
+                smc_snapshot=snapshot, indicators=indicators, config=config,
+                direction=d, current_price=current_price, symbol=symbol,
+            )
+            for d in ("bullish", "bearish")
+        ]
+
+    breakdowns = _score_both()
+    best = max(zip(("bullish", "bearish"), breakdowns), key=lambda p: p[1].total_score)
+
+    def _plan():
+        # Planner rejections raise ValueError — a legitimate hot-path outcome.
+        try:
+            return generate_trade_plan(
+                symbol=symbol, direction=best[0], setup_type="benchmark",
+                smc_snapshot=snapshot, indicators=indicators, confluence_breakdown=best[1],
+                config=config, current_price=current_price, multi_tf_data=mtf,
+            )
+        except ValueError:
+            return None
+
+    benches = [
+        Bench("smc.structure_breaks", lambda: detect_structural_breaks(df, smc_cfg)),
+        Bench("smc.order_blocks", lambda: detect_order_blocks(df, smc_cfg)),
+        Bench("smc.fvgs", lambda: detect_fvgs(df, smc_cfg)),
+        Bench("smc.liquidity_sweeps", lambda: detect_liquidity_sweeps(df, smc_cfg)),
+        Bench("smc.equal_highs_lows", lambda: detect_equal_highs_lows(df)),
+        Bench("smc.swing_structure", lambda: detect_swing_structure(df)),
+        Bench("smc.detect", lambda: smc_service.detect(mtf, current_price), rounds=3),
+        Bench("indicators.compute", lambda: indicator_service.compute(mtf), rounds=3),
+        Bench("confluence.score", _score_both),
+        Bench("planner.generate_trade_plan", _plan),
+    ]
+
+    scan_list = list(fixture)[:scan_symbols]
+    if scan_list:
+        from backend.engine.orchestrator import Orchestrator
+
+        orch = Orchestrator(
+            config=config, exchange_adapter=FixtureAdapter(fixture), concurrency_workers=2
+        )
+        orch.config.regime_assets = tuple(scan_list[:1])
+        # Macro context pulls dominance from CryptoCompare over the network;
+        # the benchmarked scan runs without the macro overlay so it stays offline.
+        orch._compute_macro_context_from_data = lambda prefetched: None
+        benches.append(
+            Bench(
+                f"orchestrator.scan[{len(scan_list)}]",
+                lambda: orch.scan(scan_list),
+                setup=orch.ingestion_pipeline.clear_cache,
+                rounds=2,
+                warmup=0,
+            )
+        )
+    return benches
+
+
+def run_benches(benches: List[Bench], name_filter: Optional[str] = None, rounds: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Time each bench. Returns {name: {median_ms, min_ms, max_ms, rounds}}."""
+    results: Dict[str, Dict[str, Any]] = {}
+    # Planner/scorer debug print() calls would otherwise interleave with the report.
+    devnull = open(os.devnull, "w")
+    for bench in benches:
+        if name_filter and name_filter not in bench.name:
+            continue
+        n_rounds = max(1, rounds if rounds is not None else bench.rounds)
+        samples: List[float] = []
+        with contextlib.redirect_stdout(devnull):
+            for _ in range(bench.warmup):
+                if bench.setup:
+                    bench.setup()
+                bench.fn()
+            for _ in range(n_rounds):
+                if bench.setup:
+                    bench.setup()
+                t0 = time.perf_counter()
+                bench.fn()
+                samples.append((time.perf_counter() - t0) * 1000.0)
+        results[bench.name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3),
+            "rounds": n_rounds,
+        }
+        print(f"  {bench.name:<36} median={results[bench.name]['median_ms']:>10.3f} ms  (n={n_rounds})")
+    devnull.close()
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+    per_bench: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Row per bench present in both runs: {name, baseline_ms, current_ms,
+    delta_pct, threshold_pct, regressed}. Benches present on only one
+    side are reported with regressed=False and a None on the missing side.
+    """
+    per_bench = per_bench or {}
+    rows: List[Dict[str, Any]] = []
+    for name in sorted(set(baseline) | set(current)):
+        base = (baseline.get(name) or {}).get("median_ms")
+        cur = (current.get(name) or {}).get("median_ms")
+        limit = float(per_bench.get(name, threshold_pct))
+        if base is None or cur is None or base <= 0:
+            rows.append({"name": name, "baseline_ms": base, "current_ms": cur,
+                         "delta_pct": None, "threshold_pct": limit, "regressed": False})
+            continue
+        delta = (cur - base) / base * 100.0
+        rows.append({"name": name, "baseline_ms": base, "current_ms": cur,
+                     "delta_pct": round(delta, 1), "threshold_pct": limit,
+                     "regressed": delta > limit})
+    return rows
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> int:
+    regressions = 0
+    print("\n=== SUMMARY ===")
+    for r in rows:
+        if r["delta_pct"] is None:
+            side = "ADDED" if r["baseline_ms"] is None else "REMOVED"
+            print(f"  - {r['name']}: {side}")
+            continue
+        flag = "REGRESSION" if r["regressed"] else "ok"
+        regressions += int(r["regressed"])
+        print(
+            f"  - {r['name']}: {flag} {r['baseline_ms']:.3f} -> {r['current_ms']:.3f} ms "
+            f"({r['delta_pct']:+.1f}%, limit +{r['threshold_pct']:.0f}%)"
+        )
+    print(f"\n=== RESULT: {'REGRESSION' if regressions else 'CLEAN'} ({regressions} benches) ===")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+
+def _collect(args) -> Dict[str, Any]:
+    # Pipeline modules log per-candle detail at INFO — silence it so the
+    # logging cost is not what we measure.
+    logging.disable(logging.INFO)
+    try:
+        from loguru import logger as _loguru
+
+        _loguru.remove()
+    except Exception:
+        pass
+    fixture_id, fixture = load_fixture(args.symbols, args.bars)
+    print(f"[perf_bench] fixture={fixture_id} mode={args.mode}")
+    benches = build_benches(fixture, mode=args.mode, scan_symbols=args.symbols)
+    results = run_benches(benches, name_filter=args.filter, rounds=args.rounds)
+    return {
+        "fixture": fixture_id,
+        "mode": args.mode,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()}-{platform.machine()}",
+        "results": results,
+    }
+
+
+def cmd_run(args) -> int:
+    payload = _collect(args)
+    if args.json:
+        Path(args.json).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return 0
+
+
+def cmd_capture(args) -> int:
+    """Mint a new baseline. Operator must document the why in commit body."""
+    print(f"[perf_bench] Capturing baseline -> {BASELINE_PATH.relative_to(REPO_ROOT)}")
+    prior: Dict[str, Any] = {}
+    if BASELINE_PATH.exists():
+        prior = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    payload = _collect(args)
+    payload["threshold_pct"] = prior.get("threshold_pct", DEFAULT_THRESHOLD_PCT)
+    payload["thresholds"] = prior.get("thresholds", {})
+    BASELINE_PATH.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print("\n[perf_bench] done.")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    """Compare a fresh run vs the frozen baseline. Non-zero on regression."""
+    print(f"[perf_bench] Verifying vs {BASELINE_PATH.relative_to(REPO_ROOT)}")
+    if not BASELINE_PATH.exists():
+        print(f"\n=== RESULT: NO BASELINE ({BASELINE_PATH.relative_to(REPO_ROOT)} missing — run capture first) ===")
+        return 1
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    current = _collect(args)
+    if baseline.get("fixture") != current["fixture"]:
+        print(f"\n=== RESULT: FIXTURE MISMATCH (baseline={baseline.get('fixture')} current={current['fixture']}) ===")
+        return 1
+    base_results = baseline.get("results", {})
+    if args.filter:
+        base_results = {k: v for k, v in base_results.items() if args.filter in k}
+    rows = compare_results(
+        base_results, current["results"],
+        threshold_pct=args.threshold if args.threshold is not None else baseline.get("threshold_pct", DEFAULT_THRESHOLD_PCT),
+        per_bench=baseline.get("thresholds", {}),
+    )
+    return 1 if _print_rows(rows) else 0
+
+
+def _run_at_ref(ref: str, args, workdir: Path) -> Dict[str, Any]:
+    """Check out `ref` into a temporary worktree and run THIS harness against it."""
+    tree = workdir / ref.replace("/", "_")
+    subprocess.run(["git", "-C", str(REPO_ROOT), "worktree", "add", "--detach", str(tree), ref],
+                   check=True, capture_output=True)
+    try:
+        out = workdir / f"{tree.name}.json"
+        cmd = [sys.executable, str(Path(__file__).resolve()), "run", "--json", str(out),
+               "--symbols", str(args.symbols), "--bars", str(args.bars), "--mode", args.mode]
+        if args.filter:
+            cmd += ["--filter", args.filter]
+        if args.rounds is not None:
+            cmd += ["--rounds", str(args.rounds)]
+        print(f"[perf_bench] {ref} -> {tree}")
+        subprocess.run(cmd, cwd=tree, check=True, env={**os.environ, "PYTHONPATH": str(tree)})
+        return json.loads(out.read_text(encoding="utf-8"))
+    finally:
+        subprocess.run(["git", "-C", str(REPO_ROOT), "worktree", "remove", "--force", str(tree)],
+                       capture_output=True)
+
+
+def cmd_compare(args) -> int:
+    """Run both refs in isolated worktrees; fail if ref_b regresses vs ref_a."""
+    with tempfile.TemporaryDirectory(prefix="perf_bench_") as tmp:
+        a = _run_at_ref(args.ref_a, args, Path(tmp))
+        b = _run_at_ref(args.ref_b, args, Path(tmp))
+    threshold = args.threshold
+    per_bench: Dict[str, float] = {}
+    if threshold is None and BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        threshold = baseline.get("threshold_pct")
+        per_bench = baseline.get("thresholds", {})
+    rows = compare_results(a["results"], b["results"], threshold or DEFAULT_THRESHOLD_PCT, per_bench)
+    print(f"\n[perf_bench] {args.ref_a} (base) vs {args.ref_b} (candidate)")
+    return 1 if _print_rows(rows) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.diagnostics.perf_bench")
+    sub = parser.add_subparsers(dest="cmd")
+
+    def _common(p):
+        p.add_argument("--filter", default=None, help="Only run benches whose name contains this")
+        p.add_argument("--rounds", type=int, default=None, help="Override timed rounds per bench")
+        p.add_argument("--symbols", type=int, default=DEFAULT_SYMBOLS)
+        p.add_argument("--bars", type=int, default=DEFAULT_BARS)
+        p.add_argument("--mode", default="stealth")
+        p.add_argument("--threshold", type=float, default=None, help="Regression limit in percent")
+
+    p_run = sub.add_parser("run")
+    _common(p_run)
+    p_run.add_argument("--json", default=None)
+    _common(sub.add_parser("capture"))
+    _common(sub.add_parser("verify"))
+    p_cmp = sub.add_parser("compare")
+    p_cmp.add_argument("ref_a")
+    p_cmp.add_argument("ref_b")
+    _common(p_cmp)
+
+    args = parser.parse_args(list(sys.argv[1:] if argv is None else argv) or ["verify"])
+    handlers = {"run": cmd_run, "capture": cmd_capture, "verify": cmd_verify, "compare": cmd_compare}
+    return handlers[args.cmd](args)
+
+
+if __name__ == "__main__":
+    # Invoked by file path from `compare` inside a worktree: drop this file's
+    # directory from sys.path so the worktree's `backend` package wins.
+    if sys.path and Path(sys.path[0]).resolve() == DIAG_DIR.resolve():
+        sys.path.pop(0)
+    raise SystemExit(main())
@@ -6,7 +6,7 @@ against historical data for validation and testing.
 """
 
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 from pathlib import Path
 
@@ -25,23 +25,45 @@ class BacktestAdapter:
     """
     Mock exchange adapter that serves historical data from CSV.
     Implements the interface required by IngestionPipeline.
+
+    Args:
+        csv_path: CSV with symbol, timeframe, timestamp, open, high, low, close, volume
+        data: the same layout already in memory (e.g. a synthetic universe from
+              backend.data.adapters.synthetic_universe) instead of a CSV
     """
 
-    def __init__(self, csv_path: Path):
+    REQUIRED_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+    def __init__(self, csv_path: Optional[Path] = None, data: Optional[pd.DataFrame] = None):
+        if csv_path is None and data is None:
+            raise ValueError("BacktestAdapter needs csv_path or data")
         self.csv_path = csv_path
-        self._data = self._load_data()
+        self._data = self._load_data() if data is None else self._normalize(data)
         self.symbols = self._data["symbol"].unique().tolist()
-        logger.info(f"BacktestAdapter initialized with {len(self.symbols)} symbols from {csv_path}")
+        # Split once per (symbol, timeframe); masking the whole table on every
+        # fetch is O(rows) and dominates large universes
+        columns = self._data[self.REQUIRED_COLUMNS]
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        for key, rows in self._data.groupby(["symbol", "timeframe"], sort=False, observed=True).indices.items():
+            frame = columns.take(rows).reset_index(drop=True)
+            if not frame["timestamp"].is_monotonic_increasing:
+                frame = frame.sort_values("timestamp").reset_index(drop=True)
+            self._frames[key] = frame
+        source = csv_path if data is None else "in-memory data"
+        logger.info(f"BacktestAdapter initialized with {len(self.symbols)} symbols from {source}")
 
     def _load_data(self) -> pd.DataFrame:
         """Load and normalize CSV data."""
         if not self.csv_path.exists():
             raise FileNotFoundError(f"Backtest data not found at {self.csv_path}")
 
-        df = pd.read_csv(self.csv_path)
+        return self._normalize(pd.read_csv(self.csv_path))
 
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
         # Ensure timestamp is datetime
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        if not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+            df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
 
         # Normalize columns if needed (already correct in checked CSV)
         return df
@@ -58,20 +80,14 @@ class BacktestAdapter:
         Returns:
             DataFrame with OHLCV data
         """
-        # Filter by symbol and timeframe
-        mask = (self._data["symbol"] == symbol) & (self._data["timeframe"] == timeframe)
-        df = self._data[mask].copy()
+        df = self._frames.get((symbol, timeframe))
 
-        if df.empty:
+        if df is None or df.empty:
             logger.warning(f"No backtest data for {symbol} {timeframe}")
             return pd.DataFrame()
 
-        # Select and order columns required by IngestionPipeline
-        required_cols = ["timestamp", "open", "high", "low", "close", "volume"]
-
-        # Sort and return
-        df = df.sort_values("timestamp").reset_index(drop=True)
-        return df[required_cols]
+        # Sorted, with the columns required by IngestionPipeline
+        return df.copy()
 
     def get_top_symbols(self, n: int = 20, quote_currency: str = "USDT") -> List[str]:
         """Return available symbols in the backtest dataset."""
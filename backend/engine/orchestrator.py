@@ -36,7 +36,8 @@ from backend.shared.models.smc import SMCSnapshot
 from backend.shared.models.scoring import ConfluenceBreakdown
 from backend.shared.models.planner import TradePlan
 from backend.shared.models.regime import MarketRegime, SymbolRegime
-from backend.analysis.regime_detector import get_regime_detector
+from backend.analysis.regime_detector import RegimeDetector, get_regime_detector
+from backend.analysis.universe_regime import PrecomputedTrend, UniverseRegime, compute_universe_regime
 from backend.analysis.regime_policies import get_regime_policy
 from backend.strategy.planner.regime_engine import select_market_regime
 from backend.shared.utils.logging_utils import (
@@ -59,6 +60,7 @@ from backend.risk.position_sizer import PositionSizer
 from backend.analysis.macro_context import MacroContext
 from backend.analysis.htf_levels import HTFLevelDetector
 
+from backend.engine import stage_profiler
 from backend.engine.cooldown_manager import CooldownManager
 from backend.engine.decision import (
     DecisionPolicy,
@@ -287,10 +289,16 @@ class Orchestrator:
         # This ensures planner uses mode-specific thresholds, not ScanConfig defaults
         self.apply_mode(self.scanner_mode)
 
-        # Regime detection
-        self.regime_detector = get_regime_detector()
+        # Regime detection. Replay orchestrators get their own stateless
+        # detector: the shared one caches by wall clock, carries hysteresis
+        # between readings and is also fed by live scans.
+        self.regime_detector = (
+            RegimeDetector(replay_mode=True) if self.replay_mode else get_regime_detector()
+        )
         self.regime_policy = get_regime_policy(self.scanner_mode.name)
         self.current_regime: Optional[MarketRegime] = None
+        # Universe-level trend pass (per-symbol PrecomputedTrend + breadth); once per scan
+        self.universe_regime: Optional[UniverseRegime] = None
         # Macro context (dominance/flows); compute once per scan when available
         self.macro_context: Optional[MacroContext] = None
 
@@ -486,6 +494,27 @@ class Orchestrator:
             logger.warning("Regime detection failed: %s - continuing without regime context", e)
             self.current_regime = None
 
+        # Universe regime: trend inputs for every symbol in one matrix pass.
+        # Workers receive their symbol's PrecomputedTrend instead of re-deriving it.
+        self.universe_regime = None
+        if self.regime_detector and prefetched_data:
+            try:
+                self.universe_regime = compute_universe_regime(prefetched_data, self.regime_detector)
+                logger.info("🌐 Universe regime: %s", self.universe_regime.to_dict())
+                self._progress("UNIVERSE_REGIME", self.universe_regime.to_dict())
+            except Exception as e:
+                logger.warning("Universe regime pass failed: %s - workers derive trend per symbol", e)
+                self.universe_regime = None
+
+        # Fold the new bars into the risk manager's EWMA correlation matrix so
+        # correlated-exposure checks run on measured correlations, not only the
+        # static groups. Worker orchestrators get the result via worker_args.
+        if prefetched_data:
+            try:
+                self.risk_manager.update_correlations_from_universe(prefetched_data)
+            except Exception as e:
+                logger.warning("Correlation update failed: %s - keeping previous matrix", e)
+
         # Compute macro context using pre-fetched data (no additional API calls)
         try:
             self.macro_context = self._compute_macro_context_from_data(prefetched_data)
@@ -518,6 +547,7 @@ class Orchestrator:
         # Prepare inputs for child processes
         # We pass minimal serializable data to avoid pickling the main Orchestrator object's locks
         worker_args = []
+        correlations = self.risk_manager.correlation_snapshot()
         for sym in symbols:
             # Task 1: Get exchange precision metadata for rounding
             tick_size = 0.0
@@ -540,7 +570,9 @@ class Orchestrator:
                 self.current_regime,  # global regime → HTF-alignment bonus + ranging leniency (audit #8)
                 self.scanner_mode,
                 tick_size,  # Pass tick_size to worker
-                lot_size    # Pass lot_size to worker
+                lot_size,   # Pass lot_size to worker
+                self.universe_regime.trends.get(sym) if self.universe_regime else None,
+                correlations,  # this scan's EWMA matrix for the worker's risk checks
             ))
 
         # Process symbols with ProcessPoolExecutor for true CPU parallelism
@@ -601,6 +633,7 @@ class Orchestrator:
         
         # Max workers from config if specified
         max_workers = getattr(self.config, "max_parallel_symbols", self.concurrency_workers)
+        _profile_mode = getattr(self.scanner_mode, "name", self.config.profile)
 
         with ProcessPoolExecutor(max_workers=max_workers) as executor:
             # Submit all tasks using the module-level worker
@@ -611,7 +644,8 @@ class Orchestrator:
             for future in as_completed(future_to_symbol):
                 sym = future_to_symbol[future]
                 try:
-                    result, rejection_info = future.result(timeout=120)  # 120s timeout per symbol
+                    result, rejection_info, stage_timings = future.result(timeout=120)  # 120s timeout per symbol
+                    stage_profiler.record(_profile_mode, stage_timings, run_id=run_id)
                     processed_symbol_results.append((sym, result, rejection_info))
                     _update_stale_counter_from_result(sym, rejection_info)
                     completed += 1
@@ -1139,6 +1173,7 @@ class Orchestrator:
         prefetched_data: Optional[MultiTimeframeData] = None,
         tick_size: float = 0.0,
         lot_size: float = 0.0,
+        precomputed_trend: Optional[PrecomputedTrend] = None,
     ) -> tuple[Optional[TradePlan], Optional[Dict[str, Any]]]:
         """
         Process single symbol through complete pipeline.
@@ -1148,6 +1183,8 @@ class Orchestrator:
             run_id: Unique scan run identifier
             timestamp: Scan timestamp
             prefetched_data: Optional pre-fetched multi-timeframe data (avoids duplicate API call)
+            precomputed_trend: Optional trend verdict from the scan's universe regime
+                pass; skips the per-symbol trend derivation in Stage 3.5
 
         Returns:
             Tuple of (TradePlan if qualifying, rejection_info dict if rejected)
@@ -1188,6 +1225,7 @@ class Orchestrator:
         context.macro_context = self.macro_context
 
         # Stage 2: Data ingestion (use pre-fetched data if available, else fetch)
+        stage_profiler.enter("ingest")
         if prefetched_data is not None:
             context.multi_tf_data = prefetched_data
             logger.debug("📊 %s: Using pre-fetched data", symbol)
@@ -1241,6 +1279,7 @@ class Orchestrator:
         # propagate back to filter_stale_symbols().
 
         # Stage 2.5: Check critical timeframe availability
+        stage_profiler.enter("gates")
         missing_critical_tfs = self._check_critical_timeframes(context.multi_tf_data)
         if missing_critical_tfs:
             logger.info(
@@ -1318,6 +1357,7 @@ class Orchestrator:
         context.metadata["missing_critical_timeframes"] = missing_critical_tfs
 
         # Stage 3: Indicator computation
+        stage_profiler.enter("indicators")
         try:
             context.multi_tf_indicators = self.indicator_service.compute(context.multi_tf_data)
 
@@ -1339,12 +1379,14 @@ class Orchestrator:
             return None, {"symbol": symbol, "reason": str(e), "reason_type": "errors"}
 
         # Stage 3.5: Detect symbol-specific regime (after indicators computed)
+        stage_profiler.enter("regime")
         if context.multi_tf_data and context.multi_tf_indicators and self.regime_detector:
             try:
                 symbol_regime = self.regime_detector.detect_symbol_regime(
                     symbol=symbol,
                     data=context.multi_tf_data,
                     indicators=context.multi_tf_indicators,
+                    precomputed_trend=precomputed_trend,
                 )
                 context.metadata["symbol_regime"] = symbol_regime
                 logger.debug(
@@ -1401,6 +1443,7 @@ class Orchestrator:
                 logger.debug("%s: Intermediate regime detection skipped: %s", symbol, e)
 
         # Stage 4: SMC detection
+        stage_profiler.enter("smc")
         logger.info("%s [%s]: 🔍 Starting SMC detection", symbol, trace_id)
         try:
             # Get current price for P/D zones
@@ -1452,6 +1495,7 @@ class Orchestrator:
             return None, {"symbol": symbol, "reason": str(e), "reason_type": "errors"}
 
         # Stage 4a: HTF Level Detection (S/R and Fibs)
+        stage_profiler.enter("htf_levels")
         logger.debug("%s [%s]: 🔎 Stage 4a: HTF Level Detection", symbol, trace_id)
         try:
             current_price = context.multi_tf_data.get_current_price() or 0
@@ -1478,6 +1522,7 @@ class Orchestrator:
             logger.warning(f"HTF Level detection failed for {symbol}: {e}")
 
         # Stage 4b: Volume Profile calculation (institutional-grade VAP analysis)
+        stage_profiler.enter("volume_profile")
         logger.debug("%s [%s]: 🔎 Stage 4b: Volume Profile", symbol, trace_id)
         try:
             # Use RELATIVITY_MAP for dynamic timeframe and lookback
@@ -1523,6 +1568,7 @@ class Orchestrator:
             logger.debug("Volume profile calculation skipped: %s", e)
 
         # Stage 5: Confluence scoring (Delegated to service)
+        stage_profiler.enter("confluence")
         logger.info("%s [%s]: 📊 Starting confluence scoring", symbol, trace_id)
         try:
             # --- Inline Context Detection ---
@@ -1532,51 +1578,46 @@ class Orchestrator:
             # 1. Cycle Context
             cycle_context = None
             try:
-                # FIXED: Use mode's primary TF instead of hardcoded 4H
-                cycle_tf = getattr(self.config, "primary_planning_timeframe", "4h")
-                cycle_df = context.multi_tf_data.timeframes.get(
-                    cycle_tf
-                ) or context.multi_tf_data.timeframes.get("1h")
-                if cycle_df is not None:
-                    cycle_context = detect_cycle_context(cycle_df, CycleConfig())
-
-                    # ── BRIDGE: merge symbol_detector failure flags ───────────────
-                    # detect_symbol_cycles has more reliable failure tracking
-                    # (buffer logic, proper window constraints) than cycle_detector's
-                    # raw price comparison. Merge its is_failed flags into CycleContext
-                    # as INFORMATIONAL metadata only — do NOT force directional bias.
-                    # Let confluence scoring drive direction based on full signal picture.
-                    try:
-                        from backend.strategy.smc.symbol_cycle_detector import detect_symbol_cycles
-                        sym_cycles = detect_symbol_cycles(
-                            cycle_df,
-                            symbol=symbol,
-                            current_price=current_price_val,
-                        )
-                        # Use dataclasses.replace to avoid mutating frozen fields
-                        import dataclasses
-                        cycle_context = dataclasses.replace(
-                            cycle_context,
-                            dcl_failed=sym_cycles.dcl.is_failed,
-                            wcl_failed=sym_cycles.wcl.is_failed,
+                # Off by default: the detector windows assume daily bars, and cycle
+                # bonuses/penalties in the scorer are unvalidated on the planning TF.
+                from backend.services.cycle_state_service import (
+                    cycle_scoring_enabled,
+                    get_cycle_state_service,
+                )
+
+                if cycle_scoring_enabled():
+                    # FIXED: Use mode's primary TF instead of hardcoded 4H
+                    cycle_tf = getattr(self.config, "primary_planning_timeframe", "4h")
+                    cycle_df = context.multi_tf_data.timeframes.get(cycle_tf)
+                    if cycle_df is None:
+                        cycle_tf = "1h"
+                        cycle_df = context.multi_tf_data.timeframes.get(cycle_tf)
+                    if cycle_df is not None:
+                        # Served from the shared cycle state: recomputed only when a
+                        # new candle closes (or, for the failure flags, when the price moves).
+                        # The flags come from detect_symbol_cycles, which has more
+                        # reliable failure tracking (buffer logic, proper window
+                        # constraints) than cycle_detector's raw price comparison. They
+                        # are INFORMATIONAL metadata only — do NOT force directional bias.
+                        # Let confluence scoring drive direction based on full signal picture.
+                        cycle_state = get_cycle_state_service().update(
+                            symbol, cycle_df, timeframe=cycle_tf, current_price=current_price_val
                         )
+                        cycle_context = cycle_state.cycle_context()
+
                         # Log cycle failures as informational context (not directional override)
-                        if sym_cycles.wcl.is_failed:
+                        if cycle_context.wcl_failed:
                             logger.info(
                                 "%s: WCL FAILED — weekly cycle broken (informational, not forcing direction)",
                                 symbol,
                             )
-                        elif sym_cycles.dcl.is_failed:
+                        elif cycle_context.dcl_failed:
                             logger.info(
                                 "%s: DCL FAILED — daily cycle broken (informational, not forcing direction)",
                                 symbol,
                             )
-                    except Exception as e:
-                        logger.debug("%s: Symbol cycle merge skipped: %s", symbol, e)
-                    # ─────────────────────────────────────────────────────────────
-
-            except Exception:
-                pass
+            except Exception as e:
+                logger.debug("%s: Cycle context skipped: %s", symbol, e)
 
             # 2. Reversal Context
             rev_ctx_long = None
@@ -2371,6 +2412,7 @@ class Orchestrator:
 
 
         # Stage 6: Trade planning
+        stage_profiler.enter("planner")
         logger.debug("%s [%s]: Generating trade plan", symbol, trace_id)
         # current_price already computed above for cooldown check
         chosen_direction = context.metadata.get("chosen_direction", "UNKNOWN")
@@ -2533,6 +2575,7 @@ class Orchestrator:
             self._progress("PLANNER_FAIL", {"symbol": symbol, "reason": "error"})
 
         # Stage 7: Risk validation
+        stage_profiler.enter("risk")
         logger.debug("%s [%s]: Validating risk parameters", symbol, trace_id)
         risk_failure_reason = None
         if context.plan:
@@ -2857,6 +2900,24 @@ class Orchestrator:
         self._last_replay_context = None
         return plan, rejection_info, captured
 
+    # Instance state a replay step carries into the next one (everything else
+    # process_symbol_for_replay touches is reset per call).
+    _REPLAY_CARRY_ATTRS = ("current_regime", "macro_context")
+
+    def export_replay_state(self) -> Dict[str, Any]:
+        """
+        Snapshot the cross-step state of a replay orchestrator so the replay
+        engine can checkpoint it and later resume from that bar instead of
+        recomputing from the start of the window. Values are replaced, never
+        mutated, between steps, so references are sufficient.
+        """
+        return {attr: getattr(self, attr, None) for attr in self._REPLAY_CARRY_ATTRS}
+
+    def restore_replay_state(self, state: Dict[str, Any]) -> None:
+        """Restore a snapshot taken by export_replay_state()."""
+        for attr in self._REPLAY_CARRY_ATTRS:
+            setattr(self, attr, state.get(attr))
+
     def _progress(self, stage: str, data: Dict[str, Any]):
         """Pass progress up to orchestrator level (to be hooked by service)."""
         # This is a stub - real implementer is in scanner_service.py
@@ -4915,10 +4976,18 @@ def _parallel_process_symbol_worker(args):
     The Orchestrator is cached at module level per worker process so that
     initialisation (RegimeDetector, HTFLevelDetector, domain services, etc.)
     only happens once per worker, not once per symbol.
+
+    Returns (plan, rejection_info, stage_timings). stage_timings is the
+    {stage: ms} dict from stage_profiler (None when the profiler is
+    disabled or the worker failed before processing started).
     """
     global _WORKER_ORCHESTRATOR, _WORKER_CONFIG_ID
 
-    symbol, run_id, timestamp, prefetched_data, config, macro_context, current_regime, scanner_mode, tick_size, lot_size = args
+    symbol, run_id, timestamp, prefetched_data, config, macro_context, current_regime, scanner_mode, tick_size, lot_size, *extra = args
+    # Optional trailing PrecomputedTrend from the scan's universe regime pass,
+    # then the parent RiskManager's correlation snapshot.
+    precomputed_trend = extra[0] if extra else None
+    correlations = extra[1] if len(extra) > 1 else None
 
     try:
         # Rebuild the orchestrator only when the worker is brand-new or the
@@ -4952,15 +5021,27 @@ def _parallel_process_symbol_worker(args):
         _WORKER_ORCHESTRATOR.macro_context = macro_context
         _WORKER_ORCHESTRATOR.current_regime = current_regime
         _WORKER_ORCHESTRATOR.scanner_mode = scanner_mode
-
-        return _WORKER_ORCHESTRATOR._process_symbol(
-            symbol,
-            run_id,
-            timestamp,
-            prefetched_data=prefetched_data,
-            tick_size=tick_size,
-            lot_size=lot_size,
-        )
+        # The worker's own RiskManager never sees scan data: without this its
+        # correlated-exposure check would fall back to the static groups.
+        if correlations is not None:
+            _WORKER_ORCHESTRATOR.risk_manager.load_correlation_snapshot(correlations)
+
+        # Stage timings ride back with the result as a plain dict; the parent
+        # folds them into stage_profiler's per-mode histograms.
+        stage_profiler.begin()
+        try:
+            result, rejection_info = _WORKER_ORCHESTRATOR._process_symbol(
+                symbol,
+                run_id,
+                timestamp,
+                prefetched_data=prefetched_data,
+                tick_size=tick_size,
+                lot_size=lot_size,
+                precomputed_trend=precomputed_trend,
+            )
+        finally:
+            stage_timings = stage_profiler.end()
+        return result, rejection_info, stage_timings
 
     except Exception as e:
         import traceback
@@ -4970,4 +5051,4 @@ def _parallel_process_symbol_worker(args):
             "reason_type": "errors",
             "reason": f"Process worker error: {str(e)}",
             "error_details": tb,
-        }
+        }, None
@@ -22,6 +22,29 @@ Scope (per the approved plan):
     - 30-day max window
     - Ring buffer of last 20 step results for instant back-scrub
 
+Incremental stepping:
+    - At load, a BarCloseIndex precomputes for every playback bar how many
+      rows of each TF have closed (one searchsorted per TF), so a step
+      slices with iloc instead of re-masking the full frames.
+    - Every CHECKPOINT_INTERVAL bars the orchestrator's carry-over state
+      (keep-last-good regime, macro context) is checkpointed with the
+      step result. Seeks beyond the ring buffer resume from the nearest
+      checkpoint at or before the target instead of from bar 0.
+    - Steps carry candles as deltas: when the client passes the index it
+      currently shows, only the bars that closed since then are sent
+      (candles_mode="delta"); otherwise the last CANDLE_PAYLOAD_ROWS bars
+      per TF (candles_mode="full").
+
+Jump-to-next-signal search:
+    Upcoming bars are evaluated speculatively in SEARCH_CHUNK_BARS chunks
+    on a per-session process pool, every chunk starting from the carry-over
+    state at the search start. A chunk is accepted, in index order, only if
+    that assumption held — the state it started from equals the real state
+    before its first bar, or its first bar computed a fresh regime (the
+    only state a bar reads). Otherwise the search finishes sequentially.
+    Accepted bars fill the ring buffer and checkpoints exactly as
+    sequential stepping would. The search is cancellable (cancel_search).
+
 Session storage is an in-memory dict + threading.Lock. Sessions are pinned
 to one FastAPI worker process; deployments using --workers > 1 will not
 share session state across workers (acceptable for single-operator local
@@ -32,13 +55,15 @@ Six-concern table (CLAUDE.md §16 Rubric 1):
        collision probability negligible. Run-ids prefixed with "replay-".
     2. Concurrency: (a) _REPLAY_ENGINE singleton guarded by _REPLAY_ENGINE_LOCK
        at module level. (b) ReplayEngine._sessions dict guarded by self._lock.
-       (c) Per-session state (step_index, ring_buffer, orchestrator) is NOT
+       (c) Per-session state (step_index, ring_buffer, checkpoints, orchestrator) is NOT
        lock-guarded — the router contract is single-threaded per session_id
        (frontend issues serial step calls, never parallel). Documented here
        and in ReplaySession docstring. If a future change introduces parallel
-       per-session traffic, add a session-scoped lock.
+       per-session traffic, add a session-scoped lock. The one exception,
+       cancel_search, only sets the session's threading.Event.
     3. Silent-failure: _slice_to_bar_close asserts mass conservation runtime
-       (catches "row vanished" bug class). _serialize_smc logs every
+       (catches "row vanished" bug class); BarCloseIndex slices are the same
+       rows as prefixes of the time-sorted frame (parity unit-tested). _serialize_smc logs every
        per-item exception (no silent suppression per CLAUDE.md §15).
        Adapter fetch errors raise loudly via _fetch_window.
     4. Retrieval: get_session returns Optional, callers handle None.
@@ -56,18 +81,23 @@ Six-concern table (CLAUDE.md §16 Rubric 1):
 
 from __future__ import annotations
 
+import bisect
+import os
 import threading
 import uuid
 from collections import deque
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from backend.data.ingestion_pipeline import IngestionPipeline
 from backend.engine.context import SniperContext
+from backend.engine.decision import is_fresh_entry_price
 from backend.engine.orchestrator import Orchestrator
 from backend.shared.config.defaults import ScanConfig
 from backend.shared.config.scanner_modes import (
@@ -104,9 +134,20 @@ MAX_WINDOW_DAYS = 30
 # In-memory session TTL — sessions idle past this are GC'd on the next step
 SESSION_IDLE_TTL_SECONDS = 30 * 60
 
-# Ring-buffer depth for instant back-scrub (deeper scrub triggers recompute)
+# Ring-buffer depth for instant back-scrub (deeper scrub resumes from a checkpoint)
 RING_BUFFER_DEPTH = 20
 
+# Bars between orchestrator-state checkpoints (a seek recomputes at most this many)
+CHECKPOINT_INTERVAL = 24
+
+# Candles per TF in a full chart payload (and the client-side window for deltas)
+CANDLE_PAYLOAD_ROWS = 1000
+
+# Jump-to-next-signal speculative search: bars per worker task, and the
+# default per-session worker count (0/1 = sequential search only)
+SEARCH_CHUNK_BARS = 8
+SEARCH_WORKERS = max(0, min(4, (os.cpu_count() or 1) - 1))
+
 # BTC/USDT must be prefetched alongside the chosen symbol so the regime
 # detector sees historical BTC, not live. Mandatory per the audit plan.
 BTC_SYMBOL = "BTC/USDT"
@@ -127,6 +168,80 @@ class StepResult:
     smc_snapshot: Optional[Dict[str, Any]] = None
     regime: Optional[Dict[str, Any]] = None
     signal_fired: bool = False
+    # "full": candles_by_tf holds the last CANDLE_PAYLOAD_ROWS bars per TF;
+    # "delta": only the bars closed since the client's index (append + trim)
+    candles_mode: str = "full"
+
+
+@dataclass
+class _Checkpoint:
+    """Orchestrator carry-over state right after computing `index` (-1 = fresh)."""
+
+    index: int
+    state: Dict[str, Any]
+    result: Optional[StepResult]
+
+
+class BarCloseIndex:
+    """
+    Per-TF closed-row counts for every playback bar, computed once per session.
+
+    counts[tf][i] is the number of rows of `tf` whose bar has closed at the
+    close of playback bar i (bar_open + tf_seconds <= close_i) — the same
+    rows _slice_to_bar_close's mask selects, as a prefix of the time-sorted
+    frame. OHLCV columns are kept as arrays so chart payloads are array
+    slices rather than DataFrame row iteration.
+    """
+
+    def __init__(self, full_by_tf: Dict[str, pd.DataFrame], step_close_ns: np.ndarray) -> None:
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.counts: Dict[str, np.ndarray] = {}
+        self._times: Dict[str, np.ndarray] = {}
+        self._ohlcv: Dict[str, np.ndarray] = {}
+        for tf, df in full_by_tf.items():
+            tf_lower = tf.lower()
+            if tf_lower not in TF_SECONDS:
+                logger.warning("Replay index: unknown TF '%s', skipping", tf)
+                continue
+            if df is None or len(df) == 0:
+                continue
+            open_ns = _timestamps_ns(df["timestamp"])
+            if len(open_ns) > 1 and (np.diff(open_ns) < 0).any():
+                order = np.argsort(open_ns, kind="stable")
+                df = df.iloc[order]
+                open_ns = open_ns[order]
+            close_ns = open_ns + TF_SECONDS[tf_lower] * 1_000_000_000
+            self.frames[tf] = df
+            self.counts[tf] = np.searchsorted(close_ns, step_close_ns, side="right")
+            self._times[tf] = open_ns // 1_000_000_000
+            self._ohlcv[tf] = df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float)
+
+    def counts_at(self, index: int) -> Dict[str, int]:
+        """{tf: closed rows} at playback bar `index` (TFs with no closed bar omitted)."""
+        out = {}
+        for tf, counts in self.counts.items():
+            n = int(counts[index])
+            if n > 0:
+                out[tf] = n
+        return out
+
+    def slice(self, index: int) -> Dict[str, pd.DataFrame]:
+        """Frames sliced to the bars closed at playback bar `index`."""
+        return {tf: self.frames[tf].iloc[:n].copy() for tf, n in self.counts_at(index).items()}
+
+    def candles(self, tf: str, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Chart payload rows [start, stop) of `tf` ({time, open, high, low, close, volume})."""
+        times = self._times[tf][start:stop].tolist()
+        ohlcv = self._ohlcv[tf][start:stop].tolist()
+        return [
+            {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for t, (o, h, lo, c, v) in zip(times, ohlcv)
+        ]
+
+
+def _timestamps_ns(col: pd.Series) -> np.ndarray:
+    """UTC epoch nanoseconds of a timestamp column (naive = UTC)."""
+    return pd.DatetimeIndex(pd.to_datetime(col, utc=True)).as_unit("ns").asi8.copy()
 
 
 @dataclass
@@ -148,11 +263,24 @@ class ReplaySession:
         default_factory=lambda: deque(maxlen=RING_BUFFER_DEPTH)
     )
     last_touched: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # Built by load_session, or on first step for sessions constructed directly
+    symbol_index: Optional[BarCloseIndex] = None
+    btc_index: Optional[BarCloseIndex] = None
+    checkpoints: Dict[int, _Checkpoint] = field(default_factory=dict)
+    checkpoint_indices: List[int] = field(default_factory=list)  # sorted keys of checkpoints
+    # Jump-to-next-signal search: cancel flag (set by cancel_search / end_session)
+    # and the session's worker pool (created on the first parallel search)
+    search_cancel: threading.Event = field(default_factory=threading.Event)
+    search_pool: Optional[ProcessPoolExecutor] = None
 
     @property
     def total_bars(self) -> int:
         return len(self.bar_timestamps)
 
+    def current_ts_at(self, index: int) -> datetime:
+        """Close of playback bar `index` (the synthetic 'now' of that step)."""
+        return self.bar_timestamps[index] + timedelta(seconds=TF_SECONDS[self.tf_step])
+
 
 def _to_jsonable(v: Any) -> Any:
     """Coerce numpy / pandas / datetime scalars to JSON-native Python types
@@ -397,13 +525,146 @@ def _serialize_regime(regime) -> Optional[Dict[str, Any]]:
     }
 
 
+def _ensure_index(session: ReplaySession) -> BarCloseIndex:
+    """Build the session's BarCloseIndex pair on first use (sessions
+    constructed outside load_session, e.g. diagnostics, arrive without)."""
+    if session.symbol_index is None or session.btc_index is None:
+        step_close_ns = _timestamps_ns(pd.Series(session.bar_timestamps)) + (
+            TF_SECONDS[session.tf_step] * 1_000_000_000
+        )
+        session.symbol_index = BarCloseIndex(session.multi_tf_full, step_close_ns)
+        session.btc_index = BarCloseIndex(session.btc_full, step_close_ns)
+    return session.symbol_index
+
+
+def _compute_step(session: ReplaySession, index: int) -> StepResult:
+    """Slice data, run orchestrator, return StepResult (without candles —
+    _render attaches those). Side effects are limited to the
+    orchestrator's carry-over state; the caller manages step_index,
+    ring buffer and checkpoints."""
+    bar_open = session.bar_timestamps[index]
+    current_ts = session.current_ts_at(index)
+
+    _ensure_index(session)
+    sliced_symbol = session.symbol_index.slice(index)
+    sliced_btc = session.btc_index.slice(index)
+
+    # If a critical TF didn't make it through slicing (e.g. very early
+    # in the window before the HTF bar has formed), surface an empty
+    # rejection rather than calling the orchestrator with garbage.
+    if not sliced_symbol:
+        return StepResult(
+            index=index,
+            bar_open_ts=bar_open,
+            current_ts=current_ts,
+            candles_by_tf={},
+            rejection={
+                "reason_type": "no_data_at_replay_index",
+                "reason": "No closed bars yet at this index — try a later bar",
+            },
+            signal_fired=False,
+        )
+
+    # Wrap sliced dicts as MultiTimeframeData (the orchestrator's
+    # downstream consumers expect that shape)
+    symbol_data = MultiTimeframeData(symbol=session.symbol, timeframes=sliced_symbol)
+    btc_data = (
+        MultiTimeframeData(symbol=BTC_SYMBOL, timeframes=sliced_btc) if sliced_btc else None
+    )
+
+    run_id = f"replay-{session.session_id}-{index}"
+    try:
+        plan, rejection, context = session.orchestrator.process_symbol_for_replay(
+            symbol=session.symbol,
+            prefetched_data=symbol_data,
+            timestamp=current_ts,
+            run_id=run_id,
+            playback_index=index,
+            session_id=session.session_id,
+            prefetched_btc_data=btc_data,
+        )
+    except Exception as e:
+        # Loud failure (CLAUDE.md §12) but don't kill the session —
+        # surface as a structured rejection so the operator can see it
+        logger.exception("Replay step failed at index=%d: %s", index, e)
+        return StepResult(
+            index=index,
+            bar_open_ts=bar_open,
+            current_ts=current_ts,
+            candles_by_tf={},
+            rejection={"reason_type": "replay_pipeline_error", "reason": str(e)},
+            signal_fired=False,
+        )
+
+    return StepResult(
+        index=index,
+        bar_open_ts=bar_open,
+        current_ts=current_ts,
+        candles_by_tf={},
+        confluence=_serialize_confluence(
+            context.confluence_breakdown if context else None
+        ),
+        plan=_serialize_plan(plan),
+        rejection=rejection,
+        smc_snapshot=_serialize_smc(context.smc_snapshot if context else None),
+        regime=_serialize_regime(session.orchestrator.current_regime),
+        signal_fired=plan is not None,
+    )
+
+
+def _build_replay_orchestrator(mode: ScannerMode, exchange_adapter) -> Orchestrator:
+    """Construct a dedicated Orchestrator for a replay session. The
+    instance is replay_mode=True (sticky) — never re-used for live scans."""
+    # Build a config aligned with the mode. ScanConfig is constructed by
+    # apply_mode internally, but we need a starting config.
+    config = ScanConfig(
+        profile=mode.profile,
+        timeframes=tuple(mode.timeframes),
+        min_confluence_score=mode.min_confluence_score,
+    )
+    # The Orchestrator constructor will call apply_mode() and stamp the
+    # mode-specific overrides into config.
+    return Orchestrator(
+        config=config,
+        exchange_adapter=exchange_adapter,
+        concurrency_workers=1,
+        replay_mode=True,
+    )
+
+
+def _carry_matches(a: Dict[str, Any], b: Dict[str, Any], ignore: Tuple[str, ...] = ()) -> bool:
+    """Whether two export_replay_state() snapshots are equal (values compared
+    by identity, then ==; uncomparable values count as different)."""
+    for key in a.keys() | b.keys():
+        if key in ignore:
+            continue
+        x, y = a.get(key), b.get(key)
+        if x is y:
+            continue
+        try:
+            if not bool(x == y):
+                return False
+        except Exception:
+            return False
+    return True
+
+
+def _release_session(session: ReplaySession) -> None:
+    """Stop a dropped session's search and its worker pool."""
+    session.search_cancel.set()
+    if session.search_pool is not None:
+        session.search_pool.shutdown(wait=False, cancel_futures=True)
+        session.search_pool = None
+
+
 class ReplayEngine:
     """Holds replay sessions and orchestrates per-step slicing + pipeline
     execution. Singleton-style: one ReplayEngine per FastAPI process,
     instantiated at router configuration time."""
 
-    def __init__(self, exchange_adapter):
+    def __init__(self, exchange_adapter, search_workers: Optional[int] = None):
         self._adapter = exchange_adapter
+        self._search_workers = SEARCH_WORKERS if search_workers is None else max(0, search_workers)
         # Cache enabled so historical HTF candles populated by the live bot
         # don't need to be re-fetched (Phemex limits 1d/4h fetches to ~500
         # candles per request, and the live cache typically holds far more).
@@ -500,6 +761,7 @@ class ReplayEngine:
             orchestrator=orchestrator,
             step_index=-1,
         )
+        self._ensure_index(session)
 
         with self._lock:
             self._gc_idle_locked()
@@ -521,18 +783,33 @@ class ReplayEngine:
         with self._lock:
             removed = self._sessions.pop(session_id, None)
         if removed:
+            _release_session(removed)
             logger.info("Replay session ended: id=%s", session_id)
         return removed is not None
 
+    def cancel_search(self, session_id: str) -> bool:
+        """Stop a running jump_to_next_signal for the session at the next
+        bar/chunk boundary. Returns False if the session does not exist."""
+        session = self.get_session(session_id)
+        if session is None:
+            return False
+        session.search_cancel.set()
+        return True
+
     # ------------------------------------------------------------------
     # Per-bar stepping
     # ------------------------------------------------------------------
 
-    def step(self, session_id: str, n: int = 1) -> StepResult:
+    def step(
+        self, session_id: str, n: int = 1, client_index: Optional[int] = None
+    ) -> StepResult:
         """Advance (or retreat) the playback by `n` bars and return the
         StepResult for the new position. Negative `n` goes back; within the
         ring buffer the cached result is returned, otherwise the engine
-        recomputes from window_start to the target index."""
+        resumes from the nearest checkpoint at or before the target.
+
+        `client_index` is the index the caller currently displays; when
+        given, candles are returned as a delta against it (see _render)."""
         session = self.get_session(session_id)
         if session is None:
             raise KeyError(f"Session {session_id} not found or expired")
@@ -544,9 +821,11 @@ class ReplayEngine:
         if target >= session.total_bars:
             target = session.total_bars - 1
 
-        return self._goto_index(session, target)
+        return self._render(session, self._goto_index(session, target), client_index)
 
-    def goto(self, session_id: str, index: int) -> StepResult:
+    def goto(
+        self, session_id: str, index: int, client_index: Optional[int] = None
+    ) -> StepResult:
         """Jump to absolute index (used by timeline-scrub and jump-to-signal)."""
         session = self.get_session(session_id)
         if session is None:
@@ -555,40 +834,78 @@ class ReplayEngine:
             raise IndexError(
                 f"Index {index} out of range [0, {session.total_bars - 1}] for session {session_id}"
             )
-        return self._goto_index(session, index)
+        return self._render(session, self._goto_index(session, index), client_index)
 
     def jump_to_next_signal(
-        self, session_id: str, max_lookahead: int = 100
+        self, session_id: str, max_lookahead: int = 100, client_index: Optional[int] = None
     ) -> Tuple[Optional[StepResult], int]:
         """Step forward up to `max_lookahead` bars until a signal fires
         (plan is not None). Returns (StepResult, bars_advanced). If no
-        signal fires within the lookahead, returns (None, bars_advanced)
-        with the session positioned at the final scanned bar."""
+        signal fires within the lookahead, or the search is cancelled,
+        returns (None, bars_advanced) with the session positioned at the
+        final scanned bar (session.search_cancel tells the two apart)."""
         session = self.get_session(session_id)
         if session is None:
             raise KeyError(f"Session {session_id} not found or expired")
+        session.search_cancel.clear()
 
-        bars_advanced = 0
         # Start from the bar after the current position
         start = session.step_index + 1
         end = min(start + max_lookahead, session.total_bars)
-        for idx in range(start, end):
-            result = self._goto_index(session, idx)
-            bars_advanced += 1
-            if result.signal_fired:
-                return result, bars_advanced
-        # No signal found
-        return None, bars_advanced
+        result, bars_advanced = self._parallel_search(session, start, end)
+        signal_found = result is not None and result.signal_fired
+        if not signal_found and not session.search_cancel.is_set():
+            for idx in range(start + bars_advanced, end):
+                if session.search_cancel.is_set():
+                    break
+                result = self._goto_index(session, idx)
+                bars_advanced += 1
+                if result.signal_fired:
+                    break
+        if result is None or not result.signal_fired:
+            # No signal found (or cancelled)
+            return None, bars_advanced
+        return self._render(session, result, client_index), bars_advanced
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
 
+    def _ensure_index(self, session: ReplaySession) -> BarCloseIndex:
+        return _ensure_index(session)
+
+    def _save_checkpoint(
+        self,
+        session: ReplaySession,
+        index: int,
+        result: Optional[StepResult],
+        state: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if index not in session.checkpoints:
+            bisect.insort(session.checkpoint_indices, index)
+        session.checkpoints[index] = _Checkpoint(
+            index=index,
+            state=session.orchestrator.export_replay_state() if state is None else state,
+            result=result,
+        )
+
+    def _nearest_checkpoint(self, session: ReplaySession, target: int) -> Optional[_Checkpoint]:
+        pos = bisect.bisect_right(session.checkpoint_indices, target)
+        if pos == 0:
+            return None
+        return session.checkpoints[session.checkpoint_indices[pos - 1]]
+
     def _goto_index(self, session: ReplaySession, target: int) -> StepResult:
-        """Move to absolute `target` index. Honors ring buffer; recomputes
-        if target is outside the cached range."""
+        """Move to absolute `target` index. Honors the ring buffer; outside
+        it, resumes from the nearest checkpoint at or before target (when
+        that is closer than the current position) and computes forward."""
+        self._ensure_index(session)
+        if session.step_index == -1 and -1 not in session.checkpoints:
+            # Fresh orchestrator state — the floor every seek can resume from
+            self._save_checkpoint(session, -1, None)
+
         # Ring buffer lookup — only valid for back-scrubs within depth
-        if target < session.step_index:
+        if target <= session.step_index:
             for cached in reversed(session.ring_buffer):
                 if cached.index == target:
                     session.step_index = target
@@ -597,7 +914,24 @@ class ReplayEngine:
                         target, session.session_id,
                     )
                     return cached
-            # Back-scrub beyond ring → reset and recompute up to target
+
+        checkpoint = self._nearest_checkpoint(session, target)
+        if checkpoint is not None and (
+            target < session.step_index or checkpoint.index > session.step_index
+        ):
+            logger.info(
+                "Replay: resuming from checkpoint idx=%d for target=%d (session=%s)",
+                checkpoint.index, target, session.session_id,
+            )
+            session.orchestrator.restore_replay_state(checkpoint.state)
+            session.ring_buffer.clear()
+            session.step_index = checkpoint.index
+            if checkpoint.result is not None:
+                session.ring_buffer.append(checkpoint.result)
+                if checkpoint.index == target:
+                    return checkpoint.result
+        elif target < session.step_index:
+            # No checkpoint to resume from — recompute from the window start
             logger.info(
                 "Replay: back-scrub beyond ring depth — recomputing 0..%d (session=%s)",
                 target, session.session_id,
@@ -606,110 +940,144 @@ class ReplayEngine:
             session.step_index = -1
 
         # Compute the missing bars sequentially up to target. For a single
-        # forward step this is just one compute. For a deep back-scrub it
-        # may be many — frontend shows the "recomputing…" indicator.
+        # forward step this is just one compute; a seek computes at most
+        # CHECKPOINT_INTERVAL bars past the checkpoint it resumed from.
         result: Optional[StepResult] = None
         while session.step_index < target:
             session.step_index += 1
             result = self._compute_step(session, session.step_index)
             session.ring_buffer.append(result)
+            if (session.step_index + 1) % CHECKPOINT_INTERVAL == 0:
+                self._save_checkpoint(session, session.step_index, result)
         assert result is not None, "Should have computed at least one bar"
         return result
 
-    def _compute_step(self, session: ReplaySession, index: int) -> StepResult:
-        """Slice data, run orchestrator, return StepResult. Pure of side
-        effects on the session (caller manages step_index + ring buffer)."""
-        bar_open = session.bar_timestamps[index]
-        tf_step_secs = TF_SECONDS[session.tf_step]
-        current_ts = bar_open + timedelta(seconds=tf_step_secs)
-
-        sliced_symbol = _slice_to_bar_close(session.multi_tf_full, current_ts)
-        sliced_btc = _slice_to_bar_close(session.btc_full, current_ts)
-
-        candles_payload: Dict[str, List[Dict[str, Any]]] = {}
-        for tf, df in sliced_symbol.items():
-            candles_payload[tf] = _candles_to_payload(df)
-
-        # If a critical TF didn't make it through slicing (e.g. very early
-        # in the window before the HTF bar has formed), surface an empty
-        # rejection rather than calling the orchestrator with garbage.
-        if not sliced_symbol:
-            return StepResult(
-                index=index,
-                bar_open_ts=bar_open,
-                current_ts=current_ts,
-                candles_by_tf=candles_payload,
-                rejection={
-                    "reason_type": "no_data_at_replay_index",
-                    "reason": "No closed bars yet at this index — try a later bar",
-                },
-                signal_fired=False,
+    def _render(
+        self, session: ReplaySession, result: StepResult, client_index: Optional[int]
+    ) -> StepResult:
+        """Attach chart candles to a (cached or fresh) StepResult.
+
+        With a `client_index` in [0, result.index] and no TF gaining more
+        than CANDLE_PAYLOAD_ROWS bars since then, only the bars closed after
+        client_index are sent (candles_mode="delta"; the client appends and
+        trims to CANDLE_PAYLOAD_ROWS). Otherwise the last CANDLE_PAYLOAD_ROWS
+        closed bars per TF are sent (candles_mode="full")."""
+        index = self._ensure_index(session)
+        delta = (
+            client_index is not None
+            and 0 <= client_index <= result.index
+            and all(
+                counts[result.index] - counts[client_index] <= CANDLE_PAYLOAD_ROWS
+                for counts in index.counts.values()
             )
+        )
+        payload: Dict[str, List[Dict[str, Any]]] = {}
+        for tf, counts in index.counts.items():
+            stop = int(counts[result.index])
+            if stop == 0:
+                continue
+            start = int(counts[client_index]) if delta else max(0, stop - CANDLE_PAYLOAD_ROWS)
+            payload[tf] = index.candles(tf, start, stop)
+        return replace(result, candles_by_tf=payload, candles_mode="delta" if delta else "full")
 
-        # Wrap sliced dicts as MultiTimeframeData (the orchestrator's
-        # downstream consumers expect that shape)
-        symbol_data = MultiTimeframeData(symbol=session.symbol, timeframes=sliced_symbol)
-        btc_data = (
-            MultiTimeframeData(symbol=BTC_SYMBOL, timeframes=sliced_btc) if sliced_btc else None
+    def _compute_step(self, session: ReplaySession, index: int) -> StepResult:
+        return _compute_step(session, index)
+
+    def _parallel_search(
+        self, session: ReplaySession, start: int, end: int
+    ) -> Tuple[Optional[StepResult], int]:
+        """Speculative chunked search over [start, end) on the session's
+        process pool (see module docstring). Returns (result at the last
+        accepted bar, bars accepted); the result is the signal bar if one
+        fired. (None, 0) when the range is too short, workers are disabled
+        or the first chunk is rejected — the caller continues sequentially
+        from start + bars accepted."""
+        if self._search_workers < 2 or end - start < 2 * SEARCH_CHUNK_BARS:
+            return None, 0
+        if is_fresh_entry_price():
+            # Fresh-price plan geometry reads the live adapter, which the
+            # worker orchestrators do not have — results would differ
+            return None, 0
+        self._ensure_index(session)
+        if session.step_index == -1 and -1 not in session.checkpoints:
+            self._save_checkpoint(session, -1, None)
+
+        pool = self._search_pool(session)
+        assumed = session.orchestrator.export_replay_state()
+        chunks = deque(
+            (a, min(a + SEARCH_CHUNK_BARS, end)) for a in range(start, end, SEARCH_CHUNK_BARS)
         )
+        in_flight: Deque[Tuple[int, Future]] = deque()
 
-        run_id = f"replay-{session.session_id}-{index}"
+        def _submit() -> None:
+            while chunks and len(in_flight) < 2 * self._search_workers:
+                a, b = chunks.popleft()
+                in_flight.append((a, pool.submit(_search_chunk_worker, a, b, assumed)))
+
+        result: Optional[StepResult] = None
+        accepted = 0
         try:
-            plan, rejection, context = session.orchestrator.process_symbol_for_replay(
-                symbol=session.symbol,
-                prefetched_data=symbol_data,
-                timestamp=current_ts,
-                run_id=run_id,
-                playback_index=index,
-                session_id=session.session_id,
-                prefetched_btc_data=btc_data,
-            )
-        except Exception as e:
-            # Loud failure (CLAUDE.md §12) but don't kill the session —
-            # surface as a structured rejection so the operator can see it
-            logger.exception("Replay step failed at index=%d: %s", index, e)
-            return StepResult(
-                index=index,
-                bar_open_ts=bar_open,
-                current_ts=current_ts,
-                candles_by_tf=candles_payload,
-                rejection={"reason_type": "replay_pipeline_error", "reason": str(e)},
-                signal_fired=False,
+            _submit()
+            while in_flight:
+                if session.search_cancel.is_set():
+                    break
+                a, future = in_flight.popleft()
+                try:
+                    steps, fresh_regime = future.result()
+                except Exception as e:
+                    logger.warning(
+                        "Replay search: chunk at idx=%d failed (%s) — continuing sequentially (session=%s)",
+                        a, e, session.session_id,
+                    )
+                    self._drop_search_pool(session)
+                    break
+                actual = session.orchestrator.export_replay_state()
+                if not _carry_matches(actual, assumed, ignore=("current_regime",) if fresh_regime else ()):
+                    logger.debug(
+                        "Replay search: speculation rejected at idx=%d (session=%s)",
+                        a, session.session_id,
+                    )
+                    break
+                for step, state in steps:
+                    session.step_index = step.index
+                    session.ring_buffer.append(step)
+                    session.orchestrator.restore_replay_state(state)
+                    if (step.index + 1) % CHECKPOINT_INTERVAL == 0:
+                        self._save_checkpoint(session, step.index, step, state)
+                    result = step
+                    accepted += 1
+                    if step.signal_fired:
+                        return result, accepted
+                _submit()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+        return result, accepted
+
+    def _search_pool(self, session: ReplaySession) -> ProcessPoolExecutor:
+        if session.search_pool is None:
+            session.search_pool = ProcessPoolExecutor(
+                max_workers=self._search_workers,
+                initializer=_init_search_worker,
+                initargs=(
+                    session.session_id,
+                    session.symbol,
+                    session.mode_name,
+                    session.multi_tf_full,
+                    session.btc_full,
+                    session.tf_step,
+                    session.bar_timestamps,
+                ),
             )
+        return session.search_pool
 
-        return StepResult(
-            index=index,
-            bar_open_ts=bar_open,
-            current_ts=current_ts,
-            candles_by_tf=candles_payload,
-            confluence=_serialize_confluence(
-                context.confluence_breakdown if context else None
-            ),
-            plan=_serialize_plan(plan),
-            rejection=rejection,
-            smc_snapshot=_serialize_smc(context.smc_snapshot if context else None),
-            regime=_serialize_regime(session.orchestrator.current_regime),
-            signal_fired=plan is not None,
-        )
+    def _drop_search_pool(self, session: ReplaySession) -> None:
+        pool, session.search_pool = session.search_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def _build_orchestrator(self, mode: ScannerMode) -> Orchestrator:
-        """Construct a dedicated Orchestrator for a replay session. The
-        instance is replay_mode=True (sticky) — never re-used for live scans."""
-        # Build a config aligned with the mode. ScanConfig is constructed by
-        # apply_mode internally, but we need a starting config.
-        config = ScanConfig(
-            profile=mode.profile,
-            timeframes=tuple(mode.timeframes),
-            min_confluence_score=mode.min_confluence_score,
-        )
-        # The Orchestrator constructor will call apply_mode() and stamp the
-        # mode-specific overrides into config.
-        return Orchestrator(
-            config=config,
-            exchange_adapter=self._adapter,
-            concurrency_workers=1,
-            replay_mode=True,
-        )
+        return _build_replay_orchestrator(mode, self._adapter)
 
     def _fetch_window(
         self,
@@ -778,11 +1146,78 @@ class ReplayEngine:
         cutoff = now - timedelta(seconds=SESSION_IDLE_TTL_SECONDS)
         stale = [sid for sid, s in self._sessions.items() if s.last_touched < cutoff]
         for sid in stale:
-            self._sessions.pop(sid, None)
+            _release_session(self._sessions.pop(sid))
             logger.info("Replay GC: dropped idle session %s", sid)
         return len(stale)
 
 
+# Per-worker-process replay session for the jump-to-next-signal search pool.
+# Each session gets its own pool, so the worker builds the session (frames,
+# BarCloseIndex, replay-mode orchestrator) once in the pool initializer and
+# every chunk task only carries its bar range and the assumed start state.
+# Tasks run one at a time per worker, so the cached orchestrator's per-call
+# replay stash is never shared between concurrent calls.
+_SEARCH_WORKER_SESSION: Optional[ReplaySession] = None
+
+
+class _NoFetchAdapter:
+    """Worker-side adapter stand-in: replay steps run on prefetched frames."""
+
+    def fetch_ohlcv(self, *args, **kwargs):
+        return None
+
+
+def _init_search_worker(
+    session_id: str,
+    symbol: str,
+    mode_name: str,
+    multi_tf_full: Dict[str, pd.DataFrame],
+    btc_full: Dict[str, pd.DataFrame],
+    tf_step: str,
+    bar_timestamps: List[datetime],
+) -> None:
+    global _SEARCH_WORKER_SESSION
+    session = ReplaySession(
+        session_id=session_id,
+        symbol=symbol,
+        mode_name=mode_name,
+        window_start=bar_timestamps[0],
+        window_end=bar_timestamps[-1],
+        multi_tf_full=multi_tf_full,
+        btc_full=btc_full,
+        tf_step=tf_step,
+        bar_timestamps=bar_timestamps,
+        orchestrator=_build_replay_orchestrator(get_mode(mode_name), _NoFetchAdapter()),
+    )
+    _ensure_index(session)
+    _SEARCH_WORKER_SESSION = session
+
+
+def _search_chunk_worker(
+    start: int, stop: int, state: Dict[str, Any]
+) -> Tuple[List[Tuple[StepResult, Dict[str, Any]]], bool]:
+    """
+    Module-level worker for the search pool: compute bars [start, stop)
+    sequentially from carry-over `state`.
+
+    Returns ([(step, state after step)], fresh_regime) where fresh_regime
+    says the first bar replaced the incoming regime, i.e. its result does
+    not depend on the regime the chunk assumed.
+    """
+    session = _SEARCH_WORKER_SESSION
+    orchestrator = session.orchestrator
+    orchestrator.restore_replay_state(state)
+    incoming = orchestrator.current_regime
+    steps: List[Tuple[StepResult, Dict[str, Any]]] = []
+    fresh_regime = False
+    for index in range(start, stop):
+        result = _compute_step(session, index)
+        if index == start:
+            fresh_regime = orchestrator.current_regime is not incoming
+        steps.append((result, orchestrator.export_replay_state()))
+    return steps, fresh_regime
+
+
 # Singleton accessor — router configures it at startup with the live adapter
 _REPLAY_ENGINE: Optional[ReplayEngine] = None
 _REPLAY_ENGINE_LOCK = threading.Lock()
@@ -0,0 +1,342 @@
+"""
+Per-stage latency profiler for the per-symbol pipeline.
+
+Two halves, one module:
+
+  1. Recorder (runs inside the worker process that executes
+     Orchestrator._process_symbol). `begin()` opens a per-symbol
+     recording, `enter(stage)` marks the start of each top-level pipeline
+     stage (the previous stage is closed at the same instant, so early
+     returns are attributed to the stage they happened in), `stage(name)`
+     is a nested context manager for sub-stages such as individual SMC
+     detectors, and `end()` closes everything and returns a plain
+     {stage: ms} dict that pickles back across the ProcessPool boundary
+     with the (plan, rejection_info) result.
+
+  2. Aggregator (runs in the main process). `record(mode, timings)`
+     folds one symbol's timings into per-(mode, stage) fixed-bucket
+     histograms plus a bounded reservoir used for p50/p95/p99. Powers:
+
+       - GET /api/cycles/stage-latency
+       - GET /api/cycles/stage-latency/flame
+
+Overhead:
+  When no recording is open (direct _process_symbol calls, replay,
+  tests) `enter()` and `stage()` short-circuit on a single module-global
+  check — `stage()` hands back a shared no-op context manager. When a
+  recording is open the cost is two `time.perf_counter_ns()` reads and a
+  dict update per stage. perf_counter_ns is monotonic, so wall-clock
+  adjustments mid-scan cannot produce negative durations.
+
+Stage naming:
+  Dotted names form a hierarchy: "smc.order_blocks" is a child of "smc".
+  Nested timings with the same name accumulate (the SMC detectors run
+  once per timeframe; the recorded value is the per-symbol total). The
+  flame report converts the hierarchy to collapsed-stack format
+  ("symbol;smc;order_blocks <us>") with self-time for parents, which
+  flamegraph.pl and speedscope both consume directly.
+
+Threading model:
+  Recorder state is process-local and assumes one symbol at a time per
+  process — true for the ProcessPool worker. Aggregator state follows
+  the cycle_heartbeat pattern: writer is the orchestrator scan loop,
+  readers are FastAPI handlers; every access goes through one Lock.
+
+Disable with SS_STAGE_PROFILER=0.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +inf).
+# Log-ish spacing covers sub-ms detector calls up to a stalled stage.
+HISTOGRAM_BUCKETS_MS: Tuple[float, ...] = (
+    1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0,
+)
+
+# Per-(mode, stage) sample reservoir for percentiles. 2000 samples at
+# ~50 symbols/scan covers the last ~40 scans for that mode.
+_RESERVOIR_SIZE = 2000
+
+# Key under which the whole _process_symbol wall time is recorded.
+TOTAL_STAGE = "total"
+
+
+def is_enabled() -> bool:
+    return os.getenv("SS_STAGE_PROFILER", "1") != "0"
+
+
+# ---------------------------------------------------------------------------
+# Recorder (worker side)
+# ---------------------------------------------------------------------------
+
+_current: Optional[Dict[str, int]] = None  # stage -> accumulated ns
+_open_stage: Optional[str] = None
+_open_stage_t0: int = 0
+_begin_t0: int = 0
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.t0 = 0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter_ns() - self.t0
+        rec = _current
+        if rec is not None:
+            rec[self.name] = rec.get(self.name, 0) + elapsed
+        return False  # Don't suppress exceptions
+
+
+def begin() -> None:
+    """Open a per-symbol recording. Discards any recording left open."""
+    global _current, _open_stage, _begin_t0
+    if not is_enabled():
+        _current = None
+        return
+    _current = {}
+    _open_stage = None
+    _begin_t0 = time.perf_counter_ns()
+
+
+def enter(stage_name: str) -> None:
+    """Close the open top-level stage (if any) and open `stage_name`."""
+    global _open_stage, _open_stage_t0
+    rec = _current
+    if rec is None:
+        return
+    now = time.perf_counter_ns()
+    if _open_stage is not None:
+        rec[_open_stage] = rec.get(_open_stage, 0) + (now - _open_stage_t0)
+    _open_stage = stage_name
+    _open_stage_t0 = now
+
+
+def stage(stage_name: str):
+    """Context manager timing a nested sub-stage. No-op when not recording."""
+    if _current is None:
+        return _NULL_STAGE
+    return _Stage(stage_name)
+
+
+def end() -> Optional[Dict[str, float]]:
+    """
+    Close the recording and return {stage: ms}, including TOTAL_STAGE.
+    Returns None when no recording was open (profiler disabled).
+    """
+    global _current, _open_stage
+    rec = _current
+    if rec is None:
+        return None
+    now = time.perf_counter_ns()
+    if _open_stage is not None:
+        rec[_open_stage] = rec.get(_open_stage, 0) + (now - _open_stage_t0)
+    rec[TOTAL_STAGE] = now - _begin_t0
+    _current = None
+    _open_stage = None
+    return {name: ns / 1e6 for name, ns in rec.items()}
+
+
+# ---------------------------------------------------------------------------
+# Aggregator (main-process side)
+# ---------------------------------------------------------------------------
+
+
+class _StageStats:
+    __slots__ = ("count", "sum_ms", "max_ms", "buckets", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.samples: Deque[float] = deque(maxlen=_RESERVOIR_SIZE)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.buckets[bisect_left(HISTOGRAM_BUCKETS_MS, ms)] += 1
+        self.samples.append(ms)
+
+
+_lock = Lock()
+_stats: Dict[Tuple[str, str], _StageStats] = {}
+_symbols_recorded = 0
+_last_run: Dict[str, Any] = {}
+
+
+def record(mode: Optional[str], timings: Optional[Dict[str, float]], run_id: Optional[str] = None) -> bool:
+    """
+    Fold one symbol's {stage: ms} timings into the per-mode aggregates.
+
+    Returns False (and records nothing) when timings is empty/None —
+    e.g. the worker had the profiler disabled or raised before begin().
+    """
+    global _symbols_recorded
+    if not timings:
+        return False
+    mode_key = (mode or "unknown").lower()
+    with _lock:
+        for stage_name, ms in timings.items():
+            try:
+                val = float(ms)
+            except (TypeError, ValueError):
+                continue
+            key = (mode_key, stage_name)
+            st = _stats.get(key)
+            if st is None:
+                st = _StageStats()
+                _stats[key] = st
+            st.add(val)
+        _symbols_recorded += 1
+        if run_id is not None:
+            if _last_run.get("run_id") != run_id:
+                _last_run.clear()
+                _last_run.update({"run_id": run_id, "mode": mode_key, "symbols": 0, "sum_ms": {}})
+            _last_run["symbols"] += 1
+            sums = _last_run["sum_ms"]
+            for stage_name, ms in timings.items():
+                sums[stage_name] = sums.get(stage_name, 0.0) + float(ms)
+    return True
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    """Nearest-rank percentile on a pre-sorted list."""
+    if not sorted_vals:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_vals))
+    return sorted_vals[max(0, min(len(sorted_vals), rank) - 1)]
+
+
+def snapshot(mode: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Return {mode: {stage: summary}} where summary carries count, mean,
+    max, p50/p95/p99 (from the reservoir) and the cumulative histogram.
+    """
+    mode_key = mode.lower() if mode else None
+    with _lock:
+        items = [
+            (m, s, st.count, st.sum_ms, st.max_ms, list(st.buckets), sorted(st.samples))
+            for (m, s), st in _stats.items()
+            if mode_key is None or m == mode_key
+        ]
+
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for m, s, count, sum_ms, max_ms, buckets, samples in items:
+        out.setdefault(m, {})[s] = {
+            "count": count,
+            "mean_ms": round(sum_ms / count, 3) if count else 0.0,
+            "max_ms": round(max_ms, 3),
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p95_ms": round(_percentile(samples, 95), 3),
+            "p99_ms": round(_percentile(samples, 99), 3),
+            "histogram": [
+                {"le_ms": le, "count": c}
+                for le, c in zip(list(HISTOGRAM_BUCKETS_MS) + [None], buckets)
+            ],
+        }
+    return out
+
+
+def flame_report(mode: Optional[str] = None, root: str = "symbol") -> str:
+    """
+    Collapsed-stack flame report of mean per-symbol time, in microseconds.
+
+    One line per stage: "<root>;<part>;<part> <self_us>". Parent stages
+    report self-time (their total minus their direct children), clipped
+    at zero since nested timers are measured independently. The TOTAL
+    stage becomes the root frame's self-time remainder.
+    """
+    summary = snapshot(mode)
+    lines: List[str] = []
+    for m in sorted(summary):
+        stages = summary[m]
+        # Mean over every recorded symbol, not just those that reached
+        # the stage — early rejections legitimately spend zero time there.
+        n = stages.get(TOTAL_STAGE, {}).get("count") or max(
+            (v["count"] for v in stages.values()), default=1
+        )
+        per_symbol = {s: v["mean_ms"] * v["count"] / n for s, v in stages.items()}
+
+        children: Dict[str, float] = {}
+        for s, ms in per_symbol.items():
+            if s == TOTAL_STAGE:
+                continue
+            parent = s.rsplit(".", 1)[0] if "." in s else ""
+            children[parent] = children.get(parent, 0.0) + ms
+
+        prefix = f"{root};{m}" if mode is None else root
+        for s in sorted(per_symbol):
+            if s == TOTAL_STAGE:
+                continue
+            self_ms = max(0.0, per_symbol[s] - children.get(s, 0.0))
+            frames = ";".join(s.split("."))
+            lines.append(f"{prefix};{frames} {int(round(self_ms * 1000))}")
+        if TOTAL_STAGE in per_symbol:
+            root_self = max(0.0, per_symbol[TOTAL_STAGE] - children.get("", 0.0))
+            lines.append(f"{prefix} {int(round(root_self * 1000))}")
+    return "\n".join(lines)
+
+
+def last_run() -> Dict[str, Any]:
+    """Per-stage totals for the most recent run_id seen by record()."""
+    with _lock:
+        if not _last_run:
+            return {}
+        return {
+            "run_id": _last_run["run_id"],
+            "mode": _last_run["mode"],
+            "symbols": _last_run["symbols"],
+            "sum_ms": {k: round(v, 3) for k, v in _last_run["sum_ms"].items()},
+        }
+
+
+def stats() -> Dict[str, int]:
+    """Visibility counters for diagnostics / health endpoints."""
+    with _lock:
+        return {
+            "symbols_recorded": _symbols_recorded,
+            "series": len(_stats),
+            "reservoir_capacity": _RESERVOIR_SIZE,
+        }
+
+
+def clear() -> None:
+    """Drop all aggregates and any open recording. Used by tests."""
+    global _symbols_recorded, _current, _open_stage
+    with _lock:
+        _stats.clear()
+        _last_run.clear()
+        _symbols_recorded = 0
+    _current = None
+    _open_stage = None
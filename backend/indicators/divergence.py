@@ -8,15 +8,29 @@ Detects price-indicator divergences for trading signals:
 - Hidden Bearish Divergence: Price lower high + Indicator higher high (continuation signal)
 
 Works with RSI, MACD, and volume indicators.
+
+Scoring path: snapshot_divergences() runs the one-pass engine
+(detect_divergences) on the RSI / MACD-histogram arrays IndicatorService
+already attached to the IndicatorSnapshot, finds price and indicator
+pivots once, evaluates regular + hidden for both directions from the same
+pivot pairs, and caches the result on the snapshot. The per-type
+detect_* functions below are kept for ad-hoc use and agree with it.
 """
 
 import math
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from backend.indicators.momentum import compute_rsi, compute_macd
 
+# Indicators the one-pass engine evaluates, in result order.
+DIVERGENCE_INDICATORS = ("rsi", "macd")
+
+# Minimum bars before divergences are evaluated.
+MIN_DIVERGENCE_BARS = 50
+
 
 class DivergenceResult:
     """Container for divergence detection results"""
@@ -76,6 +90,32 @@ class DivergenceResult:
         return "hidden" in self.divergence_type
 
 
+def _pivot_mask(values: np.ndarray, lookback: int, highs: bool) -> np.ndarray:
+    """
+    Boolean mask of strict swing highs (or lows) over +/- `lookback` bars.
+
+    Same rule as the historical per-element loop: a bar is a pivot unless
+    some neighbour is >= (<= for lows) it. Comparisons involving NaN are
+    False, so NaN bars never disqualify a neighbour and are themselves
+    reported as pivots — kept for parity with existing scores.
+    """
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if n < 2 * lookback + 1:
+        return mask
+    center = values[lookback:n - lookback]
+    ok = np.ones(len(center), dtype=bool)
+    for j in range(1, lookback + 1):
+        left = values[lookback - j:n - lookback - j]
+        right = values[lookback + j:n - lookback + j]
+        if highs:
+            ok &= ~(left >= center) & ~(right >= center)
+        else:
+            ok &= ~(left <= center) & ~(right <= center)
+    mask[lookback:n - lookback] = ok
+    return mask
+
+
 def find_swing_highs(series: pd.Series, lookback: int = 5) -> List[int]:
     """
     Find swing highs (local peaks) in a series.
@@ -87,22 +127,8 @@ def find_swing_highs(series: pd.Series, lookback: int = 5) -> List[int]:
     Returns:
         List of indices where swing highs occur
     """
-    swing_highs = []
-
-    for i in range(lookback, len(series) - lookback):
-        is_peak = True
-        current_value = series.iloc[i]
-
-        # Check if current value is higher than lookback bars on both sides
-        for j in range(1, lookback + 1):
-            if series.iloc[i - j] >= current_value or series.iloc[i + j] >= current_value:
-                is_peak = False
-                break
-
-        if is_peak:
-            swing_highs.append(i)
-
-    return swing_highs
+    values = np.asarray(series, dtype=float)
+    return np.flatnonzero(_pivot_mask(values, lookback, highs=True)).tolist()
 
 
 def find_swing_lows(series: pd.Series, lookback: int = 5) -> List[int]:
@@ -116,22 +142,8 @@ def find_swing_lows(series: pd.Series, lookback: int = 5) -> List[int]:
     Returns:
         List of indices where swing lows occur
     """
-    swing_lows = []
-
-    for i in range(lookback, len(series) - lookback):
-        is_trough = True
-        current_value = series.iloc[i]
-
-        # Check if current value is lower than lookback bars on both sides
-        for j in range(1, lookback + 1):
-            if series.iloc[i - j] <= current_value or series.iloc[i + j] <= current_value:
-                is_trough = False
-                break
-
-        if is_trough:
-            swing_lows.append(i)
-
-    return swing_lows
+    values = np.asarray(series, dtype=float)
+    return np.flatnonzero(_pivot_mask(values, lookback, highs=False)).tolist()
 
 
 def detect_regular_bullish_divergence(
@@ -633,11 +645,216 @@ def detect_all_divergences(
     Returns:
         Dictionary with 'rsi' and 'macd' keys, each containing list of divergences
     """
-    return {
-        "rsi": detect_rsi_divergence(
-            df, direction, lookback, min_pivot_distance, max_lookback_bars
-        ),
-        "macd": detect_macd_divergence(
-            df, direction, lookback, min_pivot_distance, max_lookback_bars
-        ),
+    if len(df) < MIN_DIVERGENCE_BARS:
+        return _empty_result()
+    both = detect_divergences(
+        df["high"], df["low"], _indicator_arrays(df), lookback, min_pivot_distance, max_lookback_bars
+    )
+    return dict(both.get(direction) or _empty_result())
+
+
+# ---------------------------------------------------------------------------
+# One-pass engine
+# ---------------------------------------------------------------------------
+
+def _pivot_pair(
+    price_pivots: Sequence[int],
+    indicator_pivots: Sequence[int],
+    n: int,
+    min_pivot_distance: int,
+    max_lookback_bars: int,
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Pick (price_pivot_1, price_pivot_2, indicator_pivot_1, indicator_pivot_2)
+    exactly as the detect_* functions do, or None if no aligned pair exists.
+    """
+    if len(price_pivots) < 2 or len(indicator_pivots) < 2:
+        return None
+    recent_price = [i for i in price_pivots if n - i <= max_lookback_bars]
+    recent_ind = [i for i in indicator_pivots if n - i <= max_lookback_bars]
+    if len(recent_price) < 2 or len(recent_ind) < 2:
+        return None
+
+    price_pivot_2, price_pivot_1 = recent_price[-1], recent_price[-2]
+    if price_pivot_2 - price_pivot_1 < min_pivot_distance:
+        return None
+
+    indicator_pivot_2 = min(recent_ind, key=lambda x: abs(x - price_pivot_2))
+    indicator_pivot_1 = min(recent_ind, key=lambda x: abs(x - price_pivot_1))
+    if abs(indicator_pivot_2 - price_pivot_2) > 3 or abs(indicator_pivot_1 - price_pivot_1) > 3:
+        return None
+    return price_pivot_1, price_pivot_2, indicator_pivot_1, indicator_pivot_2
+
+
+def _classify_pair(
+    side: str,
+    price: np.ndarray,
+    indicator: np.ndarray,
+    indicator_name: str,
+    pair: Tuple[int, int, int, int],
+) -> Optional[DivergenceResult]:
+    """
+    Turn one pivot pair into a regular or hidden divergence for `side`
+    ("bullish" uses swing lows, "bearish" swing highs). Regular and hidden
+    conditions are mutually exclusive, so at most one result.
+    """
+    p1, p2, i1, i2 = pair
+    pv1, pv2 = price[p1], price[p2]
+    iv1, iv2 = indicator[i1], indicator[i2]
+
+    price_up = pv2 > pv1
+    price_down = pv2 < pv1
+    ind_up = iv2 > iv1
+    ind_down = iv2 < iv1
+    if side == "bullish":
+        regular, hidden = price_down and ind_up, price_up and ind_down
+    else:
+        regular, hidden = price_up and ind_down, price_down and ind_up
+    if not (regular or hidden):
+        return None
+
+    price_change_pct = abs((pv2 - pv1) / pv1) * 100
+    indicator_change_pct = abs((iv2 - iv1) / max(iv1, 1)) * 100
+    # Regular: x40 log scale; hidden (continuation) scores ~80% of regular.
+    scale = 40 if regular else 32
+    strength = min(100, math.log1p(price_change_pct + indicator_change_pct) * scale)
+
+    return DivergenceResult(
+        divergence_type=f"{'regular' if regular else 'hidden'}_{side}",
+        indicator=indicator_name,
+        price_pivot_1=p1,
+        price_pivot_2=p2,
+        indicator_pivot_1=i1,
+        indicator_pivot_2=i2,
+        price_value_1=pv1,
+        price_value_2=pv2,
+        indicator_value_1=iv1,
+        indicator_value_2=iv2,
+        strength=strength,
+    )
+
+
+def detect_divergences(
+    high: Any,
+    low: Any,
+    indicators: Dict[str, Any],
+    lookback: int = 5,
+    min_pivot_distance: int = 10,
+    max_lookback_bars: int = 100,
+) -> Dict[str, Dict[str, List[DivergenceResult]]]:
+    """
+    Detect regular and hidden divergences for both directions in one pass.
+
+    Price swing highs/lows and each indicator's swing highs/lows are found
+    once and shared by the regular and hidden checks.
+
+    Args:
+        high, low: Price arrays (same length as the indicator arrays)
+        indicators: {name: array}; None values yield empty lists
+        lookback, min_pivot_distance, max_lookback_bars: as detect_all_divergences
+
+    Returns:
+        {"bullish": {name: [...]}, "bearish": {name: [...]}}
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = len(high)
+    price_pivots = {
+        "bullish": np.flatnonzero(_pivot_mask(low, lookback, highs=False)).tolist(),
+        "bearish": np.flatnonzero(_pivot_mask(high, lookback, highs=True)).tolist(),
     }
+    price = {"bullish": low, "bearish": high}
+
+    out: Dict[str, Dict[str, List[DivergenceResult]]] = {"bullish": {}, "bearish": {}}
+    for name, values in indicators.items():
+        out["bullish"][name] = []
+        out["bearish"][name] = []
+        if values is None:
+            continue
+        values = np.asarray(values, dtype=float)
+        if len(values) != n:
+            continue
+        ind_pivots = {
+            "bullish": np.flatnonzero(_pivot_mask(values, lookback, highs=False)).tolist(),
+            "bearish": np.flatnonzero(_pivot_mask(values, lookback, highs=True)).tolist(),
+        }
+        for side in ("bullish", "bearish"):
+            pair = _pivot_pair(
+                price_pivots[side], ind_pivots[side], n, min_pivot_distance, max_lookback_bars
+            )
+            if pair is None:
+                continue
+            result = _classify_pair(side, price[side], values, name, pair)
+            if result is not None:
+                out[side][name].append(result)
+    return out
+
+
+def _indicator_arrays(df: pd.DataFrame) -> Dict[str, Optional[np.ndarray]]:
+    """Compute RSI / MACD histogram for df the same way detect_rsi/macd_divergence do."""
+    arrays: Dict[str, Optional[np.ndarray]] = {"rsi": None, "macd": None}
+    try:
+        arrays["rsi"] = compute_rsi(df, period=14, validate_input=False).to_numpy(dtype=float)
+    except Exception as e:
+        logger.warning(f"Failed to compute RSI for divergence: {e}")
+    try:
+        _, _, histogram = compute_macd(df)
+        arrays["macd"] = histogram.to_numpy(dtype=float)
+    except Exception as e:
+        logger.warning(f"Failed to compute MACD for divergence: {e}")
+    return arrays
+
+
+def _empty_result() -> Dict[str, List[DivergenceResult]]:
+    return {name: [] for name in DIVERGENCE_INDICATORS}
+
+
+def snapshot_divergences(
+    snapshot: Any,
+    direction: str,
+    lookback: int = 5,
+    min_pivot_distance: int = 10,
+    max_lookback_bars: int = 100,
+) -> Dict[str, List[DivergenceResult]]:
+    """
+    detect_all_divergences for an IndicatorSnapshot, computed once per
+    snapshot and parameter set and cached on the snapshot.
+
+    Uses the full RSI / MACD-histogram arrays IndicatorService attaches
+    (rsi_values / macd_histogram_values) and only falls back to computing
+    them when they are missing or out of step with snapshot.dataframe.
+
+    Returns {"rsi": [...], "macd": [...]} for `direction`
+    ('bullish' / 'bearish'); empty lists for any other value.
+    """
+    df = getattr(snapshot, "dataframe", None)
+    if df is None or len(df) < MIN_DIVERGENCE_BARS:
+        return _empty_result()
+
+    cache = getattr(snapshot, "_divergence_cache", None)
+    if cache is None:
+        cache = {}
+        snapshot._divergence_cache = cache
+    key = (id(df), len(df), lookback, min_pivot_distance, max_lookback_bars)
+    both = cache.get(key)
+    if both is None:
+        arrays = {
+            "rsi": getattr(snapshot, "rsi_values", None),
+            "macd": getattr(snapshot, "macd_histogram_values", None),
+        }
+        if any(a is None or len(a) != len(df) for a in arrays.values()):
+            computed = _indicator_arrays(df)
+            arrays = {
+                k: (a if a is not None and len(a) == len(df) else computed[k])
+                for k, a in arrays.items()
+            }
+        both = detect_divergences(
+            df["high"].to_numpy(dtype=float),
+            df["low"].to_numpy(dtype=float),
+            arrays,
+            lookback,
+            min_pivot_distance,
+            max_lookback_bars,
+        )
+        cache[key] = both
+    return dict(both.get(direction) or _empty_result())
@@ -16,11 +16,23 @@ Layer-1 upgrades
     and a direction value (mean SHAP) so the dashboard can show which features
     help vs hurt win probability.
 
+Inference
+---------
+  predict_proba_batch     — scores many records with one matrix call.
+    Results are cached by a hash of the feature vector (LRU, cleared on
+    retrain), and the matrix call goes through a pure-NumPy export of the
+    fitted pipeline (backend.ml.numpy_scorer) when one is available.
+    EdgeModel.from_scorer builds a scoring-only model from a saved export,
+    so scoring processes never unpickle the sklearn pipeline.
+
 This model only affects the dashboard — no live bot behaviour changes.
 """
 
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -36,6 +48,9 @@ logger = logging.getLogger(__name__)
 
 _GBC_THRESHOLD = 100
 
+# Max cached (feature-hash → probability) entries per model.
+_PROBA_CACHE_SIZE = 4096
+
 
 # ── Purged Walk-Forward Cross-Validator ───────────────────────────────────────
 
@@ -98,9 +113,13 @@ class EdgeModel:
     Win-probability classifier for completed trades.
 
     Call `train(records)` to (re-)fit from the journal, then
-    `predict_proba(record)` to score an individual trade plan.
+    `predict_proba(record)` to score an individual trade plan or
+    `predict_proba_batch(records)` to score a whole scan at once.
     """
 
+    # Runtime-only state, rebuilt after unpickling (see __setstate__).
+    _TRANSIENT = ("_proba_cache", "_cache_lock", "_scorer", "_scorer_built")
+
     def __init__(self) -> None:
         self._model: Any = None
         self._feature_names: List[str] = feature_names()
@@ -111,6 +130,42 @@ class EdgeModel:
         # SHAP: mean |shap| and mean shap per feature, set after fit
         self._shap_importance: Optional[np.ndarray] = None   # mean |SHAP|
         self._shap_direction: Optional[np.ndarray] = None    # mean SHAP (signed)
+        self._init_runtime()
+
+    def _init_runtime(self) -> None:
+        self._proba_cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._scorer: Any = None
+        self._scorer_built = False
+
+    @classmethod
+    def from_scorer(cls, scorer: Any, meta: Optional[Dict[str, Any]] = None) -> "EdgeModel":
+        """
+        Scoring-only model backed by a NumpyScorer (no sklearn pipeline).
+
+        predict_proba / predict_proba_batch behave as on the model the scorer
+        was exported from; training state is only what `meta` (the saved
+        status()) reports.
+        """
+        model = cls()
+        model._scorer = scorer
+        model._scorer_built = True
+        meta = meta or {}
+        model._model_type = meta.get("model_type", model._model_type)
+        model._n_samples = int(meta.get("n_samples", 0))
+        model._accuracy = float(meta.get("accuracy", 0.0))
+        model._trained_at = meta.get("trained_at")
+        return model
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in self._TRANSIENT:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_runtime()
 
     # ── public ────────────────────────────────────────────────────────────────
 
@@ -136,7 +191,7 @@ class EdgeModel:
             return {"success": False, "n_samples": n, "message": str(exc)}
 
         from datetime import datetime, timezone
-        self._model = model
+        self._set_model(model)
         self._n_samples = n
         self._accuracy = accuracy
         self._trained_at = datetime.now(timezone.utc).isoformat()
@@ -163,27 +218,78 @@ class EdgeModel:
 
         Returns None if the model is not trained or the record is not enriched.
         """
-        if self._model is None:
-            return None
+        return self.predict_proba_batch([record])[0]
 
-        vec = extract_features(record)
-        if vec is None:
-            return None
+    def predict_proba_batch(self, records: Sequence[Dict[str, Any]]) -> List[Optional[float]]:
+        """
+        Return WIN probabilities for many records, aligned with `records`.
 
-        try:
-            X = vec.reshape(1, -1)
+        Entries are None where predict_proba would return None (untrained
+        model, un-enriched record, feature-count mismatch). Cached vectors
+        are served from the LRU; the rest are scored in one matrix call.
+        """
+        out: List[Optional[float]] = [None] * len(records)
+        if (self._model is None and self._scorer is None) or not records:
+            return out
+
+        pending: Dict[bytes, List[int]] = {}
+        vectors: List[np.ndarray] = []
+        with self._cache_lock:
+            for i, record in enumerate(records):
+                vec = extract_features(record)
+                if vec is None:
+                    continue
+                key = _feature_key(vec)
+                cached = self._proba_cache.get(key)
+                if cached is not None:
+                    self._proba_cache.move_to_end(key)
+                    out[i] = cached
+                elif key in pending:
+                    pending[key].append(i)
+                else:
+                    pending[key] = [i]
+                    vectors.append(vec)
+
+        if not vectors:
+            return out
+
+        X = np.vstack(vectors)
+        scorer = self._get_scorer()
+        if scorer is not None:
+            expected = scorer.n_features
+        else:
             expected = getattr(self._model, "n_features_in_", None)
-            if expected is not None and X.shape[1] != expected:
-                logger.warning(
-                    "predict_proba: feature count mismatch (model=%d, input=%d) — retrain needed",
-                    expected, X.shape[1],
-                )
-                return None
-            proba = self._model.predict_proba(X)[0][1]
-            return float(proba)
+        if expected is not None and X.shape[1] != expected:
+            logger.warning(
+                "predict_proba: feature count mismatch (model=%d, input=%d) — retrain needed",
+                expected, X.shape[1],
+            )
+            return out
+
+        try:
+            if scorer is not None:
+                probs = scorer.predict_proba(X)
+            else:
+                probs = self._model.predict_proba(X)[:, 1]
         except Exception as exc:
             logger.warning("predict_proba failed: %s", exc)
-            return None
+            return out
+
+        with self._cache_lock:
+            for (key, idxs), p in zip(pending.items(), probs.tolist()):
+                for i in idxs:
+                    out[i] = p
+                self._proba_cache[key] = p
+            while len(self._proba_cache) > _PROBA_CACHE_SIZE:
+                self._proba_cache.popitem(last=False)
+        return out
+
+    def export_scorer(self):
+        """
+        Return a NumpyScorer equivalent of the fitted pipeline, or None if
+        the model is untrained or has no NumPy export.
+        """
+        return self._get_scorer()
 
     def feature_importance(self) -> List[Dict[str, Any]]:
         """
@@ -276,7 +382,7 @@ class EdgeModel:
             return {"success": False, "n_samples": n, "message": str(exc)}
 
         from datetime import datetime, timezone
-        self._model = model
+        self._set_model(model)
         self._n_samples = n
         self._accuracy = accuracy
         self._trained_at = datetime.now(timezone.utc).isoformat()
@@ -347,7 +453,7 @@ class EdgeModel:
     def status(self) -> Dict[str, Any]:
         """Return current model metadata."""
         return {
-            "trained": self._model is not None,
+            "trained": self._model is not None or self._scorer is not None,
             "model_type": self._model_type,
             "n_samples": self._n_samples,
             "accuracy": self._accuracy,
@@ -358,6 +464,25 @@ class EdgeModel:
 
     # ── private ───────────────────────────────────────────────────────────────
 
+    def _set_model(self, model: Any) -> None:
+        """Install a freshly fitted pipeline and drop state derived from the old one."""
+        with self._cache_lock:
+            self._model = model
+            self._proba_cache.clear()
+            self._scorer = None
+            self._scorer_built = False
+
+    def _get_scorer(self):
+        if not self._scorer_built and self._model is not None:
+            from backend.ml.numpy_scorer import export_numpy_scorer
+            try:
+                self._scorer = export_numpy_scorer(self._model)
+            except Exception as exc:
+                logger.warning("NumPy scorer export failed, using sklearn: %s", exc)
+                self._scorer = None
+            self._scorer_built = True
+        return self._scorer
+
     def _fit(
         self, X: np.ndarray, y: np.ndarray, sample_weight: np.ndarray
     ) -> Tuple[Any, float]:
@@ -440,3 +565,8 @@ class EdgeModel:
             logger.warning("SHAP computation failed: %s", exc)
             self._shap_importance = None
             self._shap_direction = None
+
+
+def _feature_key(vec: np.ndarray) -> bytes:
+    """Stable cache key for a feature vector."""
+    return hashlib.blake2b(np.ascontiguousarray(vec, dtype=np.float32).tobytes(), digest_size=16).digest()
@@ -3,18 +3,25 @@ Model Store
 
 Handles serialization and loading of the EdgeModel to/from disk,
 and provides a module-level singleton for use throughout the backend.
+
+Alongside the joblib pickle, each save writes a NumPy-only export of the
+pipeline (edge_model_scorer.npz) when the model type supports it. Scoring
+(predict_proba / predict_proba_batch) loads that export instead of the
+pickle, so processes that only score never import sklearn; the pickle is
+loaded for training and importance, or when there is no current export.
 """
 
 import json
 import logging
 import os
 import threading
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 _MODEL_PATH = "backend/cache/edge_model.joblib"
 _META_PATH = "backend/cache/edge_model_meta.json"
+_SCORER_PATH = "backend/cache/edge_model_scorer.npz"
 
 _lock = threading.Lock()
 _instance: Optional["ManagedEdgeModel"] = None
@@ -31,11 +38,15 @@ class ManagedEdgeModel:
         self,
         model_path: str = _MODEL_PATH,
         meta_path: str = _META_PATH,
+        scorer_path: str = _SCORER_PATH,
     ) -> None:
         self.model_path = model_path
         self.meta_path = meta_path
+        self.scorer_path = scorer_path
         self._edge_model: Optional[Any] = None  # EdgeModel, lazy-imported
         self._loaded = False
+        self._scoring_model: Optional[Any] = None  # EdgeModel.from_scorer, if exported
+        self._scoring_loaded = False
 
     # ── public ────────────────────────────────────────────────────────────────
 
@@ -54,7 +65,13 @@ class ManagedEdgeModel:
         return result
 
     def predict_proba(self, record: Dict[str, Any]) -> Optional[float]:
-        return self._get_model().predict_proba(record)
+        return self._get_scoring_model().predict_proba(record)
+
+    def predict_proba_batch(self, records) -> List[Optional[float]]:
+        return self._get_scoring_model().predict_proba_batch(records)
+
+    def export_scorer(self):
+        return self._get_model().export_scorer()
 
     def feature_importance(self):
         return self._get_model().feature_importance()
@@ -63,7 +80,26 @@ class ManagedEdgeModel:
         return self._get_model().gate_recommendations()
 
     def status(self) -> Dict[str, Any]:
-        return self._get_model().status()
+        return self._get_scoring_model().status()
+
+    def reset(self) -> bool:
+        """
+        Delete the saved model and its NumPy export, and drop both in-memory
+        models so the next access starts from a fresh, untrained EdgeModel.
+
+        Returns True if a saved model file was deleted.
+        """
+        deleted = False
+        if os.path.exists(self.model_path):
+            os.remove(self.model_path)
+            deleted = True
+        if os.path.exists(self.scorer_path):
+            os.remove(self.scorer_path)
+        self._edge_model = None
+        self._loaded = False
+        self._scoring_model = None
+        self._scoring_loaded = False
+        return deleted
 
     # ── persistence ───────────────────────────────────────────────────────────
 
@@ -72,6 +108,41 @@ class ManagedEdgeModel:
             self._load()
         return self._edge_model
 
+    def _get_scoring_model(self):
+        """
+        The full model once it is loaded, else a NumPy-only model from the
+        saved export. Falls back to the full model (sklearn) when there is no
+        export, or it predates the pickle (a later save failed to export).
+        """
+        if self._loaded:
+            return self._edge_model
+        if not self._scoring_loaded:
+            self._scoring_loaded = True
+            self._scoring_model = self._load_scoring_model()
+        return self._scoring_model or self._get_model()
+
+    def _load_scoring_model(self):
+        try:
+            if os.path.getmtime(self.scorer_path) < os.path.getmtime(self.model_path):
+                logger.warning("NumPy scorer %s is older than %s; using sklearn", self.scorer_path, self.model_path)
+                return None
+        except OSError:
+            return None
+        scorer = load_numpy_scorer(self.scorer_path)
+        if scorer is None:
+            return None
+
+        from backend.ml.edge_model import EdgeModel
+
+        meta = {}
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            pass
+        logger.info("EdgeModel scoring from NumPy export %s", self.scorer_path)
+        return EdgeModel.from_scorer(scorer, meta)
+
     def _ensure_dir(self):
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
 
@@ -86,6 +157,16 @@ class ManagedEdgeModel:
             logger.info("EdgeModel saved to %s", self.model_path)
         except Exception as exc:
             logger.error("Failed to save EdgeModel: %s", exc)
+            return
+
+        try:
+            scorer = model.export_scorer()
+            if scorer is not None:
+                scorer.save(self.scorer_path)
+            elif os.path.exists(self.scorer_path):
+                os.remove(self.scorer_path)
+        except Exception as exc:
+            logger.warning("Failed to save NumPy scorer: %s", exc)
 
     def _load(self) -> None:
         from backend.ml.edge_model import EdgeModel
@@ -115,6 +196,23 @@ class ManagedEdgeModel:
             self._edge_model = EdgeModel()
 
 
+def load_numpy_scorer(path: str = _SCORER_PATH):
+    """
+    Load the NumPy-only scorer written by the last save, or None if absent.
+
+    Only imports NumPy — safe for worker processes that must not pull in
+    sklearn.
+    """
+    if not os.path.exists(path):
+        return None
+    from backend.ml.numpy_scorer import NumpyScorer
+    try:
+        return NumpyScorer.load(path)
+    except Exception as exc:
+        logger.warning("Failed to load NumPy scorer from %s: %s", path, exc)
+        return None
+
+
 def get_model_store() -> ManagedEdgeModel:
     """Return the process-wide ManagedEdgeModel singleton."""
     global _instance
@@ -0,0 +1,183 @@
+"""
+NumPy Scorer
+
+Pure-NumPy re-implementation of the fitted EdgeModel pipelines so scoring
+does not need sklearn (or joblib) on the hot path.
+
+Supported pipelines (the two EdgeModel._fit produces):
+  LogisticRegression   — StandardScaler + LogisticRegression
+                         p = sigmoid(((x - mean) / scale) · coef + intercept)
+  GradientBoosting     — binary log-loss GradientBoostingClassifier
+                         p = sigmoid(baseline + lr * Σ tree(x))
+
+Export happens once, from the sklearn pipeline (export_numpy_scorer);
+the result is a handful of flat arrays that can be saved with np.savez and
+re-loaded in any process with only NumPy installed (NumpyScorer.load).
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class NumpyScorer:
+    """
+    Win-probability scorer backed only by NumPy arrays.
+
+    kind       — "linear" or "trees"
+    arrays     — parameters for `kind` (see export_numpy_scorer)
+    n_features — expected input width
+    """
+
+    def __init__(self, kind: str, arrays: Dict[str, np.ndarray], n_features: int) -> None:
+        if kind not in ("linear", "trees"):
+            raise ValueError(f"Unknown scorer kind: {kind}")
+        self.kind = kind
+        self.arrays = arrays
+        self.n_features = n_features
+
+    # ── scoring ───────────────────────────────────────────────────────────────
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Return P(win) for every row of X, shape (n_rows,)."""
+        X = np.atleast_2d(X)
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"feature count mismatch (scorer={self.n_features}, input={X.shape[1]})"
+            )
+        if self.kind == "linear":
+            return _sigmoid(self._linear_decision(X))
+        return _sigmoid(self._tree_decision(X))
+
+    def _linear_decision(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        Z = (X.astype(np.float64) - a["mean"]) / a["scale"]
+        return Z @ a["coef"] + a["intercept"][0]
+
+    def _tree_decision(self, X: np.ndarray) -> np.ndarray:
+        """
+        Evaluate all trees for all rows.
+
+        Nodes of every tree live in one flat array; `roots` holds each
+        tree's first node. Rows descend level by level, so the loop runs
+        max_depth times regardless of tree or row count.
+        """
+        a = self.arrays
+        # sklearn compares float32 inputs against float32-derived thresholds
+        Xf = X.astype(np.float32).astype(np.float64)
+        left, right = a["left"], a["right"]
+        feature, threshold, value = a["feature"], a["threshold"], a["value"]
+
+        n_rows = Xf.shape[0]
+        rows = np.arange(n_rows)[:, None]
+        node = np.broadcast_to(a["roots"], (n_rows, len(a["roots"]))).copy()
+        for _ in range(int(a["max_depth"][0]) + 1):
+            is_split = left[node] >= 0
+            if not is_split.any():
+                break
+            go_left = Xf[rows, feature[node]] <= threshold[node]
+            nxt = np.where(go_left, left[node], right[node])
+            node = np.where(is_split, nxt, node)
+        return a["baseline"][0] + a["learning_rate"][0] * value[node].sum(axis=1)
+
+    # ── persistence ───────────────────────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            kind=np.array(self.kind),
+            n_features=np.array([self.n_features]),
+            **self.arrays,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyScorer":
+        with np.load(path, allow_pickle=False) as data:
+            kind = str(data["kind"])
+            n_features = int(data["n_features"][0])
+            arrays = {k: data[k] for k in data.files if k not in ("kind", "n_features")}
+        return cls(kind, arrays, n_features)
+
+
+def export_numpy_scorer(pipe: Any) -> Optional[NumpyScorer]:
+    """
+    Build a NumpyScorer from a fitted EdgeModel pipeline.
+
+    Returns None for estimators without a NumPy equivalent; callers keep
+    using the sklearn pipeline in that case.
+    """
+    steps = getattr(pipe, "named_steps", None) or {}
+    clf = steps.get("clf", pipe)
+    scaler = steps.get("scaler")
+    n_features = getattr(clf, "n_features_in_", None)
+    if n_features is None:
+        return None
+
+    if hasattr(clf, "coef_") and getattr(clf, "classes_", np.empty(0)).size == 2:
+        mean = np.zeros(n_features) if scaler is None else np.asarray(scaler.mean_, dtype=np.float64)
+        scale = np.ones(n_features) if scaler is None else np.asarray(scaler.scale_, dtype=np.float64)
+        return NumpyScorer(
+            "linear",
+            {
+                "mean": mean,
+                "scale": scale,
+                "coef": np.asarray(clf.coef_[0], dtype=np.float64),
+                "intercept": np.asarray(clf.intercept_, dtype=np.float64).reshape(1),
+            },
+            n_features,
+        )
+
+    estimators = getattr(clf, "estimators_", None)
+    if (
+        scaler is None
+        and estimators is not None
+        and hasattr(clf, "learning_rate")
+        and getattr(clf, "n_classes_", 0) == 2
+    ):
+        arrays = _flatten_trees([est.tree_ for est in estimators[:, 0]])
+        arrays["learning_rate"] = np.array([float(clf.learning_rate)])
+        arrays["baseline"] = np.array([0.0])
+        scorer = NumpyScorer("trees", arrays, n_features)
+        # The init estimator's raw prediction is a constant; recover it from
+        # decision_function rather than re-deriving sklearn's prior link.
+        probe = np.zeros((1, n_features), dtype=np.float32)
+        arrays["baseline"][0] = float(clf.decision_function(probe)[0] - scorer._tree_decision(probe)[0])
+        return scorer
+
+    logger.info("No NumPy scorer for %s; using sklearn pipeline", type(clf).__name__)
+    return None
+
+
+def _flatten_trees(trees) -> Dict[str, np.ndarray]:
+    """Concatenate sklearn Tree objects into flat node arrays with global indices."""
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        n = tree.node_count
+        cl = tree.children_left.astype(np.int64)
+        cr = tree.children_right.astype(np.int64)
+        left.append(np.where(cl >= 0, cl + offset, -1))
+        right.append(np.where(cr >= 0, cr + offset, -1))
+        feature.append(np.maximum(tree.feature.astype(np.int64), 0))
+        threshold.append(tree.threshold.astype(np.float64))
+        value.append(tree.value.reshape(n).astype(np.float64))
+        roots.append(offset)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += n
+    return {
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "feature": np.concatenate(feature),
+        "threshold": np.concatenate(threshold),
+        "value": np.concatenate(value),
+        "roots": np.array(roots, dtype=np.int64),
+        "max_depth": np.array([max_depth]),
+    }
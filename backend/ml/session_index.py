@@ -0,0 +1,444 @@
+"""
+Session Log Index
+
+SQLite index over the paper-trading session logs (signals.jsonl and
+trades.jsonl per session directory) and the cross-session trade journal.
+
+The JSONL files stay the source of truth. The index only ingests bytes it
+has not seen yet: each file's byte offset is recorded, so a sync reads just
+the lines appended since the previous one (a file that shrank or whose head
+changed is re-ingested from scratch). Parsed fields are stored as columns:
+
+  - timestamps as epoch seconds (parsed once at ingest, not per match)
+  - (symbol, direction, time) B-tree indexes on signals and trades, so the
+    signal -> trade as-of match is one range join instead of a per-signal
+    scan of the symbol's trades
+  - the ML feature vector of each signal (BLOB), computed once per feature
+    schema and reused on every training run
+
+Readers that want the raw records (session report, analyze_session.py) get
+them back in file order from the `raw` column.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_REPO_ROOT = Path(__file__).parent.parent.parent
+SESSION_LOGS_DIR = _REPO_ROOT / "logs" / "paper_trading"
+TRADE_JOURNAL_PATH = _REPO_ROOT / "backend" / "cache" / "trade_journal.jsonl"
+INDEX_PATH = _REPO_ROOT / "backend" / "cache" / "session_index.db"
+
+MATCH_WINDOW_S = 300.0  # executed signal -> trade entry tolerance
+_HEAD_BYTES = 256       # prefix hashed to detect a rewritten file
+
+# Source kinds
+SIGNALS = "signals"
+SESSION_TRADES = "session_trades"
+JOURNAL = "journal"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    session TEXT,
+    offset INTEGER NOT NULL DEFAULT 0,
+    n_lines INTEGER NOT NULL DEFAULT 0,
+    head TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS signals (
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    session TEXT,
+    symbol TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    result TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    ts REAL,
+    raw TEXT NOT NULL,
+    features BLOB,
+    feat_key TEXT,
+    PRIMARY KEY (source, line)
+);
+CREATE INDEX IF NOT EXISTS idx_signals_match ON signals(symbol, direction, ts);
+CREATE INDEX IF NOT EXISTS idx_signals_result ON signals(result);
+CREATE TABLE IF NOT EXISTS trades (
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    session TEXT,
+    trade_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    entry_ts REAL,
+    exit_reason TEXT NOT NULL,
+    pnl REAL NOT NULL,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (source, line)
+);
+CREATE INDEX IF NOT EXISTS idx_trades_match ON trades(kind, symbol, direction, entry_ts);
+"""
+
+# Best journal trade per executed signal: same symbol + direction, entry within
+# the window, smallest |Δt| (ties -> earliest journal line). Signal order is the
+# session directory order then line order, i.e. the order collect_signals()
+# has always returned.
+_DATASET_QUERY = """
+WITH ordered AS (
+    SELECT source, line, symbol, direction, result, timestamp, ts, features,
+           ROW_NUMBER() OVER (ORDER BY session, source, line) - 1 AS i
+    FROM signals
+),
+matches AS (
+    SELECT s.source, s.line, t.trade_id, t.exit_reason, t.pnl,
+           ROW_NUMBER() OVER (
+               PARTITION BY s.source, s.line
+               ORDER BY ABS(t.entry_ts - s.ts), t.source, t.line
+           ) AS rk
+    FROM signals s
+    JOIN trades t
+      ON t.kind = :journal
+     AND t.symbol = s.symbol
+     AND t.direction = s.direction
+     AND t.entry_ts > s.ts - :window
+     AND t.entry_ts < s.ts + :window
+    WHERE s.result = 'executed'
+)
+SELECT o.i, o.symbol, o.timestamp, o.result, o.features,
+       m.trade_id, m.exit_reason, m.pnl, m.rk IS NOT NULL AS matched
+FROM ordered o
+LEFT JOIN matches m ON m.source = o.source AND m.line = o.line AND m.rk = 1
+WHERE o.features IS NOT NULL
+  AND (o.result = 'filtered' OR (o.result = 'executed' AND m.rk IS NOT NULL))
+ORDER BY o.i
+"""
+
+
+def parse_ts(value: Any) -> Optional[float]:
+    """ISO-8601 string -> epoch seconds (naive = UTC); None if unparseable."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class SessionLogIndex:
+    """
+    Incremental SQLite index over session signals/trades and the trade journal.
+
+    Args:
+        db_path: SQLite file (":memory:" for a throwaway index)
+        sessions_dir: directory holding one sub-directory per session
+        journal_path: cross-session trade_journal.jsonl
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        sessions_dir: Optional[Path] = None,
+        journal_path: Optional[Path] = None,
+    ) -> None:
+        if db_path is None:
+            INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+            db_path = str(INDEX_PATH)
+        self.db_path = str(db_path)
+        self.sessions_dir = Path(sessions_dir) if sessions_dir else SESSION_LOGS_DIR
+        self.journal_path = Path(journal_path) if journal_path else TRADE_JOURNAL_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── ingest ────────────────────────────────────────────────────────────────
+
+    def sync(self, session_dirs: Optional[Iterable[Path]] = None) -> Dict[str, int]:
+        """
+        Ingest lines appended since the last sync.
+
+        With no `session_dirs` every session under sessions_dir plus the trade
+        journal is synced, and sessions whose files were deleted are dropped.
+        Returns {"signals": n, "trades": n} newly indexed rows.
+        """
+        full = session_dirs is None
+        if full:
+            dirs = sorted(d for d in self.sessions_dir.iterdir() if d.is_dir()) if self.sessions_dir.exists() else []
+        else:
+            dirs = [Path(d) for d in session_dirs]
+
+        files: List[Tuple[Path, str, Optional[str]]] = []
+        for d in dirs:
+            files.append((d / "signals.jsonl", SIGNALS, d.name))
+            files.append((d / "trades.jsonl", SESSION_TRADES, d.name))
+        if full:
+            files.append((self.journal_path, JOURNAL, None))
+
+        added = {"signals": 0, "trades": 0}
+        with self._lock:
+            if full:
+                self._drop_missing({str(p) for p, _, _ in files if p.exists()})
+            for path, kind, session in files:
+                if not path.exists():
+                    continue
+                try:
+                    n = self._ingest(path, kind, session)
+                except OSError as e:
+                    logger.warning("Session index: failed to read %s: %s", path, e)
+                    continue
+                added["signals" if kind == SIGNALS else "trades"] += n
+            self._conn.commit()
+        if added["signals"] or added["trades"]:
+            logger.info("Session index: +%d signals, +%d trades", added["signals"], added["trades"])
+        return added
+
+    def _drop_missing(self, present: set) -> None:
+        rows = self._conn.execute("SELECT path FROM sources").fetchall()
+        for (path,) in rows:
+            if path not in present:
+                self._forget(path)
+
+    def _forget(self, path: str) -> None:
+        self._conn.execute("DELETE FROM signals WHERE source = ?", (path,))
+        self._conn.execute("DELETE FROM trades WHERE source = ?", (path,))
+        self._conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+
+    def _ingest(self, path: Path, kind: str, session: Optional[str]) -> int:
+        key = str(path)
+        row = self._conn.execute("SELECT offset, n_lines, head FROM sources WHERE path = ?", (key,)).fetchone()
+        offset, n_lines, head = row if row else (0, 0, "")
+        with open(path, "rb") as f:
+            if offset:
+                size = path.stat().st_size
+                prefix = f.read(min(offset, _HEAD_BYTES))
+                if size < offset or _digest(prefix) != head:
+                    self._forget(key)  # truncated or rewritten: start over
+                    offset, n_lines = 0, 0
+            f.seek(offset)
+            data = f.read()
+            end = data.rfind(b"\n")  # a trailing partial line waits for the next sync
+            if end < 0:
+                return 0
+            new_offset = offset + end + 1
+            f.seek(0)
+            head = _digest(f.read(min(new_offset, _HEAD_BYTES)))
+
+        records: List[Tuple[int, Dict[str, Any], str]] = []
+        for raw in data[: end + 1].splitlines():
+            line_no = n_lines
+            n_lines += 1
+            text = raw.decode("utf-8", errors="replace").strip()
+            if not text:
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                records.append((line_no, record, text))
+
+        if kind == SIGNALS:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signals (source, line, session, symbol, direction, result, timestamp, ts, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        key, line_no, session,
+                        str(r.get("symbol") or ""), str(r.get("direction") or ""), str(r.get("result") or ""),
+                        str(r.get("timestamp") or ""), parse_ts(r.get("timestamp")), text,
+                    )
+                    for line_no, r, text in records
+                ],
+            )
+        else:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO trades (source, line, kind, session, trade_id, symbol, direction, "
+                "entry_ts, exit_reason, pnl, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        key, line_no, kind, session if kind == SESSION_TRADES else r.get("session_id"),
+                        str(r.get("trade_id") or ""), str(r.get("symbol") or ""), str(r.get("direction") or ""),
+                        parse_ts(r.get("entry_time")), str(r.get("exit_reason") or "").lower(),
+                        _as_float(r.get("pnl")), text,
+                    )
+                    for line_no, r, text in records
+                ],
+            )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sources (path, kind, session, offset, n_lines, head) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, session, new_offset, n_lines, head),
+        )
+        return len(records)
+
+    def load(self, signals: Iterable[Dict[str, Any]], trades: Iterable[Dict[str, Any]]) -> None:
+        """Index in-memory records (as if read from one signals file and the journal)."""
+        with self._lock:
+            for name, kind, records in (("<signals>", SIGNALS, signals), ("<journal>", JOURNAL, trades)):
+                self._forget(name)
+                rows = [(i, r, json.dumps(r, default=str)) for i, r in enumerate(records)]
+                if kind == SIGNALS:
+                    self._conn.executemany(
+                        "INSERT INTO signals (source, line, symbol, direction, result, timestamp, ts, raw) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                name, i, str(r.get("symbol") or ""), str(r.get("direction") or ""),
+                                str(r.get("result") or ""), str(r.get("timestamp") or ""),
+                                parse_ts(r.get("timestamp")), text,
+                            )
+                            for i, r, text in rows
+                        ],
+                    )
+                else:
+                    self._conn.executemany(
+                        "INSERT INTO trades (source, line, kind, trade_id, symbol, direction, entry_ts, "
+                        "exit_reason, pnl, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                name, i, kind, str(r.get("trade_id") or ""), str(r.get("symbol") or ""),
+                                str(r.get("direction") or ""), parse_ts(r.get("entry_time")),
+                                str(r.get("exit_reason") or "").lower(), _as_float(r.get("pnl")), text,
+                            )
+                            for i, r, text in rows
+                        ],
+                    )
+            self._conn.commit()
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    def signals(self, session_dirs: Optional[Iterable[Path]] = None, result: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Raw signal records in file order, optionally limited to sessions / one result."""
+        return self._raw("signals", SIGNALS, session_dirs, result)
+
+    def session_trades(self, session_dirs: Optional[Iterable[Path]] = None) -> List[Dict[str, Any]]:
+        """Raw records of the sessions' trades.jsonl files, in file order."""
+        return self._raw("trades", SESSION_TRADES, session_dirs, None)
+
+    def journal_trades(self) -> List[Dict[str, Any]]:
+        """Raw trade journal records, in file order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT raw FROM trades WHERE kind = ? ORDER BY source, line", (JOURNAL,)
+            ).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def _raw(self, table: str, kind: str, session_dirs, result: Optional[str]) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if table == "trades":
+            clauses.append("kind = ?")
+            params.append(kind)
+        if session_dirs is not None:
+            paths = [str(Path(d) / ("signals.jsonl" if kind == SIGNALS else "trades.jsonl")) for d in session_dirs]
+            clauses.append(f"source IN ({','.join('?' * len(paths))})")
+            params.extend(paths)
+        if result is not None:
+            clauses.append("result = ?")
+            params.append(result)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT raw FROM {table} {where} ORDER BY session, source, line", params).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def signal_counts(self) -> Dict[str, int]:
+        """{result: n} over every indexed signal."""
+        with self._lock:
+            rows = self._conn.execute("SELECT result, COUNT(*) FROM signals GROUP BY result").fetchall()
+        return {result: n for result, n in rows}
+
+    def journal_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trades WHERE kind = ?", (JOURNAL,)).fetchone()[0]
+
+    # ── dataset ───────────────────────────────────────────────────────────────
+
+    def dataset_rows(
+        self,
+        featurize: Callable[[Dict[str, Any]], Optional[np.ndarray]],
+        feature_key: str,
+        window_s: float = MATCH_WINDOW_S,
+        prepare: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Signals usable for training, each executed one joined to its best
+        journal trade, in signal order.
+
+        Feature vectors are computed with `featurize` only for signals not yet
+        featurized under `feature_key`; signals it rejects (None) are excluded.
+        `prepare`, if given, sees those signals as one batch first (e.g. to
+        fill in derived fields) and may update them in place.
+
+        Columns: i, symbol, timestamp, result, features, trade_id,
+        exit_reason, pnl, matched.
+        """
+        with self._lock:
+            self._featurize_pending(featurize, feature_key, prepare)
+            cur = self._conn.execute(_DATASET_QUERY, {"journal": JOURNAL, "window": window_s})
+            columns = [c[0] for c in cur.description]
+            return pd.DataFrame(cur.fetchall(), columns=columns)
+
+    def _featurize_pending(
+        self,
+        featurize: Callable[[Dict[str, Any]], Optional[np.ndarray]],
+        feature_key: str,
+        prepare: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> None:
+        pending = self._conn.execute(
+            "SELECT source, line, raw FROM signals WHERE feat_key IS NOT ? AND result IN ('executed', 'filtered')",
+            (feature_key,),
+        ).fetchall()
+        if not pending:
+            return
+        signals = [json.loads(raw) for _, _, raw in pending]
+        if prepare is not None:
+            prepare(signals)
+        updates = []
+        for (source, line, _), signal in zip(pending, signals):
+            vec = featurize(signal)
+            blob = None if vec is None else np.asarray(vec, dtype=np.float32).tobytes()
+            updates.append((blob, feature_key, source, line))
+        self._conn.executemany("UPDATE signals SET features = ?, feat_key = ? WHERE source = ? AND line = ?", updates)
+        self._conn.commit()
+
+
+_INDEX: Optional[SessionLogIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_session_index() -> SessionLogIndex:
+    """Process-wide SessionLogIndex over the default session/journal paths."""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = SessionLogIndex()
+    return _INDEX
@@ -10,50 +10,87 @@ Labeling strategy:
   - Executed signals with no matched trade → excluded (outcome unknown)
   - Filtered signals → label 0 with low weight (0.15) — the gauntlet rejected
     them for a reason, so they're weak negatives
+
+Signals and journal trades are read through the incremental session-log
+index (backend.ml.session_index): only lines appended since the last call
+are parsed, and the signal -> trade match plus the per-signal feature
+vectors come back from one indexed query.
 """
 
-import json
+import hashlib
 import logging
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+import pandas as pd
 
 from backend.ml.feature_extractor import (
     extract_features,
+    feature_names,
     _KILL_ZONES,
 )
+from backend.ml.session_index import (
+    MATCH_WINDOW_S,
+    SESSION_LOGS_DIR as _SESSION_LOGS_DIR,
+    SessionLogIndex,
+    get_session_index,
+    parse_ts,
+)
+from backend.shared.utils.log_sink import get_log_sink
 
 logger = logging.getLogger(__name__)
 
-_SESSION_LOGS_DIR = Path(__file__).parent.parent.parent / "logs" / "paper_trading"
-_TRADE_JOURNAL_PATH = Path(__file__).parent.parent / "cache" / "trade_journal.jsonl"
-
 FILTERED_SIGNAL_WEIGHT = 0.15
 
 
-def _derive_kill_zone(timestamp_iso: str) -> str:
-    """Derive kill zone from ISO timestamp."""
+# Kill-zone label per hour of the signal timestamp's own clock (the labels and
+# hour ranges the trained models were fitted on; see feature_extractor._KILL_ZONES)
+_HOUR_KILL_ZONES = np.array(
+    ["asian_session"] * 8
+    + ["london_open"]
+    + ["london_session"] * 3
+    + ["new_york_open"] * 2
+    + ["new_york_session"] * 3
+    + ["london_close"]
+    + ["no_session"] * 6
+    + ["no_session"],  # index -1: unparseable timestamp
+    dtype=object,
+)
+
+
+def _own_clock_hour(timestamp_iso: Any) -> float:
     try:
-        dt = datetime.fromisoformat(timestamp_iso.replace("Z", "+00:00"))
-        hour = dt.hour
-        if 0 <= hour < 8:
-            return "asian_session"
-        elif 8 <= hour < 9:
-            return "london_open"
-        elif 9 <= hour < 12:
-            return "london_session"
-        elif 12 <= hour < 14:
-            return "new_york_open"
-        elif 14 <= hour < 17:
-            return "new_york_session"
-        elif 17 <= hour < 18:
-            return "london_close"
-        else:
-            return "no_session"
+        return datetime.fromisoformat(timestamp_iso.replace("Z", "+00:00")).hour
     except Exception:
-        return "no_session"
+        return float("nan")
+
+
+def _derive_kill_zones(timestamps_iso: List[Any]) -> List[str]:
+    """
+    Kill zone labels for many ISO timestamps, by the hour on each
+    timestamp's own clock: one vectorized parse, then a table lookup.
+    """
+    if not timestamps_iso:
+        return []
+    stamps = pd.Series([ts if isinstance(ts, str) else None for ts in timestamps_iso], dtype=object)
+    try:
+        hours = pd.to_datetime(stamps, errors="coerce", utc=False, format="ISO8601").dt.hour
+    except ValueError:  # mixed UTC offsets cannot share one column: parse one by one
+        hours = stamps.map(_own_clock_hour)
+    return _HOUR_KILL_ZONES[hours.fillna(-1).to_numpy(dtype=np.int64)].tolist()
+
+
+def _derive_kill_zone(timestamp_iso: str) -> str:
+    """Derive kill zone from ISO timestamp."""
+    return _derive_kill_zones([timestamp_iso])[0]
+
+
+def _prepare_signals(signals: List[Dict[str, Any]]) -> None:
+    """Fill in derived kill zones for a batch of signals before featurizing them."""
+    missing = [s for s in signals if not s.get("kill_zone")]
+    for signal, kill_zone in zip(missing, _derive_kill_zones([s.get("timestamp", "") for s in missing])):
+        signal["kill_zone"] = kill_zone
 
 
 def _signal_to_record(signal: Dict[str, Any]) -> Dict[str, Any]:
@@ -73,89 +110,76 @@ def _signal_to_record(signal: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def collect_signals() -> List[Dict[str, Any]]:
-    """Read all signals from all session log directories."""
-    signals = []
+def _signal_features(signal: Dict[str, Any]) -> Optional[np.ndarray]:
+    return extract_features(_signal_to_record(signal))
 
-    if not _SESSION_LOGS_DIR.exists():
-        return signals
 
-    for session_dir in sorted(_SESSION_LOGS_DIR.iterdir()):
-        signals_file = session_dir / "signals.jsonl"
-        if not signals_file.exists():
-            continue
-        try:
-            with open(signals_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            signals.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue
-        except Exception as e:
-            logger.warning("Failed to read %s: %s", signals_file, e)
+# Cached feature vectors are recomputed when the feature layout changes.
+_FEATURE_KEY = hashlib.sha1("|".join(feature_names()).encode("utf-8")).hexdigest()[:16]
+
+
+def sync_index() -> SessionLogIndex:
+    """Bring the session-log index up to date with the files on disk."""
+    index = get_session_index()
+    get_log_sink().flush()  # a running session's newest lines may still be queued
+    index.sync()
+    return index
+
 
+def collect_signals() -> List[Dict[str, Any]]:
+    """Read all signals from all session log directories."""
+    signals = sync_index().signals()
     logger.info("Collected %d signals from %s", len(signals), _SESSION_LOGS_DIR)
     return signals
 
 
 def load_trade_journal() -> List[Dict[str, Any]]:
     """Load completed trades from the trade journal."""
-    trades = []
-    if not _TRADE_JOURNAL_PATH.exists():
-        return trades
-    try:
-        with open(_TRADE_JOURNAL_PATH, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        trades.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-    except Exception as e:
-        logger.warning("Failed to read trade journal: %s", e)
-    return trades
+    return sync_index().journal_trades()
 
 
 def _match_signal_to_trade(
     signal: Dict[str, Any],
     trades_by_symbol: Dict[str, List[Dict[str, Any]]],
 ) -> Optional[Dict[str, Any]]:
-    """Find the trade that was opened from this executed signal."""
-    symbol = signal.get("symbol", "")
-    direction = signal.get("direction", "")
-    signal_time = signal.get("timestamp", "")
-
-    candidates = trades_by_symbol.get(symbol, [])
-    if not candidates:
-        return None
+    """
+    Find the trade that was opened from this executed signal.
 
-    try:
-        sig_dt = datetime.fromisoformat(signal_time.replace("Z", "+00:00"))
-    except Exception:
+    Single-signal form of the as-of join build_signal_dataset runs in the
+    index: same direction, entry within MATCH_WINDOW_S, closest wins.
+    """
+    sig_ts = parse_ts(signal.get("timestamp", ""))
+    if sig_ts is None:
         return None
+    direction = signal.get("direction", "")
 
     best_match = None
     best_delta = float("inf")
-
-    for trade in candidates:
+    for trade in trades_by_symbol.get(signal.get("symbol", ""), []):
         if trade.get("direction") != direction:
             continue
-        trade_time = trade.get("entry_time", "")
-        try:
-            trade_dt = datetime.fromisoformat(trade_time.replace("Z", "+00:00"))
-        except Exception:
+        trade_ts = parse_ts(trade.get("entry_time", ""))
+        if trade_ts is None:
             continue
-        delta = abs((trade_dt - sig_dt).total_seconds())
-        if delta < 300 and delta < best_delta:
+        delta = abs(trade_ts - sig_ts)
+        if delta < MATCH_WINDOW_S and delta < best_delta:
             best_delta = delta
             best_match = trade
-
     return best_match
 
 
+# exit_reason -> (label rule, weight). "pnl" labels by the sign of the trade's pnl.
+# target_strip (all targets on the wrong side of the fill) is a planner/fill-drift
+# issue, not signal quality, so like unknown reasons it is left out of training.
+_EXIT_LABELS = {
+    "target": (1, 1.0),
+    "stop_loss": (0, 1.0),
+    "stagnation": ("pnl", 0.3),
+    "max_hours": ("pnl", 0.3),
+    "manual": ("pnl", 0.5),
+}
+
+
 def build_signal_dataset(
     signals: Optional[List[Dict[str, Any]]] = None,
     trades: Optional[List[Dict[str, Any]]] = None,
@@ -163,88 +187,51 @@ def build_signal_dataset(
     """
     Build training dataset from scan signals + trade outcomes.
 
+    With no arguments the persistent session-log index is used; explicit
+    `signals` / `trades` lists are loaded into a throwaway in-memory index.
+
     Returns same format as feature_extractor.build_dataset():
         X:              shape (n, 25) feature matrix
         y:              shape (n,)    binary labels
         sample_weights: shape (n,)    confidence weights
         ids:            list of signal identifiers
     """
-    if signals is None:
-        signals = collect_signals()
-    if trades is None:
-        trades = load_trade_journal()
-
-    trades_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
-    for t in trades:
-        sym = t.get("symbol", "")
-        trades_by_symbol.setdefault(sym, []).append(t)
-
-    X_rows, y_rows, w_rows, ids = [], [], [], []
-    matched_trade_ids = set()
-
-    for i, signal in enumerate(signals):
-        record = _signal_to_record(signal)
-        vec = extract_features(record)
-
-        if vec is None:
-            continue
+    if signals is None and trades is None:
+        index = sync_index()
+    else:
+        index = SessionLogIndex(db_path=":memory:")
+        index.load(
+            signals if signals is not None else collect_signals(),
+            trades if trades is not None else load_trade_journal(),
+        )
+    rows = index.dataset_rows(_signal_features, _FEATURE_KEY, window_s=MATCH_WINDOW_S, prepare=_prepare_signals)
+    if signals is not None or trades is not None:
+        index.close()
+
+    if rows.empty:
+        return np.empty((0, 0)), np.empty((0,)), np.empty((0,)), []
 
-        result = signal.get("result", "")
-        sig_id = f"sig_{i}_{signal.get('symbol', '')}_{signal.get('timestamp', '')}"
-
-        if result == "executed":
-            matched_trade = _match_signal_to_trade(signal, trades_by_symbol)
-            if matched_trade is None:
-                continue
-
-            trade_id = matched_trade.get("trade_id", "")
-            if trade_id in matched_trade_ids:
-                continue
-            matched_trade_ids.add(trade_id)
-
-            exit_reason = str(matched_trade.get("exit_reason", "")).lower()
-            pnl = float(matched_trade.get("pnl", 0))
-
-            if exit_reason == "target":
-                label, weight = 1, 1.0
-            elif exit_reason == "stop_loss":
-                label, weight = 0, 1.0
-            elif exit_reason in ("stagnation", "max_hours"):
-                label, weight = (1 if pnl > 0 else 0), 0.3
-            elif exit_reason == "manual":
-                label, weight = (1 if pnl > 0 else 0), 0.5
-            elif exit_reason == "target_strip":
-                # Entry-geometry failure: all targets were on the wrong side of the
-                # actual fill price. This reflects a planner/fill-drift issue, not
-                # signal quality. Exclude from training — it would add label noise.
-                continue
-            else:
-                continue
-
-            X_rows.append(vec)
-            y_rows.append(label)
-            w_rows.append(weight)
-            ids.append(sig_id)
-
-        elif result == "filtered":
-            X_rows.append(vec)
-            y_rows.append(0)
-            w_rows.append(FILTERED_SIGNAL_WEIGHT)
-            ids.append(sig_id)
-
-    if not X_rows:
+    executed = (rows["result"] == "executed").to_numpy()
+    # Each trade labels only the first signal (in signal order) matched to it.
+    dup_trade = rows["trade_id"].where(executed).duplicated() & executed
+    reasons = rows["exit_reason"].fillna("")
+    rule = reasons.map(lambda r: _EXIT_LABELS.get(r, (None, 0.0))[0])
+    weight = reasons.map(lambda r: _EXIT_LABELS.get(r, (None, 0.0))[1]).to_numpy(dtype=np.float32)
+    pnl_win = (rows["pnl"].fillna(0.0).to_numpy() > 0).astype(np.int32)
+    label = np.where(rule == "pnl", pnl_win, np.where(rule == 1, 1, 0)).astype(np.int32)
+
+    keep = ~executed | (rule.notna().to_numpy() & ~dup_trade.to_numpy())
+    if not keep.any():
         return np.empty((0, 0)), np.empty((0,)), np.empty((0,)), []
+    label = np.where(executed, label, 0)[keep]
+    weight = np.where(executed, weight, np.float32(FILTERED_SIGNAL_WEIGHT))[keep].astype(np.float32)
+    kept = rows[keep]
+    X = np.stack([np.frombuffer(b, dtype=np.float32) for b in kept["features"]])
+    ids = [f"sig_{i}_{sym}_{ts}" for i, sym, ts in zip(kept["i"], kept["symbol"], kept["timestamp"])]
 
+    n_exec = int(executed[keep].sum())
     logger.info(
         "Signal dataset: %d samples (%d executed+matched, %d filtered)",
-        len(X_rows),
-        sum(1 for w in w_rows if w > FILTERED_SIGNAL_WEIGHT),
-        sum(1 for w in w_rows if w == FILTERED_SIGNAL_WEIGHT),
-    )
-
-    return (
-        np.stack(X_rows),
-        np.array(y_rows, dtype=np.int32),
-        np.array(w_rows, dtype=np.float32),
-        ids,
+        len(ids), n_exec, len(ids) - n_exec,
     )
+    return X, label, weight, ids
@@ -0,0 +1,224 @@
+"""
+Correlation Engine
+
+Rolling EWMA covariance / correlation of log returns for every scanned
+symbol, held as dense NumPy matrices and advanced once per scan from the
+closes the scan already fetched (Orchestrator prefetched_data).
+
+Estimator (RiskMetrics style, zero-mean returns):
+
+    S_t = decay * S_{t-1} + (1 - decay) * r_t r_t^T
+
+For pairs with gaps (a symbol listed later, a missing candle) the joint
+observation weight W is tracked the same way and the covariance is the
+weighted mean S / W over the bars both symbols traded. Correlation is
+then S_ij / W_ij normalised by each symbol's own variance.
+
+Per scan only the bars newer than the last processed timestamp are
+folded in, all of them in one weighted matrix product
+(decay^k * S + (1 - decay) * Rᵀ diag(w) R), so the update is O(k·n²)
+vectorised for k new bars. A symbol seen for the first time is
+back-filled from the history in the same scan. Reads go through the
+published (index, matrix) snapshot and are O(1) per pair.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEFRAME = "1h"
+DEFAULT_DECAY = 0.97        # ~23-bar half-life on 1h bars
+DEFAULT_MIN_OBS = 30        # joint bars required before a pair reports a correlation
+DEFAULT_MAX_HISTORY = 500   # bars used to back-fill a newly seen symbol
+
+CorrelationSnapshot = Tuple[Dict[str, int], np.ndarray]
+
+
+def closes_from_universe(universe: Dict[str, Any], timeframe: str = DEFAULT_TIMEFRAME) -> Dict[str, pd.Series]:
+    """
+    {symbol: close series indexed by bar timestamp} from a
+    {symbol: MultiTimeframeData} universe. Symbols without `timeframe`
+    are skipped.
+    """
+    out: Dict[str, pd.Series] = {}
+    for symbol, mtf in universe.items():
+        frames = getattr(mtf, "timeframes", None) or {}
+        df = frames.get(timeframe)
+        if df is None or len(df) < 2 or "close" not in df:
+            continue
+        if "timestamp" in df:
+            index = pd.DatetimeIndex(pd.to_datetime(df["timestamp"], utc=True))
+        else:
+            index = pd.DatetimeIndex(pd.to_datetime(df.index, utc=True))
+        series = pd.Series(df["close"].to_numpy(dtype=float), index=index)
+        out[symbol] = series[~series.index.duplicated(keep="last")]
+    return out
+
+
+class EwmaCorrelationEngine:
+    """
+    Incremental EWMA covariance over log returns for a growing symbol set.
+
+    Args:
+        decay: per-bar decay factor (lambda)
+        timeframe: bar timeframe read by update_from_universe
+        min_obs: joint observations before a pair's correlation is published
+        max_history: bars used to back-fill a symbol the first time it is seen
+    """
+
+    def __init__(
+        self,
+        decay: float = DEFAULT_DECAY,
+        timeframe: str = DEFAULT_TIMEFRAME,
+        min_obs: int = DEFAULT_MIN_OBS,
+        max_history: int = DEFAULT_MAX_HISTORY,
+    ) -> None:
+        if not 0.0 < decay < 1.0:
+            raise ValueError(f"decay must be in (0, 1), got {decay}")
+        self.decay = decay
+        self.timeframe = timeframe
+        self.min_obs = min_obs
+        self.max_history = max_history
+
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._cov = np.zeros((0, 0))
+        self._weight = np.zeros((0, 0))
+        self._nobs = np.zeros((0, 0), dtype=np.int64)
+        self._last_ts: Optional[pd.Timestamp] = None
+        self._snapshot: CorrelationSnapshot = ({}, np.zeros((0, 0)))
+        self._lock = threading.Lock()
+
+    # ── updates ───────────────────────────────────────────────────────────────
+
+    def update_from_universe(self, universe: Dict[str, Any]) -> CorrelationSnapshot:
+        """update() with the closes of `self.timeframe` from a scan's prefetched_data."""
+        return self.update(closes_from_universe(universe, self.timeframe))
+
+    def update(self, closes: Dict[str, pd.Series]) -> CorrelationSnapshot:
+        """
+        Fold bars newer than the last update into the estimator.
+
+        Args:
+            closes: {symbol: close prices indexed by bar timestamp}
+
+        Returns:
+            The published (symbol -> index, correlation matrix) snapshot
+        """
+        if not closes:
+            return self._snapshot
+        aligned = pd.DataFrame(closes).sort_index()
+        if len(aligned) > self.max_history + 1:
+            aligned = aligned.iloc[-(self.max_history + 1):]
+        prices = aligned.to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logp = np.where(prices > 0, np.log(prices), np.nan)
+        returns = logp[1:] - logp[:-1]
+        times = aligned.index[1:]
+        if returns.shape[0] == 0:
+            return self._snapshot
+
+        with self._lock:
+            added = [s for s in aligned.columns if s not in self._index]
+            if added:
+                self._grow(added)
+            cols = np.array([self._index[s] for s in aligned.columns], dtype=np.int64)
+
+            fresh = np.ones(len(times), dtype=bool) if self._last_ts is None else np.asarray(times > self._last_ts)
+            if fresh.any():
+                self._fold(returns[fresh], cols)
+                self._last_ts = times[fresh][-1]
+            if added:
+                self._backfill(returns, cols, np.array([self._index[s] for s in added], dtype=np.int64))
+            self._snapshot = (dict(self._index), self._correlation())
+            return self._snapshot
+
+    def _grow(self, added: List[str]) -> None:
+        n_old = len(self._symbols)
+        n_new = n_old + len(added)
+        for name in ("_cov", "_weight", "_nobs"):
+            old = getattr(self, name)
+            grown = np.zeros((n_new, n_new), dtype=old.dtype)
+            grown[:n_old, :n_old] = old
+            setattr(self, name, grown)
+        for s in added:
+            self._index[s] = len(self._symbols)
+            self._symbols.append(s)
+
+    @staticmethod
+    def _weighted_products(Z: np.ndarray, M: np.ndarray, w: np.ndarray, Z2: np.ndarray, M2: np.ndarray):
+        """(Σ w·z zᵀ, Σ w·m mᵀ, Σ m mᵀ) between the columns of (Z, M) and (Z2, M2)."""
+        Zw = Z * w[:, None]
+        Mw = M * w[:, None]
+        return Zw.T @ Z2, Mw.T @ M2, M.T.astype(np.int64) @ M2.astype(np.int64)
+
+    def _fold(self, R: np.ndarray, cols: np.ndarray) -> None:
+        """Advance the estimator by the k rows of R (bars x columns `cols`)."""
+        k = R.shape[0]
+        M = np.isfinite(R)
+        Z = np.where(M, R, 0.0)
+        Mf = M.astype(np.float64)
+        w = (1.0 - self.decay) * self.decay ** np.arange(k - 1, -1, -1, dtype=np.float64)
+        dcov, dweight, dnobs = self._weighted_products(Z, Mf, w, Z, Mf)
+        scale = self.decay ** k
+        self._cov *= scale
+        self._weight *= scale
+        block = np.ix_(cols, cols)
+        self._cov[block] += dcov
+        self._weight[block] += dweight
+        self._nobs[block] += dnobs
+
+    def _backfill(self, R: np.ndarray, cols: np.ndarray, added: np.ndarray) -> None:
+        """Rebuild the rows/columns of newly added symbols from the whole history in R."""
+        T = R.shape[0]
+        M = np.isfinite(R)
+        Z = np.where(M, R, 0.0)
+        Mf = M.astype(np.float64)
+        w = (1.0 - self.decay) * self.decay ** np.arange(T - 1, -1, -1, dtype=np.float64)
+        pos = {int(c): i for i, c in enumerate(cols)}
+        sel = np.array([pos[int(a)] for a in added], dtype=np.int64)
+        cov, weight, nobs = self._weighted_products(Z[:, sel], Mf[:, sel], w, Z, Mf)
+        for name, block in (("_cov", cov), ("_weight", weight), ("_nobs", nobs)):
+            target = getattr(self, name)
+            target[np.ix_(added, cols)] = block
+            target[np.ix_(cols, added)] = block.T
+
+    def _correlation(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = np.where(self._weight > 0, self._cov / self._weight, np.nan)
+            sd = np.sqrt(np.diag(cov))
+            corr = cov / np.outer(sd, sd)
+        corr = np.clip(corr, -1.0, 1.0)
+        corr[self._nobs < self.min_obs] = np.nan
+        corr[~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def snapshot(self) -> CorrelationSnapshot:
+        """Last published (symbol -> index, correlation matrix); NaN = not enough joint data."""
+        return self._snapshot
+
+    def correlation(self, symbol1: str, symbol2: str) -> Optional[float]:
+        index, corr = self._snapshot
+        i, j = index.get(symbol1), index.get(symbol2)
+        if i is None or j is None or np.isnan(corr[i, j]):
+            return None
+        return float(corr[i, j])
+
+    def covariance(self) -> Tuple[List[str], np.ndarray]:
+        """(symbols, EWMA covariance of log returns) — NaN where no joint data."""
+        with self._lock:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cov = np.where(self._weight > 0, self._cov / self._weight, np.nan)
+            return list(self._symbols), cov
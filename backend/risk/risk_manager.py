@@ -19,6 +19,8 @@ import logging
 import threading
 import numpy as np
 
+from backend.risk.correlation_engine import CorrelationSnapshot, EwmaCorrelationEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -192,9 +194,12 @@ class RiskManager:
             "ALTS": [],  # Define alt correlation groups as needed
         }
 
-        # Dynamic correlation matrix (symbol -> symbol -> correlation coefficient)
-        # Updated via update_correlation_matrix() with actual price data
-        self.correlation_matrix: Dict[str, Dict[str, float]] = {}
+        # Dynamic correlations: (symbol -> row index, n x n coefficient matrix), replaced
+        # atomically. Fed per scan by update_correlations_from_universe() (EWMA engine)
+        # or explicitly via update_correlation_matrix() with aligned price arrays.
+        # NaN = not enough joint history for that pair.
+        self._correlations: Tuple[Dict[str, int], np.ndarray] = ({}, np.zeros((0, 0)))
+        self.correlation_engine = EwmaCorrelationEngine()
         self.correlation_threshold: float = (
             0.7  # Assets above this correlation treated as correlated
         )
@@ -348,9 +353,12 @@ class RiskManager:
         correlated_exposure = 0.0
 
         # Use dynamic correlation matrix if available
-        if symbol in self.correlation_matrix:
+        index, corr = self._correlations
+        row = index.get(symbol)
+        if row is not None:
             for pos_symbol, position in self.positions.items():
-                correlation = self.correlation_matrix.get(symbol, {}).get(pos_symbol, 0.0)
+                col = index.get(pos_symbol)
+                correlation = corr[row, col] if col is not None else 0.0
                 if abs(correlation) >= self.correlation_threshold:
                     correlated_exposure += position.notional_value
         else:
@@ -543,10 +551,13 @@ class RiskManager:
         correlated_exposure = 0.0
 
         # Use dynamic correlation matrix if available
-        if symbol in self.correlation_matrix:
+        index, corr = self._correlations
+        row = index.get(symbol)
+        if row is not None:
             for pos_symbol, position in self.positions.items():
-                # Check correlation coefficient
-                correlation = self.correlation_matrix.get(symbol, {}).get(pos_symbol, 0.0)
+                # Check correlation coefficient (NaN = insufficient joint history)
+                col = index.get(pos_symbol)
+                correlation = corr[row, col] if col is not None else 0.0
 
                 # If highly correlated (above threshold), include in exposure
                 if abs(correlation) >= self.correlation_threshold:
@@ -604,84 +615,86 @@ class RiskManager:
             logger.error(f"Inconsistent price data lengths: {dict(zip(symbols, lengths))}")
             return
 
-        # Calculate returns for each symbol
-        returns_data = {}
-        for symbol, prices in price_data.items():
-            if len(prices) < 2:
-                logger.warning(f"Insufficient price data for {symbol}: {len(prices)} periods")
-                continue
-
-            # Calculate percentage returns
-            returns = np.diff(prices) / prices[:-1]
-            returns_data[symbol] = returns
-
-        if not returns_data:
-            logger.warning("No valid returns data - correlation matrix not updated")
+        if lengths[0] < 2:
+            logger.warning(f"Insufficient price data ({lengths[0]} periods) - correlation matrix not updated")
             return
 
-        # Build correlation matrix
-        new_matrix = {}
-
-        for symbol1 in symbols:
-            if symbol1 not in returns_data:
-                continue
-
-            new_matrix[symbol1] = {}
-
-            for symbol2 in symbols:
-                if symbol2 not in returns_data:
-                    continue
+        # Percentage returns for every symbol at once (periods-1 x symbols)
+        prices = np.column_stack([np.asarray(price_data[s], dtype=float) for s in symbols])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(prices, axis=0) / prices[:-1]
 
-                # Self-correlation is always 1.0
-                if symbol1 == symbol2:
-                    new_matrix[symbol1][symbol2] = 1.0
-                    continue
-
-                # Calculate Pearson correlation
-                returns1 = returns_data[symbol1]
-                returns2 = returns_data[symbol2]
+        if returns.shape[0] < 2:
+            new_matrix = np.eye(len(symbols))
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                new_matrix = np.corrcoef(returns, rowvar=False).reshape(len(symbols), len(symbols))
+            # NaN can occur with constant prices
+            new_matrix = np.nan_to_num(new_matrix, nan=0.0)
+            np.fill_diagonal(new_matrix, 1.0)
 
-                # Ensure equal length (should be guaranteed by earlier check)
-                min_len = min(len(returns1), len(returns2))
-                returns1 = returns1[:min_len]
-                returns2 = returns2[:min_len]
+        self._publish_correlations({s: i for i, s in enumerate(symbols)}, new_matrix)
 
-                if min_len < 2:
-                    new_matrix[symbol1][symbol2] = 0.0
-                    continue
+        logger.info(
+            f"Correlation matrix updated: {len(symbols)} symbols, {len(symbols) ** 2} pairs"
+        )
 
-                # Calculate correlation coefficient
-                try:
-                    correlation = np.corrcoef(returns1, returns2)[0, 1]
+    def update_correlations_from_universe(self, universe: Dict) -> None:
+        """
+        Advance the EWMA correlation engine with a scan's fetched data and
+        publish its matrix for the exposure checks.
 
-                    # Handle NaN (can occur with constant prices)
-                    if np.isnan(correlation):
-                        correlation = 0.0
+        Args:
+            universe: {symbol: MultiTimeframeData} (Orchestrator prefetched_data)
+        """
+        index, corr = self.correlation_engine.update_from_universe(universe)
+        if index:
+            self._publish_correlations(index, corr)
+            logger.debug(f"EWMA correlations updated: {len(index)} symbols")
 
-                    new_matrix[symbol1][symbol2] = float(correlation)
+    def _publish_correlations(self, index: Dict[str, int], matrix: np.ndarray) -> None:
+        """Swap in a new (index, matrix) pair and log newly high-correlation pairs."""
+        with self._lock:
+            self._correlations = (index, matrix)
+
+        symbols = sorted(index, key=index.get)
+        order = np.array([index[s] for s in symbols], dtype=np.int64)
+        with np.errstate(invalid="ignore"):
+            high = np.abs(matrix[np.ix_(order, order)]) >= self.correlation_threshold
+        for i, j in zip(*np.nonzero(np.triu(high, k=1))):
+            logger.debug(
+                f"High correlation detected: {symbols[i]} - {symbols[j]} = {matrix[order[i], order[j]]:.2f}"
+            )
+
+    def correlation_snapshot(self) -> CorrelationSnapshot:
+        """The published (symbol -> index, matrix) pair, for handing to another process."""
+        return self._correlations
+
+    def load_correlation_snapshot(self, snapshot: CorrelationSnapshot) -> None:
+        """Install a pair taken by another RiskManager's correlation_snapshot()."""
+        with self._lock:
+            self._correlations = snapshot
 
-                except Exception as e:
-                    logger.error(f"Error calculating correlation {symbol1}-{symbol2}: {e}")
-                    new_matrix[symbol1][symbol2] = 0.0
+    @property
+    def correlation_matrix(self) -> Dict[str, Dict[str, float]]:
+        """Nested-dict view of the published correlations (NaN pairs omitted)."""
+        index, corr = self._correlations
+        return {
+            s1: {s2: float(corr[i, j]) for s2, j in index.items() if not np.isnan(corr[i, j])}
+            for s1, i in index.items()
+        }
 
-        # Update correlation matrix atomically
+    @correlation_matrix.setter
+    def correlation_matrix(self, matrix: Dict[str, Dict[str, float]]) -> None:
+        symbols = list(dict.fromkeys([*matrix, *(s for row in matrix.values() for s in row)]))
+        index = {s: i for i, s in enumerate(symbols)}
+        values = np.full((len(symbols), len(symbols)), np.nan)
+        for s1, row in matrix.items():
+            for s2, corr in row.items():
+                values[index[s1], index[s2]] = corr
+        np.fill_diagonal(values, 1.0)
         with self._lock:
-            self.correlation_matrix = new_matrix
-
-        # Log high correlations
-        for symbol1 in new_matrix:
-            for symbol2 in new_matrix[symbol1]:
-                if symbol1 < symbol2:  # Avoid duplicate pairs
-                    corr = new_matrix[symbol1][symbol2]
-                    if abs(corr) >= self.correlation_threshold:
-                        logger.info(
-                            f"High correlation detected: {symbol1} - {symbol2} = {corr:.2f}"
-                        )
-
-        logger.info(
-            f"Correlation matrix updated: {len(new_matrix)} symbols, "
-            f"{sum(len(v) for v in new_matrix.values())} pairs"
-        )
+            self._correlations = (index, values)
 
     def get_correlation(self, symbol1: str, symbol2: str) -> Optional[float]:
         """
@@ -694,7 +707,11 @@ class RiskManager:
         Returns:
             Correlation coefficient (-1 to 1) or None if not available
         """
-        return self.correlation_matrix.get(symbol1, {}).get(symbol2)
+        index, corr = self._correlations
+        i, j = index.get(symbol1), index.get(symbol2)
+        if i is None or j is None or np.isnan(corr[i, j]):
+            return None
+        return float(corr[i, j])
 
     def get_correlated_symbols(
         self, symbol: str, min_correlation: Optional[float] = None
@@ -712,14 +729,16 @@ class RiskManager:
         if min_correlation is None:
             min_correlation = self.correlation_threshold
 
-        if symbol not in self.correlation_matrix:
+        index, matrix = self._correlations
+        row = index.get(symbol)
+        if row is None:
             return []
 
-        correlated = [
-            (other_symbol, corr)
-            for other_symbol, corr in self.correlation_matrix[symbol].items()
-            if other_symbol != symbol and abs(corr) >= min_correlation
-        ]
+        with np.errstate(invalid="ignore"):
+            hits = np.abs(matrix[row]) >= min_correlation
+        hits[row] = False
+        by_col = {i: s for s, i in index.items()}
+        correlated = [(by_col[int(j)], float(matrix[row, j])) for j in np.nonzero(hits)[0]]
 
         # Sort by absolute correlation (strongest first)
         correlated.sort(key=lambda x: abs(x[1]), reverse=True)
@@ -754,7 +773,7 @@ class RiskManager:
         """
         # Calculate correlation exposure breakdown
         correlation_exposure = {}
-        if self.correlation_matrix:
+        if self._correlations[0]:
             for symbol in self.positions:
                 corr_exp = self._get_correlated_exposure(symbol)
                 correlation_exposure[symbol] = {
@@ -780,6 +799,6 @@ class RiskManager:
             "daily_loss": self._get_period_loss(24),
             "weekly_loss": self._get_period_loss(168),
             "positions_by_direction": self.get_positions_by_direction(),
-            "correlation_matrix_loaded": len(self.correlation_matrix) > 0,
+            "correlation_matrix_loaded": len(self._correlations[0]) > 0,
             "correlation_exposure": correlation_exposure,
         }
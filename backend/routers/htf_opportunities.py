@@ -4,13 +4,17 @@ Detects major swing setups at higher timeframe levels and recommends mode switch
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
+from functools import partial
 import logging
 
 from backend.analysis.htf_levels import HTFLevelDetector
-from backend.data.adapters.phemex import PhemexAdapter
+from backend.shared.cache import get_cache_manager
+
+if TYPE_CHECKING:  # adapter module imports ccxt; loaded on first request
+    from backend.data.adapters.phemex import PhemexAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +22,12 @@ router = APIRouter(prefix="/api/htf", tags=["HTF Opportunities"])
 
 # Singleton detector and adapter for reuse
 _detector: Optional[HTFLevelDetector] = None
-_adapter: Optional[PhemexAdapter] = None
+_adapter: Optional["PhemexAdapter"] = None
+
+# Per-symbol opportunity cache. 4H/1D levels barely move inside 5 minutes;
+# concurrent dashboard requests for the same symbol share one analysis.
+_OPPORTUNITY_TTL = 300
+_OPPORTUNITY_STALE_TTL = 600
 
 
 def _get_detector(proximity_threshold: float = 2.0) -> HTFLevelDetector:
@@ -28,9 +37,11 @@ def _get_detector(proximity_threshold: float = 2.0) -> HTFLevelDetector:
     return _detector
 
 
-def _get_adapter() -> PhemexAdapter:
+def _get_adapter() -> "PhemexAdapter":
     global _adapter
     if _adapter is None:
+        from backend.data.adapters.phemex import PhemexAdapter
+
         _adapter = PhemexAdapter()
     return _adapter
 
@@ -83,18 +94,23 @@ async def get_htf_opportunities(
         target_symbols = symbols.split(",") if symbols else ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
         target_symbols = [s.strip() for s in target_symbols]
 
-        # Run blocking analysis in thread pool
+        # Run blocking analysis in the shared cache compute pool, one
+        # single-flight cached computation per symbol. Empty results are
+        # not cached: they also cover fetch failures.
         import asyncio
 
-        loop = asyncio.get_event_loop()
-
-        tasks = []
-        for symbol in target_symbols:
-            tasks.append(
-                loop.run_in_executor(
-                    None, _analyze_symbol_sync, symbol, detector, adapter, min_confidence
-                )
+        cache = get_cache_manager().namespace("generic")
+        tasks = [
+            cache.get_or_compute_async(
+                f"htf_opportunities:{symbol}:{proximity_threshold}:{min_confidence}",
+                partial(_analyze_symbol_sync, symbol, detector, adapter, min_confidence),
+                ttl=_OPPORTUNITY_TTL,
+                stale_ttl=_OPPORTUNITY_STALE_TTL,
+                refresh_ahead=30,
+                cacheable=bool,
             )
+            for symbol in target_symbols
+        ]
 
         results = await asyncio.gather(*tasks)
 
@@ -118,7 +134,7 @@ async def get_htf_opportunities(
 
 
 def _analyze_symbol_sync(
-    symbol: str, detector: HTFLevelDetector, adapter: PhemexAdapter, min_confidence: float
+    symbol: str, detector: HTFLevelDetector, adapter: "PhemexAdapter", min_confidence: float
 ) -> List[OpportunityResponse]:
     """Synchronous helper for single symbol analysis (run in thread)."""
     opportunities: List[OpportunityResponse] = []
@@ -223,7 +239,7 @@ async def get_symbol_levels(
 
 
 def _get_symbol_levels_sync(
-    symbol: str, detector: HTFLevelDetector, adapter: PhemexAdapter, min_strength: float
+    symbol: str, detector: HTFLevelDetector, adapter: "PhemexAdapter", min_strength: float
 ) -> Dict[str, Any]:
     """Synchronous helper for single symbol level detection."""
     try:
@@ -18,6 +18,9 @@ Routes
   GET /api/cycles/last                         cheap   — Most recent heartbeat
   GET /api/cycles/history                      cheap   — Last N heartbeats
                                                           (?n=, ?mode=, ?include_audit=true → moderate)
+  GET /api/cycles/stage-latency                moderate— Per-stage p50/p95/p99 + histograms
+                                                          (?mode=)
+  GET /api/cycles/stage-latency/flame          moderate— Collapsed-stack flame report (text/plain)
 
 ────────────────────────────────────────────────────────────────────────
 Lookup-miss contract
@@ -67,7 +70,7 @@ import time
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from backend.shared.models.envelope import (
     Envelope,
@@ -85,6 +88,8 @@ from backend.shared.models.observability import (
     FactorContribution,
     GauntletSubstage,
     SignalTrace,
+    StageLatency,
+    StageLatencyReport,
     TraceStage,
     Universe,
     UniverseCounts,
@@ -556,3 +561,55 @@ async def get_cycles_history(
         env = ok_envelope(payload, source="cycle_heartbeat", cost_class="moderate")
         env = env.model_copy(update={"warnings": list(warnings)})
     return JSONResponse(content=env.model_dump(by_alias=True))
+
+
+# ---------------------------------------------------------------------------
+# /api/cycles/stage-latency  +  /api/cycles/stage-latency/flame
+# ---------------------------------------------------------------------------
+
+
+@router.get(
+    "/api/cycles/stage-latency",
+    response_model=Envelope[StageLatencyReport],
+    summary="Per-stage latency percentiles and histograms for the per-symbol pipeline",
+    description=(
+        "Aggregated timings for each _process_symbol stage (ingest, indicators, "
+        "regime, smc, confluence, planner, risk, ...) and each SMC detector "
+        "(smc.*), per scanner mode. Percentiles come from a bounded sample "
+        "reservoir; histograms are cumulative since process start. "
+        "Cost: moderate (sorts the reservoir on read)."
+    ),
+)
+async def get_stage_latency(
+    mode: Optional[str] = Query(None, description="Filter by scanner mode (e.g. stealth)"),
+) -> JSONResponse:
+    from backend.engine import stage_profiler
+
+    summary = stage_profiler.snapshot(mode)
+    report = StageLatencyReport(
+        symbols_recorded=stage_profiler.stats()["symbols_recorded"],
+        by_mode={
+            m: [StageLatency(stage=name, **vals) for name, vals in sorted(stages.items())]
+            for m, stages in summary.items()
+        },
+        last_run=stage_profiler.last_run() or None,
+    )
+    env = ok_envelope(report.model_dump(), source="stage_profiler", cost_class="moderate")
+    return JSONResponse(content=env.model_dump(by_alias=True))
+
+
+@router.get(
+    "/api/cycles/stage-latency/flame",
+    response_class=PlainTextResponse,
+    summary="Collapsed-stack flame report of mean per-symbol stage time",
+    description=(
+        "One line per stage in flamegraph.pl / speedscope collapsed format, "
+        "value = mean self-time per symbol in microseconds."
+    ),
+)
+async def get_stage_latency_flame(
+    mode: Optional[str] = Query(None, description="Filter by scanner mode (e.g. stealth)"),
+) -> PlainTextResponse:
+    from backend.engine import stage_profiler
+
+    return PlainTextResponse(stage_profiler.flame_report(mode))
@@ -1,12 +1,13 @@
 """
 SniperSight Replay router.
 
-Five endpoints serving the candle-by-candle replay UX:
+Six endpoints serving the candle-by-candle replay UX:
 
     POST   /api/replay/sessions
     GET    /api/replay/sessions/{id}
     POST   /api/replay/sessions/{id}/step
     POST   /api/replay/sessions/{id}/jump-to-next-signal
+    POST   /api/replay/sessions/{id}/cancel-search
     DELETE /api/replay/sessions/{id}
 
 Session state is in-memory inside the ReplayEngine singleton (initialized
@@ -22,6 +23,7 @@ orchestrator singleton in api_server is untouched.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -30,12 +32,14 @@ from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 
 from backend.engine.replay_engine import (
+    CANDLE_PAYLOAD_ROWS,
     MAX_WINDOW_DAYS,
     ReplaySession,
     StepResult,
     configure_replay_engine,
     get_replay_engine,
 )
+from backend.shared.utils.lazy_service import describe
 
 router = APIRouter(tags=["Replay"])
 
@@ -98,6 +102,13 @@ class SessionStatusResponse(BaseModel):
 
 class StepRequest(BaseModel):
     n: int = Field(default=1, description="Bars to advance (or retreat if negative)")
+    client_index: Optional[int] = Field(
+        default=None,
+        description=(
+            "Index the client currently displays. When set, candles_by_tf"
+            " carries only the bars closed since then (candles_mode=delta)."
+        ),
+    )
 
 
 class JumpToSignalRequest(BaseModel):
@@ -109,6 +120,9 @@ class JumpToSignalRequest(BaseModel):
             " timeouts; the frontend should chunk if needed."
         ),
     )
+    client_index: Optional[int] = Field(
+        default=None, description="Index the client currently displays (see StepRequest)"
+    )
 
 
 class StepResponse(BaseModel):
@@ -123,12 +137,27 @@ class StepResponse(BaseModel):
     smc_snapshot: Optional[Dict[str, Any]] = None
     regime: Optional[Dict[str, Any]] = None
     signal_fired: bool
+    candles_mode: str = Field(
+        default="full",
+        description=(
+            "full: candles_by_tf is the last candles_window bars per TF."
+            " delta: only bars closed since client_index — append to the"
+            " client's series and keep the last candles_window bars."
+        ),
+    )
+    candles_window: int = CANDLE_PAYLOAD_ROWS
 
 
 class JumpToSignalResponse(BaseModel):
     found: bool
     bars_advanced: int
     step: Optional[StepResponse] = None
+    cancelled: bool = False
+
+
+class CancelSearchResponse(BaseModel):
+    ok: bool
+    session_id: str
 
 
 class DeleteSessionResponse(BaseModel):
@@ -154,6 +183,7 @@ def _step_to_response(session_id: str, step: StepResult) -> StepResponse:
         smc_snapshot=step.smc_snapshot,
         regime=step.regime,
         signal_fired=step.signal_fired,
+        candles_mode=step.candles_mode,
     )
 
 
@@ -235,10 +265,11 @@ async def get_session_status(session_id: str) -> SessionStatusResponse:
 async def step_session(session_id: str, req: StepRequest) -> StepResponse:
     """Advance (or retreat with negative n) by n bars. Returns the step
     result for the new position. Within the 20-bar ring buffer back-scrub
-    is instant; deeper scrub recomputes from window_start (slow)."""
+    is instant; deeper scrub resumes from the nearest checkpoint (at most
+    CHECKPOINT_INTERVAL bars of recompute)."""
     engine = _engine_or_500()
     try:
-        step = engine.step(session_id, n=req.n)
+        step = engine.step(session_id, n=req.n, client_index=req.client_index)
     except KeyError:
         raise HTTPException(status_code=404, detail=f"session {session_id} not found or expired")
     except IndexError as e:
@@ -256,19 +287,44 @@ async def jump_to_next_signal(
     """Step forward up to max_lookahead bars until a signal fires. If none
     found within the lookahead, returns found=false with the session
     positioned at the last scanned bar so the frontend can update its
-    cursor without losing the operator's place."""
+    cursor without losing the operator's place.
+
+    The search runs in a worker thread (upcoming bars are evaluated in
+    parallel chunks by the engine) so cancel-search can be served while it
+    runs; a cancelled search returns found=false, cancelled=true."""
     engine = _engine_or_500()
     try:
-        step, bars = engine.jump_to_next_signal(session_id, max_lookahead=req.max_lookahead)
+        step, bars = await asyncio.to_thread(
+            engine.jump_to_next_signal,
+            session_id,
+            max_lookahead=req.max_lookahead,
+            client_index=req.client_index,
+        )
     except KeyError:
         raise HTTPException(status_code=404, detail=f"session {session_id} not found or expired")
     if step is None:
-        return JumpToSignalResponse(found=False, bars_advanced=bars, step=None)
+        session = engine.get_session(session_id)
+        cancelled = session is None or session.search_cancel.is_set()
+        return JumpToSignalResponse(found=False, bars_advanced=bars, step=None, cancelled=cancelled)
     return JumpToSignalResponse(
         found=True, bars_advanced=bars, step=_step_to_response(session_id, step)
     )
 
 
+@router.post(
+    "/api/replay/sessions/{session_id}/cancel-search",
+    response_model=CancelSearchResponse,
+)
+async def cancel_search(session_id: str) -> CancelSearchResponse:
+    """Stop a running jump-to-next-signal search at its next bar/chunk
+    boundary. The pending jump request then returns cancelled=true with the
+    session positioned at the last bar it accepted."""
+    engine = _engine_or_500()
+    if not engine.cancel_search(session_id):
+        raise HTTPException(status_code=404, detail=f"session {session_id} not found or expired")
+    return CancelSearchResponse(ok=True, session_id=session_id)
+
+
 @router.delete(
     "/api/replay/sessions/{session_id}",
     response_model=DeleteSessionResponse,
@@ -296,5 +352,5 @@ def configure_replay_router(exchange_adapter) -> None:
     configure_replay_engine(exchange_adapter)
     logger.info(
         "Replay router configured with adapter={} (MAX_WINDOW_DAYS={})",
-        type(exchange_adapter).__name__, MAX_WINDOW_DAYS,
+        describe(exchange_adapter), MAX_WINDOW_DAYS,
     )
@@ -27,6 +27,14 @@ from backend.services.confluence_service import (
     configure_confluence_service,
 )
 
+from backend.services.cycle_state_service import (
+    CycleStateEntry,
+    CycleStateService,
+    get_cycle_state_service,
+    configure_cycle_state_service,
+    cycle_scoring_enabled,
+)
+
 __all__ = [
     # Scanner Service
     "ScanJob",
@@ -47,4 +55,10 @@ __all__ = [
     "ConfluenceService",
     "get_confluence_service",
     "configure_confluence_service",
+    # Cycle State Service
+    "CycleStateEntry",
+    "CycleStateService",
+    "get_cycle_state_service",
+    "configure_cycle_state_service",
+    "cycle_scoring_enabled",
 ]
@@ -0,0 +1,289 @@
+"""
+Cycle State Service - DCL/WCL/4-year cycle state kept in memory per symbol
+
+Cycle analysis (cycle_detector + symbol_cycle_detector) is a pure function of
+the candles, except for the wall-clock temporal bias and the live price used
+for the failure check. Candles only change when one closes, so the state is
+computed once per new closed candle per tracked symbol/timeframe and served
+from memory in between:
+
+- /api/market/cycles, /api/market/symbol-cycles and /api/market/btc-cycle-context
+  share one daily state per symbol
+- the orchestrator's cycle_context for confluence scoring reads the same store
+- the temporal bias is applied when served, the 4-year context is cached per day
+
+State is persisted to backend/cache/cycles so a restart serves warm state
+until the next close. Only the main process writes it: scan workers load it
+and keep their own updates in memory.
+
+The orchestrator reads it only with SS_CYCLE_SCORING on (default OFF).
+"""
+
+import dataclasses
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from backend.shared.models.smc import CycleContext
+from backend.strategy.smc.cycle_detector import (
+    CycleConfig,
+    apply_temporal_bias,
+    detect_cycle_state,
+)
+from backend.strategy.smc.symbol_cycle_detector import SymbolCycles, detect_symbol_cycles
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path("backend/cache/cycles")
+STATE_FILE = CACHE_DIR / "cycle_state.pkl"
+
+# Minimum seconds between state file writes (state is recomputable, writes are best-effort)
+SAVE_INTERVAL_SECONDS = 60.0
+
+
+def cycle_scoring_enabled() -> bool:
+    """SS_CYCLE_SCORING flag (default OFF): scans attach cycle_context for confluence scoring."""
+    return os.getenv("SS_CYCLE_SCORING", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class CycleStateEntry:
+    """
+    Cycle state of one symbol/timeframe as of its latest candle.
+
+    Attributes:
+        symbol: Trading pair
+        timeframe: Candle timeframe the state was computed on
+        candle_key: Identity of the candles the state was computed from
+        context: detect_cycle_state() result with failure flags merged
+            (None if there were too few candles)
+        symbol_cycles: detect_symbol_cycles() result (None if it failed)
+        symbol_cycles_price: Price symbol_cycles was evaluated at (None = last close)
+        symbol_cycles_error: Why symbol cycle detection failed, if it did
+        last_timestamp: Timestamp of the latest candle
+        last_close: Close of the latest candle
+        updated_at: Unix time the state was computed
+    """
+
+    symbol: str
+    timeframe: str
+    candle_key: Tuple
+    context: Optional[CycleContext]
+    symbol_cycles: Optional[SymbolCycles]
+    symbol_cycles_price: Optional[float]
+    symbol_cycles_error: Optional[str]
+    last_timestamp: Any
+    last_close: float
+    updated_at: float
+
+    def cycle_context(self, now: Optional[datetime] = None) -> CycleContext:
+        """
+        Full CycleContext as detect_cycle_context() (plus the symbol_cycle_detector
+        failure flags) would return it at `now`.
+        """
+        flags = {}
+        if self.symbol_cycles is not None:
+            flags = {
+                "dcl_failed": self.symbol_cycles.dcl.is_failed,
+                "wcl_failed": self.symbol_cycles.wcl.is_failed,
+            }
+        if self.context is None:
+            return CycleContext(**flags)
+        check_time = (now or datetime.now()) if self.last_close else self.last_timestamp
+        if hasattr(check_time, "to_pydatetime"):
+            check_time = check_time.to_pydatetime()
+        return apply_temporal_bias(dataclasses.replace(self.context, **flags), check_time)
+
+
+class CycleStateService:
+    """
+    In-memory cycle state per (symbol, timeframe), recomputed only when the
+    candles change.
+
+    Usage:
+        service = get_cycle_state_service()
+        state = service.update("BTC/USDT", daily_df)
+        cycle_ctx = state.cycle_context()
+    """
+
+    def __init__(self, state_file: Optional[Path] = STATE_FILE, config: Optional[CycleConfig] = None):
+        """
+        Initialize cycle state service.
+
+        Args:
+            state_file: Pickle file the state is persisted to (None = memory only)
+            config: Cycle timing configuration for cycle_detector
+        """
+        self.state_file = state_file
+        self._config = config or CycleConfig()
+        self._states: Dict[Tuple[str, str], CycleStateEntry] = {}
+        self._lock = Lock()
+        self._save_lock = Lock()
+        self._saved_at = 0.0
+        self._four_year: Optional[Tuple[date, Any, Dict]] = None
+        self._load()
+
+    # ── state ─────────────────────────────────────────────────────────────────
+
+    def update(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        timeframe: str = "1d",
+        current_price: Optional[float] = None,
+    ) -> CycleStateEntry:
+        """
+        Return the cycle state for `df`, recomputing only what changed since the
+        last call: everything on a new candle, just the symbol cycles (failure
+        check) on a new `current_price`.
+
+        Args:
+            symbol: Trading pair
+            df: OHLC DataFrame with DatetimeIndex
+            timeframe: Timeframe of `df`
+            current_price: Price for the symbol cycle failure check (default: last close)
+
+        Raises:
+            ValueError: If df lacks a DatetimeIndex or OHLC columns (as detect_cycle_context)
+        """
+        key = (symbol, timeframe)
+        candle_key = _candle_key(df)
+        with self._lock:
+            entry = self._states.get(key)
+        if entry is not None and entry.candle_key == candle_key:
+            if entry.symbol_cycles_price == current_price:
+                return entry
+            entry = dataclasses.replace(entry, **self._symbol_cycles(symbol, df, current_price))
+        else:
+            entry = CycleStateEntry(
+                symbol=symbol,
+                timeframe=timeframe,
+                candle_key=candle_key,
+                context=detect_cycle_state(df, self._config),
+                last_timestamp=df.index[-1] if len(df) else None,
+                last_close=float(df["close"].iloc[-1]) if len(df) else 0.0,
+                updated_at=time.time(),
+                **self._symbol_cycles(symbol, df, current_price),
+            )
+            logger.debug("Cycle state recomputed for %s %s (%d candles)", symbol, timeframe, len(df))
+        with self._lock:
+            self._states[key] = entry
+        self._save()
+        return entry
+
+    def get(self, symbol: str, timeframe: str = "1d") -> Optional[CycleStateEntry]:
+        """Last computed state for a symbol/timeframe, without touching candles."""
+        with self._lock:
+            return self._states.get((symbol, timeframe))
+
+    def tracked(self) -> Dict[Tuple[str, str], CycleStateEntry]:
+        """All tracked (symbol, timeframe) states."""
+        with self._lock:
+            return dict(self._states)
+
+    def four_year_cycle(self) -> Tuple[Any, Dict]:
+        """(FourYearCycleContext, halving info) for today; date-based, computed once per day."""
+        from backend.strategy.smc.four_year_cycle import (
+            get_four_year_cycle_context,
+            get_halving_info,
+        )
+
+        today = date.today()
+        cached = self._four_year
+        if cached is None or cached[0] != today:
+            cached = (today, get_four_year_cycle_context(), get_halving_info())
+            self._four_year = cached
+        return cached[1], cached[2]
+
+    def _symbol_cycles(self, symbol: str, df: pd.DataFrame, current_price: Optional[float]) -> Dict[str, Any]:
+        try:
+            cycles = detect_symbol_cycles(df, symbol=symbol, current_price=current_price)
+            error = None
+        except Exception as e:
+            logger.debug("%s: Symbol cycle detection failed: %s", symbol, e)
+            cycles, error = None, f"{type(e).__name__}: {e}"
+        return {
+            "symbol_cycles": cycles,
+            "symbol_cycles_price": current_price,
+            "symbol_cycles_error": error,
+        }
+
+    # ── persistence ───────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        """Load persisted state from disk."""
+        if self.state_file is None or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "rb") as f:
+                self._states = pickle.load(f)
+            logger.info("Loaded cycle state for %d symbol/timeframes", len(self._states))
+        except Exception as e:
+            logger.warning("Failed to load cycle state: %s", e)
+
+    def _save(self, force: bool = False) -> None:
+        """
+        Persist state to disk (throttled to SAVE_INTERVAL_SECONDS unless forced).
+
+        Scan workers (child processes) never write: they would overwrite each
+        other's states with whichever worker replaced the file last.
+        """
+        if self.state_file is None or multiprocessing.parent_process() is not None:
+            return
+        now = time.time()
+        if not force and now - self._saved_at < SAVE_INTERVAL_SECONDS:
+            return
+        self._saved_at = now
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                blob = pickle.dumps(self._states)
+            with self._save_lock:
+                tmp = self.state_file.with_suffix(".tmp")
+                tmp.write_bytes(blob)
+                tmp.replace(self.state_file)
+        except Exception as e:
+            logger.warning("Failed to save cycle state: %s", e)
+
+    def save(self) -> None:
+        """Persist state to disk now."""
+        self._save(force=True)
+
+
+def _candle_key(df: pd.DataFrame) -> Tuple:
+    """Identity of a candle window: its span, length and the latest candle's OHLC."""
+    if not len(df):
+        return (0,)
+    last = df.iloc[-1]
+    ohlc = tuple(float(last[c]) if c in df.columns else None for c in ("open", "high", "low", "close"))
+    return (len(df), df.index[0], df.index[-1], ohlc)
+
+
+# Singleton instance
+_cycle_state_service: Optional[CycleStateService] = None
+
+
+def get_cycle_state_service() -> CycleStateService:
+    """Get the singleton CycleStateService instance (created on first use)."""
+    global _cycle_state_service
+    if _cycle_state_service is None:
+        _cycle_state_service = CycleStateService()
+    return _cycle_state_service
+
+
+def configure_cycle_state_service(
+    state_file: Optional[Path] = STATE_FILE, config: Optional[CycleConfig] = None
+) -> CycleStateService:
+    """Configure and return the singleton CycleStateService."""
+    global _cycle_state_service
+    _cycle_state_service = CycleStateService(state_file=state_file, config=config)
+    return _cycle_state_service
@@ -291,6 +291,12 @@ class IndicatorService:
         # Attach raw dataframe for close-quality confluence analysis
         # This enables close momentum and multi-candle confirmation factors
         snapshot.dataframe = df
+        # Full RSI / MACD-histogram arrays for the divergence engine
+        # (snapshot_divergences) so scoring does not recompute them.
+        snapshot.rsi_values = rsi.to_numpy(dtype=float)
+        snapshot.macd_histogram_values = (
+            macd_hist.to_numpy(dtype=float) if macd_hist is not None else None
+        )
 
         return snapshot
 
@@ -48,6 +48,7 @@ from backend.strategy.smc.swing_structure import detect_swing_structure
 from backend.strategy.smc.mitigation_tracker import update_ob_mitigation, update_fvg_fill_status
 from backend.strategy.smc.consolidation_detector import detect_consolidations
 from backend.indicators.volatility import compute_atr
+from backend.engine import stage_profiler
 
 # Analysis functions
 from backend.analysis.premium_discount import detect_premium_discount
@@ -463,210 +464,221 @@ class SMCDetectionService:
         # This ensures thresholds like ob_min_wick_ratio from tf_config actually get used
         tf_smc_config = self._create_tf_smc_config(tf_config)
 
-        # Calculate ATR for FVG merge
-        try:
-            atr = compute_atr(df, period=14)
-            atr_val = atr.iloc[-1] if len(atr) > 0 and pd.notna(atr.iloc[-1]) else 0
+        with stage_profiler.stage("smc.atr"):
+            # Calculate ATR for FVG merge
+            try:
+                atr = compute_atr(df, period=14)
+                atr_val = atr.iloc[-1] if len(atr) > 0 and pd.notna(atr.iloc[-1]) else 0
 
-            # Log market state for diagnostics
-            if atr_val > 0:
-                atr_pct = (atr_val / current_price) * 100 if current_price > 0 else 0
-                logger.info(
-                    "📊 %s Market: ATR=%.4f | ATR%%=%.3f%% | Price=%.2f",
-                    timeframe,
-                    atr_val,
-                    atr_pct,
-                    current_price,
-                )
-            else:
-                logger.warning(
-                    "⚠️ %s Market: ATR=0 (insufficient data for volatility calc)", timeframe
-                )
-        except Exception as e:
-            logger.warning("⚠️ %s ATR calculation failed: %s", timeframe, e)
-            atr_val = 0
+                # Log market state for diagnostics
+                if atr_val > 0:
+                    atr_pct = (atr_val / current_price) * 100 if current_price > 0 else 0
+                    logger.info(
+                        "📊 %s Market: ATR=%.4f | ATR%%=%.3f%% | Price=%.2f",
+                        timeframe,
+                        atr_val,
+                        atr_pct,
+                        current_price,
+                    )
+                else:
+                    logger.warning(
+                        "⚠️ %s Market: ATR=0 (insufficient data for volatility calc)", timeframe
+                    )
+            except Exception as e:
+                logger.warning("⚠️ %s ATR calculation failed: %s", timeframe, e)
+                atr_val = 0
 
         # Swing detection for structural OBs
         swing_lookback = tf_config.get(
             "structure_swing_lookback", getattr(self._smc_config, "structure_swing_lookback", 10)
         )
-        swing_highs = _detect_swing_highs(df, swing_lookback)
-        swing_lows = _detect_swing_lows(df, swing_lookback)
+        with stage_profiler.stage("smc.swing_points"):
+            swing_highs = _detect_swing_highs(df, swing_lookback)
+            swing_lows = _detect_swing_lows(df, swing_lookback)
 
         # Structure breaks MUST run first — detect_obs_from_bos() depends on them for Grade A OBs.
         # FIX: was running at line ~573 (after OB detection), so bos_obs always received [] and returned [].
-        if tf_config.get("detect_bos", True):
-            result["structure_breaks"] = detect_structural_breaks(
-                df, tf_smc_config, mode_profile=self._mode_profile
-            )
-        else:
-            logger.debug("📐 %s: BOS detection SKIPPED (TF filter)", timeframe)
-
-        # Order blocks (skip if detect_ob=False for this TF)
-        if tf_config.get("detect_ob", True):
-            try:
-                # Use TF-specific config with adjusted thresholds
-                result["order_blocks"] = detect_order_blocks(df, tf_smc_config)
-                logger.debug(
-                    "📦 %s: Traditional OB detected %d", timeframe, len(result["order_blocks"])
+        with stage_profiler.stage("smc.structure_breaks"):
+            if tf_config.get("detect_bos", True):
+                result["structure_breaks"] = detect_structural_breaks(
+                    df, tf_smc_config, mode_profile=self._mode_profile
                 )
-            except Exception as e:
-                logger.warning("📦 %s: Traditional OB detection FAILED: %s", timeframe, e)
-                result["order_blocks"] = []
-
-            try:
-                structural_obs = detect_order_blocks_structural(
-                    df, swing_highs, swing_lows, tf_smc_config
-                )
-                result["order_blocks"].extend(structural_obs)
-                logger.debug("📦 %s: Structural OB detected %d", timeframe, len(structural_obs))
-            except Exception as e:
-                logger.warning("📦 %s: Structural OB detection FAILED: %s", timeframe, e)
+            else:
+                logger.debug("📐 %s: BOS detection SKIPPED (TF filter)", timeframe)
 
-            # NEW: Detect OBs from BOS events (Grade A - structure-confirmed)
-            try:
-                bos_obs = detect_obs_from_bos(df, result["structure_breaks"], tf_smc_config)
-                result["order_blocks"].extend(bos_obs)
-                logger.debug("📦 %s: BOS-linked OB detected %d", timeframe, len(bos_obs))
-            except Exception as e:
-                logger.warning("📦 %s: BOS-linked OB detection FAILED: %s", timeframe, e)
+        # Order blocks (skip if detect_ob=False for this TF)
+        with stage_profiler.stage("smc.order_blocks"):
+            if tf_config.get("detect_ob", True):
+                try:
+                    # Use TF-specific config with adjusted thresholds
+                    result["order_blocks"] = detect_order_blocks(df, tf_smc_config)
+                    logger.debug(
+                        "📦 %s: Traditional OB detected %d", timeframe, len(result["order_blocks"])
+                    )
+                except Exception as e:
+                    logger.warning("📦 %s: Traditional OB detection FAILED: %s", timeframe, e)
+                    result["order_blocks"] = []
 
-            # Deduplicate overlapping OBs (prefer stronger ones).
-            # max_overlap=0.5 means two OBs must share >50% of the same price zone
-            # before the weaker is removed — previously 0.70 allowed near-duplicate
-            # zones to both survive and inflate conflict density counts.
-            if result["order_blocks"]:
-                result["order_blocks"] = filter_overlapping_order_blocks(
-                    result["order_blocks"], max_overlap=0.5
-                )
+                try:
+                    structural_obs = detect_order_blocks_structural(
+                        df, swing_highs, swing_lows, tf_smc_config
+                    )
+                    result["order_blocks"].extend(structural_obs)
+                    logger.debug("📦 %s: Structural OB detected %d", timeframe, len(structural_obs))
+                except Exception as e:
+                    logger.warning("📦 %s: Structural OB detection FAILED: %s", timeframe, e)
+
+                # NEW: Detect OBs from BOS events (Grade A - structure-confirmed)
+                try:
+                    bos_obs = detect_obs_from_bos(df, result["structure_breaks"], tf_smc_config)
+                    result["order_blocks"].extend(bos_obs)
+                    logger.debug("📦 %s: BOS-linked OB detected %d", timeframe, len(bos_obs))
+                except Exception as e:
+                    logger.warning("📦 %s: BOS-linked OB detection FAILED: %s", timeframe, e)
+
+                # Deduplicate overlapping OBs (prefer stronger ones).
+                # max_overlap=0.5 means two OBs must share >50% of the same price zone
+                # before the weaker is removed — previously 0.70 allowed near-duplicate
+                # zones to both survive and inflate conflict density counts.
+                if result["order_blocks"]:
+                    result["order_blocks"] = filter_overlapping_order_blocks(
+                        result["order_blocks"], max_overlap=0.5
+                    )
 
-                # NEW: Mode-specific filtering (Gap #1 - SMC Enhancements)
-                # Filter OBs by mode requirements (TF, mitigation, freshness)
-                from datetime import datetime
+                    # NEW: Mode-specific filtering (Gap #1 - SMC Enhancements)
+                    # Filter OBs by mode requirements (TF, mitigation, freshness)
+                    from datetime import datetime
 
-                pre_filter_count = len(result["order_blocks"])
+                    pre_filter_count = len(result["order_blocks"])
 
-                # Track for UI stats
-                self._filter_stats["ob_detected"] = (
-                    self._filter_stats.get("ob_detected", 0) + pre_filter_count
-                )
+                    # Track for UI stats
+                    self._filter_stats["ob_detected"] = (
+                        self._filter_stats.get("ob_detected", 0) + pre_filter_count
+                    )
 
-                result["order_blocks"] = filter_obs_by_mode(
-                    result["order_blocks"],
-                    mode_profile=self._mode_profile,
-                    current_time=datetime.now(),
-                )
-                filtered_count = pre_filter_count - len(result["order_blocks"])
-                if filtered_count > 0:
-                    logger.debug(
-                        "📦 %s: Mode filter (%s) removed %d OBs",
-                        timeframe,
-                        self._mode_profile,
-                        filtered_count,
+                    result["order_blocks"] = filter_obs_by_mode(
+                        result["order_blocks"],
+                        mode_profile=self._mode_profile,
+                        current_time=datetime.now(),
                     )
-        else:
-            logger.debug("📦 %s: OB detection SKIPPED (TF filter)", timeframe)
+                    filtered_count = pre_filter_count - len(result["order_blocks"])
+                    if filtered_count > 0:
+                        logger.debug(
+                            "📦 %s: Mode filter (%s) removed %d OBs",
+                            timeframe,
+                            self._mode_profile,
+                            filtered_count,
+                        )
+            else:
+                logger.debug("📦 %s: OB detection SKIPPED (TF filter)", timeframe)
 
         # Fair value gaps (use TF-specific config for gap thresholds)
-        if tf_config.get("detect_fvg", True):
-            # Single detection pass: _return_raw_count gives pre-mode count without a second scan.
-            fvgs, raw_fvg_count = detect_fvgs(
-                df, tf_smc_config, mode_profile=self._mode_profile, _return_raw_count=True
-            )
+        with stage_profiler.stage("smc.fvgs"):
+            if tf_config.get("detect_fvg", True):
+                # Single detection pass: _return_raw_count gives pre-mode count without a second scan.
+                fvgs, raw_fvg_count = detect_fvgs(
+                    df, tf_smc_config, mode_profile=self._mode_profile, _return_raw_count=True
+                )
 
-            # Track for UI stats
-            self._filter_stats["fvg_detected"] = (
-                self._filter_stats.get("fvg_detected", 0) + raw_fvg_count
-            )
+                # Track for UI stats
+                self._filter_stats["fvg_detected"] = (
+                    self._filter_stats.get("fvg_detected", 0) + raw_fvg_count
+                )
 
-            if atr_val > 0:
-                fvgs = merge_consecutive_fvgs(fvgs, max_gap_atr=0.5, atr_value=atr_val)
-            result["fvgs"] = fvgs
+                if atr_val > 0:
+                    fvgs = merge_consecutive_fvgs(fvgs, max_gap_atr=0.5, atr_value=atr_val)
+                result["fvgs"] = fvgs
 
         # Liquidity sweeps (use TF-specific config for sweep thresholds)
         # Single-pass: _return_raw_count=True detects with the full 12-bar window,
         # applies mode-window post-filtering internally, and returns both the
         # filtered list and the pre-filter raw count — no duplicate detection run.
-        if tf_config.get("detect_sweep", True):
-            try:
-                sweeps, raw_sweep_count = detect_liquidity_sweeps(
-                    df,
-                    tf_smc_config,
-                    mode_profile=self._mode_profile,
-                    _return_raw_count=True,
-                )
+        with stage_profiler.stage("smc.liquidity_sweeps"):
+            if tf_config.get("detect_sweep", True):
+                try:
+                    sweeps, raw_sweep_count = detect_liquidity_sweeps(
+                        df,
+                        tf_smc_config,
+                        mode_profile=self._mode_profile,
+                        _return_raw_count=True,
+                    )
 
-                # Track for UI stats (raw = full-window count before mode filtering)
-                self._filter_stats["sweep_detected"] = (
-                    self._filter_stats.get("sweep_detected", 0) + raw_sweep_count
-                )
+                    # Track for UI stats (raw = full-window count before mode filtering)
+                    self._filter_stats["sweep_detected"] = (
+                        self._filter_stats.get("sweep_detected", 0) + raw_sweep_count
+                    )
 
-                # Set timeframe on each sweep for TF filtering and HTF context
-                from dataclasses import replace
+                    # Set timeframe on each sweep for TF filtering and HTF context
+                    from dataclasses import replace
 
-                result["liquidity_sweeps"] = [
-                    replace(s, timeframe=timeframe.lower()) for s in sweeps
-                ]
-            except Exception as e:
-                logger.warning("💧 %s: Sweep detection FAILED: %s", timeframe, e)
-                result["liquidity_sweeps"] = []
-        else:
-            logger.debug("💧 %s: Sweep detection SKIPPED (TF filter)", timeframe)
+                    result["liquidity_sweeps"] = [
+                        replace(s, timeframe=timeframe.lower()) for s in sweeps
+                    ]
+                except Exception as e:
+                    logger.warning("💧 %s: Sweep detection FAILED: %s", timeframe, e)
+                    result["liquidity_sweeps"] = []
+            else:
+                logger.debug("💧 %s: Sweep detection SKIPPED (TF filter)", timeframe)
 
         # --- LuxAlgo-style OB filtering (MODE-AWARE) ---
         # Keep raw OBs for liquidity analysis, filter to active for trading signals
-        if result["order_blocks"]:
-            raw_count = len(result["order_blocks"])
-            result["raw_order_blocks"] = result["order_blocks"].copy()
-
-            # MODE-AWARE filtering rules:
-            # OBs persist until MITIGATED (price closes beyond range)
-            # Structure confirmation is used for SCORING (confluence), not visibility
-            # This ensures bearish OBs are visible for resistance detection
-            tf_lower = timeframe.lower()
-            is_htf = tf_lower in ("1w", "1d", "4h")
-            is_ltf = tf_lower in ("15m", "5m")
-
-            # Mitigation thresholds - HTF OBs are more sacred
-            if is_htf:
-                max_mit = 0.7  # HTF OBs can take more damage before invalidation
-            elif is_ltf:
-                max_mit = 0.8  # LTF OBs are quicker to invalidate
-            else:
-                max_mit = 0.75  # MTF (1H)
+        with stage_profiler.stage("smc.ob_active_filter"):
+            if result["order_blocks"]:
+                raw_count = len(result["order_blocks"])
+                result["raw_order_blocks"] = result["order_blocks"].copy()
+
+                # MODE-AWARE filtering rules:
+                # OBs persist until MITIGATED (price closes beyond range)
+                # Structure confirmation is used for SCORING (confluence), not visibility
+                # This ensures bearish OBs are visible for resistance detection
+                tf_lower = timeframe.lower()
+                is_htf = tf_lower in ("1w", "1d", "4h")
+                is_ltf = tf_lower in ("15m", "5m")
+
+                # Mitigation thresholds - HTF OBs are more sacred
+                if is_htf:
+                    max_mit = 0.7  # HTF OBs can take more damage before invalidation
+                elif is_ltf:
+                    max_mit = 0.8  # LTF OBs are quicker to invalidate
+                else:
+                    max_mit = 0.75  # MTF (1H)
 
-            # Apply filter - NO structure confirmation required for visibility
-            # OBs live until mitigated, structure confirmation affects scoring only
-            result["order_blocks"] = filter_to_active_obs(
-                result["order_blocks"],
-                df,
-                structure_breaks=result["structure_breaks"],
-                max_mitigation=max_mit,
-                require_structure_confirmation=False,  # FIXED: OBs persist until mitigated
-                confirmation_window_candles=10,
-            )
+                # Apply filter - NO structure confirmation required for visibility
+                # OBs live until mitigated, structure confirmation affects scoring only
+                result["order_blocks"] = filter_to_active_obs(
+                    result["order_blocks"],
+                    df,
+                    structure_breaks=result["structure_breaks"],
+                    max_mitigation=max_mit,
+                    require_structure_confirmation=False,  # FIXED: OBs persist until mitigated
+                    confirmation_window_candles=10,
+                )
 
-            logger.debug(
-                "🎯 %s: OB filtered %d → %d (active, mitig_threshold=%.2f, mode=%s)",
-                timeframe,
-                raw_count,
-                len(result["order_blocks"]),
-                max_mit,
-                self._mode,
-            )
+                logger.debug(
+                    "🎯 %s: OB filtered %d → %d (active, mitig_threshold=%.2f, mode=%s)",
+                    timeframe,
+                    raw_count,
+                    len(result["order_blocks"]),
+                    max_mit,
+                    self._mode,
+                )
 
         # Equal highs/lows (liquidity pools)
-        self._detect_equal_highs_lows(timeframe, df, result)
+        with stage_profiler.stage("smc.equal_highs_lows"):
+            self._detect_equal_highs_lows(timeframe, df, result)
 
         # Swing structure (for HTF bias)
         if timeframe.lower() in ("1w", "1d", "4h"):
-            self._detect_swing_structure(timeframe, df, result)
+            with stage_profiler.stage("smc.swing_structure"):
+                self._detect_swing_structure(timeframe, df, result)
 
         # Premium/Discount zones
-        self._detect_premium_discount(timeframe, df, current_price, result)
+        with stage_profiler.stage("smc.premium_discount"):
+            self._detect_premium_discount(timeframe, df, current_price, result)
 
         # Consolidations (NEW - for trend continuation entries)
-        self._detect_consolidations(timeframe, df, atr_val, result, tf_smc_config)
+        with stage_profiler.stage("smc.consolidations"):
+            self._detect_consolidations(timeframe, df, atr_val, result, tf_smc_config)
 
         return result
 
@@ -824,15 +836,9 @@ class SMCDetectionService:
         _pre_recalc_count = len(order_blocks)
         try:
             from datetime import datetime
-            from dataclasses import replace
-            from backend.strategy.smc.order_blocks import calculate_freshness
-
-            current_time = datetime.now()
-            updated_obs = []
-            for ob in order_blocks:
-                new_freshness = calculate_freshness(ob, current_time)
-                updated_ob = replace(ob, freshness_score=new_freshness)
-                updated_obs.append(updated_ob)
+            from backend.strategy.smc.order_blocks import refresh_freshness
+
+            updated_obs = refresh_freshness(order_blocks, datetime.now())
 
             # Gate 2 (filter_obs_by_mode) is the SINGLE freshness authority (decision #3).
             # This aggregation step only REFRESHES freshness_score (consumed by sort /
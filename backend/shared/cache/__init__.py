@@ -4,6 +4,7 @@ from backend.shared.cache.cache_manager import (
     CacheManager,
     CacheNamespace,
     CacheStats,
+    SingleFlight,
     get_cache_manager,
     TIMEFRAME_SECONDS,
 )
@@ -12,6 +13,7 @@ __all__ = [
     "CacheManager",
     "CacheNamespace",
     "CacheStats",
+    "SingleFlight",
     "get_cache_manager",
     "TIMEFRAME_SECONDS",
 ]
@@ -13,11 +13,16 @@ Features:
 - Configurable TTL per cache type
 - Stats tracking (hits, misses, evictions)
 - Unified interface for all cache operations
+- Single-flight get_or_compute: concurrent misses on one key share one
+  computation; stale-while-revalidate and refresh-ahead serve the cached
+  value while a background refresh runs
 """
 
+import asyncio
 import time
 import threading
-from typing import Dict, Any, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from collections import OrderedDict
 from dataclasses import dataclass
 import logging
@@ -56,6 +61,10 @@ class CacheStats:
     evictions: int = 0
     current_entries: int = 0
     max_entries: int = 0
+    stale_hits: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
 
     @property
     def hit_rate(self) -> float:
@@ -70,9 +79,91 @@ class CacheStats:
             "current_entries": self.current_entries,
             "max_entries": self.max_entries,
             "hit_rate_pct": round(self.hit_rate, 2),
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
         }
 
 
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key onto one in-flight computation.
+
+    The first caller for a key (the leader) runs the function; every caller
+    that arrives while it is running receives the same Future, so they all
+    see the leader's result or exception. Nothing is remembered once the
+    call completes — caching is the caller's job.
+
+    Futures are concurrent.futures.Future, so sync callers block on
+    .result() and async callers await asyncio.wrap_future() without tying
+    up a thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            return fut, True
+
+    def _run(self, key: str, fut: Future, fn: Callable[[], Any]) -> None:
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+        else:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn (or join the in-flight run) and return (result, shared)."""
+        fut, leader = self._claim(key)
+        if leader:
+            self._run(key, fut, fn)
+        return fut.result(), not leader
+
+    def submit(self, key: str, fn: Callable[[], Any], executor) -> Tuple[Future, bool]:
+        """Like do() but the leader runs fn on `executor`. Returns (future, shared)."""
+        fut, leader = self._claim(key)
+        if leader:
+            executor.submit(self._run, key, fut, fn)
+        return fut, not leader
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._inflight
+
+
+# Shared worker pool for get_or_compute_async leaders and background
+# refreshes. Small on purpose: these are a handful of dashboard endpoints,
+# and the upstream fetches they make go through the global rate limiter.
+_compute_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_compute_executor() -> ThreadPoolExecutor:
+    global _compute_executor
+    if _compute_executor is None:
+        with _executor_lock:
+            if _compute_executor is None:
+                _compute_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-compute")
+    return _compute_executor
+
+
+def _default_cacheable(value: Any) -> bool:
+    return value is not None
+
+
 class CacheNamespace:
     """
     A single cache namespace with TTL and LRU eviction.
@@ -88,6 +179,7 @@ class CacheNamespace:
         self._max_entries = max_entries
         self._default_ttl = default_ttl
         self._stats = CacheStats(max_entries=max_entries)
+        self._flight = SingleFlight()
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache, returns None if expired or missing."""
@@ -128,6 +220,148 @@ class CacheNamespace:
 
             self._stats.current_entries = len(self._cache)
 
+    # -------------------------------------------------------------------------
+    # Single-flight / stale-while-revalidate
+    # -------------------------------------------------------------------------
+
+    def _lookup(self, key: str, stale_ttl: float, refresh_ahead: float) -> Tuple[Any, str]:
+        """
+        Classify the entry for `key` as one of:
+          "fresh"   — age <= ttl - refresh_ahead
+          "refresh" — still within ttl, but due for a background refresh
+          "stale"   — past ttl but within ttl + stale_ttl (served, refreshed)
+          "miss"    — absent or past the stale window (entry dropped)
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None, "miss"
+            ttl = entry.get("_ttl", self._default_ttl)
+            age = time.time() - entry.get("_cached_at", 0)
+            if age > ttl + stale_ttl:
+                del self._cache[key]
+                self._stats.current_entries = len(self._cache)
+                self._stats.misses += 1
+                return None, "miss"
+            self._cache.move_to_end(key)
+            if age > ttl:
+                self._stats.stale_hits += 1
+                return entry.get("_value"), "stale"
+            self._stats.hits += 1
+            if refresh_ahead > 0 and age > ttl - refresh_ahead:
+                return entry.get("_value"), "refresh"
+            return entry.get("_value"), "fresh"
+
+    def _compute_and_store(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        cacheable: Callable[[Any], bool],
+    ) -> Any:
+        value = compute()
+        if cacheable(value):
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        cacheable: Callable[[Any], bool],
+    ) -> None:
+        """Start one background recompute for `key`; errors keep the old value."""
+        if self._flight.in_flight(key):
+            return
+        with self._lock:
+            self._stats.refreshes += 1
+        fut, _ = self._flight.submit(
+            key,
+            lambda: self._compute_and_store(key, compute, ttl, cacheable),
+            _get_compute_executor(),
+        )
+
+        def _log_failure(f: Future) -> None:
+            exc = f.exception()
+            if exc is not None:
+                with self._lock:
+                    self._stats.refresh_errors += 1
+                logger.warning("Background refresh of %s:%s failed: %s", self.name, key, exc)
+
+        fut.add_done_callback(_log_failure)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: float = 0,
+        refresh_ahead: float = 0,
+        cacheable: Callable[[Any], bool] = _default_cacheable,
+    ) -> Any:
+        """
+        Return the cached value for `key`, computing it at most once at a time.
+
+        - fresh hit: returned as-is
+        - within `refresh_ahead` seconds of expiry: returned, and one
+          background refresh is started
+        - expired but within `stale_ttl` seconds: stale value returned,
+          background refresh started
+        - miss: concurrent callers share a single call to `compute`
+
+        Only values for which `cacheable(value)` is true are stored (by
+        default anything but None), so error payloads are not pinned for
+        a full TTL. Exceptions from `compute` propagate to every waiter
+        on a miss; background refresh failures are logged and the cached
+        value stays in place.
+        """
+        value, state = self._lookup(key, stale_ttl, refresh_ahead)
+        if state != "miss":
+            if state != "fresh":
+                self._refresh_in_background(key, compute, ttl, cacheable)
+            return value
+        value, shared = self._flight.do(
+            key, lambda: self._compute_and_store(key, compute, ttl, cacheable)
+        )
+        if shared:
+            with self._lock:
+                self._stats.coalesced += 1
+        return value
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        stale_ttl: float = 0,
+        refresh_ahead: float = 0,
+        cacheable: Callable[[Any], bool] = _default_cacheable,
+    ) -> Any:
+        """
+        Async variant of get_or_compute for FastAPI handlers.
+
+        Hits are served without leaving the event loop. On a miss the
+        leader's `compute` (synchronous, typically blocking I/O plus
+        CPU work) runs on the shared compute pool and every concurrent
+        request awaits the same future.
+        """
+        value, state = self._lookup(key, stale_ttl, refresh_ahead)
+        if state != "miss":
+            if state != "fresh":
+                self._refresh_in_background(key, compute, ttl, cacheable)
+            return value
+        fut, shared = self._flight.submit(
+            key,
+            lambda: self._compute_and_store(key, compute, ttl, cacheable),
+            _get_compute_executor(),
+        )
+        if shared:
+            with self._lock:
+                self._stats.coalesced += 1
+        return await asyncio.wrap_future(fut)
+
     def delete(self, key: str) -> bool:
         """Delete a specific key. Returns True if key existed."""
         with self._lock:
@@ -155,6 +389,10 @@ class CacheNamespace:
                 evictions=self._stats.evictions,
                 current_entries=self._stats.current_entries,
                 max_entries=self._stats.max_entries,
+                stale_hits=self._stats.stale_hits,
+                coalesced=self._stats.coalesced,
+                refreshes=self._stats.refreshes,
+                refresh_errors=self._stats.refresh_errors,
             )
 
     def get_entries_info(self) -> List[Dict[str, Any]]:
@@ -294,6 +532,10 @@ class CacheManager:
     # Management
     # =========================================================================
 
+    def namespace(self, name: str) -> CacheNamespace:
+        """Return a namespace by name (falls back to "generic")."""
+        return self._namespaces.get(name, self._namespaces["generic"])
+
     def clear_namespace(self, namespace: str) -> int:
         """Clear all entries in a namespace."""
         ns = self._namespaces.get(namespace)
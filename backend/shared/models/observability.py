@@ -9,6 +9,7 @@ Wire types for the Phase 1 observability surfaces:
   - GET /api/scanner/universe
   - GET /api/cycles/last
   - GET /api/cycles/history
+  - GET /api/cycles/stage-latency
 
 ────────────────────────────────────────────────────────────────────────
 Schema stability rules — IMPORTANT
@@ -263,3 +264,45 @@ class CycleHeartbeat(BaseModel):
     )
     failed: bool
     exception_class: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Per-stage latency
+# ---------------------------------------------------------------------------
+
+
+class LatencyBucket(BaseModel):
+    """One histogram bucket. le_ms=None is the +inf overflow bucket."""
+
+    model_config = _STRICT_CONFIG
+
+    le_ms: Optional[float]
+    count: int
+
+
+class StageLatency(BaseModel):
+    """Latency summary for one pipeline stage within one scanner mode."""
+
+    model_config = _STRICT_CONFIG
+
+    stage: str = Field(..., examples=["smc", "smc.order_blocks", "total"])
+    count: int
+    mean_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    histogram: List[LatencyBucket]
+
+
+class StageLatencyReport(BaseModel):
+    """Wire format for /api/cycles/stage-latency."""
+
+    model_config = _STRICT_CONFIG
+
+    symbols_recorded: int
+    by_mode: Dict[str, List[StageLatency]]
+    last_run: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-stage summed ms across all symbols of the most recent scan run.",
+    )
@@ -13,6 +13,8 @@ from datetime import datetime
 from typing import List, Literal, Optional, Any
 from enum import Enum
 
+from backend.shared.models.smc_table import PatternTable
+
 # Pattern quality grade - A (excellent), B (good), C (marginal)
 PatternGrade = Literal["A", "B", "C"]
 
@@ -461,6 +463,9 @@ class SMCSnapshot:
         equal_lows: Price levels with clustered equal lows (DEPRECATED - use liquidity_pools)
         liquidity_pools: List of structured LiquidityPool objects (NEW)
         filter_metadata: Filter statistics for UI display (NEW)
+
+    table(name) gives a pattern list as columns (smc_table.PatternTable);
+    pickling goes through the same columns, which keeps process transfer small.
     """
 
     order_blocks: List[OrderBlock]
@@ -511,6 +516,39 @@ class SMCSnapshot:
         if self.htf_levels is None:
             self.htf_levels = []
 
+    def table(self, name: str) -> PatternTable:
+        """
+        Columnar view of one pattern list ('order_blocks', 'fvgs',
+        'structural_breaks', 'liquidity_sweeps') for mask-based filtering.
+        Built on each call, so it reflects the list as it is now.
+        """
+        return PatternTable.from_patterns(getattr(self, name), kind=PATTERN_KINDS[name])
+
+    def __reduce__(self):
+        # Pickle the pattern lists as columns (worker -> parent transfer);
+        # lists that do not round-trip exactly are pickled as they are
+        state = dict(self.__dict__)
+        for name, kind in PATTERN_KINDS.items():
+            try:
+                if state[name] is not None:
+                    state[name] = PatternTable.from_patterns(state[name], kind=kind)
+            except TypeError:
+                pass
+        return _restore_snapshot, (state,)
+
+    def __copy__(self) -> "SMCSnapshot":
+        clone = SMCSnapshot.__new__(SMCSnapshot)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def __deepcopy__(self, memo) -> "SMCSnapshot":
+        import copy
+
+        clone = SMCSnapshot.__new__(SMCSnapshot)
+        memo[id(self)] = clone
+        clone.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return clone
+
     def get_fresh_order_blocks(self) -> List[OrderBlock]:
         """Get only fresh, unmitigated order blocks."""
         return [ob for ob in self.order_blocks if ob.is_fresh]
@@ -572,6 +610,24 @@ class SMCSnapshot:
         )
 
 
+PATTERN_KINDS = {
+    "order_blocks": OrderBlock,
+    "fvgs": FVG,
+    "structural_breaks": StructuralBreak,
+    "liquidity_sweeps": LiquiditySweep,
+}
+
+
+def _restore_snapshot(state: dict) -> SMCSnapshot:
+    """Unpickle an SMCSnapshot packed by SMCSnapshot.__reduce__."""
+    snapshot = SMCSnapshot.__new__(SMCSnapshot)
+    for name in PATTERN_KINDS:
+        if isinstance(state.get(name), PatternTable):
+            state[name] = state[name].to_patterns()
+    snapshot.__dict__.update(state)
+    return snapshot
+
+
 @dataclass
 class CycleContext:
     """
@@ -0,0 +1,289 @@
+"""
+Columnar (struct-of-arrays) storage for SMC pattern lists.
+
+SMCSnapshot keeps OrderBlock / FVG / StructuralBreak / LiquiditySweep as
+lists of dataclasses, which is what the scorer and planner consume. A
+PatternTable holds the same patterns as one NumPy array per field:
+
+  - floats, ints and bools as float64 / int64 / bool arrays
+  - strings (timeframe, direction, grade, source, ...) as int16 codes
+    into a per-table category list, so a predicate runs once per category
+  - naive datetimes and pd.Timestamps (timestamp, confirmed_at) as
+    datetime64[ns], None as NaT; `times` records which of the two a column
+    held (and the Timestamps' unit) so decoding gives back the same objects
+  - anything else as an object array, so conversion is always lossless
+
+Tables filter by boolean mask (mask / take), hand out lightweight
+PatternView rows that read like the dataclass (same attribute names and
+properties), and rebuild the dataclasses with to_patterns(). They also
+pickle to a fraction of the list's size — SMCSnapshot pickles through them.
+"""
+
+import types
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Price columns giving each pattern's zone as (upper, lower)
+BOUNDS = {
+    "OrderBlock": ("high", "low"),
+    "FVG": ("top", "bottom"),
+    "StructuralBreak": ("level", "level"),
+    "LiquiditySweep": ("level", "level"),
+}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NAT = np.iinfo(np.int64).min
+# Naive datetimes that fit a datetime64[ns] column, in microseconds since the epoch
+_MIN_US = (pd.Timestamp.min.to_pydatetime(warn=False) - _EPOCH) // _MICROSECOND + 1
+_MAX_US = (pd.Timestamp.max.to_pydatetime(warn=False) - _EPOCH) // _MICROSECOND
+# `times` value for datetime.datetime columns; Timestamp columns store their unit
+DATETIME = "datetime"
+
+
+class PatternTable:
+    """
+    Patterns of one dataclass type as columns.
+
+    Attributes:
+        kind: the pattern dataclass (OrderBlock, FVG, ...)
+        columns: field name -> array, one row per pattern
+        categories: field name -> category list for string columns (codes; -1 is None)
+        times: field name -> DATETIME or the pd.Timestamp unit, for datetime64 columns
+    """
+
+    def __init__(
+        self,
+        kind: type,
+        columns: Dict[str, np.ndarray],
+        categories: Dict[str, List[Any]],
+        times: Optional[Dict[str, str]] = None,
+    ):
+        self.kind = kind
+        self.columns = columns
+        self.categories = categories
+        self.times = times or {}
+
+    @classmethod
+    def from_patterns(cls, items: Sequence[Any], kind: Optional[type] = None) -> "PatternTable":
+        """
+        Build a table from dataclass instances of one exact type.
+
+        Raises TypeError for mixed types, non-dataclass items or instances
+        carrying attributes beyond their fields (they would not round-trip).
+        """
+        kind = kind or (type(items[0]) if len(items) else None)
+        if kind is None:
+            raise TypeError("kind is required for an empty pattern list")
+        names = [f.name for f in fields(kind)]
+        rows = []
+        for item in items:
+            if type(item) is not kind or len(item.__dict__) != len(names):
+                raise TypeError(f"{type(item).__name__} does not round-trip as a {kind.__name__} row")
+            rows.append(item.__dict__)
+        columns: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[Any]] = {}
+        times: Dict[str, str] = {}
+        for name in names:
+            values = [row[name] for row in rows]
+            columns[name], category, time_type = _encode(values)
+            if category is not None:
+                categories[name] = category
+            if time_type is not None:
+                times[name] = time_type
+        return cls(kind, columns, categories, times)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "columns": self.columns, "categories": self.categories, "times": self.times}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault("times", {})
+
+    # ── columns ───────────────────────────────────────────────────────────────
+
+    def value(self, name: str, row: int) -> Any:
+        """One cell as the Python value the dataclass held."""
+        column = self.columns[name]
+        if name in self.categories:
+            code = int(column[row])
+            return None if code < 0 else self.categories[name][code]
+        if column.dtype.kind == "M":
+            return self._decode_times(name, column[row : row + 1])[0]
+        return column[row].item() if column.dtype != object else column[row]
+
+    def decoded(self, name: str) -> List[Any]:
+        """A whole column as Python values."""
+        column = self.columns[name]
+        if name in self.categories:
+            lookup = list(self.categories[name]) + [None]
+            return [lookup[code] for code in column.tolist()]
+        if column.dtype.kind == "M":
+            return self._decode_times(name, column)
+        return column.tolist()
+
+    def _decode_times(self, name: str, column: np.ndarray) -> List[Any]:
+        time_type = self.times.get(name, DATETIME)
+        if time_type == DATETIME:
+            return column.astype("datetime64[us]").astype(object).tolist()
+        stamps = pd.DatetimeIndex(column).as_unit(time_type)
+        return [None if ts is pd.NaT else ts for ts in stamps]
+
+    def isin(self, name: str, values: Iterable[Any], key=None) -> np.ndarray:
+        """
+        Rows whose `name` is in `values`; with `key`, compares key(value)
+        instead (e.g. str.lower). For string columns this evaluates once
+        per category, not once per row.
+        """
+        wanted = set(values)
+        match = (lambda v: key(v) in wanted) if key else (lambda v: v in wanted)
+        if name in self.categories:
+            hits = np.array([v is not None and match(v) for v in self.categories[name]] + [False], dtype=bool)
+            return hits[self.columns[name]]
+        return np.array([v is not None and match(v) for v in self.decoded(name)], dtype=bool)
+
+    @property
+    def upper(self) -> np.ndarray:
+        return self.columns[BOUNDS[self.kind.__name__][0]]
+
+    @property
+    def lower(self) -> np.ndarray:
+        return self.columns[BOUNDS[self.kind.__name__][1]]
+
+    @property
+    def direction(self) -> np.ndarray:
+        """+1 bullish / -1 bearish per row; a sweep of lows is bullish, of highs bearish."""
+        if "direction" in self.columns:
+            return self.isin("direction", ("bullish",)).astype(np.int8) - self.isin("direction", ("bearish",))
+        return self.isin("sweep_type", ("low",)).astype(np.int8) - self.isin("sweep_type", ("high",))
+
+    # ── selection ─────────────────────────────────────────────────────────────
+
+    def mask(
+        self,
+        timeframes: Optional[Iterable[str]] = None,
+        direction: Optional[str] = None,
+        grades: Optional[Iterable[str]] = None,
+        min_freshness: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Boolean row mask; every given criterion must hold. Timeframes
+        compare case-insensitively ('1H' matches '1h').
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if timeframes is not None:
+            keep &= self.isin("timeframe", {tf.lower() for tf in timeframes}, key=str.lower)
+        if direction is not None:
+            keep &= self.direction == (1 if direction in ("bullish", "LONG") else -1)
+        if grades is not None:
+            keep &= self.isin("grade", grades)
+        if min_freshness is not None:
+            keep &= self.columns["freshness_score"] >= min_freshness
+        return keep
+
+    def take(self, rows) -> "PatternTable":
+        """Sub-table for a boolean mask or integer row indices (categories are shared)."""
+        return PatternTable(self.kind, {k: v[rows] for k, v in self.columns.items()}, self.categories, self.times)
+
+    def with_column(self, name: str, values: np.ndarray) -> "PatternTable":
+        """Copy with one numeric column replaced (e.g. recomputed freshness)."""
+        if name in self.categories or name in self.times or name not in self.columns:
+            raise KeyError(f"{name} is not a numeric column of {self.kind.__name__}")
+        columns = dict(self.columns)
+        columns[name] = np.asarray(values, dtype=self.columns[name].dtype)
+        return PatternTable(self.kind, columns, self.categories, self.times)
+
+    # ── rows ──────────────────────────────────────────────────────────────────
+
+    def views(self) -> List["PatternView"]:
+        return [PatternView(self, row) for row in range(len(self))]
+
+    def to_patterns(self) -> List[Any]:
+        """
+        Rebuild the dataclass instances. Values came from valid instances,
+        so __init__ / __post_init__ validation is not re-run.
+        """
+        names = list(self.columns)
+        rows = zip(*(self.decoded(name) for name in names)) if names else iter(())
+        out = []
+        new = object.__new__
+        for row in rows:
+            item = new(self.kind)
+            item.__dict__.update(zip(names, row))
+            out.append(item)
+        return out
+
+
+class PatternView:
+    """
+    Read-only row of a PatternTable with the dataclass' attribute names,
+    properties and methods (ob.midpoint, fvg.contains_price(p), ...).
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: PatternTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name: str) -> Any:
+        table = object.__getattribute__(self, "_table")
+        if name in table.columns:
+            return table.value(name, object.__getattribute__(self, "_row"))
+        attr = getattr(table.kind, name, None)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        raise AttributeError(f"{table.kind.__name__} view has no attribute {name!r}")
+
+    def materialize(self) -> Any:
+        """The full dataclass instance for this row."""
+        return self._table.take([self._row]).to_patterns()[0]
+
+    def __repr__(self) -> str:
+        return f"<{self._table.kind.__name__} view row={self._row}>"
+
+
+def _encode(values: List[Any]) -> Tuple[np.ndarray, Optional[List[Any]], Optional[str]]:
+    """
+    (column, categories, time type) for one field; categories is None unless
+    string-coded, time type is None unless the column is datetime64.
+    """
+    kinds = {type(v) for v in values}
+    if not values or kinds == {float}:
+        return np.array(values, dtype=np.float64), None, None
+    if kinds == {bool}:
+        return np.array(values, dtype=bool), None, None
+    if kinds == {int} and all(-(2**63) <= v < 2**63 for v in values):
+        return np.array(values, dtype=np.int64), None, None
+    if kinds <= {str, type(None)}:
+        lookup: Dict[str, int] = {}
+        codes = [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+        dtype = np.int16 if len(lookup) < 2**15 else np.int32
+        return np.array(codes, dtype=dtype), list(lookup), None
+    naive = kinds <= {datetime, pd.Timestamp, type(None)} and all(v is None or v.tzinfo is None for v in values)
+    if naive and kinds <= {datetime, type(None)}:
+        # Integer microseconds: much faster than NumPy parsing datetime objects
+        micros = [_NAT if v is None else (v - _EPOCH) // _MICROSECOND for v in values]
+        if all(v == _NAT or _MIN_US <= v <= _MAX_US for v in micros):
+            nanos = [v if v == _NAT else v * 1000 for v in micros]
+            return np.array(nanos, dtype=np.int64).view("datetime64[ns]"), None, DATETIME
+    if naive and kinds <= {pd.Timestamp, type(None)}:
+        units = {v.unit for v in values if v is not None}
+        if len(units) == 1:  # one unit, so decoding restores each Timestamp exactly
+            try:
+                nanos = [_NAT if v is None else v.as_unit("ns").value for v in values]
+            except (OverflowError, ValueError):  # OutOfBoundsDatetime: outside the ns range
+                pass
+            else:
+                return np.array(nanos, dtype=np.int64).view("datetime64[ns]"), None, units.pop()
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column, None, None
@@ -0,0 +1,141 @@
+"""
+Lazy service holders for process-wide singletons that are expensive to build.
+
+A LazyService wraps a zero-argument factory and stands in for the object it
+builds: attribute reads, writes and calls are forwarded to the real object,
+which is constructed on first use (thread-safe, exactly once) or ahead of
+time by warm_up(). Modules can therefore keep a module-level name such as
+`orchestrator` without paying for construction (network, heavy imports) at
+import time.
+
+Every holder registers itself so the API can report readiness per component:
+
+    cold     — not built yet
+    warming  — factory running
+    ready    — built
+    failed   — factory raised; the next use retries
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+_REGISTRY: Dict[str, "LazyService"] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class LazyService:
+    """
+    Proxy that builds its target with `factory` on first use.
+
+    Args:
+        name: component name reported by readiness()
+        factory: zero-argument callable returning the service
+    """
+
+    _OWN = frozenset(("_name", "_factory", "_target", "_lock", "_state", "_error", "_init_ms"))
+
+    def __init__(self, name: str, factory: Callable[[], Any]) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_state", COLD)
+        object.__setattr__(self, "_error", None)
+        object.__setattr__(self, "_init_ms", None)
+        with _REGISTRY_LOCK:
+            _REGISTRY[name] = self
+
+    def get(self) -> Any:
+        """Return the service, building it first if needed. Re-raises factory errors."""
+        target = self._target
+        if target is not None:
+            return target
+        with self._lock:
+            if self._target is None:
+                object.__setattr__(self, "_state", WARMING)
+                t0 = time.perf_counter()
+                try:
+                    built = self._factory()
+                except Exception as e:
+                    object.__setattr__(self, "_state", FAILED)
+                    object.__setattr__(self, "_error", f"{type(e).__name__}: {e}")
+                    raise
+                object.__setattr__(self, "_init_ms", (time.perf_counter() - t0) * 1000.0)
+                object.__setattr__(self, "_error", None)
+                object.__setattr__(self, "_target", built)
+                object.__setattr__(self, "_state", READY)
+                logger.info("%s ready in %.0f ms", self._name, self._init_ms)
+            return self._target
+
+    @property
+    def is_ready(self) -> bool:
+        return self._target is not None
+
+    def status(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"state": self._state}
+        if self._init_ms is not None:
+            out["init_ms"] = round(self._init_ms, 1)
+        if self._error:
+            out["error"] = self._error
+        return out
+
+    # ── forwarding ────────────────────────────────────────────────────────────
+
+    def __getattr__(self, item: str) -> Any:
+        # Only reached for names not found on the proxy itself.
+        return getattr(self.get(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key in self._OWN:
+            object.__setattr__(self, key, value)
+        else:
+            setattr(self.get(), key, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.get()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<LazyService {self._name} ({self._state})>"
+
+
+def describe(obj: Any) -> str:
+    """
+    Class name of `obj` for logs, or of the service a LazyService builds.
+    A LazyService that is not built yet is reported as such, never built.
+    """
+    if isinstance(obj, LazyService):
+        if not obj.is_ready:
+            return repr(obj)
+        obj = obj.get()
+    return type(obj).__name__
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the named services (default: every registered one) in order.
+    Failures are logged, not raised; returns readiness() afterwards.
+    """
+    with _REGISTRY_LOCK:
+        services = list(_REGISTRY.values()) if names is None else [_REGISTRY[n] for n in names]
+    for svc in services:
+        try:
+            svc.get()
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", svc._name, e)
+    return readiness()
+
+
+def readiness() -> Dict[str, Dict[str, Any]]:
+    """{name: status()} for every registered service."""
+    with _REGISTRY_LOCK:
+        services = dict(_REGISTRY)
+    return {name: svc.status() for name, svc in services.items()}
@@ -0,0 +1,342 @@
+"""
+Log Sink - background writer for structured (JSONL) logs and checkpoints.
+
+Hot paths (scan loop, monitor loop, confluence scoring) used to open the
+target file, json.dumps the record and write it synchronously for every
+event. With the sink they only enqueue; one daemon thread:
+
+  - serializes records (orjson when installed, stdlib json otherwise)
+  - groups queued lines by file and writes each group in one call through
+    a persistent append handle (LRU-capped number of open files)
+  - coalesces whole-file snapshots (write_snapshot): only the newest
+    payload per path is written, atomically via tmp + rename
+  - optionally rotates a file at max_bytes, compressing the rolled file
+    with zstd when `zstandard` is installed (gzip otherwise)
+
+Records handed to write_json / write_snapshot must not be mutated by the
+caller afterwards; they are serialized later on the writer thread.
+flush() blocks until everything queued so far is on disk — call it before
+reading a file the sink writes.
+
+Writes never raise into callers. If the queue is full (writer stalled on
+a dead disk) new lines are dropped and counted in stats()["dropped"].
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+_FLUSH_INTERVAL = 0.25      # seconds the writer waits for more lines before writing a batch
+_MAX_BATCH = 5000           # lines drained per batch
+_MAX_QUEUE = 200_000        # queued items before new lines are dropped
+_MAX_OPEN_FILES = 64
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(record: Any, indent: bool = False) -> str:
+    """
+    Serialize `record` to a JSON string (orjson when available).
+
+    Non-JSON values fall back to str(), like json.dumps(default=str).
+    """
+    if ORJSON_AVAILABLE:
+        opts = _ORJSON_OPTS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTS
+        try:
+            return orjson.dumps(record, default=str, option=opts).decode("utf-8")
+        except TypeError:
+            pass  # e.g. int beyond 64 bits; stdlib handles it
+    return json.dumps(record, default=str, indent=2 if indent else None)
+
+
+@dataclass
+class RotationPolicy:
+    """Rotate at max_bytes, keeping `backups` rolled files (compressed if `compress`)."""
+
+    max_bytes: int
+    backups: int = 3
+    compress: bool = True
+
+
+class LogChannel:
+    """
+    A sink-backed append-only file. `info` keeps the logging.Logger call
+    shape so it can replace a dedicated file logger.
+    """
+
+    def __init__(self, sink: "LogSink", path: Path) -> None:
+        self.sink = sink
+        self.path = path
+
+    def info(self, line: str) -> None:
+        self.sink.write_line(self.path, line)
+
+    def write_json(self, record: Any) -> None:
+        self.sink.write_json(self.path, record)
+
+
+# Queue items: (kind, path, payload)
+_LINE, _JSON, _SNAPSHOT, _BARRIER = "line", "json", "snapshot", "barrier"
+
+
+class LogSink:
+    """Background writer thread shared by every structured log in the process."""
+
+    def __init__(
+        self,
+        flush_interval: float = _FLUSH_INTERVAL,
+        max_queue: int = _MAX_QUEUE,
+        max_open_files: int = _MAX_OPEN_FILES,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.max_open_files = max_open_files
+        self._queue: "queue.Queue[Tuple[str, Optional[Path], Any]]" = queue.Queue(maxsize=max_queue)
+        self._handles: "OrderedDict[Path, Any]" = OrderedDict()
+        self._sizes: Dict[Path, int] = {}
+        self._rotation: Dict[Path, RotationPolicy] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {"lines": 0, "snapshots": 0, "batches": 0, "dropped": 0, "errors": 0, "rotations": 0}
+
+    # ── producer API (hot path: enqueue only) ─────────────────────────────────
+
+    def channel(self, path: PathLike, rotation: Optional[RotationPolicy] = None) -> LogChannel:
+        """Return a LogChannel for `path`, registering its rotation policy."""
+        p = Path(path)
+        if rotation is not None:
+            with self._lock:
+                self._rotation[p] = rotation
+        return LogChannel(self, p)
+
+    def write_json(self, path: PathLike, record: Any) -> None:
+        """Append `record` as one JSON line to `path`."""
+        self._put((_JSON, Path(path), record))
+
+    def write_line(self, path: PathLike, line: str) -> None:
+        """Append a pre-formatted line (newline added) to `path`."""
+        self._put((_LINE, Path(path), line))
+
+    def write_snapshot(self, path: PathLike, record: Any) -> None:
+        """Replace `path` with `record` (indented JSON), atomically. Superseded snapshots are skipped."""
+        self._put((_SNAPSHOT, Path(path), record))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything enqueued before this call is written. False on timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((_BARRIER, None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flush, stop the writer and close all handles."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+        self._close_handles()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "queued": self._queue.qsize(), "open_files": len(self._handles)}
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _put(self, item: Tuple[str, Optional[Path], Any]) -> None:
+        if self._closed:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._stats["dropped"] += 1
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as e:  # never let the writer die
+                self._stats["errors"] += 1
+                logger.warning("log sink batch failed: %s", e)
+            for kind, _, payload in batch:
+                if kind == _BARRIER:
+                    payload.set()
+
+    def _write_batch(self, batch: List[Tuple[str, Optional[Path], Any]]) -> None:
+        lines: "OrderedDict[Path, List[str]]" = OrderedDict()
+        snapshots: Dict[Path, Any] = {}
+        for kind, path, payload in batch:
+            if kind == _BARRIER:
+                continue
+            if kind == _SNAPSHOT:
+                snapshots[path] = payload  # newest wins
+                continue
+            try:
+                text = payload if kind == _LINE else dumps(payload)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.debug("log sink: unserializable record for %s: %s", path, e)
+                continue
+            lines.setdefault(path, []).append(text)
+
+        for path, chunk in lines.items():
+            try:
+                self._append(path, "".join(f"{line}\n" for line in chunk))
+                self._stats["lines"] += len(chunk)
+            except Exception as e:
+                self._stats["errors"] += 1
+                self._drop_handle(path)
+                logger.warning("log sink: write to %s failed: %s", path, e)
+        for path, record in snapshots.items():
+            try:
+                self._write_snapshot(path, record)
+                self._stats["snapshots"] += 1
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning("log sink: snapshot %s failed: %s", path, e)
+        self._stats["batches"] += 1
+        for fh in self._handles.values():
+            fh.flush()
+
+    def _handle(self, path: Path):
+        fh = self._handles.get(path)
+        if fh is not None:
+            self._handles.move_to_end(path)
+            return fh
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(path, "a", encoding="utf-8")
+        self._handles[path] = fh
+        self._sizes[path] = fh.tell()
+        while len(self._handles) > self.max_open_files:
+            old_path, old = self._handles.popitem(last=False)
+            self._sizes.pop(old_path, None)
+            old.close()
+        return fh
+
+    def _drop_handle(self, path: Path) -> None:
+        fh = self._handles.pop(path, None)
+        self._sizes.pop(path, None)
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+    def _append(self, path: Path, text: str) -> None:
+        fh = self._handle(path)
+        fh.write(text)
+        self._sizes[path] = self._sizes.get(path, 0) + len(text.encode("utf-8"))
+        policy = self._rotation.get(path)
+        if policy is not None and self._sizes[path] >= policy.max_bytes:
+            self._rotate(path, policy)
+
+    def _rotate(self, path: Path, policy: RotationPolicy) -> None:
+        self._drop_handle(path)
+        suffix = (".zst" if ZSTD_AVAILABLE else ".gz") if policy.compress else ""
+
+        def rolled(i: int) -> Path:
+            return path.with_name(f"{path.name}.{i}{suffix}")
+
+        if policy.backups <= 0:
+            path.unlink(missing_ok=True)
+        else:
+            rolled(policy.backups).unlink(missing_ok=True)
+            for i in range(policy.backups - 1, 0, -1):
+                if rolled(i).exists():
+                    os.replace(rolled(i), rolled(i + 1))
+            if policy.compress:
+                _compress_file(path, rolled(1))
+                path.unlink()
+            else:
+                os.replace(path, rolled(1))
+        self._stats["rotations"] += 1
+
+    def _write_snapshot(self, path: Path, record: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(dumps(record, indent=True))
+        os.replace(tmp, path)
+
+    def _close_handles(self) -> None:
+        for fh in self._handles.values():
+            try:
+                fh.close()
+            except Exception:
+                pass
+        self._handles.clear()
+        self._sizes.clear()
+
+
+def _compress_file(src: Path, dst: Path) -> None:
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        if ZSTD_AVAILABLE:
+            zstandard.ZstdCompressor(level=3).copy_stream(fin, fout)
+        else:
+            with gzip.GzipFile(fileobj=fout, mode="wb") as gz:
+                shutil.copyfileobj(fin, gz)
+
+
+_SINK: Optional[LogSink] = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_log_sink() -> LogSink:
+    """Process-wide LogSink (created on first use, flushed at exit)."""
+    global _SINK
+    if _SINK is None:
+        with _SINK_LOCK:
+            if _SINK is None:
+                _SINK = LogSink()
+                atexit.register(_SINK.close)
+    return _SINK
@@ -16,11 +16,9 @@ Outputs a comprehensive ConfluenceBreakdown with synergy bonuses and conflict pe
 """
 
 from typing import List, Dict, Optional, Tuple, TYPE_CHECKING, Any
-import json
 import time
 from datetime import datetime, timezone
 from loguru import logger
-import threading
 
 from backend.shared.models.smc import SMCSnapshot, OrderBlock, FVG, StructuralBreak, LiquiditySweep
 from backend.shared.models.indicators import IndicatorSet, IndicatorSnapshot
@@ -32,7 +30,7 @@ from backend.analysis.premium_discount import detect_premium_discount
 from backend.analysis.pullback_detector import detect_pullback_setup
 from backend.strategy.smc.sessions import get_current_kill_zone
 from backend.analysis.macro_context import MacroContext, compute_macro_score
-from backend.indicators.divergence import detect_all_divergences
+from backend.indicators.divergence import snapshot_divergences
 from backend.analysis.fibonacci import (
     calculate_fib_levels,
     find_nearest_fib,
@@ -40,40 +38,16 @@ from backend.analysis.fibonacci import (
 )
 
 # === FILE LOGGING FOR CONFLUENCE BREAKDOWN ===
-# Uses a RotatingFileHandler so the file never grows unbounded.
-# Max 5 MB per file, 3 backups kept (≤15 MB total on disk).
+# Written through the shared log sink: scoring only enqueues the line, the
+# sink's writer thread appends it. Rotates at 5 MB, 3 compressed backups kept.
 
-import logging as _stdlib_logging
-from logging.handlers import RotatingFileHandler as _RotatingFileHandler
+from backend.shared.utils.log_sink import RotationPolicy, dumps as _fast_dumps, get_log_sink
 
 BREAKDOWN_LOG_PATH = "logs/confluence_breakdown.log"
-BREAKDOWN_LOG_LOCK = threading.Lock()
 
-def _make_breakdown_logger() -> Optional[_stdlib_logging.Logger]:
-    """Create a dedicated rotating-file logger for confluence breakdowns."""
-    try:
-        import os
-        os.makedirs("logs", exist_ok=True)
-        _lg = _stdlib_logging.getLogger("confluence_breakdown")
-        _lg.setLevel(_stdlib_logging.DEBUG)
-        if not _lg.handlers:
-            _rh = _RotatingFileHandler(
-                BREAKDOWN_LOG_PATH,
-                maxBytes=5 * 1024 * 1024,  # 5 MB
-                backupCount=3,
-                encoding="utf-8",
-            )
-            _rh.setFormatter(_stdlib_logging.Formatter("%(message)s"))
-            _lg.addHandler(_rh)
-            _lg.propagate = False  # don't bubble up to root logger
-        return _lg
-    except Exception as _e:
-        logger.warning(f"Could not create breakdown logger: {_e}")
-        return None
-
-BREAKDOWN_LOG_FILE = _make_breakdown_logger()
-if BREAKDOWN_LOG_FILE:
-    logger.info(f"📝 Confluence breakdown logging (rotating) to: {BREAKDOWN_LOG_PATH}")
+BREAKDOWN_LOG_FILE = get_log_sink().channel(
+    BREAKDOWN_LOG_PATH, rotation=RotationPolicy(max_bytes=5 * 1024 * 1024, backups=3)
+)
 
 # Conditional imports for type hints
 if TYPE_CHECKING:
@@ -1427,8 +1401,8 @@ def evaluate_htf_momentum_gate(
         htf_hidden_div = False
         if hasattr(ind, "dataframe") and ind.dataframe is not None and len(ind.dataframe) >= 50:
             try:
-                htf_divs = detect_all_divergences(
-                    df=ind.dataframe,
+                htf_divs = snapshot_divergences(
+                    ind,
                     direction=direction,
                     lookback=5,
                     min_pivot_distance=10,
@@ -2717,7 +2691,7 @@ def calculate_confluence_score(
             df = primary_indicators.dataframe
             if len(df) >= 50:
                 try:
-                    divergences = detect_all_divergences(df=df, direction=direction, lookback=5, min_pivot_distance=10, max_lookback_bars=100)
+                    divergences = snapshot_divergences(primary_indicators, direction=direction, lookback=5, min_pivot_distance=10, max_lookback_bars=100)
                     div_res = _score_divergences_incremental(divergences, direction)
                     div_score = div_res["score"]
                     div_rationale = div_res["rationale"]
@@ -3372,8 +3346,7 @@ def calculate_confluence_score(
                     for f in breakdown.factors
                 ],
             }
-            with BREAKDOWN_LOG_LOCK:
-                BREAKDOWN_LOG_FILE.info(json.dumps(_entry))
+            BREAKDOWN_LOG_FILE.info(_fast_dumps(_entry))
         except Exception as _e:
             logger.warning("Breakdown persistence failed (non-fatal): %s", _e)
 
@@ -12,6 +12,7 @@ from typing import List, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 import bisect
 import logging
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -325,11 +326,29 @@ def detect_structural_breaks(
     # Hoist mode volume requirement — constant for the entire scan, no need to re-lookup per candle.
     vol_req = MODE_VOLUME_REQUIREMENTS.get(mode_profile) if mode_profile else None
 
-    for i in range(swing_lookback * 2, len(df)):
+    # Column arrays: the per-candle body reads these instead of .iloc
+    highs = df["high"].to_numpy()
+    lows = df["low"].to_numpy()
+    closes = df["close"].to_numpy()
+    atr_values = atr.to_numpy()
+    volumes = df["volume"].to_numpy() if has_volume else None
+    avg_volumes = avg_volume.to_numpy() if avg_volume is not None else None
+    timeframe = _infer_timeframe(df)
+
+    # Event scan: between two swing candles the swing refs only change when a
+    # break fires, so the next candle that can act is the first one whose close
+    # clears a ref — found with one array comparison per segment instead of a
+    # pass through the body per candle. Needs unique, increasing timestamps
+    # (swing lookup and bisect are by timestamp); otherwise every candle runs.
+    n = len(df)
+    fast_scan = _EVENT_SCAN and df.index.is_unique and df.index.is_monotonic_increasing
+    swing_positions = np.flatnonzero(df.index.isin(swing_highs.index) | df.index.isin(swing_lows.index))
+    min_breaks = np.nan_to_num(atr_values, nan=0.0)
+    min_breaks = np.where(min_breaks > 0, min_breaks * min_break_distance_atr, 0.0)
+
+    i = swing_lookback * 2
+    while i < n:
         current_idx = df.index[i]
-        current_high = df["high"].iloc[i]
-        current_low = df["low"].iloc[i]
-        current_close = df["close"].iloc[i]
 
         # Update swing points up to current position.
         # KNOWN LIMITATION (Phase 3B, flagged not fixed): a swing becomes usable here
@@ -344,11 +363,37 @@ def detect_structural_breaks(
         if current_idx in swing_lows.index:
             last_swing_low = swing_lows.loc[current_idx]
 
-        # Need at least one swing point of each type to detect breaks
-        if last_swing_high is None or last_swing_low is None:
+        if fast_scan:
+            k = np.searchsorted(swing_positions, i, side="right")
+            segment_end = int(swing_positions[k]) if k < len(swing_positions) else n
+            # Need at least one swing point of each type to detect breaks
+            if last_swing_high is None or last_swing_low is None:
+                i = segment_end
+                continue
+            window = closes[i:segment_end]
+            if use_4swing:
+                fires = _4swing_candidates(
+                    window, current_trend, _hl_order, _level_order,
+                    bisect.bisect_right(_idx_order, current_idx),
+                )
+            else:
+                fires = ((window - last_swing_high) > min_breaks[i:segment_end]) | (
+                    (last_swing_low - window) > min_breaks[i:segment_end]
+                )
+            if not fires.any():
+                i = segment_end
+                continue
+            i += int(fires.argmax())
+            current_idx = df.index[i]
+        elif last_swing_high is None or last_swing_low is None:
+            i += 1
             continue
 
-        atr_value = atr.iloc[i] if pd.notna(atr.iloc[i]) else 0
+        current_high = highs[i]
+        current_low = lows[i]
+        current_close = closes[i]
+
+        atr_value = atr_values[i] if pd.notna(atr_values[i]) else 0
 
         # Calculate minimum break threshold (must break by at least this much)
         min_break = atr_value * min_break_distance_atr if atr_value > 0 else 0
@@ -362,12 +407,12 @@ def detect_structural_breaks(
         volume_confirmed = False
         if (
             has_volume
-            and avg_volume is not None
-            and pd.notna(avg_volume.iloc[i])
-            and avg_volume.iloc[i] > 0
+            and avg_volumes is not None
+            and pd.notna(avg_volumes[i])
+            and avg_volumes[i] > 0
         ):
-            current_volume = df["volume"].iloc[i]
-            volume_ratio = current_volume / avg_volume.iloc[i]
+            current_volume = volumes[i]
+            volume_ratio = current_volume / avg_volumes[i]
             volume_confirmed = volume_ratio >= 1.5  # 1.5x average = confirmed
 
         # 4-swing structural pattern check.
@@ -435,7 +480,7 @@ def detect_structural_breaks(
                         skip_signal = True
                 if not skip_signal:
                     structural_breaks.append(StructuralBreak(
-                        timeframe=_infer_timeframe(df), break_type="BOS", direction="bullish",
+                        timeframe=timeframe, break_type="BOS", direction="bullish",
                         level=_level, timestamp=current_idx.to_pydatetime(),
                         htf_aligned=htf_aligned, grade=grade,
                     ))
@@ -462,7 +507,7 @@ def detect_structural_breaks(
                         skip_signal = True
                 if not skip_signal:
                     structural_breaks.append(StructuralBreak(
-                        timeframe=_infer_timeframe(df), break_type="CHoCH", direction="bearish",
+                        timeframe=timeframe, break_type="CHoCH", direction="bearish",
                         level=_level, timestamp=current_idx.to_pydatetime(),
                         htf_aligned=htf_aligned, grade=grade,
                     ))
@@ -493,7 +538,7 @@ def detect_structural_breaks(
                         skip_signal = True
                 if not skip_signal:
                     structural_breaks.append(StructuralBreak(
-                        timeframe=_infer_timeframe(df), break_type="BOS", direction="bearish",
+                        timeframe=timeframe, break_type="BOS", direction="bearish",
                         level=_level, timestamp=current_idx.to_pydatetime(),
                         htf_aligned=htf_aligned, grade=grade,
                     ))
@@ -528,7 +573,7 @@ def detect_structural_breaks(
 
                 if not skip_signal:
                     structural_breaks.append(StructuralBreak(
-                        timeframe=_infer_timeframe(df),
+                        timeframe=timeframe,
                         break_type="CHoCH",
                         direction="bullish",  # CHoCH in downtrend = turning bullish
                         level=_level,
@@ -580,9 +625,50 @@ def detect_structural_breaks(
                         current_idx,
                     )
 
+        i += 1
+
     return structural_breaks
 
 
+# Module switch for the event scan in detect_structural_breaks; False runs the
+# body on every candle (reference path for parity tests).
+_EVENT_SCAN = True
+
+# (break_type, direction) pairs each trend state acts on in 4-swing mode
+_4SWING_ACTIONS = {
+    "uptrend": {("BOS", "bullish"), ("CHoCH", "bearish")},
+    "downtrend": {("BOS", "bearish"), ("CHoCH", "bullish")},
+}
+
+
+def _4swing_candidates(
+    closes: np.ndarray,
+    trend: str,
+    highs_lows_order: List[int],
+    level_order: List[float],
+    pos: int,
+) -> np.ndarray:
+    """
+    Candles (mask over `closes`) where the 4-swing pattern of the first
+    `pos` swings fires and the current trend state acts on it. The pattern's
+    structure conditions do not depend on the close, so it is evaluated once
+    per shape with an unbounded close and the close test applied to the array.
+    """
+    fires = np.zeros(len(closes), dtype=bool)
+    if pos < 4:
+        return fires
+    for probe in (np.inf, -np.inf):
+        break_type, direction, level, _ = _detect_bos_choch_pattern(
+            highs_lows_order[:pos], level_order[:pos], [None] * pos, probe, probe, probe
+        )
+        if break_type is None:
+            continue
+        if trend in _4SWING_ACTIONS and (break_type, direction) not in _4SWING_ACTIONS[trend]:
+            continue
+        fires |= (closes > level) if direction == "bullish" else (closes < level)
+    return fires
+
+
 def _detect_swing_highs(df: pd.DataFrame, lookback: int) -> pd.Series:
     """
     Detect swing highs in price data.
@@ -597,31 +683,9 @@ def _detect_swing_highs(df: pd.DataFrame, lookback: int) -> pd.Series:
     Returns:
         pd.Series: Swing high levels indexed by timestamp
     """
-    swing_highs = {}
-
-    for i in range(lookback, len(df) - lookback):
-        current_high = df["high"].iloc[i]
-
-        # Check if this is a swing high
-        is_swing_high = True
-
-        # Check left side
-        for j in range(i - lookback, i):
-            if df["high"].iloc[j] >= current_high:
-                is_swing_high = False
-                break
-
-        # Check right side
-        if is_swing_high:
-            for j in range(i + 1, i + lookback + 1):
-                if df["high"].iloc[j] >= current_high:
-                    is_swing_high = False
-                    break
-
-        if is_swing_high:
-            swing_highs[df.index[i]] = current_high
-
-    return pd.Series(swing_highs)
+    highs = df["high"].to_numpy()
+    positions = _strict_pivots(highs, lookback, higher=True)
+    return pd.Series(dict(zip(df.index[positions], highs[positions])))
 
 
 def _detect_swing_lows(df: pd.DataFrame, lookback: int) -> pd.Series:
@@ -638,31 +702,25 @@ def _detect_swing_lows(df: pd.DataFrame, lookback: int) -> pd.Series:
     Returns:
         pd.Series: Swing low levels indexed by timestamp
     """
-    swing_lows = {}
-
-    for i in range(lookback, len(df) - lookback):
-        current_low = df["low"].iloc[i]
-
-        # Check if this is a swing low
-        is_swing_low = True
-
-        # Check left side
-        for j in range(i - lookback, i):
-            if df["low"].iloc[j] <= current_low:
-                is_swing_low = False
-                break
+    lows = df["low"].to_numpy()
+    positions = _strict_pivots(lows, lookback, higher=False)
+    return pd.Series(dict(zip(df.index[positions], lows[positions])))
 
-        # Check right side
-        if is_swing_low:
-            for j in range(i + 1, i + lookback + 1):
-                if df["low"].iloc[j] <= current_low:
-                    is_swing_low = False
-                    break
 
-        if is_swing_low:
-            swing_lows[df.index[i]] = current_low
-
-    return pd.Series(swing_lows)
+def _strict_pivots(values: np.ndarray, lookback: int, higher: bool) -> np.ndarray:
+    """
+    Positions in [lookback, n - lookback) whose value is strictly beyond all
+    `lookback` neighbours on each side. A neighbour comparison involving NaN
+    does not disqualify (as in the per-candle scan it replaces).
+    """
+    n = len(values)
+    if n < 2 * lookback + 1:
+        return np.empty(0, dtype=np.intp)
+    windows = np.lib.stride_tricks.sliding_window_view(values, 2 * lookback + 1)
+    center = windows[:, lookback : lookback + 1]
+    neighbours = np.delete(windows, lookback, axis=1)
+    beaten = (neighbours >= center) if higher else (neighbours <= center)
+    return np.flatnonzero(~beaten.any(axis=1)) + lookback
 
 
 def _determine_initial_trend(swing_highs: pd.Series, swing_lows: pd.Series) -> str:
@@ -13,6 +13,7 @@ Cycle theory helps identify:
 This module is backwards compatible - all functions accept Optional cycle params.
 """
 
+import dataclasses
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Tuple, List, Literal
@@ -26,6 +27,7 @@ from backend.shared.models.smc import (
     CycleConfirmation,
     StructuralBreak,
 )
+from backend.strategy.smc.bos_choch import _strict_pivots
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +100,38 @@ def detect_cycle_context(
     Returns:
         CycleContext with phase, translation, timing info, and trade bias
     """
+    context = detect_cycle_state(df, config, structural_breaks, current_price)
+    if context is None:
+        return CycleContext()  # Return empty context
+
+    if current_price is None:
+        current_price = float(df["close"].iloc[-1])
+
+    # Calculate temporal bias (Day/Time probability)
+    # Use current time if available, otherwise last candle time
+    check_time = datetime.now() if current_price else df.index[-1]
+    if hasattr(check_time, "to_pydatetime"):
+        check_time = check_time.to_pydatetime()
+
+    return apply_temporal_bias(context, check_time)
+
+
+def detect_cycle_state(
+    df: pd.DataFrame,
+    config: Optional[CycleConfig] = None,
+    structural_breaks: Optional[List[StructuralBreak]] = None,
+    current_price: Optional[float] = None,
+) -> Optional[CycleContext]:
+    """
+    The candle-derived part of detect_cycle_context: everything except the
+    day/time temporal bias, which depends on the wall clock. The result only
+    changes when a new candle arrives, so it can be cached per closed candle
+    and finished with apply_temporal_bias() when served.
+
+    Returns:
+        CycleContext with temporal fields unset and the pre-timing confidence,
+        or None if there is not enough data
+    """
     if config is None:
         config = CRYPTO_CYCLE_CONFIG
 
@@ -107,7 +141,7 @@ def detect_cycle_context(
             config.wcl_max_days,
             len(df),
         )
-        return CycleContext()  # Return empty context
+        return None
 
     if not isinstance(df.index, pd.DatetimeIndex):
         raise ValueError("DataFrame must have DatetimeIndex")
@@ -140,14 +174,6 @@ def detect_cycle_context(
     if dcl_info.get("price") and cycle_high_info.get("price"):
         midpoint = (dcl_info["price"] + cycle_high_info["price"]) / 2
 
-    # Calculate temporal bias (Day/Time probability)
-    # Use current time if available, otherwise last candle time
-    check_time = datetime.now() if current_price else df.index[-1]
-    if hasattr(check_time, "to_pydatetime"):
-        check_time = check_time.to_pydatetime()
-
-    temporal_score, timing_active = _calculate_temporal_bias(check_time)
-
     # Determine trade bias
     trade_bias, confidence = _calculate_trade_bias(
         phase=phase,
@@ -158,10 +184,6 @@ def detect_cycle_context(
         structural_breaks=structural_breaks,
     )
 
-    # Boost confidence if we are in a high probability timing window
-    if timing_active:
-        confidence = min(100.0, confidence + 10.0)
-
     return CycleContext(
         phase=phase,
         translation=translation,
@@ -180,6 +202,24 @@ def detect_cycle_context(
         in_wcl_zone=in_wcl_zone,
         trade_bias=trade_bias,
         confidence=confidence,
+    )
+
+
+def apply_temporal_bias(context: CycleContext, check_time: datetime) -> CycleContext:
+    """
+    Add the day/time temporal bias for `check_time` to a detect_cycle_state()
+    result, boosting confidence inside a high probability timing window.
+    """
+    temporal_score, timing_active = _calculate_temporal_bias(check_time)
+
+    confidence = context.confidence
+    # Boost confidence if we are in a high probability timing window
+    if timing_active:
+        confidence = min(100.0, confidence + 10.0)
+
+    return dataclasses.replace(
+        context,
+        confidence=confidence,
         temporal_score=temporal_score,
         timing_window_active=timing_active,
     )
@@ -210,29 +250,12 @@ def _detect_dcl(df: pd.DataFrame, config: CycleConfig) -> dict:
     analysis_window = min(len(df), config.dcl_max_days * 2)
     recent_df = df.tail(analysis_window)
 
-    swing_lows = []
-
-    for i in range(lookback, len(recent_df) - lookback):
-        current_low = recent_df["low"].iloc[i]
-
-        # Check if this is a swing low
-        is_swing = True
-
-        # Check left side
-        for j in range(i - lookback, i):
-            if recent_df["low"].iloc[j] <= current_low:
-                is_swing = False
-                break
-
-        # Check right side
-        if is_swing:
-            for j in range(i + 1, i + lookback + 1):
-                if recent_df["low"].iloc[j] <= current_low:
-                    is_swing = False
-                    break
-
-        if is_swing:
-            swing_lows.append({"idx": i, "price": current_low, "timestamp": recent_df.index[i]})
+    # Swing low: strictly below the lows of `lookback` bars on each side
+    lows = recent_df["low"].to_numpy()
+    swing_lows = [
+        {"idx": int(i), "price": lows[i], "timestamp": recent_df.index[i]}
+        for i in _strict_pivots(lows, lookback, higher=False)
+    ]
 
     if not swing_lows:
         return {"confirmation": CycleConfirmation.UNCONFIRMED}
@@ -324,26 +347,11 @@ def _detect_wcl(df: pd.DataFrame, config: CycleConfig, dcl_info: dict) -> dict:
 
     # Find swing lows with larger lookback (more significant lows)
     wcl_lookback = lookback * 2  # Double lookback for weekly significance
-    swing_lows = []
-
-    for i in range(wcl_lookback, len(recent_df) - wcl_lookback):
-        current_low = recent_df["low"].iloc[i]
-
-        is_swing = True
-
-        for j in range(i - wcl_lookback, i):
-            if recent_df["low"].iloc[j] <= current_low:
-                is_swing = False
-                break
-
-        if is_swing:
-            for j in range(i + 1, i + wcl_lookback + 1):
-                if recent_df["low"].iloc[j] <= current_low:
-                    is_swing = False
-                    break
-
-        if is_swing:
-            swing_lows.append({"idx": i, "price": current_low, "timestamp": recent_df.index[i]})
+    lows = recent_df["low"].to_numpy()
+    swing_lows = [
+        {"idx": int(i), "price": lows[i], "timestamp": recent_df.index[i]}
+        for i in _strict_pivots(lows, wcl_lookback, higher=False)
+    ]
 
     if not swing_lows:
         return {"confirmation": CycleConfirmation.UNCONFIRMED}
@@ -18,6 +18,7 @@ import numpy as np
 import logging
 
 from backend.shared.models.smc import OrderBlock
+from backend.shared.models.smc_table import PatternTable
 from backend.shared.config.smc_config import SMCConfig, scale_lookback
 
 logger = logging.getLogger(__name__)
@@ -623,6 +624,14 @@ def calculate_freshness(ob: OrderBlock, current_time: datetime) -> float:
     age = current_time - ob.timestamp
     age_hours = age.total_seconds() / 3600
 
+    freshness = 2 ** (-age_hours / _half_life_hours(ob.timeframe))
+
+    # Scale to 0-100 (model expects 0-100, is_fresh checks > 70)
+    return freshness * 100.0
+
+
+def _half_life_hours(timeframe: str) -> float:
+    """Freshness half-life for a timeframe label."""
     # UPDATED: Timeframe-aware half-life (faster decay for LTF)
     # This prevents using stale OBs from days ago on short timeframes
     half_life_map = {
@@ -636,26 +645,60 @@ def calculate_freshness(ob: OrderBlock, current_time: datetime) -> float:
     }
 
     # Normalize timeframe format for lookup
-    tf_normalized = ob.timeframe.upper().replace("M", "m").replace("H", "H")
+    tf_normalized = timeframe.upper().replace("M", "m").replace("H", "H")
     # Try exact match first, then pattern match
     half_life_hours = half_life_map.get(tf_normalized)
     if half_life_hours is None:
         # Pattern match fallback
-        if "m" in ob.timeframe.lower():
-            mins = int("".join(filter(str.isdigit, ob.timeframe)) or 15)
+        if "m" in timeframe.lower():
+            mins = int("".join(filter(str.isdigit, timeframe)) or 15)
             half_life_hours = 12 if mins <= 5 else 24
-        elif "h" in ob.timeframe.lower():
-            hours = int("".join(filter(str.isdigit, ob.timeframe)) or 1)
+        elif "h" in timeframe.lower():
+            hours = int("".join(filter(str.isdigit, timeframe)) or 1)
             half_life_hours = 48 if hours <= 1 else 96
-        elif "d" in ob.timeframe.lower():
+        elif "d" in timeframe.lower():
             half_life_hours = 168
         else:
             half_life_hours = 72  # Default fallback
+    return half_life_hours
 
-    freshness = 2 ** (-age_hours / half_life_hours)
 
-    # Scale to 0-100 (model expects 0-100, is_fresh checks > 70)
-    return freshness * 100.0
+def refresh_freshness(order_blocks: List[OrderBlock], current_time: datetime) -> List[OrderBlock]:
+    """
+    New OrderBlocks with freshness_score recalculated as of current_time.
+
+    Same result as replace(ob, freshness_score=calculate_freshness(ob, now))
+    per OB, computed on the columnar table (one half-life lookup per
+    timeframe, one vectorized decay). Falls back to that loop when the
+    list does not convert to a table.
+    """
+    if not order_blocks:
+        return []
+    try:
+        table = PatternTable.from_patterns(order_blocks, kind=OrderBlock)
+    except TypeError:
+        table = None
+    if (
+        table is None
+        or table.columns["timestamp"].dtype.kind != "M"
+        or np.isnat(table.columns["timestamp"]).any()
+        or "timeframe" not in table.categories
+        or (table.columns["timeframe"] < 0).any()
+        or current_time.tzinfo is not None
+    ):
+        return [replace(ob, freshness_score=calculate_freshness(ob, current_time)) for ob in order_blocks]
+
+    half_lives = np.array([_half_life_hours(tf) for tf in table.categories["timeframe"]], dtype=np.float64)
+    # Whole microseconds, as (timedelta | pd.Timedelta).total_seconds() counts them
+    now_ns = pd.Timestamp(current_time).as_unit("ns").to_datetime64()
+    age_us = (now_ns - table.columns["timestamp"]).astype(np.int64) // 1000
+    exponents = -(age_us / 10**6 / 3600) / half_lives[table.columns["timeframe"]]
+    # Scalar pow keeps results bit-identical to calculate_freshness
+    freshness = np.array([2**e for e in exponents.tolist()]) * 100.0
+    bad = ~((freshness >= 0) & (freshness <= 100))
+    if bad.any():  # replace() would reject these in OrderBlock.__post_init__
+        raise ValueError(f"Freshness score must be 0-100, got {freshness[bad][0]}")
+    return table.with_column("freshness_score", freshness).to_patterns()
 
 
 def _infer_timeframe(df: pd.DataFrame) -> str:
@@ -16,10 +16,13 @@ Integrates with smc_preset for mode-specific behavior.
 """
 
 from typing import Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, time
 from enum import Enum
+from threading import Lock
 from zoneinfo import ZoneInfo
+import numpy as np
 import pandas as pd
 
 # DST-aware reference zone. The SESSION/KILL_ZONE tables below are expressed in US
@@ -227,6 +230,9 @@ def filter_candles_in_kill_zone(df: pd.DataFrame, kill_zone: KillZone) -> pd.Dat
     """
     Filter DataFrame to only include candles within a kill zone.
 
+    Candle times are matched in DST-aware Eastern like get_current_kill_zone
+    (naive index = UTC), via the cached calendar features of the index.
+
     Args:
         df: OHLCV DataFrame with DatetimeIndex
         kill_zone: Kill zone to filter by
@@ -237,13 +243,143 @@ def filter_candles_in_kill_zone(df: pd.DataFrame, kill_zone: KillZone) -> pd.Dat
     if kill_zone not in KILL_ZONE_TIMES_EST:
         return df
 
-    sh, sm, eh, em = KILL_ZONE_TIMES_EST[kill_zone]
-
-    mask = df.index.to_series().apply(lambda ts: _time_in_range(ts.time(), (sh, sm), (eh, em)))
-
-    return df[mask]
+    return df[frame_calendar(df).kill_zone_mask(kill_zone)]
 
 
 def is_kill_zone_active(timestamp: datetime) -> bool:
     """Quick check if any kill zone is active."""
     return get_current_kill_zone(timestamp) is not None
+
+
+# --- Vectorized calendar features ---
+#
+# Per-candle session / kill zone / Eastern hour / weekday as integer arrays,
+# computed once per set of timestamps and cached, so per-candle consumers do
+# array lookups instead of astimezone + table loops per row. Codes index
+# SESSIONS / KILL_ZONES; -1 means none. Same first-match semantics as
+# get_current_session / get_current_kill_zone.
+
+SESSIONS = tuple(SESSION_TIMES_EST)
+KILL_ZONES = tuple(KILL_ZONE_TIMES_EST)
+
+_US_PER_MINUTE = 60_000_000
+_US_PER_DAY = 86_400_000_000
+_CALENDAR_CACHE_SIZE = 256
+
+
+def _windows_us(table: dict) -> np.ndarray:
+    """(start, end) of each window in microseconds of the Eastern day, table order."""
+    return np.array([((sh * 60 + sm) * _US_PER_MINUTE, (eh * 60 + em) * _US_PER_MINUTE)
+                     for sh, sm, eh, em in table.values()], dtype=np.int64)
+
+
+_SESSION_WINDOWS = _windows_us(SESSION_TIMES_EST)
+_KILL_ZONE_WINDOWS = _windows_us(KILL_ZONE_TIMES_EST)
+
+
+def _classify(us_of_day: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Index of the first window containing each time (bounds inclusive, overnight aware), else -1."""
+    code = np.full(len(us_of_day), -1, dtype=np.int8)
+    for i in range(len(windows) - 1, -1, -1):  # reversed so the first match is written last
+        start, end = windows[i]
+        if start <= end:
+            inside = (us_of_day >= start) & (us_of_day <= end)
+        else:
+            inside = (us_of_day >= start) | (us_of_day <= end)
+        code[inside] = i
+    return code
+
+
+@dataclass(frozen=True)
+class CalendarFeatures:
+    """
+    Calendar columns for a run of candle timestamps (one row per timestamp).
+
+    Attributes:
+        eastern_hour: hour of day in DST-aware US/Eastern (int8, -1 for NaT)
+        eastern_minute: minute of the Eastern day, 0-1439 (int16, -1 for NaT)
+        day_of_week: Eastern weekday, Monday=0 (int8, -1 for NaT)
+        session: index into SESSIONS (int8, -1 outside all sessions)
+        kill_zone: index into KILL_ZONES (int8, -1 outside all kill zones)
+    """
+
+    eastern_hour: np.ndarray
+    eastern_minute: np.ndarray
+    day_of_week: np.ndarray
+    session: np.ndarray
+    kill_zone: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.session)
+
+    def session_at(self, i: int) -> Optional[TradingSession]:
+        code = self.session[i]
+        return SESSIONS[code] if code >= 0 else None
+
+    def kill_zone_at(self, i: int) -> Optional[KillZone]:
+        code = self.kill_zone[i]
+        return KILL_ZONES[code] if code >= 0 else None
+
+    def kill_zone_mask(self, kill_zone: KillZone) -> np.ndarray:
+        return self.kill_zone == KILL_ZONES.index(kill_zone)
+
+    def session_mask(self, session: TradingSession) -> np.ndarray:
+        return self.session == SESSIONS.index(session)
+
+
+def compute_calendar_features(timestamps) -> CalendarFeatures:
+    """
+    Calendar features for timestamps (DatetimeIndex, Series or array-like;
+    naive = UTC, tz-aware in any zone). Uncached — see calendar_features.
+    """
+    idx = pd.DatetimeIndex(timestamps)
+    if idx.tz is None:
+        idx = idx.tz_localize(_UTC)
+    wall = idx.tz_convert(_EASTERN).tz_localize(None).as_unit("us").asi8
+    nat = idx.isna()
+    us_of_day = wall % _US_PER_DAY
+    day_of_week = ((wall // _US_PER_DAY) + 3) % 7  # 1970-01-01 was a Thursday
+    minute = (us_of_day // _US_PER_MINUTE).astype(np.int16)
+    hour = (minute // 60).astype(np.int8)
+    session = _classify(us_of_day, _SESSION_WINDOWS)
+    kill_zone = _classify(us_of_day, _KILL_ZONE_WINDOWS)
+    day_of_week = day_of_week.astype(np.int8)
+    if nat.any():
+        for column in (minute, hour, session, kill_zone, day_of_week):
+            column[nat] = -1
+    for column in (minute, hour, session, kill_zone, day_of_week):
+        column.flags.writeable = False
+    return CalendarFeatures(hour, minute, day_of_week, session, kill_zone)
+
+
+_CALENDAR_CACHE: "OrderedDict[tuple, Tuple[np.ndarray, CalendarFeatures]]" = OrderedDict()
+_CALENDAR_LOCK = Lock()
+
+
+def calendar_features(timestamps) -> CalendarFeatures:
+    """
+    Cached compute_calendar_features: keyed on the timestamp values, so every
+    consumer of the same frame (and re-fetched frames with the same candles)
+    shares one computation. Arrays are read-only.
+    """
+    idx = pd.DatetimeIndex(timestamps)
+    values = idx.as_unit("us").asi8
+    key = (str(idx.tz), len(values), hash(values.tobytes()))
+    with _CALENDAR_LOCK:
+        hit = _CALENDAR_CACHE.get(key)
+        if hit is not None and np.array_equal(hit[0], values):
+            _CALENDAR_CACHE.move_to_end(key)
+            return hit[1]
+    features = compute_calendar_features(idx)
+    with _CALENDAR_LOCK:
+        _CALENDAR_CACHE[key] = (values.copy(), features)
+        while len(_CALENDAR_CACHE) > _CALENDAR_CACHE_SIZE:
+            _CALENDAR_CACHE.popitem(last=False)
+    return features
+
+
+def frame_calendar(df: pd.DataFrame) -> CalendarFeatures:
+    """Calendar features of an OHLCV frame: its DatetimeIndex, else its timestamp column."""
+    if isinstance(df.index, pd.DatetimeIndex):
+        return calendar_features(df.index)
+    return calendar_features(df["timestamp"])
@@ -31,6 +31,8 @@ from enum import Enum
 import pandas as pd
 import logging
 
+from backend.strategy.smc.bos_choch import _strict_pivots
+
 logger = logging.getLogger(__name__)
 
 
@@ -376,31 +378,11 @@ def _find_swing_lows(df: pd.DataFrame, lookback: int = 3) -> List[Dict]:
     Returns:
         List of dicts with price, index, bars_ago
     """
-    swing_lows = []
-
-    for i in range(lookback, len(df) - lookback):
-        current_low = df["low"].iloc[i]
-
-        # Check if lower than all bars on left
-        is_swing = True
-        for j in range(i - lookback, i):
-            if df["low"].iloc[j] <= current_low:
-                is_swing = False
-                break
-
-        # Check if lower than all bars on right
-        if is_swing:
-            for j in range(i + 1, i + lookback + 1):
-                if df["low"].iloc[j] <= current_low:
-                    is_swing = False
-                    break
-
-        if is_swing:
-            swing_lows.append(
-                {"price": float(current_low), "index": i, "bars_ago": len(df) - 1 - i}
-            )
-
-    return swing_lows
+    lows = df["low"].to_numpy()
+    return [
+        {"price": float(lows[i]), "index": int(i), "bars_ago": len(df) - 1 - int(i)}
+        for i in _strict_pivots(lows, lookback, higher=False)
+    ]
 
 
 def _determine_translation(
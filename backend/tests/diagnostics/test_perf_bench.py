@@ -0,0 +1,107 @@
+"""
+Tests for backend.diagnostics.perf_bench.
+
+The timing numbers themselves are machine-specific and never asserted.
+These tests cover the parts that decide pass/fail:
+
+  - compare_results regression rule (global + per-bench thresholds)
+  - benches missing on one side are reported, never flagged
+  - the synthetic fixture is deterministic and well-formed
+  - run_benches produces the result shape capture/verify rely on
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from backend.diagnostics.perf_bench import (
+    Bench,
+    FixtureAdapter,
+    compare_results,
+    load_fixture,
+    run_benches,
+)
+
+
+def _res(ms: float) -> dict:
+    return {"median_ms": ms, "min_ms": ms, "max_ms": ms, "rounds": 1}
+
+
+def test_compare_flags_regression_over_threshold():
+    rows = compare_results({"a": _res(100.0)}, {"a": _res(130.0)}, threshold_pct=25.0)
+    assert rows == [{
+        "name": "a", "baseline_ms": 100.0, "current_ms": 130.0,
+        "delta_pct": 30.0, "threshold_pct": 25.0, "regressed": True,
+    }]
+
+
+def test_compare_within_threshold_and_speedup_pass():
+    rows = compare_results(
+        {"slow": _res(100.0), "fast": _res(100.0)},
+        {"slow": _res(120.0), "fast": _res(40.0)},
+        threshold_pct=25.0,
+    )
+    assert [r["regressed"] for r in rows] == [False, False]
+
+
+def test_compare_per_bench_threshold_overrides_global():
+    rows = compare_results(
+        {"noisy": _res(10.0), "tight": _res(10.0)},
+        {"noisy": _res(14.0), "tight": _res(11.5)},
+        threshold_pct=25.0,
+        per_bench={"noisy": 50.0, "tight": 10.0},
+    )
+    by_name = {r["name"]: r for r in rows}
+    assert by_name["noisy"]["regressed"] is False
+    assert by_name["tight"]["regressed"] is True
+
+
+def test_compare_added_and_removed_benches_never_regress():
+    rows = compare_results({"gone": _res(5.0)}, {"new": _res(5.0)})
+    assert {r["name"]: (r["baseline_ms"], r["current_ms"], r["regressed"]) for r in rows} == {
+        "gone": (5.0, None, False),
+        "new": (None, 5.0, False),
+    }
+
+
+def test_synthetic_fixture_deterministic():
+    fid_a, fx_a = load_fixture(n_symbols=2, bars=60)
+    fid_b, fx_b = load_fixture(n_symbols=2, bars=60)
+    assert fid_a == fid_b
+    assert list(fx_a) == list(fx_b)
+    for sym in fx_a:
+        for tf, df in fx_a[sym].timeframes.items():
+            pd.testing.assert_frame_equal(df, fx_b[sym].timeframes[tf])
+            assert len(df) == 60
+            assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+            assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+            assert df.index.is_monotonic_increasing
+
+
+def test_fixture_adapter_serves_tail():
+    _, fx = load_fixture(n_symbols=1, bars=60)
+    adapter = FixtureAdapter(fx)
+    sym = next(iter(fx))
+    assert adapter.get_top_symbols(5) == [sym]
+    assert len(adapter.fetch_ohlcv(sym, "1H", limit=25)) == 25
+    assert adapter.fetch_ohlcv("NOPE/USDT", "1h").empty
+
+
+def test_run_benches_shape_and_setup_excluded_from_rounds():
+    calls = {"setup": 0, "fn": 0}
+
+    def _setup():
+        calls["setup"] += 1
+
+    def _fn():
+        calls["fn"] += 1
+
+    out = run_benches(
+        [Bench("x.fn", _fn, setup=_setup, rounds=3, warmup=1), Bench("y.skip", _fn)],
+        name_filter="x.",
+    )
+    assert list(out) == ["x.fn"]
+    assert out["x.fn"]["rounds"] == 3
+    assert out["x.fn"]["min_ms"] <= out["x.fn"]["median_ms"] <= out["x.fn"]["max_ms"]
+    # warmup + timed rounds, setup before each
+    assert calls == {"setup": 4, "fn": 4}
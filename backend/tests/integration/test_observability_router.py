@@ -35,7 +35,7 @@ from backend.analysis.pair_selection import (
     select_symbols,
 )
 from backend.diagnostics import status_cache
-from backend.engine import cycle_heartbeat
+from backend.engine import cycle_heartbeat, stage_profiler
 from backend.routers.observability import router as observability_router
 from backend.shared.models.envelope import Envelope, ResponseMetadata
 from backend.shared.models.observability import (
@@ -43,6 +43,7 @@ from backend.shared.models.observability import (
     ConfluenceDistribution,
     CycleHeartbeat,
     SignalTrace,
+    StageLatencyReport,
     Universe,
 )
 from backend.shared.models.scoring import ConfluenceBreakdown, ConfluenceFactor
@@ -122,11 +123,13 @@ def fake_service(monkeypatch):
 def _reset_state():
     confluence_cache.clear()
     cycle_heartbeat.clear()
+    stage_profiler.clear()
     clear_universe_snapshot()
     status_cache.clear()
     yield
     confluence_cache.clear()
     cycle_heartbeat.clear()
+    stage_profiler.clear()
     clear_universe_snapshot()
     status_cache.clear()
 
@@ -537,6 +540,44 @@ def test_concurrent_reads_during_writes_no_torn_state(client, fake_service):
     assert write_count[0] > 0, "writer never ran"
 
 
+# ===========================================================================
+# /api/cycles/stage-latency
+# ===========================================================================
+
+
+def test_stage_latency_cold_start_returns_empty(client):
+    r = client.get("/api/cycles/stage-latency")
+    assert r.status_code == 200
+    body = r.json()
+    _assert_envelope_shape(body)
+    report = StageLatencyReport.model_validate(body["data"])
+    assert report.symbols_recorded == 0
+    assert report.by_mode == {}
+    assert report.last_run is None
+
+
+def test_stage_latency_reports_per_mode_percentiles(client):
+    stage_profiler.record("stealth", {"total": 40.0, "smc": 25.0, "smc.fvgs": 5.0}, run_id="r1")
+    stage_profiler.record("surgical", {"total": 10.0, "smc": 4.0}, run_id="r2")
+    r = client.get("/api/cycles/stage-latency", params={"mode": "stealth"})
+    body = r.json()
+    _assert_envelope_shape(body)
+    report = StageLatencyReport.model_validate(body["data"])
+    assert set(report.by_mode) == {"stealth"}
+    stages = {s.stage: s for s in report.by_mode["stealth"]}
+    assert set(stages) == {"total", "smc", "smc.fvgs"}
+    assert stages["smc"].p95_ms == 25.0
+    assert report.last_run["run_id"] == "r2"
+
+
+def test_stage_latency_flame_is_collapsed_text(client):
+    stage_profiler.record("stealth", {"total": 40.0, "smc": 25.0, "smc.fvgs": 5.0})
+    r = client.get("/api/cycles/stage-latency/flame", params={"mode": "stealth"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "symbol;smc;fvgs 5000" in r.text.splitlines()
+
+
 # ===========================================================================
 # OpenAPI — every endpoint registered, every response_model present
 # ===========================================================================
@@ -552,6 +593,7 @@ def test_openapi_renders_all_observability_endpoints(client):
         "/api/scanner/universe",
         "/api/cycles/last",
         "/api/cycles/history",
+        "/api/cycles/stage-latency",
     }
     missing = expected - set(paths.keys())
     assert not missing, f"missing from OpenAPI: {missing}"
@@ -0,0 +1,131 @@
+"""
+Tests for the async exchange layer (backend.data.adapters.async_exchange)
+as used by IngestionPipeline.
+
+parallel_fetch with an async adapter must run every symbol as a task on
+the shared exchange-io loop (no worker threads), give the same frames as
+the threaded path, fall back to the sync adapter when the async fetch
+fails, and be awaitable from another event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data.adapters import async_exchange
+from backend.data.adapters.async_exchange import async_adapter_for, run_sync
+from backend.data.ingestion_pipeline import IngestionPipeline
+
+SYMBOLS = [f"C{i}/USDT" for i in range(40)]
+TIMEFRAMES = ["1h", "4h"]
+
+
+def _frame(symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+    step = pd.Timedelta(timeframe)
+    end = pd.Timestamp(time.time(), unit="s").floor(step)
+    idx = pd.date_range(end=end, periods=limit, freq=step)
+    seed = sum(map(ord, symbol + timeframe))
+    close = 50 + np.cumsum(np.random.default_rng(seed).normal(0, 0.5, limit))
+    return pd.DataFrame(
+        {
+            "timestamp": idx,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+
+
+class _SyncAdapter:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, limit=500, since=None):
+        self.calls.append((symbol, timeframe))
+        return _frame(symbol, timeframe, limit)
+
+
+class _FakeAsyncAdapter:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.threads = set()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit=500, since=None):
+        self.threads.add(threading.current_thread().name)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            if symbol in self.failing:
+                raise RuntimeError("boom")
+            return _frame(symbol, timeframe, limit)
+        finally:
+            self.in_flight -= 1
+
+
+def _pipeline(async_adapter):
+    return IngestionPipeline(_SyncAdapter(), use_cache=False, async_adapter=async_adapter)
+
+
+def test_async_parallel_fetch_matches_threaded_path():
+    fake = _FakeAsyncAdapter()
+    got = _pipeline(fake).parallel_fetch(SYMBOLS, TIMEFRAMES, limit=50)
+    want = IngestionPipeline(_SyncAdapter(), use_cache=False).parallel_fetch(
+        SYMBOLS[:8], TIMEFRAMES, limit=50, max_workers=8
+    )
+    assert list(got) == SYMBOLS
+    for symbol in want:
+        for tf in TIMEFRAMES:
+            pd.testing.assert_frame_equal(got[symbol].timeframes[tf], want[symbol].timeframes[tf])
+    assert fake.threads == {"exchange-io"}
+    assert fake.peak >= len(SYMBOLS) // 2  # symbols overlap on one loop
+
+
+def test_async_failure_falls_back_to_sync_adapter():
+    fake = _FakeAsyncAdapter(failing={"C3/USDT"})
+    pipe = _pipeline(fake)
+    got = pipe.parallel_fetch(SYMBOLS[:6], TIMEFRAMES, limit=50)
+    assert set(got) == set(SYMBOLS[:6])
+    assert sorted(pipe.adapter.calls) == [("C3/USDT", "1h"), ("C3/USDT", "4h")]
+
+
+def test_parallel_fetch_async_from_another_loop():
+    pipe = _pipeline(_FakeAsyncAdapter())
+    got = asyncio.run(pipe.parallel_fetch_async(SYMBOLS[:5], TIMEFRAMES, limit=50))
+    assert list(got) == SYMBOLS[:5]
+
+
+def test_run_sync_refuses_io_loop():
+    async def nested():
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            run_sync(coro)
+        return True
+
+    assert run_sync(nested()) is True
+
+
+def test_async_adapter_for_sync_adapters():
+    class _Exchange:
+        id = "phemex"
+        isSandboxModeEnabled = True
+        options = {"defaultType": "swap"}
+
+    class _Adapter:
+        exchange = _Exchange()
+
+    adapter = async_adapter_for(_Adapter())
+    assert adapter.exchange_id == "phemex" and adapter.testnet and adapter.default_type == "swap"
+    assert async_adapter_for(_Adapter()) is adapter
+    assert async_adapter_for(object()) is None
+    async_exchange._ADAPTERS.clear()
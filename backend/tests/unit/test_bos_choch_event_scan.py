@@ -0,0 +1,67 @@
+"""
+detect_structural_breaks jumps between candidate candles (first close beyond
+a swing ref per swing segment) instead of running the body on every candle,
+and finds pivots with a sliding window. Both must reproduce the per-candle
+scan exactly: same breaks, levels, grades and HTF flags in every mode.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.strategy.smc import bos_choch
+from backend.strategy.smc.bos_choch import (
+    _detect_swing_highs,
+    _detect_swing_lows,
+    detect_structural_breaks,
+)
+
+
+def _frame(seed: int, n: int = 800, freq: str = "1h", ticks: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    if ticks:
+        close = np.round(close)  # equal highs/lows
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(close * (1 + np.abs(rng.normal(0, 0.004, n))), open_)
+    low = np.minimum(close * (1 - np.abs(rng.normal(0, 0.004, n))), open_)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": rng.lognormal(0, 0.6, n)},
+        index=pd.date_range("2025-01-01", periods=n, freq=freq),
+    )
+
+
+def _brute_pivots(values: np.ndarray, lookback: int, higher: bool) -> list:
+    out = []
+    for i in range(lookback, len(values) - lookback):
+        neighbours = np.r_[values[i - lookback : i], values[i + 1 : i + lookback + 1]]
+        beaten = neighbours >= values[i] if higher else neighbours <= values[i]
+        if not beaten.any():
+            out.append(i)
+    return out
+
+
+@pytest.mark.parametrize("mode", [None, "macro_surveillance", "stealth_balanced", "precision"])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_event_scan_matches_per_candle_scan(monkeypatch, mode, seed):
+    df = _frame(seed, freq=["1h", "15min", "4h"][seed % 3], ticks=seed == 3)
+    kwargs = dict(mode_profile=mode, htf_trend=[None, "bullish", "bearish"][seed % 3])
+
+    fast = detect_structural_breaks(df, **kwargs)
+    monkeypatch.setattr(bos_choch, "_EVENT_SCAN", False)
+    slow = detect_structural_breaks(df, **kwargs)
+
+    assert fast == slow
+    assert slow or mode in ("macro_surveillance", "stealth_balanced")
+
+
+def test_pivots_match_neighbour_rule():
+    df = _frame(5, n=300, ticks=True)
+    df.iloc[40, df.columns.get_loc("high")] = np.nan
+    for lookback in (1, 3, 7):
+        highs = _detect_swing_highs(df, lookback)
+        lows = _detect_swing_lows(df, lookback)
+        assert list(highs.index) == list(df.index[_brute_pivots(df["high"].to_numpy(), lookback, True)])
+        assert list(lows.index) == list(df.index[_brute_pivots(df["low"].to_numpy(), lookback, False)])
+        np.testing.assert_array_equal(highs.to_numpy(), df.loc[highs.index, "high"].to_numpy())
+    assert _detect_swing_highs(df.iloc[:5], 3).empty
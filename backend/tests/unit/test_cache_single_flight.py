@@ -0,0 +1,244 @@
+"""
+Tests for CacheNamespace.get_or_compute single-flight / stale-while-revalidate.
+
+Context: /api/market/regime, /api/market/cycles and friends run a 500-bar
+daily fetch plus detection on every cache miss. On dashboard load several
+tabs miss together and each ran the full computation. get_or_compute
+must:
+
+  - run `compute` once for N concurrent misses on the same key
+  - propagate a compute exception to every waiter and cache nothing
+  - serve a stale value inside stale_ttl while ONE background refresh runs
+  - refresh ahead of expiry without blocking the caller
+  - skip caching values rejected by `cacheable`
+
+The api_server ThreadSafeCache facade over a namespace must also keep its
+own entries to max_size, evicting its least recently used key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.shared.cache.cache_manager import CacheManager, CacheNamespace, SingleFlight
+
+
+def _slow_counter(delay: float = 0.1, value="v"):
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def compute():
+        with lock:
+            calls["n"] += 1
+        time.sleep(delay)
+        return value
+
+    return compute, calls
+
+
+def _age_entry(ns: CacheNamespace, key: str, seconds: float) -> None:
+    with ns._lock:
+        ns._cache[key]["_cached_at"] -= seconds
+
+
+def _wait_until(pred, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if pred():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_concurrent_misses_share_one_computation():
+    ns = CacheNamespace("t", default_ttl=60)
+    compute, calls = _slow_counter()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ns.get_or_compute("k", compute)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert results == ["v"] * 8
+    stats = ns.get_stats()
+    assert stats.coalesced == 7
+    # Cached afterwards: no further compute
+    assert ns.get_or_compute("k", compute) == "v"
+    assert calls["n"] == 1
+
+
+def test_different_keys_do_not_coalesce():
+    ns = CacheNamespace("t", default_ttl=60)
+    compute, calls = _slow_counter(delay=0.05)
+    threads = [
+        threading.Thread(target=ns.get_or_compute, args=(f"k{i}", compute)) for i in range(3)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls["n"] == 3
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    ns = CacheNamespace("t", default_ttl=60)
+
+    def boom():
+        time.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            ns.get_or_compute("k", boom)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == ["upstream down"] * 4
+    assert ns.get("k") is None
+    # Next call retries instead of replaying the failure
+    assert ns.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_cacheable_filter_skips_error_payloads():
+    ns = CacheNamespace("t", default_ttl=60)
+    compute, calls = _slow_counter(delay=0, value={"error": "insufficient data"})
+    cacheable = lambda v: "error" not in v  # noqa: E731
+
+    assert ns.get_or_compute("k", compute, cacheable=cacheable) == {"error": "insufficient data"}
+    ns.get_or_compute("k", compute, cacheable=cacheable)
+    assert calls["n"] == 2
+
+
+def test_none_is_not_cached_by_default():
+    ns = CacheNamespace("t", default_ttl=60)
+    compute, calls = _slow_counter(delay=0, value=None)
+    assert ns.get_or_compute("k", compute) is None
+    assert ns.get_or_compute("k", compute) is None
+    assert calls["n"] == 2
+
+
+def test_stale_value_served_while_background_refresh_runs():
+    ns = CacheNamespace("t", default_ttl=10)
+    ns.set("k", "old")
+    _age_entry(ns, "k", 15)  # past ttl, inside stale window
+
+    compute, calls = _slow_counter(delay=0.1, value="new")
+    t0 = time.perf_counter()
+    assert ns.get_or_compute("k", compute, stale_ttl=30) == "old"
+    assert time.perf_counter() - t0 < 0.05  # did not wait for the refresh
+    # A second stale read while the refresh is in flight does not start another
+    assert ns.get_or_compute("k", compute, stale_ttl=30) == "old"
+
+    assert _wait_until(lambda: ns.get("k") == "new")
+    assert calls["n"] == 1
+    stats = ns.get_stats()
+    assert stats.stale_hits == 2
+    assert stats.refreshes == 1
+
+
+def test_past_stale_window_is_a_blocking_miss():
+    ns = CacheNamespace("t", default_ttl=10)
+    ns.set("k", "old")
+    _age_entry(ns, "k", 100)
+    assert ns.get_or_compute("k", lambda: "new", stale_ttl=30) == "new"
+
+
+def test_refresh_ahead_returns_current_value_and_refreshes():
+    ns = CacheNamespace("t", default_ttl=10)
+    ns.set("k", "current")
+    _age_entry(ns, "k", 8)  # 2 s before expiry, inside the 5 s refresh window
+
+    compute, calls = _slow_counter(delay=0.02, value="refreshed")
+    assert ns.get_or_compute("k", compute, refresh_ahead=5) == "current"
+    assert _wait_until(lambda: ns.get("k") == "refreshed")
+    assert calls["n"] == 1
+
+
+def test_fresh_entry_outside_refresh_window_does_not_refresh():
+    ns = CacheNamespace("t", default_ttl=10)
+    ns.set("k", "current")
+    compute, calls = _slow_counter(delay=0)
+    assert ns.get_or_compute("k", compute, refresh_ahead=5) == "current"
+    time.sleep(0.05)
+    assert calls["n"] == 0
+
+
+def test_failed_background_refresh_keeps_stale_value():
+    ns = CacheNamespace("t", default_ttl=10)
+    ns.set("k", "old")
+    _age_entry(ns, "k", 15)
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    assert ns.get_or_compute("k", boom, stale_ttl=30) == "old"
+    assert _wait_until(lambda: ns.get_stats().refresh_errors == 1)
+    assert ns.get_or_compute("k", lambda: "unused", stale_ttl=30) == "old"
+
+
+def test_async_concurrent_misses_share_one_computation():
+    ns = CacheNamespace("t", default_ttl=60)
+    compute, calls = _slow_counter(delay=0.1)
+
+    async def main():
+        return await asyncio.gather(*[ns.get_or_compute_async("k", compute) for _ in range(6)])
+
+    assert asyncio.run(main()) == ["v"] * 6
+    assert calls["n"] == 1
+    assert ns.get_stats().coalesced == 5
+
+
+def test_async_exception_propagates():
+    ns = CacheNamespace("t", default_ttl=60)
+
+    def boom():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError, match="bad"):
+        asyncio.run(ns.get_or_compute_async("k", boom))
+    assert ns.get("k") is None
+
+
+def test_single_flight_forgets_completed_calls():
+    sf = SingleFlight()
+    assert sf.do("k", lambda: 1) == (1, False)
+    assert not sf.in_flight("k")
+    assert sf.do("k", lambda: 2) == (2, False)
+
+
+def test_thread_safe_cache_evicts_least_recently_used_past_max_size(monkeypatch):
+    import backend.api_server as api
+
+    monkeypatch.setattr(api, "get_cache_manager", CacheManager)
+    cache = api.ThreadSafeCache(max_size=2, ttl=60, namespace="regime")
+    cache._ns.set("other", "kept")  # another user of the shared namespace
+
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a")["v"] == 1
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a")["v"] == 1 and cache.get("c")["v"] == 3
+
+    assert asyncio.run(cache.get_or_compute("d", lambda: {"v": 4}))["v"] == 4
+    assert cache.get("a") is None
+    asyncio.run(cache.get_or_compute("e", lambda: {"error": "down"}))  # not cached, evicts nothing
+    assert cache.get("c")["v"] == 3 and cache.get("d")["v"] == 4
+    assert cache._ns.get("other") == "kept"
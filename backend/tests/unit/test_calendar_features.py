@@ -0,0 +1,68 @@
+"""
+Vectorized calendar features (strategy/smc/sessions.py) must agree with the
+scalar get_current_session / get_current_kill_zone year-round, including
+across both DST switches and at window boundaries, and must be cached per
+set of timestamps.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend.strategy.smc.sessions import (
+    KillZone,
+    TradingSession,
+    _to_eastern,
+    calendar_features,
+    compute_calendar_features,
+    filter_candles_in_kill_zone,
+    frame_calendar,
+    get_current_kill_zone,
+    get_current_session,
+)
+
+
+def test_matches_scalar_lookups_across_dst():
+    # US DST 2026: spring-forward Mar 8, fall-back Nov 1
+    idx = pd.date_range("2026-03-01", "2026-11-10", freq="37min")
+    features = compute_calendar_features(idx)
+    for i, ts in enumerate(idx):
+        dt = ts.to_pydatetime()
+        eastern = _to_eastern(dt)
+        assert features.session_at(i) == get_current_session(dt)
+        assert features.kill_zone_at(i) == get_current_kill_zone(dt)
+        assert (features.eastern_hour[i], features.day_of_week[i]) == (eastern.hour, eastern.weekday())
+
+
+def test_window_bounds_are_inclusive_to_the_microsecond():
+    # NY open 07:00-10:00 Eastern = 11:00-14:00 UTC in July
+    stamps = [datetime(2026, 7, 1, 14, 0), datetime(2026, 7, 1, 14, 0, 0, 1), datetime(2026, 7, 1, 11, 0)]
+    features = calendar_features(pd.DatetimeIndex(stamps))
+    assert [features.kill_zone_at(i) for i in range(3)] == [KillZone.NEW_YORK_OPEN, None, KillZone.NEW_YORK_OPEN]
+    assert features.session_at(0) == get_current_session(stamps[0]) == TradingSession.LONDON
+
+
+def test_tz_aware_input_and_nat():
+    naive = pd.date_range("2026-01-05", periods=96, freq="15min")
+    tokyo = naive.tz_localize("UTC").tz_convert("Asia/Tokyo")
+    np.testing.assert_array_equal(calendar_features(tokyo).kill_zone, calendar_features(naive).kill_zone)
+
+    features = compute_calendar_features(pd.DatetimeIndex([pd.NaT, datetime(2026, 1, 5, tzinfo=timezone.utc)]))
+    assert features.session[0] == features.kill_zone[0] == features.eastern_hour[0] == -1
+    assert features.day_of_week[1] == 6  # Sunday evening in New York
+
+
+def test_cached_per_timestamps_and_frame_filter():
+    idx = pd.date_range("2026-07-01", periods=500, freq="5min")
+    df = pd.DataFrame({"timestamp": idx, "close": 1.0}, index=idx)
+    features = frame_calendar(df)
+    assert frame_calendar(df.reset_index(drop=True)) is features
+    assert calendar_features(idx.copy()) is features
+    assert not features.session.flags.writeable
+
+    in_zone = filter_candles_in_kill_zone(df, KillZone.LONDON_OPEN)
+    assert len(in_zone) and all(
+        get_current_kill_zone(ts.to_pydatetime()) == KillZone.LONDON_OPEN for ts in in_zone.index
+    )
+    assert len(in_zone) == features.kill_zone_mask(KillZone.LONDON_OPEN).sum()
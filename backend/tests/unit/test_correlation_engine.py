@@ -0,0 +1,163 @@
+"""
+Tests for backend.risk.correlation_engine and its RiskManager wiring.
+
+  - EWMA engine == a bar-by-bar reference recursion, whether bars arrive
+    in one update or scan by scan
+  - a symbol seen for the first time is back-filled from history
+  - pairs with too little joint history publish no correlation
+  - RiskManager serves get_correlation / get_correlated_symbols from the
+    matrix and validate_new_trade counts correlated positions
+  - vectorized update_correlation_matrix == pairwise np.corrcoef
+  - scan worker processes receive the parent's matrix through worker_args
+"""
+
+from __future__ import annotations
+
+import pickle
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.risk.correlation_engine import EwmaCorrelationEngine, closes_from_universe
+from backend.risk.risk_manager import RiskManager
+
+_INDEX = pd.date_range("2026-01-01", periods=300, freq="1h", tz="UTC")
+
+
+def _universe_closes(seed=0, n=4, bars=300):
+    """Closes driven by one common factor so pairs are genuinely correlated."""
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, bars)
+    out = {}
+    for k in range(n):
+        beta = 1.0 - 0.25 * k
+        rets = beta * common + rng.normal(0, 0.004 + 0.003 * k, bars)
+        out[f"S{k}/USDT"] = pd.Series(100 * np.exp(np.cumsum(rets)), index=_INDEX[:bars])
+    return out
+
+
+def _reference_corr(closes, decay):
+    """Bar-by-bar zero-mean EWMA recursion, fully observed data."""
+    frame = pd.DataFrame(closes)
+    R = np.diff(np.log(frame.to_numpy()), axis=0)
+    S = np.zeros((R.shape[1], R.shape[1]))
+    W = 0.0
+    for r in R:
+        S = decay * S + (1 - decay) * np.outer(r, r)
+        W = decay * W + (1 - decay)
+    cov = S / W
+    sd = np.sqrt(np.diag(cov))
+    return cov / np.outer(sd, sd)
+
+
+def test_single_update_matches_reference():
+    closes = _universe_closes()
+    engine = EwmaCorrelationEngine(decay=0.95)
+    index, corr = engine.update(closes)
+    order = [index[s] for s in closes]
+    np.testing.assert_allclose(corr[np.ix_(order, order)], _reference_corr(closes, 0.95), atol=1e-10)
+
+
+def test_scan_by_scan_updates_match_one_shot():
+    closes = _universe_closes(seed=1)
+    one_shot = EwmaCorrelationEngine(decay=0.97, max_history=1000)
+    expected = one_shot.update(closes)[1]
+
+    engine = EwmaCorrelationEngine(decay=0.97, max_history=1000)
+    for end in (120, 121, 180, 250, 300):  # overlapping windows, like successive scans
+        engine.update({s: c.iloc[:end] for s, c in closes.items()})
+    np.testing.assert_allclose(engine.snapshot()[1], expected, atol=1e-10)
+
+
+def test_new_symbol_is_backfilled():
+    closes = _universe_closes(seed=2)
+    late = "S3/USDT"
+    engine = EwmaCorrelationEngine(decay=0.97, max_history=1000)
+    engine.update({s: c.iloc[:200] for s, c in closes.items() if s != late})
+    engine.update(closes)
+    ref = EwmaCorrelationEngine(decay=0.97, max_history=1000).update(closes)[1]
+    np.testing.assert_allclose(engine.snapshot()[1], ref, atol=1e-10)
+
+
+def test_short_joint_history_is_unpublished():
+    closes = _universe_closes(seed=3, n=2)
+    closes["S1/USDT"] = closes["S1/USDT"].iloc[-10:]  # only 9 joint returns
+    engine = EwmaCorrelationEngine(min_obs=30)
+    engine.update(closes)
+    assert engine.correlation("S0/USDT", "S1/USDT") is None
+    assert engine.correlation("S0/USDT", "S0/USDT") == 1.0
+    assert engine.correlation("S0/USDT", "NOPE/USDT") is None
+
+
+def test_closes_from_universe_reads_timestamp_column():
+    df = pd.DataFrame({"timestamp": _INDEX[:5], "close": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    universe = {
+        "A/USDT": SimpleNamespace(timeframes={"1h": df}),
+        "B/USDT": SimpleNamespace(timeframes={"4h": df}),
+    }
+    out = closes_from_universe(universe, "1h")
+    assert list(out) == ["A/USDT"]
+    assert out["A/USDT"].index.equals(_INDEX[:5])
+
+
+def _universe(seed):
+    return {
+        s: SimpleNamespace(timeframes={"1h": pd.DataFrame({"timestamp": c.index, "close": c.to_numpy()})})
+        for s, c in _universe_closes(seed=seed).items()
+    }
+
+
+def test_risk_manager_uses_engine_correlations():
+    universe = _universe(4)
+    rm = RiskManager(account_balance=10_000, max_correlated_exposure_pct=30.0, max_asset_exposure_pct=50.0)
+    rm.update_correlations_from_universe(universe)
+
+    corr = rm.get_correlation("S0/USDT", "S1/USDT")
+    assert corr is not None and corr > rm.correlation_threshold
+    peers = rm.get_correlated_symbols("S0/USDT")
+    assert peers and peers[0][0] == "S1/USDT"
+    assert [abs(c) for _, c in peers] == sorted((abs(c) for _, c in peers), reverse=True)
+
+    rm.add_position("S1/USDT", "LONG", quantity=20, entry_price=100.0)  # $2000
+    check = rm.validate_new_trade("S0/USDT", "LONG", position_value=1500, risk_amount=50)
+    assert not check.passed and check.limits_hit == ["correlated_exposure"]
+    assert rm.get_risk_summary()["correlation_matrix_loaded"] is True
+
+
+def test_update_correlation_matrix_matches_pairwise_corrcoef():
+    rng = np.random.default_rng(5)
+    price_data = {f"P{k}": 100 + np.cumsum(rng.normal(0, 1, 60)) for k in range(4)}
+    price_data["FLAT"] = np.full(60, 50.0)
+    rm = RiskManager(account_balance=10_000)
+    rm.update_correlation_matrix(price_data)
+    for a, pa in price_data.items():
+        for b, pb in price_data.items():
+            ra, rb = np.diff(pa) / pa[:-1], np.diff(pb) / pb[:-1]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                expected = 1.0 if a == b else np.nan_to_num(np.corrcoef(ra, rb)[0, 1])
+            assert rm.get_correlation(a, b) == pytest.approx(expected, abs=1e-12)
+    assert rm.correlation_matrix["P0"]["P0"] == 1.0
+
+
+def test_scan_worker_installs_parent_correlations():
+    import backend.engine.orchestrator as orch_mod
+
+    parent = RiskManager(account_balance=10_000)
+    parent.update_correlations_from_universe(_universe(6))
+    snapshot = pickle.loads(pickle.dumps(parent.correlation_snapshot()))  # crosses the pool
+    worker = MagicMock()
+    worker._process_symbol.return_value = (None, None)
+    worker.risk_manager = RiskManager(account_balance=10_000)
+    config = object()
+    args = ("S0/USDT", "run", pd.Timestamp("2026-01-01"), None, config, None, None, None, 0.0, 0.0, None)
+
+    with patch.object(orch_mod, "_WORKER_ORCHESTRATOR", worker), \
+            patch.object(orch_mod, "_WORKER_CONFIG_ID", id(config)):
+        orch_mod._parallel_process_symbol_worker(args)
+        assert worker.risk_manager.get_correlation("S0/USDT", "S1/USDT") is None
+        orch_mod._parallel_process_symbol_worker(args + (snapshot,))
+    assert worker.risk_manager.get_correlation("S0/USDT", "S1/USDT") == parent.get_correlation("S0/USDT", "S1/USDT")
+    assert worker.risk_manager.get_correlated_symbols("S0/USDT") == parent.get_correlated_symbols("S0/USDT")
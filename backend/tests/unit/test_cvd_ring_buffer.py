@@ -0,0 +1,181 @@
+"""
+Tests for the columnar CvdTracker buffers and the concurrent CVD poller.
+
+  - ring-buffer tracker == the original deque/rescan implementation on
+    random multi-poll streams (duplicates, gaps, eviction, compaction)
+  - the z baseline's running sums match statistics.mean / pstdev
+  - _poll_cvd_trades runs fetches off the event loop, concurrently,
+    and a failing symbol does not stop the others
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.bot.cvd.cvd_tracker import CvdTracker, _RollingStats
+
+MIN = 60 * 1000
+HOUR = 60 * MIN
+
+
+class _DequeTracker:
+    """The pre-ring implementation, kept verbatim as the parity reference."""
+
+    def __init__(self, long_window_ms=60 * MIN, z_history=120):
+        self.long_window_ms = long_window_ms
+        self._trades = defaultdict(deque)
+        self._last_ts = {}
+        self._last_gap_ts = {}
+        self._z_hist = defaultdict(lambda: deque(maxlen=z_history))
+
+    def ingest(self, symbol, trades):
+        if not trades:
+            return
+        dq = self._trades[symbol]
+        last = self._last_ts.get(symbol)
+        if last is not None and trades[0][0] > last:
+            self._last_gap_ts[symbol] = trades[-1][0]
+        for ts, sv, px in trades:
+            if last is not None and ts <= last:
+                continue
+            dq.append((ts, sv, px))
+        self._last_ts[symbol] = max(self._last_ts.get(symbol, 0), trades[-1][0])
+        now = self._last_ts[symbol]
+        while dq and dq[0][0] < now - self.long_window_ms:
+            dq.popleft()
+        self._z_hist[symbol].append(sum(sv for ts, sv, _ in dq if ts >= now - self.long_window_ms))
+
+    def snapshot_features(self, symbol, direction, now_ms):
+        dir_sign = 1.0 if direction == "LONG" else -1.0
+        zeros = {"cvd_slope_1h": 0.0, "cvd_divergence": 0.0, "cvd_z": 0.0,
+                 "cvd_coverage": 0.0, "cvd_n_trades": 0.0}
+        dq = self._trades.get(symbol)
+        long_cut = now_ms - self.long_window_ms
+        win = [t for t in (dq or ()) if t[0] >= long_cut]
+        if not win:
+            return zeros
+        net = sum(sv for _, sv, _ in win)
+        tot = sum(abs(sv) for _, sv, _ in win)
+        price_ret = (win[-1][2] - win[0][2]) / win[0][2] if win[0][2] > 0 else 0.0
+        cvd_dir = (net > 0) - (net < 0)
+        px_dir = (price_ret > 0) - (price_ret < 0)
+        divergence = float(cvd_dir) * dir_sign if cvd_dir and px_dir and cvd_dir != px_dir else 0.0
+        hist = self._z_hist.get(symbol)
+        z = 0.0
+        if hist and len(hist) >= 10:
+            sd = statistics.pstdev(hist)
+            z = (net - statistics.mean(hist)) / sd if sd > 0 else 0.0
+        coverage = max(0.0, min(1.0, (now_ms - win[0][0]) / self.long_window_ms))
+        gap = self._last_gap_ts.get(symbol)
+        if gap is not None and gap >= long_cut:
+            coverage = 0.0
+        return {"cvd_slope_1h": (net / tot if tot > 0 else 0.0) * dir_sign, "cvd_divergence": divergence,
+                "cvd_z": z * dir_sign, "cvd_coverage": coverage, "cvd_n_trades": float(len(win))}
+
+
+def _polls(seed, n_polls=150):
+    """Overlapping recent-N polls over a random trade tape, with occasional missed polls (gaps)."""
+    rng = np.random.default_rng(seed)
+    tape_ts = np.cumsum(rng.integers(1, 4_000, size=n_polls * 60))
+    tape = [(int(t), float(v), float(p)) for t, v, p in zip(
+        10 * HOUR + tape_ts,
+        np.round(rng.normal(0, 3, tape_ts.size), 3),
+        100 + np.cumsum(rng.normal(0, 0.1, tape_ts.size)),
+    )]
+    end = 0
+    for _ in range(n_polls):
+        end = min(len(tape), end + int(rng.integers(5, 120)))
+        yield tape[max(0, end - 200):end]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_ring_tracker_matches_deque_reference(seed):
+    new, ref = CvdTracker(), _DequeTracker()
+    for i, batch in enumerate(_polls(seed)):
+        new.ingest("X", batch)
+        ref.ingest("X", batch)
+        if i % 7 == 0 and batch:
+            for now in (batch[-1][0], batch[-1][0] + 20 * MIN):
+                for side in ("LONG", "SHORT"):
+                    got = new.snapshot_features("X", side, now)
+                    exp = ref.snapshot_features("X", side, now)
+                    assert got.keys() == exp.keys()
+                    for k in exp:
+                        assert got[k] == pytest.approx(exp[k], rel=1e-7, abs=1e-9), k
+
+
+def test_ring_compacts_instead_of_growing_unbounded():
+    t = CvdTracker(long_window_ms=5 * MIN)
+    for i in range(2_000):
+        t.ingest("X", [(10 * HOUR + i * 1_000, 1.0, 100.0)])
+    ring = t._trades["X"]
+    assert len(ring) == 301  # 5 minutes of 1 s trades, inclusive
+    assert len(ring.ts) <= 1024
+
+
+def test_rolling_stats_match_statistics():
+    rng = np.random.default_rng(3)
+    rs, ref = _RollingStats(50), deque(maxlen=50)
+    for x in rng.normal(1e3, 250, 400):
+        rs.append(float(x))
+        ref.append(float(x))
+        mu, sd = rs.mean_pstdev()
+        assert mu == pytest.approx(statistics.mean(ref), rel=1e-9)
+        assert sd == pytest.approx(statistics.pstdev(ref), rel=1e-6)
+
+
+def test_rolling_stats_flat_history_has_zero_stdev():
+    rs = _RollingStats(20)
+    for _ in range(45):
+        rs.append(0.1)
+    assert rs.mean_pstdev()[1] == 0.0
+
+
+class _SlowTradesAdapter:
+    def __init__(self, delay=0.1, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.threads = set()
+        self._lock = threading.Lock()
+        self._active = 0
+        self.max_concurrent = 0
+
+    def fetch_recent_trades(self, symbol, limit=200):
+        with self._lock:
+            self.threads.add(threading.get_ident())
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        time.sleep(self.delay)
+        with self._lock:
+            self._active -= 1
+        if symbol in self.failing:
+            raise RuntimeError("boom")
+        return [(10 * HOUR, 1.0, 100.0), (10 * HOUR + MIN, -0.5, 101.0)]
+
+
+def test_poll_fetches_concurrently_off_the_loop():
+    from backend.bot.paper_trading_service import PaperTradingService
+
+    adapter = _SlowTradesAdapter(delay=0.1, failing={"S1/USDT:USDT"})
+    svc = SimpleNamespace(_cvd_tracker=CvdTracker())
+    syms = [f"S{i}/USDT" for i in range(6)]
+
+    async def _run():
+        loop_thread = threading.get_ident()
+        t0 = time.perf_counter()
+        await PaperTradingService._poll_cvd_trades(svc, adapter, syms)
+        return loop_thread, time.perf_counter() - t0
+
+    loop_thread, elapsed = asyncio.run(_run())
+    assert loop_thread not in adapter.threads
+    assert adapter.max_concurrent > 1
+    assert elapsed < 0.8 * 0.1 * len(syms)
+    assert set(svc._cvd_tracker._trades) == set(syms) - {"S1/USDT"}
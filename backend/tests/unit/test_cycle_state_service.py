@@ -0,0 +1,102 @@
+"""
+Tests for the cycle state service (backend.services.cycle_state_service).
+
+State must be recomputed only when the candles change (a new price only
+re-runs the failure check), must match detect_cycle_context with the
+symbol_cycle_detector failure flags merged, and must survive a restart
+through the state file, written by the main process only.
+"""
+
+import dataclasses
+import multiprocessing
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from backend.services.cycle_state_service import CycleStateService, cycle_scoring_enabled
+from backend.strategy.smc import cycle_detector
+from backend.strategy.smc.cycle_detector import detect_cycle_context
+from backend.strategy.smc.symbol_cycle_detector import _find_swing_lows, detect_symbol_cycles
+
+NOW = datetime(2026, 1, 9, 15, 30)  # Friday afternoon: inside a timing window
+
+
+def _daily(n: int = 300, seed: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.02, n)))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.02, "low": low, "close": close},
+        index=pd.date_range("2025-01-01", periods=n, freq="1D"),
+    )
+
+
+def test_matches_detectors():
+    df = _daily()
+    state = CycleStateService(state_file=None).update("BTC/USDT", df)
+
+    class _Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return NOW
+
+    with mock.patch.object(cycle_detector, "datetime", _Clock):
+        expected = detect_cycle_context(df)
+    cycles = detect_symbol_cycles(df, "BTC/USDT")
+    expected = dataclasses.replace(expected, dcl_failed=cycles.dcl.is_failed, wcl_failed=cycles.wcl.is_failed)
+
+    assert state.cycle_context(now=NOW) == expected
+    assert state.cycle_context(now=NOW).timing_window_active
+    assert state.symbol_cycles.to_dict()["dcl"] == cycles.to_dict()["dcl"]
+
+
+def test_recomputes_only_on_new_candle_or_price():
+    df = _daily()
+    service = CycleStateService(state_file=None)
+    first = service.update("ETH/USDT", df.iloc[:-1])
+    assert service.update("ETH/USDT", df.iloc[:-1].copy()) is first
+
+    repriced = service.update("ETH/USDT", df.iloc[:-1], current_price=1.0)
+    assert repriced.context is first.context
+    assert repriced.symbol_cycles.dcl.is_failed and repriced.cycle_context().dcl_failed
+
+    closed = service.update("ETH/USDT", df)
+    assert closed.context is not first.context and closed.last_timestamp == df.index[-1]
+    assert service.get("ETH/USDT") is closed
+    assert service.update("ETH/USDT", df, timeframe="4h") is not closed
+
+
+def test_short_history_and_state_file(tmp_path):
+    service = CycleStateService(state_file=tmp_path / "cycles.pkl")
+    short = service.update("SOL/USDT", _daily(40))
+    assert short.context is None
+    assert short.cycle_context().phase.value == "unknown"
+
+    service.update("BTC/USDT", _daily())
+    service.save()
+    restored = CycleStateService(state_file=tmp_path / "cycles.pkl")
+    assert set(restored.tracked()) == {("SOL/USDT", "1d"), ("BTC/USDT", "1d")}
+    assert restored.get("BTC/USDT").cycle_context(now=NOW) == service.get("BTC/USDT").cycle_context(now=NOW)
+
+
+def test_scan_workers_do_not_write_state_file(tmp_path, monkeypatch):
+    service = CycleStateService(state_file=tmp_path / "cycles.pkl")
+    with mock.patch.object(multiprocessing, "parent_process", return_value=object()):
+        service.update("BTC/USDT", _daily())
+        service.save()
+    assert not (tmp_path / "cycles.pkl").exists()
+    service.save()
+    assert (tmp_path / "cycles.pkl").exists()
+
+    monkeypatch.delenv("SS_CYCLE_SCORING", raising=False)
+    assert not cycle_scoring_enabled()  # orchestrator cycle_context stays None by default
+
+
+def test_swing_lows_strict_on_both_sides():
+    lows = np.array([5, 4, 3, 4, 5, 2, 2, 5, 6, 1, 7, 8, 9], dtype=float)
+    df = pd.DataFrame({"low": lows})
+    assert [s["index"] for s in _find_swing_lows(df, 2)] == [2, 9]
+    assert _find_swing_lows(df, 2)[1] == {"price": 1.0, "index": 9, "bars_ago": 3}
+    assert _find_swing_lows(df.iloc[:4], 2) == []
@@ -0,0 +1,133 @@
+"""
+Tests for the one-pass divergence engine in backend.indicators.divergence.
+
+  - vectorized find_swing_highs/lows == the historical per-element loop,
+    including NaN bars (RSI / MACD warm-up)
+  - detect_divergences (both directions, shared pivots) == the per-type
+    detect_regular_* / detect_hidden_* functions
+  - snapshot_divergences reads the arrays IndicatorService attached,
+    caches per snapshot, and recomputes only when they are missing
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.diagnostics.perf_bench import _synthetic_frame
+from backend.indicators import divergence as div
+from backend.indicators.momentum import compute_macd, compute_rsi
+
+
+def _loop_swings(series: pd.Series, lookback: int, highs: bool):
+    out = []
+    for i in range(lookback, len(series) - lookback):
+        cur = series.iloc[i]
+        ok = True
+        for j in range(1, lookback + 1):
+            a, b = series.iloc[i - j], series.iloc[i + j]
+            if (a >= cur or b >= cur) if highs else (a <= cur or b <= cur):
+                ok = False
+                break
+        if ok:
+            out.append(i)
+    return out
+
+
+def _per_type(df, indicator, name, side, lookback=5):
+    if side == "bullish":
+        fns = (div.detect_regular_bullish_divergence, div.detect_hidden_bullish_divergence)
+    else:
+        fns = (div.detect_regular_bearish_divergence, div.detect_hidden_bearish_divergence)
+    return [r.to_dict() for r in (fn(df, indicator, name, lookback) for fn in fns) if r]
+
+
+def _snapshot(df):
+    return SimpleNamespace(
+        dataframe=df,
+        rsi_values=compute_rsi(df).to_numpy(dtype=float),
+        macd_histogram_values=compute_macd(df)[2].to_numpy(dtype=float),
+    )
+
+
+@pytest.mark.parametrize("lookback", [2, 5])
+def test_swings_match_loop_with_nan(lookback):
+    df = _synthetic_frame("SW/USDT", "1h", 120)
+    rsi = compute_rsi(df)  # leading NaNs
+    for series in (df["high"], df["low"], rsi):
+        assert div.find_swing_highs(series, lookback) == _loop_swings(series, lookback, True)
+        assert div.find_swing_lows(series, lookback) == _loop_swings(series, lookback, False)
+
+
+def test_short_series_has_no_swings():
+    assert div.find_swing_highs(pd.Series([1.0, 2.0, 1.0]), 5) == []
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_engine_matches_per_type_functions(seed):
+    df = _synthetic_frame(f"D{seed}/USDT", "1h", 150 + 10 * seed)
+    indicators = {"rsi": compute_rsi(df), "macd": compute_macd(df)[2]}
+    both = div.detect_divergences(df["high"], df["low"], indicators)
+    for name, series in indicators.items():
+        for side in ("bullish", "bearish"):
+            got = [r.to_dict() for r in both[side][name]]
+            assert got == _per_type(df, series, name, side)
+
+
+def test_engine_finds_constructed_regular_bullish():
+    n = 80
+    low = np.full(n, 100.0)
+    low[40], low[65] = 90.0, 85.0  # lower low in price
+    ind = np.full(n, 50.0)
+    ind[40], ind[65] = 20.0, 30.0  # higher low in the indicator
+    high = low + 2.0
+    res = div.detect_divergences(high, low, {"rsi": ind})
+    (found,) = res["bullish"]["rsi"]
+    assert found.divergence_type == "regular_bullish"
+    assert (found.price_pivot_1, found.price_pivot_2) == (40, 65)
+    assert res["bearish"]["rsi"] == []
+
+
+def test_missing_or_misaligned_indicator_yields_empty_lists():
+    df = _synthetic_frame("M/USDT", "1h", 100)
+    res = div.detect_divergences(df["high"], df["low"], {"rsi": None, "macd": np.zeros(10)})
+    assert res == {"bullish": {"rsi": [], "macd": []}, "bearish": {"rsi": [], "macd": []}}
+
+
+def test_detect_all_divergences_shape_and_short_frame():
+    df = _synthetic_frame("S/USDT", "1h", 40)
+    assert div.detect_all_divergences(df, "bullish") == {"rsi": [], "macd": []}
+    df = _synthetic_frame("S/USDT", "1h", 200)
+    assert div.detect_all_divergences(df, "sideways") == {"rsi": [], "macd": []}
+
+
+def test_snapshot_divergences_matches_and_caches():
+    df = _synthetic_frame("C/USDT", "1h", 240)
+    snap = _snapshot(df)
+    expected = {
+        d: {k: [r.to_dict() for r in v] for k, v in div.detect_all_divergences(df, d).items()}
+        for d in ("bullish", "bearish")
+    }
+
+    with patch.object(div, "compute_rsi", side_effect=AssertionError("recomputed")), \
+            patch.object(div, "compute_macd", side_effect=AssertionError("recomputed")), \
+            patch.object(div, "detect_divergences", wraps=div.detect_divergences) as engine:
+        for d in ("bullish", "bearish", "bullish"):
+            got = div.snapshot_divergences(snap, d)
+            assert {k: [r.to_dict() for r in v] for k, v in got.items()} == expected[d]
+        assert engine.call_count == 1  # both directions from one pass
+
+
+def test_snapshot_without_arrays_computes_them():
+    df = _synthetic_frame("F/USDT", "1h", 200)
+    snap = SimpleNamespace(dataframe=df)
+    got = div.snapshot_divergences(snap, "bearish")
+    expected = div.detect_all_divergences(df, "bearish")
+    assert {k: [r.to_dict() for r in v] for k, v in got.items()} == {
+        k: [r.to_dict() for r in v] for k, v in expected.items()
+    }
+    assert div.snapshot_divergences(SimpleNamespace(dataframe=None), "bearish") == {"rsi": [], "macd": []}
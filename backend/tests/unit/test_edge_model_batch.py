@@ -0,0 +1,248 @@
+"""
+Tests for EdgeModel batch / cached inference and the NumPy scorer export.
+
+  - predict_proba_batch aligns with input order, None for un-enriched rows
+  - batch == per-record predict_proba == sklearn pipeline
+  - repeated feature vectors are served from the cache; retrain clears it
+  - the NumPy scorer matches the sklearn pipeline for both model types
+    and round-trips through np.savez without sklearn objects
+  - the model still pickles (cache/lock are transient)
+  - a reloaded ManagedEdgeModel scores from the NumPy export (matching sklearn's
+    predict_proba) without unpickling the pipeline or importing sklearn,
+    and falls back to the pickle when the export is stale
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.ml.edge_model import EdgeModel
+from backend.ml.feature_extractor import extract_features
+from backend.ml.model_store import ManagedEdgeModel, load_numpy_scorer
+from backend.ml.numpy_scorer import NumpyScorer, export_numpy_scorer
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def _records(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    zones = ["no_session", "london_open", "new_york_open", "asian_session"]
+    regimes = ["bullish", "bearish", "ranging", "volatile"]
+    out = []
+    for i in range(n):
+        conf = float(rng.uniform(55, 95))
+        win = rng.random() < (conf - 40) / 60
+        out.append({
+            "trade_id": f"t{i}",
+            "confidence_score": conf,
+            "risk_reward_ratio": float(rng.uniform(1, 4)),
+            "stop_distance_atr": float(rng.uniform(0.5, 3)),
+            "pullback_probability": float(rng.random()),
+            "entry_time": f"2026-03-{1 + i % 28:02d}T{i % 24:02d}:00:00+00:00",
+            "conviction_class": "ABC"[i % 3],
+            "trade_type": ["scalp", "intraday", "swing"][i % 3],
+            "direction": "LONG" if i % 2 else "SHORT",
+            "kill_zone": zones[i % len(zones)],
+            "regime": regimes[i % len(regimes)],
+            "rsi": float(rng.uniform(20, 80)),
+            "adx": float(rng.uniform(10, 50)),
+            "exit_reason": "target" if win else "stop_loss",
+            "pnl": 1.0 if win else -1.0,
+        })
+    return out
+
+
+@pytest.fixture(scope="module")
+def linear_model():
+    model = EdgeModel()
+    assert model.train(_records(60))["success"]
+    assert model.status()["model_type"] == "LogisticRegression"
+    return model
+
+
+@pytest.fixture(scope="module")
+def gbc_model():
+    model = EdgeModel()
+    assert model.train(_records(160, seed=1))["success"]
+    assert model.status()["model_type"] == "GradientBoosting"
+    return model
+
+
+# sklearn keeps float32 inputs in float32 through the scaler; the NumPy
+# scorer works in float64, so parity is to float32 precision.
+_ATOL = 1e-6
+
+
+def _pipeline_proba(model, records):
+    X = np.vstack([extract_features(r) for r in records])
+    return model._model.predict_proba(X)[:, 1]
+
+
+@pytest.mark.parametrize("fixture", ["linear_model", "gbc_model"])
+def test_batch_matches_pipeline_and_single(fixture, request):
+    model = request.getfixturevalue(fixture)
+    model._proba_cache.clear()
+    records = _records(40, seed=7)
+    batch = model.predict_proba_batch(records)
+    np.testing.assert_allclose(batch, _pipeline_proba(model, records), rtol=0, atol=_ATOL)
+    model._proba_cache.clear()
+    assert [model.predict_proba(r) for r in records] == pytest.approx(batch, abs=1e-12)
+
+
+def test_batch_alignment_with_unenriched_and_duplicates(linear_model):
+    recs = _records(3, seed=3)
+    raw = {"confidence_score": 0}  # pre-enrichment record
+    out = linear_model.predict_proba_batch([recs[0], raw, recs[1], recs[0], recs[2]])
+    assert out[1] is None
+    assert out[0] == out[3]
+    assert all(isinstance(p, float) for i, p in enumerate(out) if i != 1)
+
+
+def test_untrained_model_returns_none():
+    assert EdgeModel().predict_proba_batch(_records(2)) == [None, None]
+    assert EdgeModel().predict_proba(_records(1)[0]) is None
+
+
+def test_cache_skips_matrix_call_for_seen_vectors(linear_model):
+    linear_model._proba_cache.clear()
+    records = _records(10, seed=11)
+    first = linear_model.predict_proba_batch(records)
+    with patch.object(NumpyScorer, "predict_proba", side_effect=AssertionError("not cached")):
+        assert linear_model.predict_proba_batch(records) == first
+
+
+def test_retrain_clears_cache():
+    model = EdgeModel()
+    model.train(_records(60))
+    model.predict_proba_batch(_records(5, seed=2))
+    assert model._proba_cache
+    model.train(_records(60, seed=4))
+    assert not model._proba_cache
+    assert model._scorer_built is False
+
+
+def test_feature_mismatch_returns_none(linear_model):
+    with patch("backend.ml.edge_model.extract_features", return_value=np.zeros(5, dtype=np.float32)):
+        assert linear_model.predict_proba_batch(_records(2)) == [None, None]
+
+
+@pytest.mark.parametrize("fixture", ["linear_model", "gbc_model"])
+def test_numpy_scorer_roundtrip(fixture, request, tmp_path):
+    model = request.getfixturevalue(fixture)
+    scorer = export_numpy_scorer(model._model)
+    assert scorer is not None
+    path = tmp_path / "scorer.npz"
+    scorer.save(str(path))
+    loaded = NumpyScorer.load(str(path))
+    assert loaded.kind == scorer.kind
+    X = np.vstack([extract_features(r) for r in _records(25, seed=5)])
+    np.testing.assert_allclose(loaded.predict_proba(X), model._model.predict_proba(X)[:, 1], atol=_ATOL)
+    with pytest.raises(ValueError):
+        loaded.predict_proba(X[:, :5])
+
+
+def test_pickle_drops_runtime_state(linear_model):
+    linear_model.predict_proba_batch(_records(3))
+    clone = pickle.loads(pickle.dumps(linear_model))
+    assert not clone._proba_cache
+    assert clone.predict_proba_batch(_records(3)) == pytest.approx(
+        linear_model.predict_proba_batch(_records(3))
+    )
+
+
+def test_store_save_writes_numpy_scorer(tmp_path):
+    store = ManagedEdgeModel(
+        model_path=str(tmp_path / "m.joblib"),
+        meta_path=str(tmp_path / "m.json"),
+        scorer_path=str(tmp_path / "m.npz"),
+    )
+    assert store.train(_records(60))["success"]
+    scorer = load_numpy_scorer(store.scorer_path)
+    assert isinstance(scorer, NumpyScorer)
+    recs = _records(4, seed=9)
+    X = np.vstack([extract_features(r) for r in recs])
+    np.testing.assert_allclose(scorer.predict_proba(X), store.predict_proba_batch(recs), atol=1e-12)
+    assert load_numpy_scorer(str(tmp_path / "missing.npz")) is None
+
+
+def _store(tmp_path):
+    return ManagedEdgeModel(
+        model_path=str(tmp_path / "m.joblib"),
+        meta_path=str(tmp_path / "m.json"),
+        scorer_path=str(tmp_path / "m.npz"),
+    )
+
+
+@pytest.mark.parametrize("n, seed", [(60, 0), (160, 1)])
+def test_reloaded_store_scores_from_export_like_sklearn(tmp_path, n, seed):
+    trained = _store(tmp_path)
+    assert trained.train(_records(n, seed=seed))["success"]
+    expected = _pipeline_proba(trained._get_model(), _records(30, seed=8))
+
+    store = _store(tmp_path)
+    recs = _records(30, seed=8)
+    with patch("joblib.load", side_effect=AssertionError("sklearn pipeline unpickled")):
+        probs = store.predict_proba_batch(recs)
+        assert store.predict_proba(recs[0]) == probs[0]
+        assert store.status()["trained"] and store.status()["n_samples"] == n
+    np.testing.assert_allclose(probs, expected, atol=_ATOL)
+    assert not store._loaded and store.status()["model_type"] == trained.status()["model_type"]
+
+
+def test_store_falls_back_to_pickle_without_current_export(tmp_path):
+    trained = _store(tmp_path)
+    assert trained.train(_records(60))["success"]
+    os.utime(trained.scorer_path, (0, 0))  # export older than the pickle
+    store = _store(tmp_path)
+    recs = _records(5, seed=3)
+    assert store.predict_proba_batch(recs) == pytest.approx(trained.predict_proba_batch(recs), abs=1e-12)
+    assert store._loaded
+
+
+def test_scoring_process_never_imports_sklearn(tmp_path):
+    trained = _store(tmp_path)
+    assert trained.train(_records(160, seed=1))["success"]
+    probe = (
+        "import json, sys\n"
+        "from backend.ml.model_store import ManagedEdgeModel\n"
+        f"store = ManagedEdgeModel({trained.model_path!r}, {trained.meta_path!r}, {trained.scorer_path!r})\n"
+        f"probs = store.predict_proba_batch(json.loads({json.dumps(json.dumps(_records(4, seed=6)))}))\n"
+        "assert store.status()['trained']\n"
+        "print(json.dumps([probs, 'sklearn' in sys.modules]))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[3])}
+    proc = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    probs, imported = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert not imported
+    assert probs == pytest.approx(trained.predict_proba_batch(_records(4, seed=6)), abs=1e-12)
+
+
+def test_reset_drops_saved_and_scoring_models(tmp_path):
+    trained = _store(tmp_path)
+    assert trained.train(_records(60))["success"]
+    store = _store(tmp_path)
+    recs = _records(3, seed=2)
+    assert all(p is not None for p in store.predict_proba_batch(recs))  # scoring from the export
+    assert store._scoring_model is not None
+
+    assert store.reset() is True
+    assert not os.path.exists(store.model_path) and not os.path.exists(store.scorer_path)
+    assert store.predict_proba_batch(recs) == [None, None, None]
+    assert store.status()["trained"] is False
+    assert store.reset() is False
@@ -0,0 +1,120 @@
+"""
+Tests for hedged OHLCV requests (backend.data.hedged_fetch) through
+IngestionPipeline.
+
+A primary that answers within the deadline must be used alone; a late,
+failing or empty one must be hedged to the secondary with the mapped
+symbol, the first valid frame must win and its exchange must be tagged in
+MultiTimeframeData.metadata; the deadline must follow the primary's p95
+latency; the async path must behave the same.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data import hedged_fetch
+from backend.data.hedged_fetch import HedgedFetcher, hedged_fetcher_for
+from backend.data.ingestion_pipeline import IngestionPipeline
+
+
+def _frame(timeframe: str, limit: int, close: float) -> pd.DataFrame:
+    step = pd.Timedelta(timeframe)
+    end = pd.Timestamp(time.time(), unit="s").floor(step)
+    idx = pd.date_range(end=end, periods=limit, freq=step)
+    values = close + np.zeros(limit)
+    return pd.DataFrame(
+        {"timestamp": idx, "open": values, "high": values + 1, "low": values - 1, "close": values, "volume": 1.0}
+    )
+
+
+class _Adapter:
+    def __init__(self, close: float, delay: float = 0.0, error: Exception | None = None, empty: bool = False):
+        self.close, self.delay, self.error, self.empty = close, delay, error, empty
+        self.calls = []
+        self.release = threading.Event()
+
+    def fetch_ohlcv(self, symbol, timeframe, limit=500, since=None):
+        self.calls.append(symbol)
+        if self.delay:
+            self.release.wait(self.delay)
+        if self.error:
+            raise self.error
+        return pd.DataFrame() if self.empty else _frame(timeframe, limit, self.close)
+
+
+def _pipeline(primary: _Adapter, secondary: _Adapter, deadline: float = 0.2):
+    hedge = HedgedFetcher(secondary, "primary", "secondary", symbol_map={"1000PEPE/USDT": "PEPE/USDT"},
+                          initial_deadline_s=deadline)
+    return IngestionPipeline(primary, use_cache=False, hedge=hedge), hedge
+
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = _Adapter(10.0), _Adapter(20.0)
+    pipeline, hedge = _pipeline(primary, secondary)
+    data = pipeline.fetch_multi_timeframe("BTC/USDT:USDT", ["1h", "4h"], limit=50)
+    assert data.metadata["ohlcv_sources"] == {"1h": "primary", "4h": "primary"}
+    assert data.metadata["hedged_timeframes"] == []
+    assert secondary.calls == []
+    assert hedge.stats()["requests"] == 2 and hedge.stats()["hedged"] == 0
+
+
+def test_slow_primary_loses_to_secondary():
+    primary, secondary = _Adapter(10.0, delay=5.0), _Adapter(20.0)
+    pipeline, hedge = _pipeline(primary, secondary)
+    started = time.monotonic()
+    data = pipeline.fetch_multi_timeframe("BTC/USDT:USDT", ["1h"], limit=50)
+    assert time.monotonic() - started < 2.0
+    primary.release.set()
+
+    assert data.timeframes["1h"]["close"].iloc[-1] == 20.0
+    assert data.metadata["hedged_timeframes"] == ["1h"]
+    assert secondary.calls == ["BTC/USDT"]
+    stats = hedge.stats()
+    assert (stats["hedged"], stats["secondary_wins"], stats["hedge_rate_pct"]) == (1, 1, 100.0)
+
+
+def test_failed_or_empty_primary_falls_over_and_mapped_symbol():
+    secondary = _Adapter(20.0)
+    pipeline, _ = _pipeline(_Adapter(10.0, error=RuntimeError("geo-blocked")), secondary, deadline=5.0)
+    data = pipeline.fetch_multi_timeframe("1000PEPE/USDT", ["1h"], limit=20)
+    assert data.metadata["ohlcv_sources"] == {"1h": "secondary"}
+    assert secondary.calls == ["PEPE/USDT"]
+
+    pipeline, hedge = _pipeline(_Adapter(10.0, empty=True), _Adapter(0.0, error=RuntimeError("down")))
+    with pytest.raises(ValueError):  # nothing from either exchange: no timeframe resolved
+        pipeline.fetch_multi_timeframe("ETH/USDT", ["1h"], limit=20)
+    assert hedge.stats()["failed"] == 1
+
+
+def test_deadline_follows_primary_p95():
+    hedge = HedgedFetcher(_Adapter(0.0), "primary", "secondary", initial_deadline_s=3.0, min_deadline_s=0.05)
+    assert hedge.deadline() == 3.0
+    for _ in range(hedged_fetch.HEDGE_MIN_SAMPLES):
+        hedge.fetch(lambda: time.sleep(0.06) or _frame("1h", 5, 1.0), "X/USDT", "1h", 5)
+    time.sleep(0.05)
+    assert 0.05 < hedge.deadline() < 1.0
+    assert hedge.stats()["hedged"] == 0
+
+
+def test_async_hedge_and_factory(monkeypatch):
+    secondary = _Adapter(20.0)
+    hedge = HedgedFetcher(secondary, "primary", "secondary", initial_deadline_s=0.1)
+
+    async def slow_primary():
+        await asyncio.sleep(2.0)
+        return _frame("1h", 5, 10.0)
+
+    df, source = asyncio.run(hedge.fetch_async(slow_primary, "SOL/USDT:USDT", "1h", 5))
+    assert source == "secondary" and df["close"].iloc[-1] == 20.0
+
+    monkeypatch.delenv("SS_HEDGE_EXCHANGE", raising=False)
+    assert hedged_fetcher_for(_Adapter(0.0)) is None
+    monkeypatch.setenv("SS_HEDGE_EXCHANGE", "_adapter")
+    assert hedged_fetcher_for(_Adapter(0.0)) is None  # the primary's own exchange
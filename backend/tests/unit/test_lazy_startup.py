@@ -0,0 +1,141 @@
+"""
+Tests for lazy API startup (backend.shared.utils.lazy_service + api_server).
+
+  - importing backend.api_server builds no exchange adapter / orchestrator
+    and does not import ccxt, within an import-time budget
+  - LazyService builds exactly once under concurrent first use, forwards
+    attribute reads/writes, names its target class for logs without
+    building it, and reports failed builds (retried next use)
+  - /api/health reports per-service readiness
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.shared.utils import lazy_service
+from backend.shared.utils.lazy_service import LazyService, describe, readiness, warm_up
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+# Cold import of the API module in a fresh interpreter. Generous enough for a
+# loaded CI box; an eager adapter (load_markets over the network) or a heavy
+# new top-level import blows straight through it.
+IMPORT_BUDGET_S = float(os.getenv("SNIPERSIGHT_IMPORT_BUDGET_S", "8.0"))
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import backend.api_server as api
+elapsed = time.perf_counter() - t0
+print(json.dumps({
+    "elapsed": elapsed,
+    "ccxt": "ccxt" in sys.modules,
+    "orchestrator_module": "backend.engine.orchestrator" in sys.modules,
+    "paper_service_module": "backend.bot.paper_trading_service" in sys.modules,
+    "services": api.readiness(),
+}))
+"""
+
+
+@pytest.fixture
+def _isolated_registry(monkeypatch):
+    monkeypatch.setattr(lazy_service, "_REGISTRY", {})
+
+
+def test_api_import_is_lazy_and_within_budget():
+    env = {**os.environ, "SNIPERSIGHT_STARTUP_MODE": "lazy", "PYTHONPATH": str(_REPO_ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=_REPO_ROOT, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert not probe["ccxt"]
+    assert not probe["paper_service_module"]
+    for name in ("exchange_adapter", "orchestrator", "paper_trading_service", "live_trading_service"):
+        assert probe["services"][name]["state"] == "cold", name
+    assert probe["elapsed"] < IMPORT_BUDGET_S, f"api_server import took {probe['elapsed']:.2f}s"
+
+
+def test_lazy_service_builds_once_under_concurrency(_isolated_registry):
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"built": True}
+
+    svc = LazyService("thing", factory)
+    assert svc.status() == {"state": "cold"}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(svc.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert svc.status()["state"] == "ready"
+    assert svc.status()["init_ms"] >= 0
+
+
+def test_lazy_service_forwards_attributes(_isolated_registry):
+    class Target:
+        value = 1
+
+        def double(self, x):
+            return 2 * x
+
+    svc = LazyService("target", Target)
+    assert describe(svc) == "<LazyService target (cold)>" and not svc.is_ready
+    assert svc.double(3) == 6
+    svc.value = 5
+    assert svc.get().value == 5
+    assert svc.is_ready
+    assert describe(svc) == describe(Target()) == "Target"
+
+
+def test_failed_build_is_reported_and_retried(_isolated_registry):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("exchange down")
+        return object()
+
+    svc = LazyService("flaky", flaky)
+    report = warm_up()  # never raises
+    assert report["flaky"]["state"] == "failed"
+    assert "exchange down" in report["flaky"]["error"]
+    svc.get()
+    assert readiness()["flaky"] == {"state": "ready", "init_ms": svc.status()["init_ms"]}
+
+
+def test_health_reports_service_readiness(monkeypatch):
+    import asyncio
+
+    import backend.api_server as api
+
+    monkeypatch.setattr(
+        api, "readiness",
+        lambda: {
+            "exchange_adapter": {"state": "ready"},
+            "orchestrator": {"state": "warming"},
+            "paper_trading_service": {"state": "cold"},
+            "live_trading_service": {"state": "cold"},
+        },
+    )
+    body = asyncio.run(api.health_check())
+    assert body["status"] == "warming"
+    assert body["components"]["scanner"] == "warming"
+    assert body["services"]["exchange_adapter"]["state"] == "ready"
@@ -0,0 +1,195 @@
+"""
+Tests for backend.data.liquidity_snapshot.LiquiditySnapshotService.
+
+The admission gates used to call get_book_quality serially (one REST call
+per symbol) before every scan. The snapshot service must:
+
+  - fetch missing books concurrently, paced by the adapter rateLimit
+  - serve repeat reads from cache inside the TTL (no adapter calls)
+  - never cache the fail-safe sentinel (inf spread / 0 depth)
+  - keep the adapter's "{} on total failure -> skip gate" contract
+  - refresh only entries a gate already asked for, in the background
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.data.liquidity_snapshot import LiquiditySnapshotService
+
+_SENTINEL = {"spread_bps": float("inf"), "depth_usd": 0.0}
+
+
+class _FakeAdapter:
+    def __init__(self, delay: float = 0.05, rate_limit_ms: int = 1, failing=()):
+        self.exchange = SimpleNamespace(rateLimit=rate_limit_ms)
+        self.delay = delay
+        self.failing = set(failing)
+        self.book_calls = []
+        self.volume_calls = []
+        self.min_order_calls = []
+        self.volumes_down = False
+        self._lock = threading.Lock()
+        self.max_concurrent = 0
+        self._active = 0
+
+    def get_book_quality(self, symbols, band_bps=10.0):
+        with self._lock:
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+            self.book_calls.append((tuple(symbols), time.monotonic()))
+        time.sleep(self.delay)
+        with self._lock:
+            self._active -= 1
+        return {
+            s: dict(_SENTINEL) if s in self.failing else {"spread_bps": 2.0, "depth_usd": 50_000.0}
+            for s in symbols
+        }
+
+    def get_symbol_volumes(self, symbols):
+        self.volume_calls.append(tuple(symbols))
+        return {} if self.volumes_down else {s: 1e7 for s in symbols}
+
+    def get_min_order_specs(self, symbols):
+        self.min_order_calls.append(tuple(symbols))
+        return {s: 5.0 for s in symbols}
+
+
+def _symbols(n):
+    return [f"S{i}/USDT" for i in range(n)]
+
+
+def test_books_fetched_concurrently_then_cached():
+    adapter = _FakeAdapter(delay=0.1)
+    svc = LiquiditySnapshotService(adapter, max_workers=4)
+    syms = _symbols(8)
+
+    t0 = time.perf_counter()
+    out = svc.get_book_quality(syms)
+    elapsed = time.perf_counter() - t0
+    assert list(out) == syms
+    assert adapter.max_concurrent > 1
+    assert elapsed < 0.8 * 0.1 * len(syms)  # well under the serial cost
+
+    n_calls = len(adapter.book_calls)
+    assert svc.get_book_quality(syms) == out
+    assert len(adapter.book_calls) == n_calls  # all served from cache
+
+
+def test_request_starts_are_paced_by_rate_limit():
+    adapter = _FakeAdapter(delay=0.0, rate_limit_ms=50)
+    svc = LiquiditySnapshotService(adapter, max_workers=4)
+    svc.get_book_quality(_symbols(4))
+    starts = sorted(ts for _, ts in adapter.book_calls)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+
+def test_failed_books_are_returned_but_not_cached():
+    adapter = _FakeAdapter(delay=0.0, failing={"S1/USDT"})
+    svc = LiquiditySnapshotService(adapter)
+    out = svc.get_book_quality(_symbols(2))
+    assert out["S1/USDT"] == _SENTINEL
+    adapter.book_calls.clear()
+    svc.get_book_quality(_symbols(2))
+    assert [c[0] for c in adapter.book_calls] == [("S1/USDT",)]
+
+
+def test_expired_books_are_refetched():
+    adapter = _FakeAdapter(delay=0.0)
+    svc = LiquiditySnapshotService(adapter, book_ttl=0.05)
+    svc.get_book_quality(_symbols(1))
+    time.sleep(0.06)
+    svc.get_book_quality(_symbols(1))
+    assert len(adapter.book_calls) == 2
+
+
+def test_band_change_invalidates_books():
+    adapter = _FakeAdapter(delay=0.0)
+    svc = LiquiditySnapshotService(adapter, band_bps=10.0)
+    svc.get_book_quality(_symbols(1))
+    svc.get_book_quality(_symbols(1), band_bps=25.0)
+    assert len(adapter.book_calls) == 2
+
+
+def test_volumes_fetch_only_missing_and_keep_total_failure_contract():
+    adapter = _FakeAdapter()
+    svc = LiquiditySnapshotService(adapter)
+    assert svc.get_symbol_volumes(_symbols(2)) == {"S0/USDT": 1e7, "S1/USDT": 1e7}
+    svc.get_symbol_volumes(_symbols(3))
+    assert adapter.volume_calls == [("S0/USDT", "S1/USDT"), ("S2/USDT",)]
+
+    adapter.volumes_down = True
+    # A new symbol forces a fetch; total failure -> {} so the caller skips the gate
+    assert svc.get_symbol_volumes(_symbols(4)) == {}
+
+
+def test_min_order_specs_cached():
+    adapter = _FakeAdapter()
+    svc = LiquiditySnapshotService(adapter)
+    svc.get_min_order_specs(_symbols(3))
+    svc.get_min_order_specs(_symbols(3))
+    assert len(adapter.min_order_calls) == 1
+
+
+def test_refresh_only_touches_requested_inputs():
+    adapter = _FakeAdapter(delay=0.0)
+    svc = LiquiditySnapshotService(adapter, book_ttl=0.2, volume_ttl=0.2, refresh_ahead=0.2)
+    syms = _symbols(3)
+    svc.get_book_quality(syms[:2])
+    svc.refresh(syms)
+    # books for the two requested symbols refreshed; volumes/min-orders never requested
+    assert sorted(c[0] for c in adapter.book_calls[2:]) == [("S0/USDT",), ("S1/USDT",)]
+    assert adapter.volume_calls == []
+    assert adapter.min_order_calls == []
+
+
+def test_background_refresher_keeps_watched_entries_warm():
+    adapter = _FakeAdapter(delay=0.0)
+    svc = LiquiditySnapshotService(adapter, book_ttl=1.0, volume_ttl=1.0, refresh_ahead=0.9)
+    syms = _symbols(2)
+    svc.get_book_quality(syms)
+    before = len(adapter.book_calls)
+    svc.watch(syms)
+    try:
+        deadline = time.time() + 3.0
+        while time.time() < deadline and (
+            len(adapter.book_calls) == before or svc.stats()["refresh_cycles"] < 2
+        ):
+            time.sleep(0.02)
+        assert len(adapter.book_calls) > before
+    finally:
+        svc.stop()
+    assert svc._refresher is None
+
+
+def test_adapter_exception_becomes_sentinel():
+    adapter = _FakeAdapter(delay=0.0)
+
+    def _raise(symbols, band_bps=10.0):
+        raise RuntimeError("boom")
+
+    adapter.get_book_quality = _raise
+    svc = LiquiditySnapshotService(adapter)
+    assert svc.get_book_quality(_symbols(2)) == {"S0/USDT": _SENTINEL, "S1/USDT": _SENTINEL}
+
+
+def test_counters_exact_under_concurrent_readers():
+    svc = LiquiditySnapshotService(_FakeAdapter(delay=0.0), max_workers=4)
+    syms = _symbols(20)
+    svc.get_book_quality(syms)
+
+    def read():
+        for _ in range(200):
+            svc.get_book_quality(syms)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = svc.stats()
+    assert stats["book_fetches"] == len(syms)
+    assert stats["book_hits"] == 8 * 200 * len(syms)
@@ -0,0 +1,132 @@
+"""
+Tests for backend.shared.utils.log_sink.
+
+  - producers only enqueue; flush() makes every queued line durable, in order
+  - lines for many files are batched through persistent handles
+  - snapshots are atomic and coalesced (newest payload wins)
+  - rotation rolls and compresses at max_bytes
+  - unserializable values fall back to str(); a bad path never raises
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend.shared.utils import log_sink as ls
+from backend.shared.utils.log_sink import LogSink, RotationPolicy, dumps
+
+
+@pytest.fixture
+def sink():
+    s = LogSink(flush_interval=0.01)
+    yield s
+    s.close()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_lines_are_written_in_order_after_flush(sink, tmp_path):
+    path = tmp_path / "session" / "signals.jsonl"  # parent created by the writer
+    for i in range(500):
+        sink.write_json(path, {"i": i, "symbol": "BTC/USDT"})
+    assert sink.flush()
+    assert [r["i"] for r in _lines(path)] == list(range(500))
+    assert sink.stats()["lines"] == 500
+    assert sink.stats()["batches"] < 500  # grouped, not one write per line
+
+
+def test_concurrent_producers_across_files(sink, tmp_path):
+    paths = [tmp_path / f"f{k}.jsonl" for k in range(4)]
+
+    def produce(k):
+        for i in range(200):
+            sink.write_json(paths[k], {"k": k, "i": i})
+
+    threads = [threading.Thread(target=produce, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sink.flush()
+    for k, path in enumerate(paths):
+        assert [r["i"] for r in _lines(path)] == list(range(200))
+    assert sink.stats()["open_files"] == 4
+
+
+def test_open_handles_are_capped(tmp_path):
+    sink = LogSink(flush_interval=0.01, max_open_files=2)
+    try:
+        for k in range(5):
+            sink.write_line(tmp_path / f"{k}.log", "x")
+        sink.flush()
+        assert sink.stats()["open_files"] == 2
+        assert all((tmp_path / f"{k}.log").read_text() == "x\n" for k in range(5))
+    finally:
+        sink.close()
+
+
+def test_snapshot_is_coalesced_and_atomic(sink, tmp_path):
+    path = tmp_path / "state.json"
+    for i in range(50):
+        sink.write_snapshot(path, {"version": i})
+    sink.flush()
+    assert json.loads(path.read_text()) == {"version": 49}
+    assert not path.with_suffix(".tmp").exists()
+    assert sink.stats()["snapshots"] <= 50
+
+
+def test_rotation_compresses_rolled_files(sink, tmp_path, monkeypatch):
+    monkeypatch.setattr(ls, "ZSTD_AVAILABLE", False)  # exercise the stdlib path
+    path = tmp_path / "breakdown.log"
+    channel = sink.channel(path, rotation=RotationPolicy(max_bytes=1000, backups=2))
+    for i in range(100):
+        channel.info(json.dumps({"i": i, "pad": "x" * 40}))
+        sink.flush()
+    rolled = sorted(tmp_path.glob("breakdown.log.*.gz"))
+    assert [p.name for p in rolled] == ["breakdown.log.1.gz", "breakdown.log.2.gz"]
+    with gzip.open(rolled[0], "rt") as f:
+        first = [json.loads(line)["i"] for line in f]
+    live = [json.loads(line)["i"] for line in path.read_text().splitlines()] if path.exists() else []
+    assert first and (not live or first[-1] < live[0])
+    assert sink.stats()["rotations"] >= 2
+
+
+def test_dumps_handles_numpy_datetime_and_fallback():
+    ts = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    out = json.loads(dumps({"a": np.float64(1.5), "b": np.int64(3), "t": ts, "o": object}))
+    assert out["a"] == 1.5 and out["b"] == 3
+    assert out["t"].startswith("2026-01-02T03:04:05")
+    assert "object" in out["o"]
+
+
+def test_unwritable_path_does_not_raise(sink, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    sink.write_json(blocker / "child.jsonl", {"x": 1})  # parent is a file
+    sink.write_json(tmp_path / "ok.jsonl", {"x": 2})
+    assert sink.flush()
+    assert _lines(tmp_path / "ok.jsonl") == [{"x": 2}]
+    assert sink.stats()["errors"] >= 1
+
+
+def test_paper_service_signal_and_activity_go_through_sink(tmp_path, monkeypatch):
+    from backend.bot import paper_trading_service as pts
+
+    sink = LogSink(flush_interval=0.01)
+    monkeypatch.setattr(pts, "get_log_sink", lambda: sink)
+    svc = pts.PaperTradingService.__new__(pts.PaperTradingService)
+    svc.activity_log = []
+    svc._session_log_dir = tmp_path
+    svc._log_activity("scan_completed", {"n": 3})
+    sink.flush()
+    (row,) = _lines(tmp_path / "activity.jsonl")
+    assert row["event_type"] == "scan_completed" and row["data"] == {"n": 3}
+    sink.close()
@@ -0,0 +1,173 @@
+"""
+Tests for the local mock Phemex exchange (backend.devtools.mock_exchange).
+
+PhemexAdapter pointed at the mock must load markets and read candles,
+tickers, book and trades through ccxt unchanged; orders must fill, attach
+TP/SL and show up in positions, balance and the private WebSocket frames; the
+injected faults must surface as the ccxt exceptions a real outage gives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import random
+import time
+
+import aiohttp
+import ccxt
+import pytest
+
+from backend.data.adapters import request_scheduler
+from backend.data.adapters.phemex import PhemexAdapter
+from backend.data.adapters.phemex_ws import PhemexWebSocketClient, default_ws_url
+from backend.data.adapters.request_scheduler import RequestScheduler
+from backend.devtools.market_sim import MarketSimulator
+from backend.devtools.mock_exchange import FaultConfig, MockExchangeServer
+
+PERP = "BTC/USDT:USDT"
+NOW = 1_790_000_000.5
+
+
+@pytest.fixture
+def mock():
+    server = MockExchangeServer(MarketSimulator(clock=lambda: NOW), tick_s=0.02)
+    server.start_in_thread()
+    key = f"phemex@{server.url}"
+    request_scheduler._SCHEDULERS[key] = RequestScheduler(key, rate_limit_ms=1)
+    yield server
+    server.stop_in_thread()
+    request_scheduler._SCHEDULERS.pop(key, None)
+
+
+@pytest.fixture
+def adapter(mock):
+    return PhemexAdapter(**mock.adapter_kwargs())
+
+
+def test_market_data_through_ccxt(mock, adapter):
+    assert adapter.exchange.market(PERP)["id"] == "BTCUSDT"
+    assert adapter.scheduler is request_scheduler._SCHEDULERS[f"phemex@{mock.url}"]
+
+    df = adapter.fetch_ohlcv(PERP, "4h", limit=500)
+    assert len(df) == 500
+    assert (df["timestamp"].diff().dropna() == "4h").all()
+    ts, rows = mock.sim.candles("BTC", 4 * 3600, 500)
+    assert df["close"].tolist() == rows[:, 3].tolist()
+
+    ticker = adapter.exchange.fetch_ticker(PERP)
+    assert ticker["bid"] < ticker["last"] < ticker["ask"]
+    book = adapter.exchange.fetch_order_book(PERP)
+    assert book["bids"][0][0] == ticker["bid"] and book["asks"][0][0] == ticker["ask"]
+    trades = adapter.exchange.fetch_trades(PERP)
+    assert trades and all(t["timestamp"] <= NOW * 1000 for t in trades)
+
+
+def test_orders_fill_and_update_positions(mock, adapter):
+    ex = adapter.exchange
+    order = ex.create_order(
+        PERP, "market", "buy", 0.01, None,
+        {"clientOrderId": "entry-1", "stopLossPrice": 1000, "takeProfitPrice": 1_000_000},
+    )
+    assert order["status"] == "closed" and order["filled"] == 0.01
+    assert ex.fetch_order(order["id"], PERP)["status"] == "closed"
+
+    [position] = [p for p in ex.fetch_positions() if p["contracts"]]
+    assert position["side"] == "long" and position["entryPrice"] == order["average"]
+    assert sorted(o["clientOrderId"] for o in ex.fetch_open_orders(PERP)) == ["entry-1-sl", "entry-1-tp"]
+    assert ex.fetch_balance()["USDT"]["used"] > 0
+
+    ex.create_order(PERP, "market", "sell", 0.01, None, {"reduceOnly": True})
+    assert [p["contracts"] for p in ex.fetch_positions()] == [0.0]
+    assert ex.fetch_open_orders(PERP) == []  # the position's TP/SL went with it
+    with pytest.raises(ccxt.InvalidOrder):
+        ex.create_order(PERP, "market", "sell", 0.01, None, {"reduceOnly": True})
+    with pytest.raises(ccxt.InsufficientFunds):
+        ex.create_order(PERP, "market", "buy", 100, None)
+
+
+def test_ws_pushes_order_snapshot_and_updates(mock, adapter):
+    ticker = adapter.exchange.fetch_ticker(PERP)
+    order = adapter.exchange.create_order(PERP, "limit", "buy", 0.01, round(ticker["last"] * 0.99))
+    assert order["status"] == "open"
+
+    async def frames():
+        expiry = int(time.time()) + 60
+        signature = hmac.new(mock.api_secret.encode(), f"{mock.api_key}{expiry}".encode(), hashlib.sha256)
+        async with aiohttp.ClientSession() as session, session.ws_connect(mock.ws_url) as ws:
+            await ws.send_json({"id": 1, "method": "user.auth", "params": ["API", mock.api_key, signature.hexdigest(), expiry]})
+            assert (await ws.receive_json())["error"] is None
+            await ws.send_json({"id": 2, "method": "aop_p.subscribe", "params": []})
+            assert (await ws.receive_json())["result"] == {"status": "success"}
+            snapshot = await ws.receive_json(timeout=5)
+            await asyncio.to_thread(adapter.exchange.cancel_order, order["id"], PERP)
+            incremental = await ws.receive_json(timeout=5)
+            return snapshot, incremental
+
+    snapshot, incremental = asyncio.run(frames())
+    assert snapshot["type"] == "snapshot"
+    assert [(o["orderID"], o["ordStatus"]) for o in snapshot["orders_p"]] == [(order["id"], "New")]
+    assert incremental["type"] == "incremental" and incremental["sequence"] > snapshot["sequence"]
+    assert [(o["orderID"], o["ordStatus"]) for o in incremental["orders_p"]] == [(order["id"], "Canceled")]
+
+
+def test_ws_client_authenticates_against_mock(mock):
+    client = PhemexWebSocketClient(mock.api_key, mock.api_secret, on_order_update=lambda *a: None, ws_url=mock.ws_url)
+
+    async def run():
+        task = asyncio.create_task(client.run())
+        for _ in range(100):
+            if client.metrics["frames_other_total"]:
+                break
+            await asyncio.sleep(0.02)
+        await client.stop()
+        task.cancel()
+
+    asyncio.run(run())
+    assert client.metrics["auth_errors_total"] == 0
+    assert client.metrics["frames_other_total"] >= 1  # the subscribe snapshot arrived
+
+
+def test_ws_url_follows_base_url_override(monkeypatch):
+    monkeypatch.setenv("SS_PHEMEX_BASE_URL", "http://127.0.0.1:8765/")
+    assert default_ws_url() == "ws://127.0.0.1:8765/ws"
+    monkeypatch.delenv("SS_PHEMEX_BASE_URL")
+    assert default_ws_url(testnet=True) == "wss://testnet-api.phemex.com/ws"
+
+
+def test_faults_map_to_ccxt_exceptions(mock, adapter):
+    ex = adapter.exchange
+    mock.faults.rate_limit_error_rate = 1.0
+    with pytest.raises(ccxt.RateLimitExceeded):
+        ex.fetch_ticker(PERP)
+    mock.faults.rate_limit_error_rate = 0.0
+
+    url = f"{mock.url}/_mock/outage?seconds=30"
+
+    async def outage():
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url) as resp:
+                return resp.status
+
+    assert asyncio.run(outage()) == 200
+    with pytest.raises(ccxt.ExchangeNotAvailable):
+        ex.fetch_ticker(PERP)
+    stats = mock.stats()["endpoints"]["/md/v2/ticker/24hr"]
+    assert stats["status"] == {"429": 1, "503": 1}
+
+
+def test_latency_distribution():
+    faults = FaultConfig(latency_ms=20, latency_p99_ms=200)
+    rng = random.Random(3)
+    samples = sorted(faults.latency_s(rng) for _ in range(20_000))
+    assert 0.018 < samples[10_000] < 0.022
+    assert 0.17 < samples[19_800] < 0.23
+    assert FaultConfig(latency_ms=5).latency_s(rng) == 0.005
+
+
+def test_private_endpoints_require_valid_signature(mock):
+    adapter = PhemexAdapter(base_url=mock.url, api_key=mock.api_key, api_secret="wrong")
+    with pytest.raises(ccxt.AuthenticationError):
+        adapter.exchange.fetch_balance()
+    assert adapter.exchange.fetch_ticker(PERP)["last"] > 0  # public data needs no credentials
@@ -0,0 +1,344 @@
+"""
+Tests for incremental replay stepping in backend.engine.replay_engine.
+
+  - BarCloseIndex slices are exactly the rows _slice_to_bar_close selects
+  - chart payloads (full and delta + client merge) match _candles_to_payload
+  - seeks resume from checkpoints and reproduce sequential playback,
+    including the orchestrator's carry-over regime
+  - the parallel jump-to-next-signal search leaves the session exactly as
+    sequential stepping would (with the fake and the real Orchestrator),
+    and can be cancelled
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.engine import replay_engine
+from backend.engine.orchestrator import Orchestrator
+from backend.engine.replay_engine import (
+    CANDLE_PAYLOAD_ROWS,
+    CHECKPOINT_INTERVAL,
+    ReplayEngine,
+    SEARCH_CHUNK_BARS,
+    ReplaySession,
+    _build_replay_orchestrator,
+    _candles_to_payload,
+    _NoFetchAdapter,
+    _slice_to_bar_close,
+)
+from backend.shared.config.scanner_modes import get_mode
+
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+WARMUP_BARS = 1200  # 15m bars before the window (> CANDLE_PAYLOAD_ROWS)
+WINDOW_BARS = 120
+SIGNAL_BARS = {3, 61, 100}
+STALE_REGIME_EVERY = 11  # bars where the fake regime detector "fails" (keep-last-good)
+REAL_WARMUP_BARS = 480  # shorter history/window for the full pipeline (~1s per bar)
+REAL_WINDOW_BARS = 3 * SEARCH_CHUNK_BARS
+
+
+def _frame(tf_minutes: int, start: datetime, end: datetime, seed: int, shuffle: bool = False) -> pd.DataFrame:
+    ts = pd.date_range(start, end, freq=f"{tf_minutes}min", inclusive="left")
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(ts)))
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "open": close + rng.normal(0, 0.1, len(ts)),
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.uniform(1, 10, len(ts)),
+        }
+    )
+    if shuffle:
+        df = df.sample(frac=1.0, random_state=seed)
+    return df
+
+
+def _frames(seed: int, shuffle_4h: bool = False):
+    start = T0 - timedelta(minutes=15 * WARMUP_BARS)
+    end = T0 + timedelta(minutes=15 * WINDOW_BARS)
+    return {
+        "15m": _frame(15, start, end, seed),
+        "1h": _frame(60, start, end, seed + 1),
+        "4h": _frame(240, start, end, seed + 2, shuffle=shuffle_4h),
+    }
+
+
+class FakeReplayOrchestrator:
+    """
+    Deterministic stand-in mirroring the real carry-over: the regime is
+    computed from the bar's data, except on every STALE_REGIME_EVERY-th bar
+    where the previous regime is kept.
+    """
+
+    _REPLAY_CARRY_ATTRS = Orchestrator._REPLAY_CARRY_ATTRS
+    export_replay_state = Orchestrator.export_replay_state
+    restore_replay_state = Orchestrator.restore_replay_state
+
+    def __init__(self):
+        self.current_regime = None
+        self.macro_context = None
+        self.calls = 0
+        self.on_call = None
+
+    def process_symbol_for_replay(self, symbol, prefetched_data, timestamp, run_id,
+                                  playback_index, session_id, prefetched_btc_data=None):
+        self.calls += 1
+        if playback_index % STALE_REGIME_EVERY != 5:
+            btc_close = float(prefetched_btc_data.timeframes["15m"]["close"].iloc[-1])
+            self.current_regime = SimpleNamespace(composite="trend", score=btc_close)
+        if self.on_call is not None:
+            self.on_call(playback_index)
+        if playback_index in SIGNAL_BARS:
+            plan = SimpleNamespace(direction="LONG", confidence_score=70.0, risk_reward=2.0)
+            return plan, None, None
+        return None, {"reason_type": "no_setup", "reason": "fake"}, None
+
+
+@pytest.fixture
+def engine():
+    return ReplayEngine(None, search_workers=0)
+
+
+def _session(engine: ReplayEngine, shuffle_4h: bool = False) -> ReplaySession:
+    symbol_full = _frames(1, shuffle_4h=shuffle_4h)
+    bar_timestamps = [T0 + timedelta(minutes=15 * i) for i in range(WINDOW_BARS)]
+    session = ReplaySession(
+        session_id=f"test{id(symbol_full)}",
+        symbol="ETH/USDT",
+        mode_name="strike",
+        window_start=T0,
+        window_end=bar_timestamps[-1] + timedelta(minutes=15),
+        multi_tf_full=symbol_full,
+        btc_full=_frames(10),
+        tf_step="15m",
+        bar_timestamps=bar_timestamps,
+        orchestrator=FakeReplayOrchestrator(),
+    )
+    engine._sessions[session.session_id] = session
+    return session
+
+
+def _analysis(result):
+    return (result.index, result.plan, result.rejection, result.regime, result.signal_fired)
+
+
+def test_index_slices_match_mask_slicing(engine):
+    session = _session(engine, shuffle_4h=True)
+    index = engine._ensure_index(session)
+    for i in (0, 1, 15, 16, 63, WINDOW_BARS - 1):
+        expected = _slice_to_bar_close(session.multi_tf_full, session.current_ts_at(i))
+        got = index.slice(i)
+        assert set(got) == set(expected)
+        for tf, df in expected.items():
+            pd.testing.assert_frame_equal(
+                got[tf], df.sort_values("timestamp", kind="stable")
+            )
+
+
+def test_full_payload_matches_candles_to_payload(engine):
+    session = _session(engine)
+    result = engine.goto(session.session_id, 40)
+    assert result.candles_mode == "full"
+    expected = _slice_to_bar_close(session.multi_tf_full, result.current_ts)
+    assert set(result.candles_by_tf) == set(expected)
+    for tf, df in expected.items():
+        assert result.candles_by_tf[tf] == _candles_to_payload(df, CANDLE_PAYLOAD_ROWS)
+    assert len(result.candles_by_tf["15m"]) == CANDLE_PAYLOAD_ROWS
+
+
+def test_delta_payloads_merge_to_full(engine):
+    session = _session(engine)
+    shown = engine.step(session.session_id, 1)
+    candles = dict(shown.candles_by_tf)
+    for n in (1, 1, 5, 16, 3):
+        result = engine.step(session.session_id, n, client_index=shown.index)
+        assert result.candles_mode == "delta"
+        assert len(result.candles_by_tf["15m"]) == n
+        for tf, added in result.candles_by_tf.items():
+            candles[tf] = (candles.get(tf, []) + added)[-CANDLE_PAYLOAD_ROWS:]
+        full = engine._render(session, result, None)
+        assert candles == full.candles_by_tf
+        shown = result
+
+    # Going backwards (or an unknown client position) falls back to full
+    back = engine.step(session.session_id, -3, client_index=shown.index)
+    assert back.candles_mode == "full"
+
+
+def test_seek_resumes_from_checkpoint(engine):
+    sequential = _session(engine)
+    expected = [
+        _analysis(engine.step(sequential.session_id, 1)) for _ in range(WINDOW_BARS)
+    ]
+    # Stepping past the end returns the last bar again
+    assert _analysis(engine.step(sequential.session_id, 1)) == expected[-1]
+
+    seeking = _session(engine)
+    fake = seeking.orchestrator
+    for target in (100, 10, 75, 99, 3, WINDOW_BARS - 1, 48):
+        before = fake.calls
+        result = engine.goto(seeking.session_id, target)
+        assert _analysis(result) == expected[target]
+        if target != 100:
+            assert fake.calls - before <= CHECKPOINT_INTERVAL
+    assert seeking.checkpoint_indices[0] == -1
+    assert all(
+        i == -1 or (i + 1) % CHECKPOINT_INTERVAL == 0 for i in seeking.checkpoint_indices
+    )
+
+
+@pytest.fixture
+def parallel_engine(monkeypatch):
+    # Pool workers are forked from this process, so they build the fake too
+    monkeypatch.setattr(
+        replay_engine, "_build_replay_orchestrator", lambda mode, adapter: FakeReplayOrchestrator()
+    )
+    monkeypatch.setattr(replay_engine, "get_mode", lambda name: None)
+    engine = ReplayEngine(None, search_workers=2)
+    yield engine
+    for session_id in list(engine._sessions):
+        engine.end_session(session_id)
+
+
+def test_parallel_search_matches_sequential(engine, parallel_engine):
+    sequential = _session(engine)
+    expected = [
+        _analysis(engine.step(sequential.session_id, 1)) for _ in range(WINDOW_BARS)
+    ]
+
+    session = _session(parallel_engine)
+    fake = session.orchestrator
+    found = []
+    while True:
+        result, bars = parallel_engine.jump_to_next_signal(
+            session.session_id, max_lookahead=WINDOW_BARS
+        )
+        if result is None:
+            break
+        assert _analysis(result) == expected[result.index]
+        assert result.candles_by_tf
+        found.append(result.index)
+    assert found == sorted(SIGNAL_BARS)
+    assert session.step_index == WINDOW_BARS - 1
+    # Most bars were computed by the pool, not the session's orchestrator
+    assert fake.calls < WINDOW_BARS // 2
+    assert [_analysis(r) for r in session.ring_buffer] == expected[-len(session.ring_buffer):]
+    assert session.orchestrator.current_regime == sequential.orchestrator.current_regime
+    assert session.checkpoint_indices == sequential.checkpoint_indices
+    for i in session.checkpoint_indices[1:]:
+        assert session.checkpoints[i].state == sequential.checkpoints[i].state
+        assert _analysis(session.checkpoints[i].result) == expected[i]
+
+    # Seeking back through the pool-filled checkpoints reproduces playback
+    for target in (10, 50, 99):
+        assert _analysis(parallel_engine.goto(session.session_id, target)) == expected[target]
+
+
+def test_jump_search_can_be_cancelled(engine):
+    session = _session(engine)
+    engine.step(session.session_id, 5)  # idx 4, past the first signal
+
+    def cancel_at(index):
+        if index == 40:
+            session.search_cancel.set()
+
+    session.orchestrator.on_call = cancel_at
+    result, bars = engine.jump_to_next_signal(session.session_id, max_lookahead=SEARCH_CHUNK_BARS * 10)
+    assert result is None
+    assert session.search_cancel.is_set()
+    assert session.step_index == 40
+    assert bars == 36
+
+    # A new search clears the flag and carries on from where it stopped
+    session.orchestrator.on_call = None
+    result, _ = engine.jump_to_next_signal(session.session_id, max_lookahead=WINDOW_BARS)
+    assert result.index == 61
+    assert engine.cancel_search(session.session_id)
+    assert not engine.cancel_search("missing")
+
+
+def _real_frames(seed: int, volume_spike: slice = slice(0)):
+    """Positive-price frames; volume_spike multiplies 15m volume on those window bars."""
+    start = T0 - timedelta(minutes=15 * REAL_WARMUP_BARS)
+    end = T0 + timedelta(minutes=15 * REAL_WINDOW_BARS)
+    frames = {}
+    for k, (tf, minutes) in enumerate((("15m", 15), ("1h", 60), ("4h", 240))):
+        ts = pd.date_range(start, end, freq=f"{minutes}min", inclusive="left")
+        rng = np.random.default_rng(seed + k)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01 * np.sqrt(minutes / 15), len(ts))))
+        frames[tf] = pd.DataFrame(
+            {
+                "timestamp": ts,
+                "open": close * (1 + rng.normal(0, 0.001, len(ts))),
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": rng.uniform(1, 10, len(ts)),
+            }
+        )
+    spike = np.arange(len(frames["15m"]))[REAL_WARMUP_BARS:][volume_spike]
+    frames["15m"].loc[spike, "volume"] *= 20
+    return frames
+
+
+def _real_session(engine: ReplayEngine) -> ReplaySession:
+    bar_timestamps = [T0 + timedelta(minutes=15 * i) for i in range(REAL_WINDOW_BARS)]
+    session = ReplaySession(
+        session_id=f"real{len(engine._sessions)}",
+        symbol="ETH/USDT",
+        mode_name="strike",
+        window_start=T0,
+        window_end=bar_timestamps[-1] + timedelta(minutes=15),
+        multi_tf_full=_real_frames(1),
+        btc_full=_real_frames(10, volume_spike=slice(6, 12)),
+        tf_step="15m",
+        bar_timestamps=bar_timestamps,
+        orchestrator=_build_replay_orchestrator(get_mode("strike"), _NoFetchAdapter()),
+    )
+    engine._sessions[session.session_id] = session
+    return session
+
+
+def test_parallel_search_matches_sequential_with_real_orchestrator():
+    """
+    Same parity through the real Orchestrator, whose regime comes from its
+    RegimeDetector: the BTC volume spike moves the regime inside the window,
+    and the pool workers must reproduce it bar for bar.
+    """
+    engine = ReplayEngine(None, search_workers=0)
+    sequential = _real_session(engine)
+    expected = [
+        _analysis(engine.step(sequential.session_id, 1)) for _ in range(REAL_WINDOW_BARS)
+    ]
+    assert len({str(analysis[3]) for analysis in expected}) > 1
+
+    parallel_engine = ReplayEngine(None, search_workers=2)
+    session = _real_session(parallel_engine)
+    orchestrator = session.orchestrator
+    calls = []
+    replay_step = orchestrator.process_symbol_for_replay
+    orchestrator.process_symbol_for_replay = lambda *a, **kw: calls.append(1) or replay_step(*a, **kw)
+    try:
+        while True:
+            result, _ = parallel_engine.jump_to_next_signal(
+                session.session_id, max_lookahead=REAL_WINDOW_BARS
+            )
+            if result is None:
+                break
+            assert _analysis(result) == expected[result.index]
+        assert session.step_index == REAL_WINDOW_BARS - 1
+        assert len(calls) < REAL_WINDOW_BARS // 2
+        assert [_analysis(r) for r in session.ring_buffer] == expected[-len(session.ring_buffer):]
+        assert orchestrator.current_regime.composite == sequential.orchestrator.current_regime.composite
+        assert orchestrator.current_regime.score == sequential.orchestrator.current_regime.score
+    finally:
+        parallel_engine.end_session(session.session_id)
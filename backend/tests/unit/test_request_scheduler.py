@@ -0,0 +1,202 @@
+"""
+Tests for backend.data.adapters.request_scheduler.
+
+Every adapter for an exchange draws from one RequestScheduler. It must:
+
+  - charge ccxt's per-endpoint cost against the exchange-wide bucket
+  - serve waiters strictly by lane (orders > positions > scan > dashboard)
+  - pause every lane after the exchange answers with a rate-limit error
+  - hook ccxt at fetch2 and replace the per-instance ccxt throttle
+  - be shared by adapter instances for the same exchange
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import ccxt
+import pytest
+
+from backend.data.adapters import request_scheduler as rs
+from backend.data.adapters.request_scheduler import (
+    ACCOUNT,
+    MARKET_DATA,
+    ORDERS,
+    BucketSpec,
+    Lane,
+    RequestScheduler,
+    classify_endpoint,
+    get_request_scheduler,
+    in_lane,
+    request_lane,
+)
+
+
+class _FakeExchange:
+    """Just enough of a ccxt Exchange: fetch2 + calculate_rate_limiter_cost."""
+
+    def __init__(self, exchange_id="fakex", rate_limit_ms=10.0, fail_with=None):
+        self.id = exchange_id
+        self.rateLimit = rate_limit_ms
+        self.enableRateLimit = True
+        self.isSandboxModeEnabled = False
+        self.fail_with = fail_with
+        self.calls = []
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        return config.get("cost", 1)
+
+    def fetch2(self, path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+        self.calls.append((path, api, method))
+        if self.fail_with:
+            raise self.fail_with("slow down")
+        return {"path": path}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(rs, "_SCHEDULERS", {})
+
+
+def test_classify_endpoint():
+    assert classify_endpoint("public", "GET") == MARKET_DATA
+    assert classify_endpoint(["v1", "public"], "GET") == MARKET_DATA
+    assert classify_endpoint("private", "GET") == ACCOUNT
+    assert classify_endpoint("privateGet", "GET") == ACCOUNT
+    assert classify_endpoint("private", "POST") == ORDERS
+    assert classify_endpoint("private", "DELETE") == ORDERS
+
+
+def test_weighted_cost_spaces_requests():
+    # 100 units/s, burst 2 s = 200 units. Emptying the bucket, then a cost-50
+    # request has to wait ~0.5 s for refill.
+    sched = RequestScheduler("t", rate_limit_ms=10.0)
+    assert sched.acquire(MARKET_DATA, cost=200) < 0.05
+    waited = sched.acquire(MARKET_DATA, cost=50)
+    assert 0.4 < waited < 0.8
+
+
+def test_request_heavier_than_bucket_waits_for_full_then_borrows():
+    sched = RequestScheduler("t", rate_limit_ms=10.0)
+    assert sched.acquire(MARKET_DATA, cost=500) < 0.05  # full bucket admits it
+    assert sched.stats()["tokens"]["global"] < 0
+
+
+def test_class_bucket_limits_private_requests():
+    sched = RequestScheduler("t", rate_limit_ms=1.0, class_limits={ORDERS: BucketSpec(capacity=2, rate=10.0)})
+    sched.acquire(ORDERS)
+    sched.acquire(ORDERS)
+    waited = sched.acquire(ORDERS)
+    assert 0.05 < waited < 0.3
+    # market data is not held back by the order bucket
+    assert sched.acquire(MARKET_DATA) < 0.05
+
+
+def test_lanes_served_in_priority_order():
+    sched = RequestScheduler("t", rate_limit_ms=10.0)
+    sched.acquire(MARKET_DATA, cost=200)  # drain: everyone below has to queue
+    order = []
+    lock = threading.Lock()
+
+    def worker(lane):
+        sched.acquire(MARKET_DATA, cost=10, lane=lane)
+        with lock:
+            order.append(lane)
+
+    threads = []
+    for lane in (Lane.DASHBOARD, Lane.SCAN, Lane.SCAN, Lane.POSITIONS, Lane.ORDERS):
+        t = threading.Thread(target=worker, args=(lane,))
+        t.start()
+        threads.append(t)
+        time.sleep(0.01)
+    for t in threads:
+        t.join(5)
+
+    assert order == [Lane.ORDERS, Lane.POSITIONS, Lane.SCAN, Lane.SCAN, Lane.DASHBOARD]
+    lanes = sched.stats()["lanes"]
+    assert lanes["scan"]["granted"] == 3 and lanes["dashboard"]["granted"] == 1
+    assert lanes["dashboard"]["wait_s_max"] >= lanes["orders"]["wait_s_max"]
+
+
+def test_lane_context():
+    assert rs.current_lane() == Lane.SCAN
+    with request_lane(Lane.ORDERS):
+        assert rs.current_lane() == Lane.ORDERS
+    assert in_lane(Lane.POSITIONS, rs.current_lane)() == Lane.POSITIONS
+    assert rs.current_lane() == Lane.SCAN
+
+
+def test_penalty_pauses_and_backs_off(monkeypatch):
+    monkeypatch.setattr(rs, "PENALTY_BASE_S", 0.1)
+    sched = RequestScheduler("t", rate_limit_ms=1.0)
+    assert sched.penalize() == pytest.approx(0.1)
+    assert sched.acquire(MARKET_DATA) >= 0.08
+    assert sched.penalize() == pytest.approx(0.2)
+    assert sched.stats()["penalties"] == 2
+
+
+def test_install_hooks_fetch2():
+    ex = _FakeExchange(rate_limit_ms=10.0)
+    sched = get_request_scheduler(ex)
+    assert ex.enableRateLimit is False
+
+    assert ex.fetch2("kline", "public", "GET", {}, None, None, {"cost": 150}) == {"path": "kline"}
+    t0 = time.monotonic()
+    ex.fetch2("kline", "public", "GET", {}, None, None, {"cost": 100})
+    assert time.monotonic() - t0 > 0.3  # 200-unit bucket: the second call waited for refill
+    assert sched.stats()["lanes"]["scan"]["granted"] == 2
+
+
+def test_rate_limit_error_penalizes(monkeypatch):
+    monkeypatch.setattr(rs, "PENALTY_BASE_S", 0.05)
+    ex = _FakeExchange(fail_with=ccxt.RateLimitExceeded)
+    sched = get_request_scheduler(ex)
+    with pytest.raises(ccxt.RateLimitExceeded):
+        ex.fetch2("kline")
+    assert sched.stats()["penalties"] == 1
+
+
+def test_shared_per_exchange_and_installed_once():
+    a, b = _FakeExchange("fakex"), _FakeExchange("fakex")
+    other = _FakeExchange("otherx")
+    sa, sb = get_request_scheduler(a), get_request_scheduler(b)
+    assert sa is sb
+    assert get_request_scheduler(other) is not sa
+    hooked = a.fetch2
+    assert get_request_scheduler(a) is sa and a.fetch2 is hooked
+
+    sandbox = _FakeExchange("fakex")
+    sandbox.isSandboxModeEnabled = True
+    assert get_request_scheduler(sandbox) is not sa
+    assert set(rs.scheduler_stats()) == {"fakex", "otherx", "fakex-testnet"}
+
+
+def test_estimate_seconds_uses_observed_cost():
+    sched = RequestScheduler("t", rate_limit_ms=10.0)
+    sched.acquire(MARKET_DATA, cost=200)
+    sched.acquire(MARKET_DATA, cost=0)  # mean observed cost 100
+    assert 9.0 < sched.estimate_seconds(10) < 11.0
+
+
+def test_install_hooks_async_fetch2():
+    import asyncio
+
+    class _AsyncExchange(_FakeExchange):
+        async def fetch2(self, path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+            self.calls.append((path, api, method))
+            return {"path": path}
+
+    ex = _AsyncExchange(exchange_id="fakex")
+    sync_ex = _FakeExchange(exchange_id="fakex")
+    sched = get_request_scheduler(ex)
+    assert get_request_scheduler(sync_ex) is sched  # one budget for sync and async clients
+
+    async def run():
+        await ex.fetch2("kline", "public", "GET", {}, None, None, {"cost": 150})
+        t0 = time.monotonic()
+        await ex.fetch2("kline", "public", "GET", {}, None, None, {"cost": 100})
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) > 0.3
+    assert sched.stats()["lanes"]["scan"]["granted"] == 2
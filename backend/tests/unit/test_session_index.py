@@ -0,0 +1,205 @@
+"""
+Tests for backend.ml.session_index and the index-backed signal dataset builder.
+
+  - sync ingests only bytes appended since the previous sync (by offset)
+  - partial trailing lines wait; rewritten / deleted files are re-indexed
+  - build_signal_dataset matches the per-signal reference implementation
+  - feature vectors are computed once per feature schema
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.ml import signal_dataset_builder as sdb
+from backend.ml.session_index import SessionLogIndex
+
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _append(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def _sig(i, result="filtered", symbol="BTC/USDT", direction="LONG", seconds=0):
+    return {
+        "symbol": symbol, "direction": direction, "result": result, "confluence": 70, "rr": 2.0,
+        "timestamp": (T0 + timedelta(seconds=seconds)).isoformat(), "n": i,
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = SessionLogIndex(
+        db_path=str(tmp_path / "index.db"),
+        sessions_dir=tmp_path / "sessions",
+        journal_path=tmp_path / "journal.jsonl",
+    )
+    yield idx
+    idx.close()
+
+
+def test_sync_reads_only_appended_lines(index, tmp_path):
+    sig_file = tmp_path / "sessions" / "session_a" / "signals.jsonl"
+    _append(sig_file, [_sig(i) for i in range(3)])
+    assert index.sync() == {"signals": 3, "trades": 0}
+    assert index.sync() == {"signals": 0, "trades": 0}
+
+    _append(sig_file, [_sig(i) for i in range(3, 5)])
+    with open(sig_file, "a", encoding="utf-8") as f:
+        f.write('{"symbol": "ETH/USDT", "resu')  # writer mid-line
+    assert index.sync()["signals"] == 2
+    with open(sig_file, "a", encoding="utf-8") as f:
+        f.write('lt": "filtered"}\nnot json\n')
+    assert index.sync()["signals"] == 1
+    assert [s.get("n") for s in index.signals()] == [0, 1, 2, 3, 4, None]
+
+
+def test_rewritten_and_deleted_files_are_reindexed(index, tmp_path):
+    session = tmp_path / "sessions" / "session_a"
+    _append(session / "trades.jsonl", [{"trade_id": "a"}, {"trade_id": "b"}])
+    _append(session / "signals.jsonl", [_sig(0)])
+    index.sync()
+    (session / "trades.jsonl").write_text(json.dumps({"trade_id": "c"}) + "\n")  # rewritten, shorter
+    index.sync()
+    assert [t["trade_id"] for t in index.session_trades([session])] == ["c"]
+
+    (session / "signals.jsonl").unlink()
+    index.sync()
+    assert index.signals() == []
+
+
+def test_signals_ordered_by_session_then_line(index, tmp_path):
+    _append(tmp_path / "sessions" / "session_b" / "signals.jsonl", [_sig(10), _sig(11)])
+    index.sync()
+    _append(tmp_path / "sessions" / "session_a" / "signals.jsonl", [_sig(0)])
+    index.sync()
+    assert [s["n"] for s in index.signals()] == [0, 10, 11]
+    assert index.signal_counts() == {"filtered": 3}
+
+
+def _reference_dataset(signals, trades):
+    """The builder's original per-signal loop, kept as the parity oracle."""
+    by_symbol = {}
+    for t in trades:
+        by_symbol.setdefault(t.get("symbol", ""), []).append(t)
+    X, y, w, ids, used = [], [], [], [], set()
+    for i, s in enumerate(signals):
+        vec = sdb.extract_features(sdb._signal_to_record(s))
+        if vec is None:
+            continue
+        sig_id = f"sig_{i}_{s.get('symbol', '')}_{s.get('timestamp', '')}"
+        if s.get("result") == "executed":
+            trade = sdb._match_signal_to_trade(s, by_symbol)
+            if trade is None or trade.get("trade_id", "") in used:
+                continue
+            used.add(trade.get("trade_id", ""))
+            reason, pnl = str(trade.get("exit_reason", "")).lower(), float(trade.get("pnl", 0))
+            if reason in ("target", "stop_loss"):
+                label, weight = int(reason == "target"), 1.0
+            elif reason in ("stagnation", "max_hours", "manual"):
+                label, weight = int(pnl > 0), 0.5 if reason == "manual" else 0.3
+            else:
+                continue
+        elif s.get("result") == "filtered":
+            label, weight = 0, sdb.FILTERED_SIGNAL_WEIGHT
+        else:
+            continue
+        X.append(vec), y.append(label), w.append(weight), ids.append(sig_id)
+    return np.stack(X), np.array(y), np.array(w, dtype=np.float32), ids
+
+
+def _random_logs(seed=7, n_signals=1500, n_trades=400):
+    rng = random.Random(seed)
+    syms = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    signals = [
+        {
+            **_sig(i, rng.choice(["executed", "executed", "filtered", "pending"]), rng.choice(syms),
+                   rng.choice(["LONG", "SHORT"]), rng.randint(0, 3 * 86400)),
+            "confluence": rng.choice([0, 60, 75]),
+        }
+        for i in range(n_signals)
+    ]
+    reasons = ["target", "stop_loss", "stagnation", "max_hours", "manual", "target_strip", "liquidated"]
+    trades = [
+        {
+            "trade_id": f"t{rng.randint(0, n_trades * 3 // 4)}", "symbol": rng.choice(syms),
+            "direction": rng.choice(["LONG", "SHORT"]), "exit_reason": rng.choice(reasons),
+            "entry_time": (T0 + timedelta(seconds=rng.randint(0, 3 * 86400))).isoformat(),
+            "pnl": rng.uniform(-5, 5),
+        }
+        for _ in range(n_trades)
+    ]
+    return signals, trades
+
+
+def test_dataset_matches_reference_for_lists():
+    signals, trades = _random_logs()
+    X, y, w, ids = sdb.build_signal_dataset(signals, trades)
+    X_ref, y_ref, w_ref, ids_ref = _reference_dataset(signals, trades)
+    assert ids == ids_ref
+    assert np.array_equal(X, X_ref) and np.array_equal(y, y_ref) and np.allclose(w, w_ref)
+    assert (w > sdb.FILTERED_SIGNAL_WEIGHT).any()
+
+
+def test_dataset_from_disk_index_and_feature_cache(index, tmp_path, monkeypatch):
+    signals, trades = _random_logs(seed=11, n_signals=600, n_trades=200)
+    _append(tmp_path / "sessions" / "session_a" / "signals.jsonl", signals[:300])
+    _append(tmp_path / "sessions" / "session_b" / "signals.jsonl", signals[300:])
+    _append(tmp_path / "journal.jsonl", trades)
+    monkeypatch.setattr(sdb, "get_session_index", lambda: index)
+
+    calls = []
+    real = sdb._signal_features
+    monkeypatch.setattr(sdb, "_signal_features", lambda s: calls.append(1) or real(s))
+    X, y, w, ids = sdb.build_signal_dataset()
+    assert ids == _reference_dataset(signals, trades)[3]
+    n_featurized = len(calls)
+    assert 0 < n_featurized <= len(signals)
+
+    sdb.build_signal_dataset()
+    assert len(calls) == n_featurized  # cached vectors reused
+    assert len(sdb.collect_signals()) == len(signals)
+    assert len(sdb.load_trade_journal()) == len(trades)
+
+
+def test_empty_dataset():
+    X, y, w, ids = sdb.build_signal_dataset([], [])
+    assert X.shape == (0, 0) and ids == []
+
+
+def _reference_kill_zone(timestamp_iso):
+    """The original per-row hour chain behind _derive_kill_zone."""
+    try:
+        hour = datetime.fromisoformat(timestamp_iso.replace("Z", "+00:00")).hour
+    except Exception:
+        return "no_session"
+    for end, label in ((8, "asian_session"), (9, "london_open"), (12, "london_session"),
+                       (14, "new_york_open"), (17, "new_york_session"), (18, "london_close")):
+        if hour < end:
+            return label
+    return "no_session"
+
+
+def test_kill_zone_labels_match_per_row_hours():
+    uniform = [ts.isoformat() + "Z" for ts in pd.date_range("2026-03-07", periods=300, freq="23min")]
+    assert sdb._derive_kill_zones(uniform) == [_reference_kill_zone(s) for s in uniform]
+
+    stamps = [ts.isoformat() for ts in pd.date_range("2026-03-07", periods=300, freq="23min")]
+    stamps += [s + "Z" for s in stamps[:50]] + [s + "+05:30" for s in stamps[:50]]
+    stamps += ["", "not a time", None, "0001-01-01T03:00:00", "9999-12-31T23:59:59"]
+    assert sdb._derive_kill_zones(stamps) == [_reference_kill_zone(s) for s in stamps]
+    assert sdb._derive_kill_zone("2026-03-07T08:30:00Z") == "london_open"
+
+    signals = [{"timestamp": "2026-03-07T12:10:00Z"}, {"timestamp": "2026-03-07T12:10:00Z", "kill_zone": "asian_session"}]
+    sdb._prepare_signals(signals)
+    assert [s["kill_zone"] for s in signals] == ["new_york_open", "asian_session"]
@@ -0,0 +1,128 @@
+"""
+Tests for the columnar SMC pattern table (backend.shared.models.smc_table).
+
+A snapshot must survive pickling through the columns unchanged (types
+included), masks must agree with the list filters they replace, views must
+read like the dataclasses, and refresh_freshness must match the per-OB
+replace(calculate_freshness) loop bit for bit — on the vectorized path
+for pd.Timestamp (scan path) as well as datetime timestamps.
+"""
+
+import copy
+import pickle
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.shared.models.smc import FVG, LiquiditySweep, OrderBlock, SMCSnapshot, StructuralBreak
+from backend.shared.models.smc_table import PatternTable, PatternView
+from backend.strategy.smc import order_blocks
+from backend.strategy.smc.order_blocks import calculate_freshness, refresh_freshness
+
+NOW = datetime(2025, 1, 6, 12)
+TFS = ["1h", "4h", "15m", "1d", "1H", "4H"]
+
+
+def _snapshot(n: int = 60) -> SMCSnapshot:
+    obs = [
+        OrderBlock(TFS[i % 6], "bullish" if i % 2 else "bearish", 101.5 + i, 100.0 + i,
+                   NOW - timedelta(hours=3.3 * i, microseconds=i), 50.0, 0.1, 40.0 + i,
+                   grade="ABC"[i % 3], source="bos", wick_agreement=bool(i % 4))
+        for i in range(n)
+    ]
+    fvgs = [FVG(TFS[i % 6], "bullish", 11.0 + i, 10.0 + i, NOW - timedelta(hours=i), 1.0, 0.2) for i in range(n)]
+    breaks = [StructuralBreak("1h", "BOS", 5.0 + i, NOW, True, direction="bearish") for i in range(n)]
+    sweeps = [LiquiditySweep(3.0 + i, "low" if i % 3 else "high", True, NOW,
+                             confirmed_at=None if i % 2 else NOW + timedelta(hours=1)) for i in range(n)]
+    return SMCSnapshot(obs, fvgs, breaks, sweeps, equal_highs=[1.0], key_levels={"pdh": 2.0})
+
+
+def test_pickle_round_trip_is_lossless_and_smaller():
+    snap = _snapshot()
+    blob = pickle.dumps(snap)
+    back = pickle.loads(blob)
+    assert back == snap
+    assert type(back.order_blocks[0].timestamp) is datetime
+    assert back.liquidity_sweeps[0].confirmed_at == NOW + timedelta(hours=1)
+    assert back.liquidity_sweeps[1].confirmed_at is None
+    assert len(blob) < 0.7 * len(pickle.dumps(snap.__dict__))
+
+
+def test_unconvertible_lists_pickle_as_lists():
+    snap = _snapshot(4)
+    aware = replace(snap.order_blocks[0], timestamp=NOW.replace(tzinfo=timezone.utc))
+    snap.order_blocks = [aware] + snap.order_blocks[1:]  # object column
+    snap.fvgs = [object()]  # not an FVG at all: pickled as is
+    back = pickle.loads(pickle.dumps(snap))
+    assert back.order_blocks == snap.order_blocks
+    assert type(back.fvgs[0]) is object
+    assert copy.copy(snap).order_blocks is snap.order_blocks
+
+
+def test_masks_match_list_filters():
+    snap = _snapshot()
+    obs = snap.table("order_blocks")
+    mask = obs.mask(timeframes=["1H", "15m"], direction="bullish", grades=["A", "B"], min_freshness=60)
+    expected = [
+        ob for ob in snap.order_blocks
+        if ob.timeframe.lower() in ("1h", "15m") and ob.direction == "bullish"
+        and ob.grade in ("A", "B") and ob.freshness_score >= 60
+    ]
+    assert obs.take(mask).to_patterns() == expected
+    assert obs.columns["timeframe"].dtype == np.int16
+    np.testing.assert_array_equal(obs.upper - obs.lower, 1.5)
+
+    sweeps = snap.table("liquidity_sweeps")
+    assert sweeps.direction.tolist()[:3] == [-1, 1, 1]
+    assert len(SMCSnapshot([], [], [], []).table("fvgs")) == 0
+
+
+def test_views_read_like_dataclasses():
+    snap = _snapshot(6)
+    views = snap.table("fvgs").views()
+    fvg = snap.fvgs[2]
+    view = views[2]
+    assert isinstance(view, PatternView)
+    assert (view.top, view.timeframe, view.timestamp) == (fvg.top, fvg.timeframe, fvg.timestamp)
+    assert view.midpoint == fvg.midpoint and view.is_fresh == fvg.is_fresh
+    assert view.contains_price(fvg.bottom + 0.5)
+    assert view.materialize() == fvg
+
+
+def test_refresh_freshness_matches_scalar_loop():
+    snap = _snapshot()
+    later = NOW + timedelta(hours=5, seconds=7)
+    expected = [replace(ob, freshness_score=calculate_freshness(ob, later)) for ob in snap.order_blocks]
+    refreshed = refresh_freshness(snap.order_blocks, later)
+    assert refreshed == expected
+    assert all(new is not old for new, old in zip(refreshed, snap.order_blocks))
+    assert refresh_freshness([], later) == []
+    assert PatternTable.from_patterns(refreshed).columns["freshness_score"].max() <= 100
+
+
+def test_timestamp_obs_take_vector_path_and_round_trip(monkeypatch):
+    # Scan-path OBs carry candle-index pd.Timestamps (any resolution)
+    index = pd.date_range("2025-01-01", periods=40, freq="37min").as_unit("ms")
+    snap = _snapshot(40)
+    snap.order_blocks = [replace(ob, timestamp=index[i]) for i, ob in enumerate(snap.order_blocks)]
+    table = snap.table("order_blocks")
+    assert table.columns["timestamp"].dtype == np.dtype("datetime64[ns]")
+    back = pickle.loads(pickle.dumps(snap)).order_blocks
+    assert back == snap.order_blocks
+    assert all(type(ob.timestamp) is pd.Timestamp and ob.timestamp.unit == "ms" for ob in back)
+
+    later = datetime(2025, 1, 3, 3, 4, 5, 678901)
+    expected = [replace(ob, freshness_score=calculate_freshness(ob, later)) for ob in snap.order_blocks]
+    monkeypatch.setattr(order_blocks, "calculate_freshness", lambda *a: pytest.fail("per-OB fallback ran"))
+    assert refresh_freshness(snap.order_blocks, later) == expected
+
+    nanos = [replace(ob, timestamp=pd.Timestamp("2025-01-01 00:00:00.123456789") + i * pd.Timedelta("1h"))
+             for i, ob in enumerate(snap.order_blocks)]
+    assert [ob.timestamp for ob in PatternTable.from_patterns(nanos).to_patterns()] == [ob.timestamp for ob in nanos]
+    monkeypatch.undo()
+    expected = [replace(ob, freshness_score=calculate_freshness(ob, later)) for ob in nanos]
+    monkeypatch.setattr(order_blocks, "calculate_freshness", lambda *a: pytest.fail("per-OB fallback ran"))
+    assert refresh_freshness(nanos, later) == expected
@@ -0,0 +1,155 @@
+"""
+Tests for backend.engine.stage_profiler.
+
+Covers:
+  - Recorder: enter() closes the previous stage, end() closes the last
+    one and reports TOTAL_STAGE; nested stage() timings accumulate
+  - Recorder is a no-op (and returns None) when no recording is open
+    or when SS_STAGE_PROFILER=0
+  - Aggregator: per-mode separation, nearest-rank percentiles,
+    histogram bucketing, last_run roll-up
+  - Flame report: collapsed-stack lines with parent self-time
+  - Worker ships timings back as the third tuple element
+"""
+
+from __future__ import annotations
+
+import pickle
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.engine import stage_profiler as sp
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    sp.clear()
+    yield
+    sp.clear()
+
+
+def test_enter_attributes_time_to_open_stage(monkeypatch):
+    clock = iter([0, 1_000_000, 3_000_000, 6_000_000, 10_000_000])
+    monkeypatch.setattr(sp.time, "perf_counter_ns", lambda: next(clock))
+    sp.begin()                 # t=0
+    sp.enter("ingest")         # t=1ms
+    sp.enter("indicators")     # t=3ms
+    sp.enter("smc")            # t=6ms
+    timings = sp.end()         # t=10ms
+    assert timings == {"ingest": 2.0, "indicators": 3.0, "smc": 4.0, "total": 10.0}
+
+
+def test_nested_stage_accumulates_across_calls():
+    sp.begin()
+    sp.enter("smc")
+    for _ in range(3):
+        with sp.stage("smc.fvgs"):
+            pass
+    timings = sp.end()
+    assert set(timings) == {"smc", "smc.fvgs", "total"}
+    assert timings["smc.fvgs"] >= 0.0
+    assert timings["smc.fvgs"] <= timings["total"]
+
+
+def test_recorder_noop_without_begin():
+    sp.enter("ingest")
+    with sp.stage("smc.fvgs"):
+        pass
+    assert sp.end() is None
+
+
+def test_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("SS_STAGE_PROFILER", "0")
+    sp.begin()
+    sp.enter("ingest")
+    assert sp.end() is None
+
+
+def test_stage_does_not_swallow_exceptions():
+    sp.begin()
+    with pytest.raises(ValueError):
+        with sp.stage("smc.order_blocks"):
+            raise ValueError("boom")
+    timings = sp.end()
+    assert "smc.order_blocks" in timings
+
+
+def test_record_percentiles_and_histogram():
+    for ms in range(1, 101):  # 1..100 ms
+        sp.record("stealth", {"smc": float(ms)})
+    snap = sp.snapshot()
+    smc = snap["stealth"]["smc"]
+    assert smc["count"] == 100
+    assert smc["p50_ms"] == 50.0
+    assert smc["p95_ms"] == 95.0
+    assert smc["p99_ms"] == 99.0
+    assert smc["max_ms"] == 100.0
+    assert sum(b["count"] for b in smc["histogram"]) == 100
+    # le=1ms bucket holds exactly the 1.0 sample (bucket bounds are inclusive)
+    assert smc["histogram"][0] == {"le_ms": 1.0, "count": 1}
+    assert smc["histogram"][-1]["le_ms"] is None
+
+
+def test_record_separates_modes_and_filters():
+    sp.record("stealth", {"smc": 10.0})
+    sp.record("Surgical", {"smc": 20.0})
+    assert set(sp.snapshot()) == {"stealth", "surgical"}
+    assert set(sp.snapshot("SURGICAL")) == {"surgical"}
+    assert sp.stats()["symbols_recorded"] == 2
+
+
+def test_record_ignores_empty_timings():
+    assert sp.record("stealth", None) is False
+    assert sp.record("stealth", {}) is False
+    assert sp.stats()["symbols_recorded"] == 0
+
+
+def test_last_run_resets_on_new_run_id():
+    sp.record("stealth", {"smc": 10.0}, run_id="r1")
+    sp.record("stealth", {"smc": 5.0}, run_id="r1")
+    assert sp.last_run()["sum_ms"] == {"smc": 15.0}
+    sp.record("stealth", {"smc": 1.0}, run_id="r2")
+    assert sp.last_run() == {"run_id": "r2", "mode": "stealth", "symbols": 1, "sum_ms": {"smc": 1.0}}
+
+
+def test_flame_report_self_time():
+    sp.record("stealth", {"total": 100.0, "smc": 60.0, "smc.fvgs": 20.0, "confluence": 30.0})
+    lines = set(sp.flame_report("stealth").splitlines())
+    assert lines == {
+        "symbol;confluence 30000",
+        "symbol;smc 40000",          # 60 - 20 child
+        "symbol;smc;fvgs 20000",
+        "symbol 10000",              # 100 - (60 + 30)
+    }
+
+
+def test_worker_returns_stage_timings():
+    """The ProcessPool worker ships a picklable {stage: ms} dict back as the
+    third element of its result tuple."""
+    from backend.engine import orchestrator as orch_mod
+
+    saved_orch = orch_mod._WORKER_ORCHESTRATOR
+    saved_cfg_id = orch_mod._WORKER_CONFIG_ID
+    try:
+        mock_orch = MagicMock()
+
+        def _fake_process(*args, **kwargs):
+            sp.enter("indicators")
+            return "plan", None
+
+        mock_orch._process_symbol.side_effect = _fake_process
+        cfg = SimpleNamespace()
+        orch_mod._WORKER_ORCHESTRATOR = mock_orch
+        orch_mod._WORKER_CONFIG_ID = id(cfg)
+
+        args = ("BTC/USDT", "run-1", 1730000000, None, cfg, None, None, "mode", 0.0, 0.0)
+        plan, rejection_info, timings = orch_mod._parallel_process_symbol_worker(args)
+
+        assert (plan, rejection_info) == ("plan", None)
+        assert set(timings) == {"indicators", "total"}
+        assert pickle.loads(pickle.dumps(timings)) == timings
+    finally:
+        orch_mod._WORKER_ORCHESTRATOR = saved_orch
+        orch_mod._WORKER_CONFIG_ID = saved_cfg_id
@@ -0,0 +1,97 @@
+"""
+Tests for the vectorized synthetic universe (backend.data.adapters.synthetic_universe).
+
+Same seed must give the same data; candles must be valid OHLC; coarser
+timeframes must be the aggregate of finer ones; injected order blocks must
+leave a fair value gap and sweeps must wick through the prior range and
+close back inside; the long layout must round-trip through BacktestAdapter
+and the shared-memory block through attach().
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data.adapters.synthetic_universe import SWEEP_LOOKBACK, SyntheticUniverse, generate_universe
+from backend.engine.backtest_engine import BacktestAdapter
+from backend.shared.models.data import MultiTimeframeData
+
+
+@pytest.fixture(scope="module")
+def universe():
+    return generate_universe(symbols=20, timeframes=("1w", "1d", "4h", "1h"), bars=300, seed=7, pattern_rate=0.01)
+
+
+def test_seeded_and_valid(universe):
+    again = generate_universe(symbols=20, timeframes=("1w", "1d", "4h", "1h"), bars=300, seed=7, pattern_rate=0.01)
+    for tf in universe.timeframes:
+        np.testing.assert_array_equal(universe.ohlcv[tf], again.ohlcv[tf])
+        rows = universe.ohlcv[tf]
+        assert rows.shape == (20, 300, 5)
+        o, h, l, c, v = np.moveaxis(rows, -1, 0)
+        assert (l > 0).all() and (v > 0).all()
+        assert (h >= np.maximum(o, c)).all() and (l <= np.minimum(o, c)).all()
+    assert not np.array_equal(generate_universe(20, ("1h",), 300, seed=8).ohlcv["1h"], universe.ohlcv["1h"])
+
+
+def test_timeframes_aggregate(universe):
+    h1 = universe.frame("SYN003/USDT", "1h").set_index("timestamp")
+    h4 = universe.frame("SYN003/USDT", "4h").set_index("timestamp")
+    resampled = h1.resample("4h").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    ).dropna()
+    pd.testing.assert_frame_equal(h4.loc[resampled.index[0]:], resampled, check_freq=False)
+    weekly = universe.frame("SYN003/USDT", "1w")["timestamp"]
+    assert (weekly.dt.dayofweek == 0).all()
+    ends = {tf: universe.timestamps[tf][-1] + pd.Timedelta(tf).value for tf in universe.timeframes}
+    assert len(set(ends.values())) == 1
+
+
+def test_injected_patterns(universe):
+    rows = universe.ohlcv["1h"]
+    obs = universe.patterns["1h"]["order_block"]
+    assert len(obs) > 10
+    gap = 0
+    for s, i, d in obs:
+        o, h, l, c = rows[s, i : i + 3, :4].T
+        gap += (l[2] > h[0]) if d > 0 else (h[2] < l[0])
+    assert gap >= 0.9 * len(obs)
+
+    sweeps = universe.patterns["1h"]["sweep"]
+    assert len(sweeps)
+    for s, j, d in sweeps:
+        prior = rows[s, j - SWEEP_LOOKBACK : j]
+        if d > 0:
+            assert rows[s, j, 2] < prior[:, 2].min() < rows[s, j, 3]
+        else:
+            assert rows[s, j, 1] > prior[:, 1].max() > rows[s, j, 3]
+
+
+def test_backtest_adapter_and_multi_timeframe(universe):
+    adapter = BacktestAdapter(data=universe.to_backtest_frame())
+    assert adapter.symbols == universe.symbols
+    pd.testing.assert_frame_equal(adapter.fetch_ohlcv("SYN011/USDT", "4h"), universe.frame("SYN011/USDT", "4h"))
+    assert adapter.fetch_ohlcv("SYN011/USDT", "5m").empty
+
+    mtf = universe.multi_timeframe("SYN011/USDT")
+    assert isinstance(mtf, MultiTimeframeData)
+    assert list(mtf.timeframes) == universe.timeframes
+
+
+def test_shared_memory_round_trip(universe):
+    shm, spec = universe.share()
+    try:
+        attached = SyntheticUniverse.attach(spec)
+        np.testing.assert_array_equal(attached.ohlcv["1d"], universe.ohlcv["1d"])
+        pd.testing.assert_frame_equal(attached.frame("SYN000/USDT", "1h"), universe.frame("SYN000/USDT", "1h"))
+        attached.close()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_rejects_inconsistent_timeframes():
+    with pytest.raises(ValueError):
+        generate_universe(2, ("1M", "1d"), 10)
+    with pytest.raises(ValueError):
+        generate_universe(2, ("3m", "5m"), 10)
@@ -0,0 +1,138 @@
+"""
+Tests for the telemetry rollup layer in backend.bot.telemetry.storage.
+
+  - hot payload fields land in indexed columns (reason, reason_type, mode)
+  - counts over arbitrary [start, end] ranges equal a raw count, although
+    whole minutes are read from the per-minute rollups
+  - databases written before the rollups existed are migrated in place
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.bot.telemetry.events import EventType, TelemetryEvent
+from backend.bot.telemetry.logger import TelemetryLogger
+from backend.bot.telemetry.storage import TelemetryStorage
+
+T0 = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(event_type, seconds, symbol=None, run_id="run1", **data):
+    return TelemetryEvent(
+        event_type=event_type,
+        timestamp=T0 + timedelta(seconds=seconds),
+        run_id=run_id,
+        symbol=symbol,
+        data=data,
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return TelemetryStorage(db_path=str(tmp_path / "telemetry.db"))
+
+
+def _brute_count(events, event_type=None, symbol=None, start=None, end=None):
+    return sum(
+        1
+        for e in events
+        if (event_type is None or e.event_type == event_type)
+        and (symbol is None or e.symbol == symbol)
+        and (start is None or e.timestamp >= start)
+        and (end is None or e.timestamp <= end)
+    )
+
+
+def test_hot_columns_and_run_mode(storage):
+    storage.store_event(_event(EventType.SCAN_STARTED, 0, profile="stealth"))
+    storage.store_event(
+        _event(EventType.SIGNAL_REJECTED, 5, "BTC/USDT", reason="Below minimum", gate_name="low_confluence")
+    )
+    with sqlite3.connect(storage.db_path) as conn:
+        rows = conn.execute(
+            "SELECT event_type, reason, reason_type, mode FROM telemetry_events ORDER BY id"
+        ).fetchall()
+    assert rows == [
+        ("scan_started", None, None, "stealth"),
+        ("signal_rejected", "Below minimum", "low_confluence", "stealth"),
+    ]
+    counts = storage.get_rollup_counts(("reason_type", "mode"), filters={"event_type": "signal_rejected"})
+    assert counts == {("low_confluence", "stealth"): 1}
+
+
+def test_range_counts_match_raw_events(storage):
+    rng = random.Random(3)
+    types = [EventType.SCAN_COMPLETED, EventType.SIGNAL_GENERATED, EventType.SIGNAL_REJECTED]
+    events = [
+        _event(rng.choice(types), rng.uniform(0, 1800), rng.choice(["BTC/USDT", "ETH/USDT", None]))
+        for _ in range(400)
+    ]
+    events.append(_event(EventType.SIGNAL_REJECTED, 600, "BTC/USDT"))  # exactly on a minute
+    for e in events:
+        storage.store_event(e)
+
+    bounds = [None, T0 + timedelta(seconds=600)] + [
+        T0 + timedelta(seconds=rng.uniform(-60, 1900)) for _ in range(30)
+    ]
+    for _ in range(200):
+        start, end = rng.choice(bounds), rng.choice(bounds)
+        et = rng.choice(types + [None])
+        sym = rng.choice(["BTC/USDT", None])
+        assert storage.get_event_count(et, sym, start, end) == _brute_count(events, et, sym, start, end)
+
+
+def test_breakdown_through_logger(storage):
+    for i, reason in enumerate(["a", "a", "b", None]):
+        data = {"reason": reason} if reason else {}
+        storage.store_event(_event(EventType.SIGNAL_REJECTED, i * 40, "BTC/USDT", **data))
+    storage.store_event(_event(EventType.SCAN_COMPLETED, 10))
+    telemetry = TelemetryLogger(storage=storage)
+
+    assert telemetry.get_event_breakdown("event_type") == {"signal_rejected": 4, "scan_completed": 1}
+    assert telemetry.get_event_breakdown(
+        "reason", event_type=EventType.SIGNAL_REJECTED, start_time=(T0 + timedelta(seconds=30)).isoformat()
+    ) == {"a": 1, "b": 1, "": 1}
+    with pytest.raises(ValueError):
+        storage.get_rollup_counts(("data_json",))
+
+
+def test_legacy_database_is_migrated(tmp_path):
+    db = tmp_path / "telemetry.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE telemetry_events (id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL, "
+            "timestamp TEXT NOT NULL, run_id TEXT, symbol TEXT, data_json TEXT, "
+            "created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        rows = [
+            ("scan_started", T0, "r1", None, {"profile": "surgical"}),
+            ("signal_rejected", T0 + timedelta(seconds=30), "r1", "SOL/USDT", {"reason": "x", "gate_name": "rr"}),
+            ("signal_rejected", T0 + timedelta(seconds=90), "r1", "SOL/USDT", {"reason": "x", "gate_name": "rr"}),
+        ]
+        conn.executemany(
+            "INSERT INTO telemetry_events (event_type, timestamp, run_id, symbol, data_json) VALUES (?, ?, ?, ?, ?)",
+            [(t, ts.isoformat(), r, s, json.dumps(d)) for t, ts, r, s, d in rows],
+        )
+
+    storage = TelemetryStorage(db_path=str(db))
+    assert storage.get_rollup_counts(("reason_type", "mode"), filters={"event_type": "signal_rejected"}) == {
+        ("rr", "surgical"): 2
+    }
+    series = storage.get_rollup_series(EventType.SIGNAL_REJECTED)
+    assert [(r["minute"], r["count"]) for r in series] == [("2026-03-01T12:00", 1), ("2026-03-01T12:01", 1)]
+    # Re-opening does not double-count
+    assert TelemetryStorage(db_path=str(db)).get_event_count(EventType.SIGNAL_REJECTED) == 2
+
+
+def test_cleanup_drops_old_rollups(storage):
+    old = TelemetryEvent(EventType.INFO_MESSAGE, datetime.now(timezone.utc) - timedelta(days=40))
+    storage.store_event(old)
+    storage.store_event(TelemetryEvent(EventType.INFO_MESSAGE, datetime.now(timezone.utc)))
+    assert storage.cleanup_old_events(older_than_days=30) == 1
+    assert storage.get_event_count(EventType.INFO_MESSAGE) == 1
@@ -0,0 +1,179 @@
+"""
+Tests for backend.data.tf_synthesis and its use in IngestionPipeline.
+
+An expired higher-timeframe cache entry is extended from a lower timeframe
+resolved in the same fetch instead of being re-downloaded. The synthesized
+candles must equal the exchange's, gaps and partial buckets must fall back
+to the exchange, and a failed periodic verification must refetch.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.data.ingestion_pipeline import IngestionPipeline
+from backend.data.ohlcv_cache import OHLCVCache
+from backend.data.tf_synthesis import (
+    TimeframeSynthesizer,
+    aggregate,
+    derivation_sources,
+    extend,
+    matches,
+)
+
+_FREQ = {"5m": "5min", "15m": "15min", "1h": "1h", "4h": "4h", "1d": "1D"}
+
+
+def _master_5m(days: int = 25) -> pd.DataFrame:
+    """Random-walk 5m candles ending with the currently forming one."""
+    now = pd.Timestamp(time.time(), unit="s").floor("5min")
+    idx = pd.date_range(end=now, periods=days * 288, freq="5min")
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, len(idx)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.2, len(idx)))
+    return pd.DataFrame(
+        {
+            "timestamp": idx,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.uniform(1, 10, len(idx)).round(3),
+        }
+    )
+
+
+def _resample(master: pd.DataFrame, tf: str) -> pd.DataFrame:
+    out = (
+        master.set_index("timestamp")
+        .resample(_FREQ[tf])
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        .reset_index()
+    )
+    return out
+
+
+class _FakeAdapter:
+    def __init__(self, master: pd.DataFrame):
+        self.master = master
+        self.calls = []
+        self.volume_skew = 1.0
+
+    def fetch_ohlcv(self, symbol, timeframe, limit=500, since=None):
+        self.calls.append((timeframe, limit))
+        df = _resample(self.master, timeframe).tail(limit).reset_index(drop=True)
+        df["volume"] = df["volume"] * self.volume_skew
+        return df
+
+
+def _pipeline(adapter, verify_interval_s=3600.0):
+    pipe = IngestionPipeline(adapter, use_cache=True)
+    pipe._cache = OHLCVCache()
+    pipe._synth = TimeframeSynthesizer(verify_interval_s=verify_interval_s)
+    return pipe
+
+
+def test_aggregate_matches_resample_and_drops_partial_buckets():
+    master = _master_5m(days=3)
+    hourly = _resample(master, "1h")
+    # Cut mid-bucket at both ends: the first and last 4h buckets are partial.
+    src = hourly.iloc[2:-1].reset_index(drop=True)
+    got = aggregate(src, "1h", "4h")
+    want = _resample(master, "4h")
+    want = want[(want["timestamp"] >= got["timestamp"].iloc[0]) & (want["timestamp"] <= got["timestamp"].iloc[-1])]
+    assert len(got) == len(want) > 0
+    for col in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_allclose(got[col].to_numpy(), want[col].to_numpy())
+    first_full = hourly["timestamp"].iloc[2].ceil("4h")
+    assert got["timestamp"].iloc[0] == first_full
+
+
+def test_derivation_sources_coarsest_first():
+    assert derivation_sources("4h", ["5m", "1h", "15m", "1d"]) == ["1h", "15m", "5m"]
+    assert derivation_sources("1w", ["1d", "4h"]) == ["1d", "4h"]
+    assert derivation_sources("1h", ["4h"]) == []
+
+
+def test_extend_uses_base_alignment_for_weeks():
+    # Weekly candles anchored on Monday (not the epoch Thursday).
+    days = pd.date_range("2024-01-01", periods=7 * 6, freq="1D")  # 2024-01-01 is a Monday
+    daily = pd.DataFrame(
+        {"timestamp": days, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 1.0}
+    )
+    weekly = aggregate(daily, "1d", "1w", anchor_ns=days[0].value)
+    assert list(weekly["timestamp"].dt.dayofweek.unique()) == [0] and len(weekly) == 6
+
+    base = weekly.iloc[:4]
+    out = extend(base, daily, "1d", "1w")
+    assert len(out) == 4
+    assert out["timestamp"].iloc[-1] == weekly["timestamp"].iloc[-1]
+    assert out["volume"].iloc[-1] == 7.0
+
+
+def test_extend_refuses_gap():
+    master = _master_5m(days=3)
+    four_h = aggregate(_resample(master, "1h"), "1h", "4h")
+    hourly = _resample(master, "1h")
+    # Source starts two buckets after the base ends -> gap
+    base = four_h.iloc[:5]
+    src = hourly[hourly["timestamp"] >= base["timestamp"].iloc[-1] + pd.Timedelta(hours=12)]
+    assert extend(base, src, "1h", "4h") is None
+
+
+def test_expired_htf_is_synthesized_not_fetched():
+    master = _master_5m()
+    adapter = _FakeAdapter(master)
+    pipe = _pipeline(adapter)
+
+    first = pipe.fetch_multi_timeframe("BTC/USDT", ["4h", "1h"], limit=200)
+    assert sorted(tf for tf, _ in adapter.calls) == ["1h", "4h"]
+    assert list(first.timeframes) == ["4h", "1h"]
+
+    # Age the 4h entry: drop its two newest candles so it is expired, and
+    # let the 1h entry expire so it is refetched.
+    stale = first.timeframes["4h"].iloc[:-2]
+    pipe._cache.set("BTC/USDT", "4h", stale)
+    pipe._cache.invalidate("BTC/USDT", "1h")
+    adapter.calls.clear()
+
+    second = pipe.fetch_multi_timeframe("BTC/USDT", ["4h", "1h"], limit=200)
+    assert adapter.calls == [("1h", 200)]
+    got = second.timeframes["4h"]
+    want = first.timeframes["4h"]
+    assert len(got) == len(stale)
+    assert got["timestamp"].iloc[-1] == want["timestamp"].iloc[-1]
+    ok, overlap = matches(got, want)
+    assert ok and overlap == len(got)
+    assert pipe._synth.stats()["synthesized"] == 1
+
+
+def test_failed_verification_falls_back_to_exchange():
+    master = _master_5m()
+    adapter = _FakeAdapter(master)
+    pipe = _pipeline(adapter, verify_interval_s=0.0)
+    first = pipe.fetch_multi_timeframe("BTC/USDT", ["4h", "1h"], limit=200)
+    pipe._cache.set("BTC/USDT", "4h", first.timeframes["4h"].iloc[:-2])
+    pipe._cache.invalidate("BTC/USDT", "1h")
+    adapter.calls.clear()
+    adapter.volume_skew = 1.5  # exchange now disagrees with local aggregation
+
+    pipe.fetch_multi_timeframe("BTC/USDT", ["4h", "1h"], limit=200)
+    assert [tf for tf, _ in adapter.calls] == ["1h", "4h", "4h"]  # source, verify, refetch
+    stats = pipe._synth.stats()
+    assert stats["mismatches"] == 1 and stats["synthesized"] == 0
+
+
+def test_source_history_too_short_fetches():
+    master = _master_5m()
+    adapter = _FakeAdapter(master)
+    pipe = _pipeline(adapter)
+    first = pipe.fetch_multi_timeframe("BTC/USDT", ["4h"], limit=200)
+    # Base far older than anything the 1h series covers
+    pipe._cache.set("BTC/USDT", "4h", first.timeframes["4h"].iloc[:-60])
+    adapter.calls.clear()
+    pipe.fetch_multi_timeframe("BTC/USDT", ["4h", "1h"], limit=100)
+    assert sorted(tf for tf, _ in adapter.calls) == ["1h", "4h"]
@@ -0,0 +1,156 @@
+"""
+Tests for backend.analysis.universe_regime.
+
+The universe pass replaces per-worker trend derivation, so it must agree
+with RegimeDetector.analyze_timeframe_trend symbol-for-symbol:
+
+  - vectorized trend_inputs == the single-frame computation per column
+  - compute_universe_regime trend/score/reason == analyze_timeframe_trend
+    on the same TF _detect_trend would pick (mixed TFs, short frames)
+  - detect_symbol_regime(precomputed_trend=...) skips _detect_trend
+  - breadth / dispersion / liquidity rank are cross-sectional aggregates
+  - the worker accepts the legacy 10-tuple and the 11-tuple with a trend
+"""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.analysis.regime_detector import RegimeDetector
+from backend.analysis.universe_regime import (
+    PrecomputedTrend,
+    compute_universe_regime,
+    frame_trend_inputs,
+    trend_inputs,
+)
+from backend.diagnostics.perf_bench import _synthetic_frame
+from backend.shared.models.data import MultiTimeframeData
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def _universe():
+    out = {}
+    for i in range(8):
+        sym = f"U{i}/USDT"
+        tfs = ("1d", "4h") if i % 3 else ("4h", "1h")
+        out[sym] = MultiTimeframeData(
+            symbol=sym, timeframes={tf: _synthetic_frame(sym, tf, 120 + 40 * (i % 2)) for tf in tfs}
+        )
+    # Too short for trend analysis
+    out["SHORT/USDT"] = MultiTimeframeData(
+        symbol="SHORT/USDT", timeframes={"1d": _synthetic_frame("SHORT/USDT", "1d", 30)}
+    )
+    return out
+
+
+def test_vectorized_inputs_match_single_frame():
+    frames = {f"S{i}": _synthetic_frame(f"S{i}/USDT", "1d", 80) for i in range(5)}
+    stacked = trend_inputs(
+        pd.DataFrame({k: v["high"].to_numpy() for k, v in frames.items()}),
+        pd.DataFrame({k: v["low"].to_numpy() for k, v in frames.items()}),
+        pd.DataFrame({k: v["close"].to_numpy() for k, v in frames.items()}),
+    )
+    for sym, df in frames.items():
+        single = frame_trend_inputs(df)
+        for col in ("adx", "slope_pct", "normalized_slope", "atr_pct"):
+            assert stacked.loc[sym, col] == pytest.approx(single[col], rel=1e-9)
+
+
+def test_adx_matches_textbook_loop():
+    """Row-by-row reference of the historical TR/DM definitions."""
+    df = _synthetic_frame("ADX/USDT", "1d", 70)
+    h, l, c = df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+    n = len(df)
+    tr = np.empty(n)
+    pdm = np.zeros(n)
+    mdm = np.zeros(n)
+    tr[0] = h[0] - l[0]
+    for i in range(1, n):
+        tr[i] = max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+        up, down = h[i] - h[i - 1], l[i - 1] - l[i]
+        pdm[i] = up if up > down and up > 0 else 0.0
+        mdm[i] = down if down > pdm[i] and down > 0 else 0.0
+    atr = pd.Series(tr).rolling(14).mean()
+    pdi = 100 * pd.Series(pdm).rolling(14).mean() / atr
+    mdi = 100 * pd.Series(mdm).rolling(14).mean() / atr
+    dx = 100 * (pdi - mdi).abs() / (pdi + mdi + 1e-10)
+    expected = dx.rolling(14).mean().iloc[-1]
+    assert frame_trend_inputs(df)["adx"] == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("profile", ["stealth_balanced", "precision"])
+def test_universe_trends_match_per_symbol_analysis(profile):
+    det = RegimeDetector(profile)
+    universe = _universe()
+    result = compute_universe_regime(universe, det)
+
+    assert set(result.trends) == set(universe)
+    for sym, mtf in universe.items():
+        pre = result.trends[sym]
+        expected_tf = "1d" if "1d" in mtf.timeframes else "4h"
+        assert pre.timeframe == expected_tf
+        expected = det.analyze_timeframe_trend(mtf.timeframes[expected_tf], expected_tf)
+        assert (pre.trend, pre.score, pre.reason) == expected, sym
+
+    assert result.trends["SHORT/USDT"].reason == "Insufficient data"
+
+
+def test_cross_sectional_aggregates():
+    universe = _universe()
+    result = compute_universe_regime(universe, RegimeDetector())
+    labels = [t.trend for t in result.trends.values()]
+    n = len(labels)
+    assert result.breadth_up_pct == pytest.approx(
+        100 * sum(t in ("up", "strong_up") for t in labels) / n
+    )
+    assert result.breadth_down_pct == pytest.approx(
+        100 * sum(t in ("down", "strong_down") for t in labels) / n
+    )
+    assert 0.0 <= result.above_ma20_pct <= 100.0
+    assert result.return_dispersion_pct > 0.0
+    assert result.median_atr_pct > 0.0
+    # Liquidity only needs the 20-bar window, so the short frame is ranked too
+    assert set(result.liquidity_pct_rank) == set(universe)
+    assert max(result.liquidity_pct_rank.values()) == 100.0
+    assert result.to_dict()["symbols"] == n
+
+
+def test_detect_symbol_regime_uses_precomputed_trend():
+    det = RegimeDetector()
+    mtf = _universe()["U1/USDT"]
+    indicators = MagicMock()
+    indicators.by_timeframe = {}
+    pre = PrecomputedTrend(symbol="U1/USDT", timeframe="1d", trend="strong_up", score=85.0, reason="x")
+
+    with patch.object(det, "_detect_trend", side_effect=AssertionError("should not run")):
+        regime = det.detect_symbol_regime("U1/USDT", mtf, indicators, precomputed_trend=pre)
+    assert regime.trend == "strong_up"
+    assert regime.volatility == "normal"  # empty IndicatorSet → neutral volatility
+    assert regime.score == det._score_symbol_regime("strong_up", "normal")
+
+
+def test_worker_forwards_precomputed_trend():
+    import backend.engine.orchestrator as orch_mod
+
+    pre = PrecomputedTrend(symbol="X/USDT", timeframe="1d", trend="down", score=70.0, reason="x")
+    fake = MagicMock()
+    fake._process_symbol.return_value = ("plan", None)
+    base_args = ("X/USDT", "run", pd.Timestamp("2026-01-01"), None, object(), None, None, None, 0.0, 0.0)
+
+    with patch.object(orch_mod, "_WORKER_ORCHESTRATOR", fake), \
+            patch.object(orch_mod, "_WORKER_CONFIG_ID", id(base_args[4])):
+        orch_mod._parallel_process_symbol_worker(base_args + (pre,))
+        assert fake._process_symbol.call_args.kwargs["precomputed_trend"] is pre
+        orch_mod._parallel_process_symbol_worker(base_args)
+        assert fake._process_symbol.call_args.kwargs["precomputed_trend"] is None
@@ -73,7 +73,7 @@ def test_worker_syncs_current_regime_onto_orchestrator():
         assert mock_orch.current_regime is sentinel_regime  # propagated (was None pre-fix)
         assert mock_orch.macro_context == "macro_ctx"        # still synced
         assert mock_orch.scanner_mode == "scanner_mode"      # still synced
-        assert result == ("plan", None)
+        assert result[:2] == ("plan", None)                 # + stage timings (3rd element)
         mock_orch._process_symbol.assert_called_once()
     finally:
         orch_mod._WORKER_ORCHESTRATOR = saved_orch
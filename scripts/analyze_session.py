@@ -26,6 +26,14 @@ from typing import Any, Dict, List, Optional, Tuple
 REPO_ROOT = Path(__file__).resolve().parent.parent
 SESSIONS_DIR = REPO_ROOT / "logs" / "paper_trading"
 
+sys.path.insert(0, str(REPO_ROOT))
+try:
+    # Incremental SQLite index shared with the API's ML dataset builder:
+    # repeat runs only parse lines appended since the last one.
+    from backend.ml.session_index import get_session_index
+except ImportError:
+    get_session_index = None
+
 # ── Colours (disabled on non-TTY) ─────────────────────────────────────────────
 _USE_COLOUR = sys.stdout.isatty()
 
@@ -1123,10 +1131,17 @@ def main():
     all_trades: List[Dict] = []
     all_signals: List[Dict] = []
 
-    for sd in session_dirs:
-        sd = Path(sd)
-        all_trades.extend(_load_jsonl(sd / "trades.jsonl"))
-        all_signals.extend(_load_jsonl(sd / "signals.jsonl"))
+    session_dirs = [Path(sd).resolve() for sd in session_dirs]
+    if get_session_index is not None:
+        index = get_session_index()
+        index.sync(session_dirs)
+        for sd in session_dirs:
+            all_trades.extend(index.session_trades([sd]))
+            all_signals.extend(index.signals([sd]))
+    else:
+        for sd in session_dirs:
+            all_trades.extend(_load_jsonl(sd / "trades.jsonl"))
+            all_signals.extend(_load_jsonl(sd / "signals.jsonl"))
 
     # ── Decision cards ────────────────────────────────────────────────────────
     show_cards = args.cards or args.card or (not args.no_cards and len(all_trades) <= 30)
@@ -75,6 +75,24 @@ function up(v: unknown): string {
   return (typeof v === 'string' ? v : '').toUpperCase();
 }
 
+// Steps requested with a client_index come back with candles_mode 'delta':
+// only the bars closed since `base` was shown. Append them to base's series
+// and keep the last candles_window bars so the chart sees the same array a
+// full response would have carried.
+function mergeReplayCandles(
+  base: ReplayStepResponse | null,
+  r: ReplayStepResponse,
+): ReplayStepResponse {
+  if (r.candles_mode !== 'delta' || !base) return r;
+  const windowSize = r.candles_window ?? 1000;
+  const merged: Record<string, ReplayCandle[]> = { ...base.candles_by_tf };
+  for (const [tf, added] of Object.entries(r.candles_by_tf)) {
+    const joined = added.length ? (merged[tf] ?? []).concat(added) : merged[tf] ?? [];
+    merged[tf] = joined.length > windowSize ? joined.slice(joined.length - windowSize) : joined;
+  }
+  return { ...r, candles_by_tf: merged };
+}
+
 // ---------------------------------------------------------------------------
 // Hotkey hook (no dependency)
 // ---------------------------------------------------------------------------
@@ -1165,6 +1183,17 @@ export function Replay() {
   const [playState, setPlayState] = useState<PlayState>('idle');
   const [session, setSession] = useState<SessionMeta | null>(null);
   const [step, setStep] = useState<ReplayStepResponse | null>(null);
+  // Latest displayed step for async handlers (closures may hold a stale
+  // `step`); delta responses merge onto the step their request was sent from.
+  const stepRef = useRef<ReplayStepResponse | null>(null);
+  const commitStep = useCallback(
+    (r: ReplayStepResponse | null, base: ReplayStepResponse | null = null) => {
+      const next = r ? mergeReplayCandles(base, r) : null;
+      stepRef.current = next;
+      setStep(next);
+    },
+    [],
+  );
   const [speed, setSpeed] = useState(1);
   const [showBriefing, setShowBriefing] = useState(false);
   const [showHelp, setShowHelp] = useState(false);
@@ -1228,7 +1257,7 @@ export function Replay() {
         if (!resp.data) throw new Error('No data in response');
         const newSession = resp.data as SessionMeta;
         setSession(newSession);
-        setStep(null);
+        commitStep(null);
         setScoreHistory(new Map());
         setSignalIndices(new Set());
         setShowBriefing(true);
@@ -1245,7 +1274,7 @@ export function Replay() {
           const first = await api.stepReplay(newSession.session_id, 1);
           if (first.data) {
             const r = first.data as ReplayStepResponse;
-            setStep(r);
+            commitStep(r);
             if (r.confluence?.total_score != null) {
               setScoreHistory((prev) => {
                 const next = new Map(prev);
@@ -1269,7 +1298,7 @@ export function Replay() {
         setPlayState('idle');
       }
     },
-    [session],
+    [session, commitStep],
   );
 
   // ---- Step execution ----
@@ -1277,11 +1306,12 @@ export function Replay() {
     async (n: number) => {
       if (!session) return;
       try {
-        const result = await api.stepReplay(session.session_id, n);
+        const base = stepRef.current;
+        const result = await api.stepReplay(session.session_id, n, base?.index);
         if (result.error) throw new Error(result.error);
         if (!result.data) return;
         const r = result.data as ReplayStepResponse;
-        setStep(r);
+        commitStep(r, base);
         // Update score history + signal indices
         if (r.confluence?.total_score != null) {
           setScoreHistory((prev) => {
@@ -1305,7 +1335,7 @@ export function Replay() {
         setErrorMsg(e?.message ?? 'Step failed');
       }
     },
-    [session],
+    [session, commitStep],
   );
 
   // ---- Scrub: absolute index. Computes delta and calls step. ----
@@ -1321,15 +1351,20 @@ export function Replay() {
   );
 
   // ---- Jump to next signal ----
+  // A search can scan many bars; Escape while it runs cancels the search
+  // (server keeps the bars it already scanned) instead of ending the session.
+  const jumpingRef = useRef(false);
   const doJump = useCallback(async () => {
     if (!session) return;
+    jumpingRef.current = true;
     try {
-      const result = await api.jumpToNextSignal(session.session_id, 100);
+      const base = stepRef.current;
+      const result = await api.jumpToNextSignal(session.session_id, 100, base?.index);
       if (result.error) throw new Error(result.error);
       if (!result.data) return;
       const r = result.data as { found: boolean; bars_advanced: number; step: ReplayStepResponse | null };
       if (r.step) {
-        setStep(r.step);
+        commitStep(r.step, base);
         if (r.step.confluence?.total_score != null) {
           setScoreHistory((prev) => {
             const next = new Map(prev);
@@ -1347,8 +1382,10 @@ export function Replay() {
       }
     } catch (e: any) {
       setErrorMsg(e?.message ?? 'Jump failed');
+    } finally {
+      jumpingRef.current = false;
     }
-  }, [session]);
+  }, [session, commitStep]);
 
   // ---- Reset to first bar ----
   const doReset = useCallback(() => {
@@ -1439,10 +1476,12 @@ export function Replay() {
     else if (e.key === '5') setSpeed(5);
     else if (e.key === '0') setSpeed(10);
     else if (e.key === 'Escape') {
-      if (session) {
+      if (session && jumpingRef.current) {
+        api.cancelReplaySearch(session.session_id).catch(() => {});
+      } else if (session) {
         api.deleteReplaySession(session.session_id).catch(() => {});
         setSession(null);
-        setStep(null);
+        commitStep(null);
         setScoreHistory(new Map());
         setSignalIndices(new Set());
         setPlayState('idle');
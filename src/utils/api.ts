@@ -141,6 +141,10 @@ export interface ReplayStepResponse {
   smc_snapshot: ReplaySMC | null;
   regime: ReplayRegime | null;
   signal_fired: boolean;
+  /** 'delta': candles_by_tf holds only bars closed since the client_index sent with the request */
+  candles_mode?: 'full' | 'delta';
+  /** Bars per TF the client keeps after appending a delta */
+  candles_window?: number;
 }
 
 export interface Signal {
@@ -719,29 +723,37 @@ class ApiClient {
     }>(`/replay/sessions/${encodeURIComponent(sessionId)}`);
   }
 
-  async stepReplay(sessionId: string, n = 1) {
+  async stepReplay(sessionId: string, n = 1, clientIndex?: number) {
     return this.request<ReplayStepResponse>(
       `/replay/sessions/${encodeURIComponent(sessionId)}/step`,
       {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ n }),
+        body: JSON.stringify({ n, client_index: clientIndex }),
       }
     );
   }
 
-  async jumpToNextSignal(sessionId: string, maxLookahead = 100) {
+  async jumpToNextSignal(sessionId: string, maxLookahead = 100, clientIndex?: number) {
     return this.request<{
       found: boolean;
       bars_advanced: number;
       step: ReplayStepResponse | null;
+      cancelled?: boolean;
     }>(`/replay/sessions/${encodeURIComponent(sessionId)}/jump-to-next-signal`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ max_lookahead: maxLookahead }),
+      body: JSON.stringify({ max_lookahead: maxLookahead, client_index: clientIndex }),
     });
   }
 
+  async cancelReplaySearch(sessionId: string) {
+    return this.request<{ ok: boolean; session_id: string }>(
+      `/replay/sessions/${encodeURIComponent(sessionId)}/cancel-search`,
+      { method: 'POST' }
+    );
+  }
+
   async deleteReplaySession(sessionId: string) {
     return this.request<{ ok: boolean; session_id: string }>(
       `/replay/sessions/${encodeURIComponent(sessionId)}`,